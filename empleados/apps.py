@@ -5,4 +5,5 @@ class EmpleadosConfig(AppConfig):
     name = 'empleados'
 
     def ready(self):
+        import empleados.conexiones  # noqa: F401
         import empleados.signals  # noqa: F401
@@ -0,0 +1,120 @@
+"""
+Retención de las bitácoras: mueve las filas más antiguas que el horizonte
+configurado a las tablas de archivo (`BitacoraArchivada`,
+`BitacoraEmpleadoArchivada`) y a archivos JSONL comprimidos por mes.
+"""
+import gzip
+import json
+import os
+from collections import defaultdict
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+from django.utils.timezone import localtime, now
+
+from .condicional import registrar_cambio_bitacora
+from .models import Bitacora, BitacoraArchivada, BitacoraEmpleado, BitacoraEmpleadoArchivada
+
+TAMANO_LOTE_ARCHIVO = 5000
+
+# (modelo activo, modelo de archivo, prefijo de los archivos JSONL)
+ORIGENES = [
+    (Bitacora, BitacoraArchivada, 'bitacora'),
+    (BitacoraEmpleado, BitacoraEmpleadoArchivada, 'bitacora_empleado'),
+]
+
+
+def fecha_limite(dias=None):
+    return now() - timedelta(days=settings.BITACORA_RETENCION_DIAS if dias is None else dias)
+
+
+def _periodo(fecha):
+    return localtime(fecha).strftime('%Y-%m')
+
+
+def _linea(datos):
+    return json.dumps(datos, ensure_ascii=False, cls=DjangoJSONEncoder, separators=(',', ':')) + '\n'
+
+
+def _ruta_pendiente(directorio, prefijo):
+    return os.path.join(directorio, f"{prefijo}.pendiente.jsonl")
+
+
+def _escribir_pendiente(directorio, prefijo, filas):
+    """Guarda el lote en `<prefijo>.pendiente.jsonl` antes de tocar la base."""
+    os.makedirs(directorio, exist_ok=True)
+    with open(_ruta_pendiente(directorio, prefijo), 'w', encoding='utf-8') as archivo:
+        for fila in filas:
+            archivo.write(_linea({'periodo': _periodo(fila['fecha']), 'fila': fila}))
+        archivo.flush()
+        os.fsync(archivo.fileno())
+
+
+def _volcar_pendiente(directorio, prefijo, modelo):
+    """
+    Agrega el lote pendiente a `<prefijo>_<AAAA-MM>.jsonl.gz` (un miembro gzip
+    nuevo por ejecución) y lo borra.
+
+    Sólo se agregan las filas que ya no están en la tabla activa, es decir, las
+    que borró una transacción confirmada; las demás se archivarán en el
+    siguiente lote.
+    """
+    ruta = _ruta_pendiente(directorio, prefijo)
+    if not os.path.exists(ruta):
+        return
+    with open(ruta, encoding='utf-8') as archivo:
+        pendientes = [json.loads(linea) for linea in archivo if linea.strip()]
+    activas = set(modelo.objects.filter(pk__in=[p['fila']['id'] for p in pendientes]).values_list('pk', flat=True))
+
+    por_periodo = defaultdict(list)
+    for pendiente in pendientes:
+        if pendiente['fila']['id'] not in activas:
+            por_periodo[pendiente['periodo']].append(pendiente['fila'])
+    for periodo, filas in por_periodo.items():
+        with gzip.open(os.path.join(directorio, f"{prefijo}_{periodo}.jsonl.gz"), 'at', encoding='utf-8') as archivo:
+            archivo.writelines(_linea(fila) for fila in filas)
+    os.remove(ruta)
+
+
+def archivar_modelo(modelo, modelo_archivo, prefijo, limite, directorio, con_tabla=True, lote=TAMANO_LOTE_ARCHIVO):
+    """
+    Mueve por lotes las filas de `modelo` con fecha anterior a `limite`.
+    Devuelve el número de filas archivadas.
+
+    Cada lote se guarda primero en un archivo pendiente; en una transacción se
+    copia a la tabla de archivo y se borra de la tabla activa, y sólo después
+    de confirmarla se agrega al JSONL del mes. Si el proceso se interrumpe,
+    volver a ejecutarlo es seguro: el pendiente que quedó se vuelca sin las
+    filas cuya transacción no llegó a confirmarse, y la copia ignora ids ya
+    archivados.
+    """
+    campos = [campo.attname for campo in modelo._meta.concrete_fields]
+    total = 0
+    _volcar_pendiente(directorio, prefijo, modelo)
+    while True:
+        filas = list(modelo.objects.filter(fecha__lt=limite).order_by('fecha', 'id').values(*campos)[:lote])
+        if not filas:
+            return total
+
+        _escribir_pendiente(directorio, prefijo, filas)
+        with transaction.atomic():
+            if con_tabla:
+                modelo_archivo.objects.bulk_create(
+                    [modelo_archivo(periodo=_periodo(fila['fecha']), **fila) for fila in filas],
+                    ignore_conflicts=True,
+                )
+            modelo.objects.filter(pk__in=[fila['id'] for fila in filas]).delete()
+            registrar_cambio_bitacora()
+        _volcar_pendiente(directorio, prefijo, modelo)
+        total += len(filas)
+
+
+def archivar_bitacoras(dias=None, directorio=None, con_tabla=True, lote=TAMANO_LOTE_ARCHIVO):
+    limite = fecha_limite(dias)
+    directorio = directorio or settings.BITACORA_ARCHIVO_DIR
+    return {
+        prefijo: archivar_modelo(modelo, modelo_archivo, prefijo, limite, directorio, con_tabla=con_tabla, lote=lote)
+        for modelo, modelo_archivo, prefijo in ORIGENES
+    }
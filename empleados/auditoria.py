@@ -0,0 +1,209 @@
+"""
+Escritura de la bitácora de auditoría.
+
+En modo `sincrono` cada entrada se inserta al momento y un error de la base de
+datos llega a quien la registró. En modo `buffer` (los errores se registran y
+las entradas se cuentan como descartadas):
+
+- dentro de una transacción, las entradas se acumulan y se escriben con un
+  solo `bulk_create` en `transaction.on_commit` (si la transacción se revierte,
+  se descartan junto con ella);
+- fuera de una transacción, se acumulan en un buffer del proceso que se vacía
+  al alcanzar BITACORA_BUFFER_TAMANO entradas o BITACORA_BUFFER_SEGUNDOS de
+  antigüedad, al terminar cada petición y al salir del proceso.
+
+Dentro de `auditoria_retenida()` las entradas esperan a que el bloque termine
+sin error para encolarse; si falla se descartan (las vistas de lectura en
+réplica lo usan para no registrar dos veces un GET que repiten en la primaria).
+"""
+import atexit
+import json
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core.signals import request_finished
+from django.db import DatabaseError, transaction
+from django.dispatch import receiver
+
+from .condicional import registrar_cambio_bitacora
+
+logger = logging.getLogger(__name__)
+
+_local = threading.local()
+# Contextvar y no threading.local: las vistas async registran desde hilos de sync_to_async
+_retenidas = ContextVar('auditoria_retenida', default=None)
+_candado = threading.Lock()
+_buffer = []
+_ultimo_volcado = time.monotonic()
+
+CONTADORES = {
+    'encolados': 0,
+    'escritos': 0,
+    'descartados': 0,
+    'duplicados_omitidos': 0,
+}
+
+
+def serializar_cambios(cambios):
+    """JSON compacto para las columnas de texto de la bitácora."""
+    return json.dumps(cambios or {}, ensure_ascii=False, separators=(',', ':'))
+
+
+def _contar(clave, cantidad=1):
+    with _candado:
+        CONTADORES[clave] += cantidad
+
+
+def estadisticas_auditoria():
+    with _candado:
+        return {**CONTADORES, 'en_buffer': len(_buffer)}
+
+
+# === DEDUPLICACIÓN VISTA / SEÑAL ===
+@contextmanager
+def auditoria_explicita():
+    """
+    Marca un bloque en el que la vista registra su propia entrada de bitácora,
+    para que las señales `post_save`/`post_delete` no la dupliquen.
+    """
+    _local.explicita = getattr(_local, 'explicita', 0) + 1
+    try:
+        yield
+    finally:
+        _local.explicita -= 1
+
+
+def auditoria_de_senal_omitida():
+    """True si la señal debe omitir su registro; lleva la cuenta de omisiones."""
+    if getattr(_local, 'explicita', 0):
+        _contar('duplicados_omitidos')
+        return True
+    return False
+
+
+# === ESCRITURA ===
+def _escribir(entradas, confirmado=False, propagar=False):
+    """
+    Inserta un lote de entradas (bitácora general y de empleado) con dos `bulk_create`.
+    `confirmado` indica que no hay una transacción externa pendiente de confirmar.
+    Con `propagar` (modo síncrono) un error de la base de datos llega a quien
+    registró la entrada; en los volcados diferidos se registra y se descarta.
+    """
+    from .models import Bitacora, BitacoraEmpleado
+
+    if not entradas:
+        return
+    try:
+        with transaction.atomic():
+            Bitacora.objects.bulk_create([general for general, _ in entradas])
+            BitacoraEmpleado.objects.bulk_create([empleado for _, empleado in entradas if empleado is not None])
+    except DatabaseError:
+        if propagar:
+            raise
+        _contar('descartados', len(entradas))
+        logger.exception("No se pudieron escribir %s entradas de bitácora.", len(entradas))
+    else:
+        _contar('escritos', len(entradas))
+        registrar_cambio_bitacora(al_confirmar=not confirmado)
+
+
+class _LoteTransaccion:
+    """Entradas de una transacción; se escriben juntas cuando la transacción confirma."""
+
+    def __init__(self):
+        self.entradas = []
+        self.confirmado = False
+
+    def __call__(self):
+        self.confirmado = True
+        _escribir(self.entradas, confirmado=True)
+
+
+def _en_transaccion():
+    return transaction.get_connection().in_atomic_block
+
+
+def _lote_de_transaccion_actual():
+    conexion = transaction.get_connection()
+    # Un lote por nivel de savepoint: si un savepoint se revierte, Django
+    # descarta su callback y con él solo las entradas de ese nivel.
+    clave = tuple(conexion.savepoint_ids)
+    lotes = getattr(_local, 'lotes', None)
+    if lotes is None:
+        lotes = _local.lotes = {}
+
+    lote = lotes.get(clave)
+    registrado = lote is not None and any(funcion is lote for _, funcion, _ in conexion.run_on_commit)
+    if lote is None or lote.confirmado or not registrado:
+        lote = lotes[clave] = _LoteTransaccion()
+        transaction.on_commit(lote)
+    return lote
+
+
+@contextmanager
+def auditoria_retenida():
+    """Retiene las entradas registradas en el bloque; se encolan si termina sin error."""
+    retenidas = []
+    token = _retenidas.set(retenidas)
+    try:
+        yield
+    finally:
+        _retenidas.reset(token)
+    for general, empleado in retenidas:
+        encolar(general, empleado)
+
+
+def encolar(general, empleado=None):
+    """
+    Registra una entrada de bitácora: `general` es un `Bitacora` sin guardar y
+    `empleado` un `BitacoraEmpleado` opcional.
+    """
+    entrada = (general, empleado)
+    retenidas = _retenidas.get()
+    if retenidas is not None:
+        retenidas.append(entrada)
+        return
+    _contar('encolados')
+
+    if settings.BITACORA_MODO != 'buffer':
+        _escribir([entrada], propagar=True)
+        return
+
+    if _en_transaccion():
+        _lote_de_transaccion_actual().entradas.append(entrada)
+        return
+
+    with _candado:
+        _buffer.append(entrada)
+        excedentes = len(_buffer) - settings.BITACORA_BUFFER_MAXIMO
+        if excedentes > 0:
+            del _buffer[:excedentes]
+            CONTADORES['descartados'] += excedentes
+        lleno = len(_buffer) >= settings.BITACORA_BUFFER_TAMANO
+        vencido = time.monotonic() - _ultimo_volcado >= settings.BITACORA_BUFFER_SEGUNDOS
+    if lleno or vencido:
+        volcar()
+
+
+def volcar():
+    """Escribe todo lo pendiente en el buffer del proceso."""
+    global _ultimo_volcado
+    with _candado:
+        entradas = _buffer[:]
+        _buffer.clear()
+        _ultimo_volcado = time.monotonic()
+    _escribir(entradas, confirmado=True)
+    return len(entradas)
+
+
+@receiver(request_finished)
+def volcar_al_terminar_peticion(sender, **kwargs):
+    if _buffer:
+        volcar()
+
+
+atexit.register(lambda: _buffer and volcar())
@@ -0,0 +1,174 @@
+"""
+Autenticación JWT con lista de revocación y modo sin estado.
+
+Con `JWT_SIN_ESTADO` activo, `JWTSinEstadoAuthentication` confía en los claims
+firmados del token (id, username, role, groups, is_staff, is_superuser) y no
+consulta `CustomUser` en cada petición. Como el token deja de reflejar cambios
+del usuario hasta que expira, los cambios sensibles lo revocan (ver
+`empleados.signals`) avanzando su versión, y la revocación se comprueba
+contra una copia en memoria de esa versión. Al cerrar sesión
+(`POST /api/token/revocar/`) se revocan el access token y su refresh token.
+"""
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import F
+from django.utils.functional import cached_property
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import InvalidToken
+from rest_framework_simplejwt.models import TokenUser
+from rest_framework_simplejwt.serializers import TokenRefreshSerializer
+from rest_framework_simplejwt.settings import api_settings
+
+from .models import VersionToken
+from .permissions import CLAIM_GRUPOS
+
+# Campos del usuario copiados como claims en CustomTokenObtainPairSerializer
+CAMPOS_EN_TOKEN = ('username', 'role', 'is_staff', 'is_superuser')
+# Campos que revocan los tokens del usuario aunque no se confíe en los claims
+# (el cliente lee el rol del token para armar su menú)
+CAMPOS_SEGURIDAD = ('password', 'is_active', 'role')
+# Versión de los tokens del usuario al emitirse (ver ListaRevocacion)
+CLAIM_VERSION = 'ver'
+
+
+def claims_confiables():
+    """True si alguna ruta de autorización usa los claims sin releer el usuario."""
+    return settings.JWT_SIN_ESTADO or settings.PERMISOS_GRUPOS_EN_TOKEN
+
+
+# === LISTA DE REVOCACIÓN ===
+class ListaRevocacion:
+    """
+    Revocación por usuario con un contador de versión: cada token lleva la
+    versión vigente al emitirse (claim `ver`) y deja de valer en cuanto el
+    contador avanza. El contador vive en la base de datos (`VersionToken`) y se
+    incrementa con un UPDATE atómico, así que ninguna revocación se pierde entre
+    procesos; cada proceso guarda una copia que relee como mucho cada
+    `JWT_REVOCACION_REFRESCO_SEGUNDOS`. Los tokens sueltos se revocan por `jti`
+    con una clave por token en la caché de Django, que expira con el token.
+    """
+    PREFIJO_TOKEN = 'jwt:revocado:'
+
+    def __init__(self):
+        self._candado = threading.Lock()
+        self._versiones = {}  # user_id -> (versión, instante monotónico de lectura)
+
+    def version_usuario(self, user_id, refrescar=False):
+        """Versión vigente de los tokens de `user_id` (0 si nunca se revocaron)."""
+        clave = str(user_id)
+        with self._candado:
+            guardada = self._versiones.get(clave)
+        if not refrescar and guardada and time.monotonic() - guardada[1] < settings.JWT_REVOCACION_REFRESCO_SEGUNDOS:
+            return guardada[0]
+        version = VersionToken.objects.filter(usuario_id=user_id).values_list('version', flat=True).first() or 0
+        with self._candado:
+            self._versiones[clave] = (version, time.monotonic())
+        return version
+
+    def revocar_token(self, *tokens):
+        """
+        Revoca tokens sueltos por su `jti`. La marca vive en la caché: sin
+        CACHE_COMPARTIDA otro proceso no la vería, así que se revocan todos los
+        tokens de sus usuarios.
+        """
+        if not settings.CACHE_COMPARTIDA:
+            for user_id in {token[api_settings.USER_ID_CLAIM] for token in tokens}:
+                self.revocar_usuario(user_id)
+            return
+        for token in tokens:
+            restante = token['exp'] - time.time()
+            if restante > 0:
+                cache.set(self.PREFIJO_TOKEN + token[api_settings.JTI_CLAIM], True, timeout=restante)
+
+    def revocar_usuario(self, user_id):
+        VersionToken.objects.get_or_create(usuario_id=user_id)
+        VersionToken.objects.filter(usuario_id=user_id).update(version=F('version') + 1)
+        with self._candado:
+            self._versiones.pop(str(user_id), None)
+
+    def revocado(self, token, refrescar=False):
+        jti = token.get(api_settings.JTI_CLAIM)
+        if jti and cache.get(self.PREFIJO_TOKEN + jti):
+            return True
+        user_id = token.get(api_settings.USER_ID_CLAIM)
+        # Los tokens emitidos antes del claim cuentan como versión 0
+        return user_id is not None and token.get(CLAIM_VERSION, 0) != self.version_usuario(user_id, refrescar)
+
+    def limpiar(self):
+        """Olvida las versiones leídas por este proceso."""
+        with self._candado:
+            self._versiones.clear()
+
+
+revocaciones = ListaRevocacion()
+
+
+def cambios_que_revocan(usuario):
+    """
+    Campos del token que cambiaron desde que se cargó `usuario`. Los de
+    `CAMPOS_EN_TOKEN` sólo cuentan si se confía en los claims.
+    """
+    campos = CAMPOS_SEGURIDAD + (CAMPOS_EN_TOKEN if claims_confiables() else ())
+    anteriores = getattr(usuario, '_valores_token', {})
+    return [
+        campo for campo in campos
+        if campo in anteriores and usuario.__dict__.get(campo) != anteriores[campo]
+    ]
+
+
+def valores_token(usuario):
+    """Valores actuales de los campos vigilados, sin provocar consultas por campos diferidos."""
+    return {
+        campo: usuario.__dict__[campo]
+        for campo in CAMPOS_EN_TOKEN + CAMPOS_SEGURIDAD if campo in usuario.__dict__
+    }
+
+
+# === USUARIO RESPALDADO POR EL TOKEN ===
+class UsuarioToken(TokenUser):
+    """`TokenUser` con los claims propios del proyecto (rol y grupos)."""
+
+    @cached_property
+    def role(self):
+        return self.token.get('role', '')
+
+    @cached_property
+    def _grupos_permisos(self):
+        # Lo usa empleados.permissions.grupos_usuario: cero consultas
+        return frozenset(self.token.get(CLAIM_GRUPOS, ()))
+
+
+# === CLASES DE AUTENTICACIÓN ===
+class JWTConRevocacionAuthentication(JWTAuthentication):
+    """`JWTAuthentication` que además rechaza los tokens revocados."""
+
+    def get_validated_token(self, raw_token):
+        token = super().get_validated_token(raw_token)
+        if revocaciones.revocado(token):
+            raise AuthenticationFailed("El token fue revocado.", code='token_revoked')
+        return token
+
+
+class JWTSinEstadoAuthentication(JWTConRevocacionAuthentication):
+    """Autentica con los claims del token, sin consultar el usuario."""
+
+    def get_user(self, validated_token):
+        if api_settings.USER_ID_CLAIM not in validated_token:
+            raise InvalidToken("El token no identifica a ningún usuario.")
+        # Tokens emitidos antes de incluir los claims: se resuelven con la base de datos
+        if not all(campo in validated_token for campo in CAMPOS_EN_TOKEN):
+            return super().get_user(validated_token)
+        return UsuarioToken(validated_token)
+
+
+class TokenRefreshConRevocacionSerializer(TokenRefreshSerializer):
+    """Impide renovar el access token con un refresh token revocado."""
+
+    def validate(self, attrs):
+        if revocaciones.revocado(self.token_class(attrs['refresh']), refrescar=True):
+            raise InvalidToken("El token fue revocado.")
+        return super().validate(attrs)
@@ -0,0 +1,115 @@
+"""
+Utilidades compartidas por los comandos `bench_*` de rendimiento.
+
+Las mediciones de memoria se hacen en un proceso hijo para que el pico de RSS
+de un escenario no contamine al siguiente.
+"""
+import random
+import resource
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from datetime import date, timedelta
+
+NOMBRES = ['Juan', 'Ana', 'Luis', 'María', 'José', 'Carmen', 'Pedro', 'Lucía', 'Miguel', 'Sofía']
+APELLIDOS = ['Pérez', 'López', 'García', 'Hernández', 'Martínez', 'González', 'Rodríguez', 'Sánchez', 'Ramírez', 'Flores']
+PUESTOS = ['Desarrollador', 'Analista', 'Gerente', 'Supervisor', 'Auxiliar', 'Contador']
+DEPARTAMENTOS = ['TI', 'RH', 'Finanzas', 'Operaciones', 'Ventas', 'Legal']
+
+
+def rss_pico_mb():
+    """Pico de memoria residente del proceso actual, en MB."""
+    pico = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reporta KB; macOS reporta bytes
+    return pico / (1024 * 1024) if sys.platform == 'darwin' else pico / 1024
+
+
+def datos_empleado(indice, semilla=None):
+    """Diccionario de campos de un empleado sintético, determinista por índice."""
+    azar = random.Random(indice if semilla is None else semilla)
+    nacimiento = date(1960, 1, 1) + timedelta(days=azar.randint(0, 15000))
+    return {
+        'num_empleado': f'B{indice:08d}',
+        'nombres': azar.choice(NOMBRES),
+        'apellido_paterno': azar.choice(APELLIDOS),
+        'apellido_materno': azar.choice(APELLIDOS),
+        'fecha_nacimiento': nacimiento,
+        'genero': azar.choice(['Masculino', 'Femenino']),
+        'estado_civil': azar.choice(['Soltero', 'Casado']),
+        'curp': f'BENC{indice:014d}'[:18],
+        'rfc': f'BEN{indice:010d}'[:13],
+        'nss': f'{indice:011d}',
+        'telefono': f'55{indice:08d}'[-10:],
+        'email': f'empleado{indice}@bench.example.com',
+        'puesto': azar.choice(PUESTOS),
+        'departamento': azar.choice(DEPARTAMENTOS),
+        'fecha_ingreso': date(2010, 1, 1) + timedelta(days=azar.randint(0, 5000)),
+        'activo': azar.random() > 0.1,
+    }
+
+
+def filas_sinteticas(total):
+    """Tuplas con la forma de `values_list(*CAMPOS_EXPORTACION)` sin tocar la base de datos."""
+    from .exportacion import CAMPOS_EXPORTACION
+
+    for indice in range(1, total + 1):
+        datos = datos_empleado(indice)
+        datos['id'] = indice
+        yield tuple(datos[campo] for campo in CAMPOS_EXPORTACION)
+
+
+@contextmanager
+def datos_temporales():
+    """
+    Ejecuta el bloque dentro de una transacción que siempre se revierte,
+    para sembrar datos sintéticos sin dejar rastro en la base de datos.
+    """
+    from django.db import transaction
+
+    with transaction.atomic():
+        yield
+        transaction.set_rollback(True)
+
+
+def crear_empleados_sinteticos(total, inicio=1, lote=5000):
+    """Inserta `total` empleados sintéticos con `bulk_create` (sin señales ni bitácora)."""
+    from .models import Empleado
+
+    for desde in range(inicio, inicio + total, lote):
+        hasta = min(desde + lote, inicio + total)
+        Empleado.objects.bulk_create([Empleado(**datos_empleado(indice)) for indice in range(desde, hasta)])
+
+
+def ejecutar_aislado(funcion, *args):
+    """Ejecuta `funcion(*args)` en un proceso nuevo y devuelve su resultado."""
+    with ProcessPoolExecutor(max_workers=1) as pool:
+        return pool.submit(funcion, *args).result()
+
+
+class Cronometro:
+    """Context manager que mide el tiempo transcurrido en segundos."""
+
+    def __enter__(self):
+        self.inicio = time.perf_counter()
+        self.segundos = 0.0
+        return self
+
+    def __exit__(self, *exc):
+        self.segundos = time.perf_counter() - self.inicio
+        return False
+
+
+def identificadores_sinteticos(total):
+    """Tuplas (CURP, RFC, NSS) con formato y dígitos verificadores válidos."""
+    from .identificadores import digito_curp, digito_nss, digito_rfc
+
+    letras = 'BCDFGHJKLMNPQRSTVWXZ'
+    for indice in range(total):
+        nacimiento = date(1960, 1, 1) + timedelta(days=indice % 15000)
+        fecha = nacimiento.strftime('%y%m%d')
+        clave = ''.join(letras[indice // 20 ** posicion % 20] for posicion in range(3))
+        curp = f'PEGA{fecha}HDF{clave}{"0" if nacimiento.year < 2000 else "A"}'
+        rfc = f'PEGA{fecha}{clave[:2]}'
+        nss = f'{indice:010d}'
+        yield curp + digito_curp(curp), rfc + digito_rfc(rfc + '0'), nss + digito_nss(nss)
@@ -0,0 +1,206 @@
+"""
+Motor de búsqueda de empleados.
+
+Cada empleado guarda en `Empleado.busqueda` un texto normalizado (minúsculas,
+sin acentos ni puntuación) con sus nombres e identificadores. En PostgreSQL ese
+texto está indexado con GIN (`to_tsvector` para prefijos y `pg_trgm` para
+subcadenas, ver la migración 0007); en otros motores, como SQLite en pruebas,
+se usa un índice de prefijos en memoria del proceso.
+
+Este módulo no importa modelos al cargarse porque `empleados.models` depende de él.
+"""
+import bisect
+import re
+import threading
+import unicodedata
+
+from django.db import connection
+from django.db.models import BooleanField, FloatField
+from django.db.models.expressions import RawSQL
+
+CAMPOS_BUSQUEDA = [
+    'nombres', 'apellido_paterno', 'apellido_materno', 'num_empleado',
+    'curp', 'rfc', 'nss', 'email', 'telefono',
+]
+
+LIMITE_RESULTADOS = 20
+LIMITE_RESULTADOS_MAXIMO = 100
+
+_NO_ALFANUMERICO = re.compile(r'[^a-z0-9]+')
+
+
+def normalizar(texto):
+    """'José Pérez-Ñúñez' -> 'jose perez nunez'."""
+    texto = unicodedata.normalize('NFKD', str(texto or '').lower())
+    texto = ''.join(caracter for caracter in texto if not unicodedata.combining(caracter))
+    return _NO_ALFANUMERICO.sub(' ', texto).strip()
+
+
+def texto_busqueda(valores):
+    """Texto indexable a partir de los valores de `CAMPOS_BUSQUEDA`."""
+    return ' '.join(filter(None, (normalizar(valor) for valor in valores)))
+
+
+def terminos(consulta):
+    """Términos normalizados y sin repetir de una consulta del usuario."""
+    return list(dict.fromkeys(normalizar(consulta).split()))
+
+
+def puntaje(texto, terminos_consulta):
+    """
+    Relevancia de `texto` para la consulta: por cada término suma 1 si coincide
+    con una palabra completa, o la fracción de la palabra que cubre si es prefijo.
+    Devuelve 0 si algún término no coincide.
+    """
+    palabras = texto.split()
+    total = 0.0
+    for termino in terminos_consulta:
+        mejor = max(
+            (len(termino) / len(palabra) for palabra in palabras if palabra.startswith(termino)),
+            default=0.0,
+        )
+        if not mejor:
+            return 0.0
+        total += mejor
+    return total
+
+
+# === ÍNDICE EN MEMORIA (motores sin GIN) ===
+class IndiceLocal:
+    """
+    Lista ordenada de pares (palabra, id) para resolver prefijos con `bisect`.
+
+    Se construye la primera vez que se consulta y se mantiene con las señales
+    de `Empleado`; los `bulk_create` lo invalidan. Como puede quedar desfasado
+    (p. ej. si una transacción se revierte), sólo propone candidatos: el texto
+    definitivo siempre se vuelve a leer de la base de datos.
+    """
+
+    def __init__(self):
+        self._candado = threading.Lock()
+        self._pares = None
+        self._palabras_por_id = {}
+
+    @property
+    def construido(self):
+        return self._pares is not None
+
+    def construir(self):
+        from .models import Empleado
+
+        pares, palabras_por_id = [], {}
+        for pk, texto in Empleado.objects.values_list('id', 'busqueda').iterator(chunk_size=5000):
+            palabras = set(texto.split())
+            palabras_por_id[pk] = palabras
+            pares.extend((palabra, pk) for palabra in palabras)
+        pares.sort()
+        with self._candado:
+            self._pares, self._palabras_por_id = pares, palabras_por_id
+
+    def invalidar(self):
+        with self._candado:
+            self._pares, self._palabras_por_id = None, {}
+
+    def _quitar(self, pk):
+        for palabra in self._palabras_por_id.pop(pk, ()):
+            posicion = bisect.bisect_left(self._pares, (palabra, pk))
+            if posicion < len(self._pares) and self._pares[posicion] == (palabra, pk):
+                del self._pares[posicion]
+
+    def actualizar(self, pk, texto):
+        with self._candado:
+            if self._pares is None:
+                return
+            self._quitar(pk)
+            palabras = set(texto.split())
+            self._palabras_por_id[pk] = palabras
+            for palabra in palabras:
+                bisect.insort(self._pares, (palabra, pk))
+
+    def eliminar(self, pk):
+        with self._candado:
+            if self._pares is not None:
+                self._quitar(pk)
+
+    def candidatos(self, terminos_consulta):
+        """{id: puntaje} de los empleados que coinciden con todos los términos (ver `puntaje`)."""
+        if self._pares is None:
+            self.construir()
+        with self._candado:
+            resultado = None
+            for termino in terminos_consulta:
+                mejores = {}
+                posicion = bisect.bisect_left(self._pares, (termino,))
+                while posicion < len(self._pares) and self._pares[posicion][0].startswith(termino):
+                    palabra, pk = self._pares[posicion]
+                    mejores[pk] = max(mejores.get(pk, 0.0), len(termino) / len(palabra))
+                    posicion += 1
+                if resultado is None:
+                    resultado = mejores
+                else:
+                    resultado = {pk: valor + mejores[pk] for pk, valor in resultado.items() if pk in mejores}
+                if not resultado:
+                    return {}
+            return resultado or {}
+
+
+indice_local = IndiceLocal()
+
+
+def usa_indice_postgres():
+    return connection.vendor == 'postgresql'
+
+
+# === BÚSQUEDA CLASIFICADA ===
+def _buscar_postgres(queryset, terminos_consulta, consulta, limite):
+    tsquery = ' & '.join(f'{termino}:*' for termino in terminos_consulta)
+    return list(
+        queryset
+        .filter(RawSQL("to_tsvector('simple', busqueda) @@ to_tsquery('simple', %s)", (tsquery,), output_field=BooleanField()))
+        .annotate(puntaje=RawSQL(
+            "ts_rank(to_tsvector('simple', busqueda), to_tsquery('simple', %s)) + similarity(busqueda, %s)",
+            (tsquery, consulta),
+            output_field=FloatField(),
+        ))
+        .order_by('-puntaje', 'id')[:limite]
+    )
+
+
+def _buscar_local(queryset, terminos_consulta, limite):
+    candidatos = indice_local.candidatos(terminos_consulta)
+    orden = sorted(candidatos, key=lambda pk: (-candidatos[pk], pk))
+    resultado = []
+    # El índice en memoria sólo propone candidatos: se revalidan contra el texto
+    # guardado, por ventanas, hasta completar el límite
+    for inicio in range(0, len(orden), limite * 2):
+        ventana = orden[inicio:inicio + limite * 2]
+        empleados = queryset.in_bulk(ventana)
+        for pk in ventana:
+            empleado = empleados.get(pk)
+            if empleado is None:
+                continue
+            empleado.puntaje = puntaje(empleado.busqueda, terminos_consulta)
+            if empleado.puntaje:
+                resultado.append(empleado)
+        if len(resultado) >= limite:
+            break
+    resultado.sort(key=lambda empleado: (-empleado.puntaje, empleado.pk))
+    return resultado[:limite]
+
+
+def buscar_empleados(consulta, limite=LIMITE_RESULTADOS, queryset=None):
+    """
+    Empleados cuyo texto de búsqueda contiene palabras que empiezan con cada
+    término de la consulta, ordenados por relevancia (atributo `puntaje`).
+    """
+    from .models import Empleado
+
+    terminos_consulta = terminos(consulta)
+    if not terminos_consulta:
+        return []
+    if queryset is None:
+        queryset = Empleado.objects.all()
+    limite = max(1, min(limite, LIMITE_RESULTADOS_MAXIMO))
+    if usa_indice_postgres():
+        return _buscar_postgres(queryset, terminos_consulta, ' '.join(terminos_consulta), limite)
+    return _buscar_local(queryset, terminos_consulta, limite)
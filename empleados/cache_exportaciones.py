@@ -0,0 +1,146 @@
+"""
+Caché en disco de las exportaciones a Excel y PDF.
+
+El archivo generado se guarda en EXPORTACIONES_CACHE_DIR con un nombre que
+combina el último cambio de empleados (`CambioEmpleado`, común a todos los
+procesos), la generación de `empleados.condicional` (avanza al confirmar cada
+escritura) y un hash del formato y los filtros. Mientras nada cambie, la misma
+exportación se sirve del disco con `FileResponse` o, con
+EXPORTACIONES_CACHE_SENDFILE, delegando el envío al servidor web.
+
+Al guardar un archivo nuevo se borran los de cambios anteriores, los que no se
+usan desde hace EXPORTACIONES_CACHE_SEGUNDOS y, si el directorio supera
+EXPORTACIONES_CACHE_MAX_MB, los usados hace más tiempo.
+"""
+import hashlib
+import json
+import os
+import tempfile
+import time
+
+from django.conf import settings
+from django.db.models import Max
+from django.http import FileResponse, HttpResponse
+
+from .condicional import CLAVE_CACHE_VERSION, leer_version
+from .filters import PARAMETROS_FILTRO_EMPLEADOS
+from .models import CambioEmpleado
+
+
+def cache_exportaciones_activa():
+    return settings.EXPORTACIONES_CACHE_SEGUNDOS > 0
+
+
+def filtros_exportacion(parametros):
+    """Parámetros del listado presentes en la petición, en orden canónico."""
+    return {clave: parametros.getlist(clave) for clave in sorted(parametros) if clave in PARAMETROS_FILTRO_EMPLEADOS}
+
+
+def ruta_exportacion(formato, extension, filtros):
+    """Ruta del archivo en caché para estos datos; puede no existir todavía."""
+    ultimo_cambio = CambioEmpleado.objects.aggregate(ultimo=Max('id'))['ultimo'] or 0
+    huella = json.dumps([formato, filtros, leer_version(CLAVE_CACHE_VERSION)], sort_keys=True)
+    nombre = f"{ultimo_cambio:012d}-{hashlib.sha1(huella.encode()).hexdigest()}.{extension}"
+    return os.path.join(settings.EXPORTACIONES_CACHE_DIR, nombre)
+
+
+def buscar_exportacion(ruta):
+    """True si el archivo existe; marca su uso para el desalojo."""
+    try:
+        os.utime(ruta)
+    except FileNotFoundError:
+        return False
+    return True
+
+
+def _temporal(ruta):
+    os.makedirs(os.path.dirname(ruta), exist_ok=True)
+    return tempfile.mkstemp(dir=os.path.dirname(ruta), suffix='.tmp')
+
+
+def guardar_bloques(bloques, ruta):
+    """
+    Entrega los bloques de una exportación en streaming y a la vez los escribe
+    en la caché. El archivo sólo aparece al terminar: si el cliente corta la
+    descarga, el temporal se borra.
+    """
+    descriptor, temporal = _temporal(ruta)
+    completo = False
+    try:
+        with os.fdopen(descriptor, 'wb') as archivo:
+            for bloque in bloques:
+                archivo.write(bloque)
+                yield bloque
+        completo = True
+    finally:
+        if completo:
+            os.replace(temporal, ruta)
+            podar_exportaciones(ruta)
+        else:
+            os.remove(temporal)
+
+
+def guardar_exportacion(ruta, escribir):
+    """Genera el archivo con `escribir(destino)` y lo publica con un reemplazo atómico."""
+    descriptor, temporal = _temporal(ruta)
+    try:
+        with os.fdopen(descriptor, 'wb') as archivo:
+            escribir(archivo)
+        os.replace(temporal, ruta)
+    except BaseException:
+        os.remove(temporal)
+        raise
+    podar_exportaciones(ruta)
+
+
+def respuesta_exportacion(ruta, nombre_descarga, content_type, adjunto=True):
+    disposicion = 'attachment' if adjunto else 'inline'
+    encabezado = settings.EXPORTACIONES_CACHE_SENDFILE
+    if encabezado:
+        # El servidor web (X-Sendfile / X-Accel-Redirect) envía el archivo
+        response = HttpResponse(content_type=content_type)
+        if encabezado.lower() == 'x-accel-redirect':
+            response[encabezado] = settings.EXPORTACIONES_CACHE_SENDFILE_URL + os.path.basename(ruta)
+        else:
+            response[encabezado] = ruta
+        response['Content-Disposition'] = f'{disposicion}; filename="{nombre_descarga}"'
+        return response
+    return FileResponse(open(ruta, 'rb'), as_attachment=adjunto, filename=nombre_descarga, content_type=content_type)
+
+
+def podar_exportaciones(vigente):
+    """Borra archivos de cambios anteriores, vencidos o en exceso de tamaño (los menos usados primero)."""
+    directorio = os.path.dirname(vigente)
+    ultimo_cambio = os.path.basename(vigente).split('-', 1)[0]
+    limite = time.time() - settings.EXPORTACIONES_CACHE_SEGUNDOS
+
+    archivos = []
+    for entrada in os.scandir(directorio):
+        if not entrada.is_file():
+            continue
+        try:
+            estado = entrada.stat()
+        except FileNotFoundError:
+            continue
+        temporal = entrada.name.endswith('.tmp')
+        obsoleto = not temporal and entrada.name.split('-', 1)[0] < ultimo_cambio
+        if obsoleto or estado.st_mtime < limite:
+            _borrar(entrada.path)
+        elif not temporal:
+            archivos.append((estado.st_mtime, estado.st_size, entrada.path))
+
+    total = sum(tamano for _, tamano, _ in archivos)
+    maximo = settings.EXPORTACIONES_CACHE_MAX_MB * 1024 * 1024
+    for _, tamano, ruta in sorted(archivos):
+        if total <= maximo:
+            break
+        if ruta != vigente:
+            _borrar(ruta)
+            total -= tamano
+
+
+def _borrar(ruta):
+    try:
+        os.remove(ruta)
+    except FileNotFoundError:
+        pass
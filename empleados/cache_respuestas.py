@@ -0,0 +1,137 @@
+"""
+Caché compartida de respuestas de lectura (listados de empleados y bitácoras).
+
+Se guardan los datos ya serializados de la respuesta en el alias `respuestas`
+de CACHES. La clave combina la vista, la URL, los parámetros de la consulta en
+orden canónico, el alcance de permisos del usuario y la generación de cada
+conjunto de datos del que depende la vista. Una escritura avanza la generación
+(ver `empleados.condicional`): las entradas anteriores dejan de encontrarse y
+sólo esperan a expirar o a ser desalojadas, así que nunca se sirve una página
+vieja y no hace falta borrar claves por patrón. Por eso la caché de respuestas
+sólo se usa con CACHE_COMPARTIDA: con `memoria` y varios workers, uno no vería
+las generaciones que avanzan los demás.
+
+Los backends `MemoriaLRUCache` y `ArchivoCache` cuentan sus desalojos para
+`estadisticas_cache()`; en Redis el desalojo lo decide el servidor.
+"""
+import hashlib
+import threading
+from urllib.parse import urlencode
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.filebased import FileBasedCache
+from django.core.cache.backends.locmem import LocMemCache
+
+from .condicional import CLAVE_CACHE_VERSION, CLAVE_CACHE_VERSION_BITACORA, leer_version
+
+ALIAS_CACHE = 'respuestas'
+GENERACIONES = {
+    'empleados': CLAVE_CACHE_VERSION,
+    'bitacora': CLAVE_CACHE_VERSION_BITACORA,
+}
+
+_candado = threading.Lock()
+CONTADORES = {
+    'aciertos': 0,
+    'fallos': 0,
+    'guardados': 0,
+    'desalojos': 0,
+}
+
+
+def _contar(clave, cantidad=1):
+    with _candado:
+        CONTADORES[clave] += cantidad
+
+
+def estadisticas_cache():
+    with _candado:
+        contadores = dict(CONTADORES)
+    consultas = contadores['aciertos'] + contadores['fallos']
+    return {
+        **contadores,
+        'tasa_aciertos': round(contadores['aciertos'] / consultas, 3) if consultas else None,
+        'tipo': settings.CACHE_TIPO,
+    }
+
+
+def reiniciar_estadisticas():
+    with _candado:
+        CONTADORES.update(dict.fromkeys(CONTADORES, 0))
+
+
+# === BACKENDS CON CONTEO DE DESALOJOS ===
+class MemoriaLRUCache(LocMemCache):
+    """LocMemCache ya desaloja primero la entrada usada hace más tiempo; aquí además se cuentan."""
+
+    def _cull(self):
+        antes = len(self._cache)
+        super()._cull()
+        _contar('desalojos', antes - len(self._cache))
+
+
+class ArchivoCache(FileBasedCache):
+    """FileBasedCache desaloja archivos al azar al llenarse; se cuentan los borrados."""
+
+    _desalojando = False
+
+    def _cull(self):
+        self._desalojando = True
+        try:
+            super()._cull()
+        finally:
+            self._desalojando = False
+
+    def _delete(self, fname):
+        borrado = super()._delete(fname)
+        if borrado and self._desalojando:
+            _contar('desalojos')
+        return borrado
+
+
+# === CLAVES Y LECTURA / ESCRITURA ===
+def cache_activa():
+    # Con una caché por proceso las generaciones no avanzan en los demás workers
+    return settings.CACHE_RESPUESTAS_SEGUNDOS > 0 and settings.CACHE_COMPARTIDA
+
+
+def alcance_permisos(request):
+    """
+    Alcance del usuario en la clave: superusuario, staff o su rol. Sale del
+    usuario ya autenticado (o de los claims del token), sin consultar sus grupos.
+    """
+    usuario = request.user
+    if usuario.is_superuser:
+        return 'superusuario'
+    if usuario.is_staff:
+        return 'staff'
+    return f"rol:{getattr(usuario, 'role', '')}"
+
+
+def parametros_normalizados(request):
+    """Query string en orden canónico: `?b=2&a=1` y `?a=1&b=2` comparten entrada."""
+    parametros = request.query_params
+    return urlencode([(nombre, valor) for nombre in sorted(parametros) for valor in parametros.getlist(nombre)])
+
+
+def clave_respuesta(request, vista, generaciones):
+    partes = [
+        type(vista).__name__,
+        request.build_absolute_uri(request.path),
+        parametros_normalizados(request),
+        alcance_permisos(request),
+        *(f'{nombre}={leer_version(GENERACIONES[nombre])}' for nombre in generaciones),
+    ]
+    return 'respuesta:' + hashlib.sha1('\n'.join(partes).encode()).hexdigest()
+
+
+def obtener_respuesta(clave):
+    datos = caches[ALIAS_CACHE].get(clave)
+    _contar('fallos' if datos is None else 'aciertos')
+    return datos
+
+
+def guardar_respuesta(clave, datos):
+    caches[ALIAS_CACHE].set(clave, datos)
+    _contar('guardados')
@@ -0,0 +1,149 @@
+"""
+Validadores HTTP (ETag / Last-Modified) para peticiones condicionales.
+
+Las versiones salen de valores baratos, no de hashear la respuesta:
+
+- un empleado: el id y la fecha de su último `CambioEmpleado` (una consulta
+  por índice, sin cargar ni serializar el empleado);
+- listados y dashboard: una versión del conjunto de empleados guardada en la
+  caché, que avanza con cada alta, edición o baja (`registrar_cambio_empleados`).
+  Si la caché la pierde se crea una nueva distinta de todas las anteriores, así
+  que nunca se responde 304 con datos viejos; a lo sumo se reenvía completo.
+  Sólo se emiten si la caché es compartida por todos los procesos
+  (CACHE_COMPARTIDA): con una caché por proceso, otro worker no vería el cambio.
+
+La caché de respuestas (`empleados.cache_respuestas`) usa estas mismas
+versiones como generaciones, junto con la de la bitácora.
+
+Los ETag son fuertes y distinguen la variante pedida por query string
+(`?fields=`, filtros, página), así que dos representaciones distintas nunca
+comparten ETag.
+"""
+import hashlib
+import uuid
+from datetime import datetime, time as hora
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+from django.utils.timezone import get_current_timezone, localdate, now
+
+CLAVE_CACHE_VERSION = 'empleados:version'
+CLAVE_CACHE_MODIFICADO = 'empleados:modificado'
+CLAVE_CACHE_VERSION_BITACORA = 'bitacora:version'
+
+
+def _version_nueva():
+    return uuid.uuid4().hex
+
+
+def _avanzar_version(clave):
+    # Un valor nuevo en vez de `incr`: en FileBasedCache `incr` es leer y escribir,
+    # y dos avances simultáneos darían la misma versión. Con `set` gana el último
+    # y cualquiera de los dos es distinto de todas las versiones anteriores.
+    cache.set(clave, _version_nueva(), timeout=None)
+
+
+def leer_version(clave):
+    """Versión actual guardada en `clave`; se crea si la caché no la tiene."""
+    version = cache.get(clave)
+    if version is None:
+        cache.add(clave, _version_nueva(), timeout=None)
+        version = cache.get(clave)
+    return version
+
+
+def avanzar_version(clave, al_confirmar=True):
+    """
+    Avanza la versión al momento y, con `al_confirmar`, otra vez al confirmar
+    la transacción: una lectura concurrente que vio la versión nueva antes del
+    COMMIT leyó datos viejos y no debe quedar asociada a la versión definitiva.
+    """
+    _avanzar_version(clave)
+    if al_confirmar:
+        transaction.on_commit(lambda: _avanzar_version(clave))
+
+
+def registrar_cambio_empleados():
+    """Avanza la versión del conjunto de empleados."""
+    avanzar_version(CLAVE_CACHE_VERSION)
+    cache.set(CLAVE_CACHE_MODIFICADO, now(), timeout=None)
+
+
+def registrar_cambio_bitacora(al_confirmar=True):
+    """Avanza la versión de la bitácora; sin `al_confirmar` si la escritura ya se confirmó."""
+    avanzar_version(CLAVE_CACHE_VERSION_BITACORA, al_confirmar)
+
+
+def version_empleados():
+    """(versión, último cambio conocido o None) del conjunto de empleados, sin consultas."""
+    return leer_version(CLAVE_CACHE_VERSION), cache.get(CLAVE_CACHE_MODIFICADO)
+
+
+def _variante(request):
+    consulta = request.META.get('QUERY_STRING', '')
+    return hashlib.sha1(consulta.encode()).hexdigest()[:12] if consulta else ''
+
+
+def _etag(*partes):
+    return '"' + '-'.join(str(parte) for parte in partes if parte != '') + '"'
+
+
+def validadores_empleado(pk, request=None):
+    """
+    (ETag, Last-Modified) de un empleado; (None, None) si no tiene cambios
+    registrados y la vista debe seguir normalmente (p. ej. para responder 404).
+    Sin `request` no distingue variantes (If-Match).
+    """
+    return _validadores_de_cambio(pk, _ultimo_cambio(pk).first(), request)
+
+
+async def avalidadores_empleado(pk, request=None):
+    return _validadores_de_cambio(pk, await _ultimo_cambio(pk).afirst(), request)
+
+
+def _ultimo_cambio(pk):
+    from .models import CambioEmpleado
+
+    return CambioEmpleado.objects.filter(empleado_id=pk).order_by('-id').values_list('id', 'fecha')
+
+
+def _validadores_de_cambio(pk, ultimo, request):
+    if ultimo is None:
+        return None, None
+    return _etag('e', pk, ultimo[0], _variante(request) if request else ''), ultimo[1]
+
+
+def validadores_empleados(request, prefijo='l'):
+    if not settings.CACHE_COMPARTIDA:
+        return None, None
+    version, modificado = version_empleados()
+    return _etag(prefijo, version, _variante(request)), modificado
+
+
+def validadores_dashboard(request):
+    # Las edades dependen del día: la fecha entra en el ETag y Last-Modified
+    # nunca es anterior al inicio del día
+    if not settings.CACHE_COMPARTIDA:
+        return None, None
+    version, modificado = version_empleados()
+    hoy = localdate()
+    inicio_dia = datetime.combine(hoy, hora.min, tzinfo=get_current_timezone())
+    return _etag('d', version, hoy.isoformat()), max(modificado, inicio_dia) if modificado else inicio_dia
+
+
+def respuesta_condicional(request, etag, modificado):
+    """304 o 412 si las precondiciones del cliente lo indican; None para seguir con la vista."""
+    return get_conditional_response(
+        request, etag=etag, last_modified=int(modificado.timestamp()) if modificado else None
+    )
+
+
+def agregar_validadores(respuesta, etag, modificado):
+    if etag and (200 <= respuesta.status_code < 300 or respuesta.status_code == 304):
+        respuesta['ETag'] = etag
+        if modificado:
+            respuesta['Last-Modified'] = http_date(modificado.timestamp())
+    return respuesta
@@ -0,0 +1,115 @@
+"""
+Dimensionamiento de las conexiones a PostgreSQL (DB_* en settings).
+
+Cada proceso del servidor (WEB_CONCURRENCY) abre sus propias conexiones:
+
+- con DB_POOL, hasta DB_POOL_MAX por proceso, compartidas por sus hilos;
+- sin pool, una por hilo (DB_HILOS_POR_WORKER), que se reutiliza durante
+  DB_CONN_MAX_AGE segundos.
+
+A eso se suma una por proceso de `procesar_exportaciones`
+(EXPORTACIONES_WORKERS). El total debe caber en DB_MAX_CONEXIONES. Cada
+réplica de lectura es otro servidor con el mismo cálculo.
+
+Los chequeos de sistema (runserver, migrate, `manage.py check`) avisan al
+arrancar si la configuración no cabe o deja hilos esperando conexión;
+`manage.py check --deploy` muestra además el cálculo y el DB_POOL_MAX
+recomendado por proceso.
+"""
+from django.conf import settings
+from django.core import checks
+
+# Tamaño que usa psycopg_pool si el pool se activa sin indicarlo
+TAMANO_POOL_PREDETERMINADO = 4
+
+
+def opciones_pool(ajustes_db):
+    pool = ajustes_db.get('OPTIONS', {}).get('pool')
+    if not pool:
+        return None
+    return pool if isinstance(pool, dict) else {}
+
+
+def presupuesto_conexiones(ajustes_db):
+    """Conexiones que abre la aplicación contra la base de `ajustes_db` y el pool recomendado."""
+    pool = opciones_pool(ajustes_db)
+    workers, hilos = settings.DB_WORKERS, settings.DB_HILOS_POR_WORKER
+    if pool is not None:
+        por_worker = pool.get('max_size') or pool.get('min_size') or TAMANO_POOL_PREDETERMINADO
+    else:
+        por_worker = hilos
+    externas = settings.EXPORTACIONES_WORKERS
+    disponibles_por_worker = max(1, (settings.DB_MAX_CONEXIONES - externas) // workers)
+    # Bajo WSGI cada hilo usa a lo sumo una conexión; bajo ASGI la concurrencia no tiene ese tope
+    recomendado = disponibles_por_worker if settings.VISTAS_ASYNC else min(hilos, disponibles_por_worker)
+    return {
+        'workers': workers,
+        'hilos': hilos,
+        'pool': pool is not None,
+        'por_worker': por_worker,
+        'externas': externas,
+        'total': workers * por_worker + externas,
+        'maximo': settings.DB_MAX_CONEXIONES,
+        'pool_max_recomendado': recomendado,
+    }
+
+
+def avisos_conexiones(alias, ajustes_db):
+    if 'postgresql' not in ajustes_db.get('ENGINE', ''):
+        return []
+    datos = presupuesto_conexiones(ajustes_db)
+    avisos = []
+    if datos['total'] > datos['maximo']:
+        avisos.append(checks.Warning(
+            f"La base '{alias}' puede recibir {datos['total']} conexiones ({datos['workers']} procesos x "
+            f"{datos['por_worker']} + {datos['externas']} de exportaciones) y DB_MAX_CONEXIONES es {datos['maximo']}.",
+            hint=(
+                f"Baja DB_POOL_MAX a {datos['pool_max_recomendado']}" if datos['pool']
+                else f"Activa DB_POOL con DB_POOL_MAX={datos['pool_max_recomendado']}"
+            ) + ", reduce WEB_CONCURRENCY o pon PgBouncer delante.",
+            id='empleados.W001',
+        ))
+    # Sólo si caben más: con el presupuesto justo manda W001
+    if datos['pool'] and not settings.VISTAS_ASYNC and datos['por_worker'] < min(datos['hilos'], datos['pool_max_recomendado']):
+        avisos.append(checks.Warning(
+            f"El pool de '{alias}' admite {datos['por_worker']} conexiones por proceso y cada proceso tiene {datos['hilos']} hilos.",
+            hint=f"Los hilos sin conexión esperan hasta DB_POOL_TIMEOUT; usa DB_POOL_MAX={datos['pool_max_recomendado']}.",
+            id='empleados.W002',
+        ))
+    if settings.VISTAS_ASYNC and not datos['pool'] and ajustes_db.get('CONN_MAX_AGE'):
+        avisos.append(checks.Warning(
+            f"La base '{alias}' usa conexiones persistentes con VISTAS_ASYNC: bajo ASGI cada petición corre en un hilo nuevo "
+            "y las conexiones persistentes se acumulan sin reutilizarse.",
+            hint="Usa DB_POOL=True (o DB_CONN_MAX_AGE=0) al servir con ASGI.",
+            id='empleados.W003',
+        ))
+    return avisos
+
+
+@checks.register()
+def revisar_conexiones(app_configs=None, **kwargs):
+    avisos = []
+    for alias, ajustes_db in settings.DATABASES.items():
+        avisos.extend(avisos_conexiones(alias, ajustes_db))
+    return avisos
+
+
+@checks.register(deploy=True)
+def resumen_conexiones(app_configs=None, **kwargs):
+    resumen = []
+    for alias, ajustes_db in settings.DATABASES.items():
+        if 'postgresql' not in ajustes_db.get('ENGINE', ''):
+            continue
+        datos = presupuesto_conexiones(ajustes_db)
+        if datos['pool']:
+            modo = f"pool de {datos['por_worker']}"
+        elif ajustes_db.get('CONN_MAX_AGE'):
+            modo = f"{datos['hilos']} persistentes (CONN_MAX_AGE={ajustes_db['CONN_MAX_AGE']})"
+        else:
+            modo = f"{datos['hilos']} abiertas en cada petición"
+        resumen.append(checks.Info(
+            f"Base '{alias}': {datos['workers']} procesos con {modo} por proceso + {datos['externas']} de exportaciones = "
+            f"{datos['total']} de {datos['maximo']} conexiones. DB_POOL_MAX recomendado por proceso: {datos['pool_max_recomendado']}.",
+            id='empleados.I001',
+        ))
+    return resumen
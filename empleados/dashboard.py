@@ -0,0 +1,136 @@
+from collections import Counter
+from datetime import date
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Case, Count, IntegerField, Q, Sum, Value, When
+from django.db.models.functions import ExtractYear
+
+from .condicional import version_empleados
+from .models import Empleado
+from .replicas import usar_primaria
+
+CLAVE_CACHE_DASHBOARD = 'empleados:dashboard'
+
+
+def expresion_edad(hoy):
+    """
+    Edad cumplida a la fecha `hoy`, calculada en la base de datos:
+    diferencia de años menos uno si aún no llega el cumpleaños.
+    """
+    aun_no_cumple = Q(fecha_nacimiento__month__gt=hoy.month) | Q(fecha_nacimiento__month=hoy.month, fecha_nacimiento__day__gt=hoy.day)
+    return (
+        Value(hoy.year)
+        - ExtractYear('fecha_nacimiento')
+        - Case(When(aun_no_cumple, then=Value(1)), default=Value(0), output_field=IntegerField())
+    )
+
+
+def consulta_dashboard(hoy):
+    """Una sola consulta agrupada por (departamento, puesto, género) con los agregados del dashboard."""
+    return (
+        Empleado.objects.order_by()
+        .values('departamento', 'puesto', 'genero')
+        .annotate(
+            total=Count('id'),
+            activos=Count('id', filter=Q(activo=True)),
+            suma_edades=Sum(expresion_edad(hoy), output_field=IntegerField()),
+            con_edad=Count('fecha_nacimiento'),
+        )
+    )
+
+
+def consolidar_dashboard(grupos):
+    """Totales del dashboard a partir de las pocas filas de `consulta_dashboard`."""
+    total = activos = suma_edades = con_edad = 0
+    por_departamento, por_puesto, por_genero = Counter(), Counter(), Counter()
+    for grupo in grupos:
+        total += grupo['total']
+        activos += grupo['activos']
+        suma_edades += grupo['suma_edades'] or 0
+        con_edad += grupo['con_edad']
+        por_departamento[grupo['departamento']] += grupo['total']
+        por_puesto[grupo['puesto']] += grupo['total']
+        por_genero[grupo['genero']] += grupo['total']
+
+    return {
+        "total_empleados": total,
+        "activos": activos,
+        "inactivos": total - activos,
+        "edad_promedio": round(suma_edades / con_edad, 1) if con_edad else 0,
+        "por_departamento": [{'departamento': k, 'total': v} for k, v in sorted(por_departamento.items())],
+        "por_puesto": [{'puesto': k, 'total': v} for k, v in sorted(por_puesto.items())],
+        "por_genero": [{'genero': k, 'total': v} for k, v in sorted(por_genero.items())],
+    }
+
+
+def calcular_dashboard(hoy=None):
+    """
+    Calcula todas las estadísticas del dashboard en una sola consulta agrupada
+    por (departamento, puesto, género); los totales se consolidan en Python
+    sobre esas pocas filas.
+    """
+    return consolidar_dashboard(consulta_dashboard(hoy or date.today()))
+
+
+async def acalcular_dashboard(hoy=None):
+    return consolidar_dashboard([grupo async for grupo in consulta_dashboard(hoy or date.today())])
+
+
+def _snapshot_activo():
+    # Con una caché por proceso, otro worker no se entera de las altas y bajas
+    return settings.DASHBOARD_CACHE_SEGUNDOS > 0 and settings.CACHE_COMPARTIDA
+
+
+def _snapshot_vigente(hoy, version):
+    snapshot = cache.get(CLAVE_CACHE_DASHBOARD)
+    return snapshot['datos'] if snapshot and snapshot['fecha'] == hoy and snapshot['version'] == version else None
+
+
+def _guardar_snapshot(hoy, version, datos):
+    cache.set(CLAVE_CACHE_DASHBOARD, {'fecha': hoy, 'version': version, 'datos': datos}, settings.DASHBOARD_CACHE_SEGUNDOS)
+
+
+def obtener_dashboard():
+    """
+    Devuelve el snapshot del dashboard desde la caché si sigue vigente (sólo
+    con CACHE_COMPARTIDA). El snapshot guarda la versión de empleados con la
+    que se calculó (ver `empleados.condicional`): deja de valer al cambiar de
+    día (las edades dependen de la fecha) y con cualquier alta, edición o baja,
+    también las confirmadas en otro proceso.
+    """
+    hoy = date.today()
+    if not _snapshot_activo():
+        return calcular_dashboard(hoy)
+
+    # La versión se lee antes de calcular: si avanza durante el cálculo, el snapshot nace vencido
+    version = version_empleados()[0]
+    datos = _snapshot_vigente(hoy, version)
+    if datos is None:
+        # El snapshot queda en la caché: se calcula en la primaria (ver empleados.replicas)
+        with usar_primaria():
+            datos = calcular_dashboard(hoy)
+        _guardar_snapshot(hoy, version, datos)
+    return datos
+
+
+async def aobtener_dashboard():
+    """`obtener_dashboard` con la consulta en el ORM asíncrono (vistas ASGI)."""
+    hoy = date.today()
+    if not _snapshot_activo():
+        return await acalcular_dashboard(hoy)
+
+    version = version_empleados()[0]
+    datos = _snapshot_vigente(hoy, version)
+    if datos is None:
+        with usar_primaria():
+            datos = await acalcular_dashboard(hoy)
+        _guardar_snapshot(hoy, version, datos)
+    return datos
+
+
+def invalidar_dashboard():
+    """Borra el snapshot al momento y otra vez al confirmar la transacción en curso."""
+    cache.delete(CLAVE_CACHE_DASHBOARD)
+    transaction.on_commit(lambda: cache.delete(CLAVE_CACHE_DASHBOARD))
@@ -0,0 +1,333 @@
+import csv
+import json
+import re
+import zipfile
+from datetime import date
+from xml.sax.saxutils import escape
+
+from django.db.models import Max
+from django.db.models.functions import Length
+from openpyxl.utils import get_column_letter
+
+from .pdf import CAMPOS_PDF, renderizar_pdf
+
+# === COLUMNAS DE EXPORTACIÓN ===
+# (campo del modelo, encabezado visible)
+COLUMNAS_EXPORTACION = [
+    ('id', 'ID'),
+    ('num_empleado', 'Número de empleado'),
+    ('nombres', 'Nombres'),
+    ('apellido_paterno', 'Apellido paterno'),
+    ('apellido_materno', 'Apellido materno'),
+    ('fecha_nacimiento', 'Fecha de nacimiento'),
+    ('genero', 'Género'),
+    ('estado_civil', 'Estado civil'),
+    ('curp', 'CURP'),
+    ('rfc', 'RFC'),
+    ('nss', 'NSS'),
+    ('telefono', 'Teléfono'),
+    ('email', 'Email'),
+    ('puesto', 'Puesto'),
+    ('departamento', 'Departamento'),
+    ('fecha_ingreso', 'Fecha de ingreso'),
+    ('activo', 'Activo'),
+]
+
+CAMPOS_EXPORTACION = [campo for campo, _ in COLUMNAS_EXPORTACION]
+ENCABEZADOS_EXPORTACION = [encabezado for _, encabezado in COLUMNAS_EXPORTACION]
+
+CAMPOS_FECHA = {'fecha_nacimiento', 'fecha_ingreso'}
+CAMPOS_TEXTO = [
+    'num_empleado', 'nombres', 'apellido_paterno', 'apellido_materno', 'genero', 'estado_civil',
+    'curp', 'rfc', 'nss', 'telefono', 'email', 'puesto', 'departamento',
+]
+
+TAMANO_LOTE_EXPORTACION = 2000
+
+
+def formatear_fila(valores):
+    """
+    Convierte una tupla de `values_list(*CAMPOS_EXPORTACION)` al formato del reporte.
+    """
+    fila = list(valores)
+    for indice, campo in enumerate(CAMPOS_EXPORTACION):
+        valor = fila[indice]
+        if campo in CAMPOS_FECHA:
+            fila[indice] = valor.strftime('%Y-%m-%d') if valor else ""
+        elif campo == 'activo':
+            fila[indice] = "Sí" if valor else "No"
+    return fila
+
+
+def valores_exportacion(queryset, tamano_lote=TAMANO_LOTE_EXPORTACION):
+    """
+    Recorre el queryset con un cursor del lado del servidor sin construir instancias del modelo.
+    """
+    return queryset.values_list(*CAMPOS_EXPORTACION).iterator(chunk_size=tamano_lote)
+
+
+def filas_exportacion(queryset, tamano_lote=TAMANO_LOTE_EXPORTACION):
+    for valores in valores_exportacion(queryset, tamano_lote):
+        yield formatear_fila(valores)
+
+
+def anchos_columnas(queryset):
+    """
+    Calcula el ancho de cada columna con un solo agregado en la base de datos,
+    en lugar de recorrer todas las celdas ya escritas.
+    """
+    agregados = {f'{campo}__largo': Max(Length(campo)) for campo in CAMPOS_TEXTO}
+    agregados['id__max'] = Max('id')
+    resultado = queryset.order_by().aggregate(**agregados)
+
+    anchos = []
+    for campo, encabezado in COLUMNAS_EXPORTACION:
+        if campo == 'id':
+            largo = len(str(resultado['id__max'] or ''))
+        elif campo in CAMPOS_FECHA:
+            largo = len('AAAA-MM-DD')
+        elif campo == 'activo':
+            largo = len('No')
+        else:
+            largo = resultado[f'{campo}__largo'] or 0
+        anchos.append(max(largo, len(encabezado)) + 2)
+    return anchos
+
+
+# === ESCRITOR XLSX EN STREAMING ===
+_XML_DECLARACION = '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+_NS_MAIN = 'http://schemas.openxmlformats.org/spreadsheetml/2006/main'
+_NS_REL = 'http://schemas.openxmlformats.org/officeDocument/2006/relationships'
+_NS_PKG_REL = 'http://schemas.openxmlformats.org/package/2006/relationships'
+
+_CONTENT_TYPES = (
+    _XML_DECLARACION
+    + '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+    '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+    '<Default Extension="xml" ContentType="application/xml"/>'
+    '<Override PartName="/xl/workbook.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+    '<Override PartName="/xl/worksheets/sheet1.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+    '<Override PartName="/xl/styles.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.styles+xml"/>'
+    '</Types>'
+)
+
+_RELS = (
+    _XML_DECLARACION
+    + f'<Relationships xmlns="{_NS_PKG_REL}">'
+    f'<Relationship Id="rId1" Type="{_NS_REL}/officeDocument" Target="xl/workbook.xml"/>'
+    '</Relationships>'
+)
+
+_WORKBOOK_RELS = (
+    _XML_DECLARACION
+    + f'<Relationships xmlns="{_NS_PKG_REL}">'
+    f'<Relationship Id="rId1" Type="{_NS_REL}/worksheet" Target="worksheets/sheet1.xml"/>'
+    f'<Relationship Id="rId2" Type="{_NS_REL}/styles" Target="styles.xml"/>'
+    '</Relationships>'
+)
+
+_STYLES = (
+    _XML_DECLARACION
+    + f'<styleSheet xmlns="{_NS_MAIN}">'
+    '<fonts count="1"><font><sz val="11"/><name val="Calibri"/></font></fonts>'
+    '<fills count="2"><fill><patternFill patternType="none"/></fill><fill><patternFill patternType="gray125"/></fill></fills>'
+    '<borders count="1"><border><left/><right/><top/><bottom/><diagonal/></border></borders>'
+    '<cellStyleXfs count="1"><xf numFmtId="0" fontId="0" fillId="0" borderId="0"/></cellStyleXfs>'
+    '<cellXfs count="1"><xf numFmtId="0" fontId="0" fillId="0" borderId="0" xfId="0"/></cellXfs>'
+    '<cellStyles count="1"><cellStyle name="Normal" xfId="0" builtinId="0"/></cellStyles>'
+    '</styleSheet>'
+)
+
+# Caracteres de control no permitidos en XML 1.0
+_CARACTERES_INVALIDOS = re.compile('[\x00-\x08\x0b\x0c\x0e-\x1f]')
+
+
+class _BufferSalida:
+    """
+    Destino de escritura no posicionable para `zipfile`: acumula los bytes
+    comprimidos hasta que el generador los drena hacia la respuesta.
+    """
+
+    def __init__(self):
+        self._partes = []
+        self._posicion = 0
+        self.pendientes = 0
+
+    def write(self, datos):
+        self._partes.append(bytes(datos))
+        self._posicion += len(datos)
+        self.pendientes += len(datos)
+        return len(datos)
+
+    def tell(self):
+        return self._posicion
+
+    def flush(self):
+        pass
+
+    def drenar(self):
+        datos = b''.join(self._partes)
+        self._partes.clear()
+        self.pendientes = 0
+        return datos
+
+
+def _celda(referencia, valor):
+    if isinstance(valor, bool) or valor is None:
+        valor = '' if valor is None else str(valor)
+    if isinstance(valor, (int, float)):
+        return f'<c r="{referencia}"><v>{valor}</v></c>'
+    texto = escape(_CARACTERES_INVALIDOS.sub('', str(valor)))
+    return f'<c r="{referencia}" t="inlineStr"><is><t xml:space="preserve">{texto}</t></is></c>'
+
+
+def _fila_xml(numero, letras, valores):
+    celdas = ''.join(_celda(f'{letra}{numero}', valor) for letra, valor in zip(letras, valores))
+    return f'<row r="{numero}">{celdas}</row>'
+
+
+def generar_xlsx(encabezados, filas, anchos, titulo='Empleados', tamano_bloque=64 * 1024):
+    """
+    Genera un libro XLSX de una sola hoja como un flujo de bloques de bytes.
+
+    La memoria usada es constante: cada fila se escribe comprimida en el ZIP y
+    se entrega en cuanto se acumulan `tamano_bloque` bytes.
+    """
+    letras = [get_column_letter(indice) for indice in range(1, len(encabezados) + 1)]
+    buffer = _BufferSalida()
+
+    with zipfile.ZipFile(buffer, mode='w', compression=zipfile.ZIP_DEFLATED) as archivo:
+        archivo.writestr('[Content_Types].xml', _CONTENT_TYPES)
+        archivo.writestr('_rels/.rels', _RELS)
+        archivo.writestr(
+            'xl/workbook.xml',
+            _XML_DECLARACION
+            + f'<workbook xmlns="{_NS_MAIN}" xmlns:r="{_NS_REL}">'
+            f'<sheets><sheet name="{escape(titulo)}" sheetId="1" r:id="rId1"/></sheets></workbook>',
+        )
+        archivo.writestr('xl/_rels/workbook.xml.rels', _WORKBOOK_RELS)
+        archivo.writestr('xl/styles.xml', _STYLES)
+        yield buffer.drenar()
+
+        with archivo.open('xl/worksheets/sheet1.xml', mode='w') as hoja:
+            columnas = ''.join(
+                f'<col min="{indice}" max="{indice}" width="{ancho}" customWidth="1"/>'
+                for indice, ancho in enumerate(anchos, start=1)
+            )
+            hoja.write(f'{_XML_DECLARACION}<worksheet xmlns="{_NS_MAIN}"><cols>{columnas}</cols><sheetData>'.encode())
+            hoja.write(_fila_xml(1, letras, encabezados).encode())
+
+            for numero, valores in enumerate(filas, start=2):
+                hoja.write(_fila_xml(numero, letras, valores).encode())
+                if buffer.pendientes >= tamano_bloque:
+                    yield buffer.drenar()
+
+            hoja.write(b'</sheetData></worksheet>')
+
+    yield buffer.drenar()
+
+
+# === CSV ===
+class _Eco:
+    """Pseudo-archivo que devuelve lo escrito, para usar `csv.writer` en un generador."""
+
+    def write(self, valor):
+        return valor
+
+
+def generar_csv(encabezados, filas):
+    """
+    Genera un CSV línea por línea. Incluye BOM para que Excel detecte UTF-8.
+    """
+    escritor = csv.writer(_Eco())
+    yield '\ufeff' + escritor.writerow(encabezados)
+    for valores in filas:
+        yield escritor.writerow(valores)
+
+
+# === NDJSON ===
+def _valor_json(valor):
+    if isinstance(valor, date):
+        return valor.isoformat()
+    raise TypeError(f"Tipo no serializable: {type(valor).__name__}")
+
+
+def generar_ndjson(campos, valores):
+    """
+    Un objeto JSON por línea con los tipos de la base de datos (fechas en
+    ISO 8601, `activo` como booleano), para cargadores que leen filas.
+    """
+    codificar = json.JSONEncoder(ensure_ascii=False, separators=(',', ':'), default=_valor_json).encode
+    for fila in valores:
+        yield codificar(dict(zip(campos, fila))) + '\n'
+
+
+# === STREAMING HTTP (GET /api/empleados/exportar/) ===
+FORMATOS_STREAMING = {
+    # formato: (tipo para bitácora, extensión, content type)
+    'csv': ('CSV', 'csv', 'text/csv; charset=utf-8'),
+    'ndjson': ('NDJSON', 'ndjson', 'application/x-ndjson'),
+}
+
+
+def agrupar_bloques(lineas, tamano_bloque=64 * 1024):
+    """
+    Junta las líneas en bloques de bytes de ~`tamano_bloque`: cada elemento de
+    una respuesta en streaming es una escritura (y, con gzip, un flush) aparte.
+    """
+    pendientes = []
+    tamano = 0
+    for linea in lineas:
+        pendientes.append(linea)
+        tamano += len(linea)
+        if tamano >= tamano_bloque:
+            yield ''.join(pendientes).encode('utf-8')
+            pendientes = []
+            tamano = 0
+    if pendientes:
+        yield ''.join(pendientes).encode('utf-8')
+
+
+def generar_exportacion_streaming(formato, queryset):
+    if formato == 'csv':
+        lineas = generar_csv(ENCABEZADOS_EXPORTACION, filas_exportacion(queryset))
+    elif formato == 'ndjson':
+        lineas = generar_ndjson(CAMPOS_EXPORTACION, valores_exportacion(queryset))
+    else:
+        raise ValueError(f"Formato de exportación no soportado: {formato}")
+    return agrupar_bloques(lineas)
+
+
+# === PDF ===
+def renderizar_pdf_empleados(empleados, destino=None):
+    """
+    Renderiza el listado de empleados con WeasyPrint (ver empleados.pdf).
+    Devuelve los bytes del PDF o los escribe en `destino` si se indica.
+    """
+    filas = empleados.values(*CAMPOS_PDF).iterator(chunk_size=TAMANO_LOTE_EXPORTACION)
+    return renderizar_pdf(filas, destino)
+
+
+# === ESCRITURA A ARCHIVO (trabajos en segundo plano) ===
+FORMATOS_EXPORTACION = {
+    # formato: (tipo para bitácora, extensión, content type)
+    'excel': ('Excel', 'xlsx', 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'),
+    'pdf': ('PDF', 'pdf', 'application/pdf'),
+    'csv': ('CSV', 'csv', 'text/csv; charset=utf-8'),
+}
+
+
+def escribir_exportacion(formato, queryset, destino):
+    """
+    Escribe la exportación de `queryset` en el archivo binario `destino`.
+    """
+    if formato == 'excel':
+        for bloque in generar_xlsx(ENCABEZADOS_EXPORTACION, filas_exportacion(queryset), anchos_columnas(queryset)):
+            destino.write(bloque)
+    elif formato == 'csv':
+        for linea in generar_csv(ENCABEZADOS_EXPORTACION, filas_exportacion(queryset)):
+            destino.write(linea.encode('utf-8'))
+    elif formato == 'pdf':
+        renderizar_pdf_empleados(queryset, destino)
+    else:
+        raise ValueError(f"Formato de exportación no soportado: {formato}")
@@ -0,0 +1,77 @@
+import django_filters
+from django_filters.rest_framework import DjangoFilterBackend
+from rest_framework.filters import SearchFilter
+
+from .busqueda import terminos
+from .models import Bitacora, BitacoraArchivada, Empleado
+
+# === PARÁMETROS DE CONSULTA DEL LISTADO DE EMPLEADOS ===
+EMPLEADO_FILTERSET_FIELDS = ['activo', 'puesto', 'departamento', 'genero', 'estado_civil', 'fecha_ingreso']
+# Una sola columna normalizada en lugar de nueve LIKE (ver empleados.busqueda)
+EMPLEADO_SEARCH_FIELDS = ['busqueda__contains']
+EMPLEADO_ORDERING_FIELDS = ['num_empleado', 'apellido_paterno', 'apellido_materno', 'fecha_ingreso', 'departamento', 'puesto']
+
+PARAMETRO_BUSQUEDA = 'search'
+PARAMETRO_ORDEN = 'ordering'
+PARAMETROS_FILTRO_EMPLEADOS = EMPLEADO_FILTERSET_FIELDS + [PARAMETRO_BUSQUEDA, PARAMETRO_ORDEN]
+
+
+class EmpleadoFilter(django_filters.FilterSet):
+    class Meta:
+        model = Empleado
+        fields = EMPLEADO_FILTERSET_FIELDS
+
+
+class BitacoraFilter(django_filters.FilterSet):
+    """Filtros alineados con los índices de `Bitacora` (ver Meta.indexes)."""
+    fecha_desde = django_filters.IsoDateTimeFilter(field_name='fecha', lookup_expr='gte')
+    fecha_hasta = django_filters.IsoDateTimeFilter(field_name='fecha', lookup_expr='lte')
+
+    class Meta:
+        model = Bitacora
+        fields = ['modelo_afectado', 'objeto_id', 'usuario', 'accion']
+
+
+class BitacoraArchivadaFilter(BitacoraFilter):
+    class Meta(BitacoraFilter.Meta):
+        model = BitacoraArchivada
+
+
+class FilterSetPorModeloBackend(DjangoFilterBackend):
+    """
+    Elige el FilterSet según el modelo del queryset (`view.filterset_classes`),
+    para filtrar con los mismos parámetros tablas activas y de archivo.
+    """
+
+    def get_filterset_class(self, view, queryset=None):
+        return view.filterset_classes.get(queryset.model)
+
+
+class BusquedaNormalizadaFilter(SearchFilter):
+    """`SearchFilter` que normaliza los términos igual que `Empleado.busqueda`."""
+
+    def get_search_terms(self, request):
+        return terminos(' '.join(super().get_search_terms(request)))
+
+
+def filtrar_empleados(parametros, queryset=None):
+    """
+    Aplica fuera de una vista los mismos filtros, búsqueda y orden que
+    `EmpleadoListCreateAPIView` (útil para exportaciones en segundo plano).
+    """
+    if queryset is None:
+        queryset = Empleado.objects.all()
+
+    filtro = EmpleadoFilter(data=parametros, queryset=queryset)
+    if not filtro.is_valid():
+        raise ValueError(dict(filtro.errors))
+    queryset = filtro.qs
+
+    for termino in terminos(parametros.get(PARAMETRO_BUSQUEDA)):
+        queryset = queryset.filter(busqueda__contains=termino)
+
+    orden = [
+        campo.strip() for campo in (parametros.get(PARAMETRO_ORDEN) or '').split(',')
+        if campo.strip().lstrip('-') in EMPLEADO_ORDERING_FIELDS
+    ]
+    return queryset.order_by(*(orden or ['id']))
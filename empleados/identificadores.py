@@ -0,0 +1,199 @@
+"""
+Validación de identificadores mexicanos: CURP, RFC y NSS.
+
+Los patrones se compilan una sola vez al importar el módulo. Cada validador
+devuelve la lista de errores del valor (vacía si es válido); con
+`estricto=True` además se comprueban el dígito verificador, que la fecha
+codificada exista y, en el CURP, la coincidencia con la fecha de nacimiento y
+el género. `validar_columna` y `validar_identificadores_lote` validan columnas
+completas de una importación y devuelven los errores por fila.
+"""
+import re
+from datetime import date
+from operator import mul
+
+from django.conf import settings
+
+ESTADOS_CURP = (
+    'AS|BC|BS|CC|CL|CM|CS|CH|DF|DG|GT|GR|HG|JC|MC|MN|MS|NT|NL|OC|'
+    'PL|QT|QR|SP|SL|SR|TC|TS|TL|VZ|YN|ZS'
+)
+PATRON_CURP = re.compile(
+    r'[A-Z][AEIOU][A-Z]{2}\d{2}(?:0[1-9]|1[0-2])(?:0[1-9]|[12]\d|3[01])[HM]'
+    rf'(?:{ESTADOS_CURP})[B-DF-HJ-NP-TV-Z]{{3}}[0-9A-Z]\d'
+)
+PATRON_RFC = re.compile(r'[A-ZÑ&]{3,4}\d{6}[A-Z0-9]{3}')
+PATRON_NSS = re.compile(r'\d{11}')
+
+MENSAJES = {
+    'curp_formato': "CURP inválido.",
+    'curp_digito': "Dígito verificador del CURP inválido.",
+    'curp_fecha': "La fecha del CURP no es válida.",
+    'curp_nacimiento': "El CURP no coincide con la fecha de nacimiento.",
+    'curp_genero': "El CURP no coincide con el género.",
+    'rfc_formato': "RFC inválido.",
+    'rfc_digito': "Dígito verificador del RFC inválido.",
+    'rfc_fecha': "La fecha del RFC no es válida.",
+    'nss_formato': "NSS inválido. Deben ser 11 dígitos.",
+    'nss_digito': "Dígito verificador del NSS inválido.",
+}
+
+# Valor de cada carácter en el cálculo de los dígitos verificadores (SEGOB y SAT)
+_VALORES_CURP = {caracter: valor for valor, caracter in enumerate('0123456789ABCDEFGHIJKLMNÑOPQRSTUVWXYZ')}
+_VALORES_RFC = {caracter: valor for valor, caracter in enumerate('0123456789ABCDEFGHIJKLMN&OPQRSTUVWXYZ Ñ')}
+_PESOS_CURP = range(18, 1, -1)
+_PESOS_RFC = range(13, 1, -1)
+_DIGITOS = {str(digito): digito for digito in range(10)}
+# Dígito duplicado con sus cifras ya sumadas (Luhn)
+_LUHN_DOBLE = {str(digito): doble for digito, doble in enumerate((0, 2, 4, 6, 8, 1, 3, 5, 7, 9))}
+_GENERO_CURP = {'masculino': 'H', 'hombre': 'H', 'h': 'H', 'femenino': 'M', 'mujer': 'M', 'm': 'M'}
+
+
+def estricto_por_defecto():
+    return settings.IDENTIFICADORES_ESTRICTOS
+
+
+# === DÍGITOS VERIFICADORES ===
+def digito_curp(curp):
+    """Dígito verificador (posición 18) a partir de las primeras 17 posiciones."""
+    suma = sum(map(mul, map(_VALORES_CURP.__getitem__, curp[:17]), _PESOS_CURP))
+    return str((10 - suma % 10) % 10)
+
+
+def digito_rfc(rfc):
+    """Dígito verificador de la homoclave a partir del RFC sin su último carácter."""
+    base = rfc[:-1].rjust(12)  # las personas morales (12 caracteres) se completan con un espacio
+    suma = sum(map(mul, map(_VALORES_RFC.__getitem__, base), _PESOS_RFC))
+    residuo = suma % 11
+    if residuo == 0:
+        return '0'
+    return 'A' if residuo == 1 else str(11 - residuo)
+
+
+def digito_nss(nss):
+    """Dígito verificador (Luhn) a partir de los primeros 10 dígitos."""
+    suma = sum(map(_DIGITOS.__getitem__, nss[0:10:2])) + sum(map(_LUHN_DOBLE.__getitem__, nss[1:10:2]))
+    return str((10 - suma % 10) % 10)
+
+
+def _fecha(anio, mes, dia):
+    try:
+        return date(anio, mes, dia)
+    except ValueError:
+        return None
+
+
+def fecha_curp(curp):
+    """Fecha de nacimiento codificada en el CURP; la posición 17 indica el siglo."""
+    siglo = 1900 if curp[16].isdigit() else 2000
+    return _fecha(siglo + int(curp[4:6]), int(curp[6:8]), int(curp[8:10]))
+
+
+# === VALIDADORES POR VALOR ===
+def coincidencias_curp(curp, fecha_nacimiento=None, genero=None):
+    """Errores de coincidencia del CURP (válido) con la fecha de nacimiento y el género."""
+    # En la importación llegan como texto sin validar todavía
+    if isinstance(fecha_nacimiento, str):
+        try:
+            fecha_nacimiento = date.fromisoformat(fecha_nacimiento)
+        except ValueError:
+            fecha_nacimiento = None
+    if not isinstance(genero, str):
+        genero = None
+
+    errores = []
+    if fecha_nacimiento is not None and fecha_curp(curp) != fecha_nacimiento:
+        errores.append(MENSAJES['curp_nacimiento'])
+    if genero and _GENERO_CURP.get(genero.strip().lower(), curp[10]) != curp[10]:
+        errores.append(MENSAJES['curp_genero'])
+    return errores
+
+
+def errores_curp(curp, fecha_nacimiento=None, genero=None, estricto=None):
+    """Errores del CURP (ya en mayúsculas). La fecha y el género son opcionales."""
+    if PATRON_CURP.fullmatch(curp) is None:
+        return [MENSAJES['curp_formato']]
+    if not (estricto_por_defecto() if estricto is None else estricto):
+        return []
+
+    errores = []
+    if curp[17] != digito_curp(curp):
+        errores.append(MENSAJES['curp_digito'])
+    if fecha_curp(curp) is None:
+        errores.append(MENSAJES['curp_fecha'])
+    else:
+        errores.extend(coincidencias_curp(curp, fecha_nacimiento, genero))
+    return errores
+
+
+def errores_rfc(rfc, estricto=None):
+    """Errores del RFC (ya en mayúsculas) de persona física o moral."""
+    if PATRON_RFC.fullmatch(rfc) is None:
+        return [MENSAJES['rfc_formato']]
+    if not (estricto_por_defecto() if estricto is None else estricto):
+        return []
+
+    errores = []
+    if rfc[-1] != digito_rfc(rfc):
+        errores.append(MENSAJES['rfc_digito'])
+    # AAMMDD tras las 3 (moral) o 4 (física) letras; el siglo no se codifica
+    fecha = rfc[-9:-3]
+    if _fecha(2000 + int(fecha[:2]), int(fecha[2:4]), int(fecha[4:])) is None:
+        errores.append(MENSAJES['rfc_fecha'])
+    return errores
+
+
+def errores_nss(nss, estricto=None):
+    if PATRON_NSS.fullmatch(nss) is None:
+        return [MENSAJES['nss_formato']]
+    if (estricto_por_defecto() if estricto is None else estricto) and nss[10] != digito_nss(nss):
+        return [MENSAJES['nss_digito']]
+    return []
+
+
+# === VALIDACIÓN POR COLUMNAS ===
+def validar_columna(valores, validador, estricto=None):
+    """
+    Valida una columna completa con `validador` (p. ej. `errores_rfc`).
+    Cada valor distinto se valida una sola vez. Devuelve {índice: [errores]}
+    sólo para las posiciones con errores.
+    """
+    estricto = estricto_por_defecto() if estricto is None else estricto
+    resultados = {}
+    errores = {}
+    for indice, valor in enumerate(valores):
+        resultado = resultados.get(valor)
+        if resultado is None:
+            resultado = resultados[valor] = validador(valor, estricto=estricto)
+        if resultado:
+            errores[indice] = resultado
+    return errores
+
+
+def validar_identificadores_lote(filas, estricto=None):
+    """
+    Valida CURP, RFC y NSS de todas las filas de una importación por columnas.
+    `filas` es [(número de fila, datos)]; devuelve {número: {campo: [errores]}}.
+    Los valores ausentes se omiten: los reporta la validación de campos requeridos.
+    """
+    estricto = estricto_por_defecto() if estricto is None else estricto
+    errores = {}
+    for campo, validador in (('curp', errores_curp), ('rfc', errores_rfc), ('nss', errores_nss)):
+        numeros, valores = [], []
+        for numero, datos in filas:
+            valor = datos.get(campo) if datos else None
+            if isinstance(valor, str) and valor.strip():
+                numeros.append(numero)
+                valores.append(valor.strip().upper())
+        for indice, mensajes in validar_columna(valores, validador, estricto=estricto).items():
+            errores.setdefault(numeros[indice], {})[campo] = mensajes
+
+    # La coincidencia del CURP con la fecha de nacimiento y el género depende de cada fila
+    if estricto:
+        for numero, datos in filas:
+            if not datos or 'curp' in errores.get(numero, {}) or not isinstance(datos.get('curp'), str):
+                continue
+            mensajes = coincidencias_curp(datos['curp'].strip().upper(), datos.get('fecha_nacimiento'), datos.get('genero'))
+            if mensajes:
+                errores.setdefault(numero, {})['curp'] = mensajes
+    return errores
@@ -0,0 +1,173 @@
+"""
+Fotos de empleados: validación, re-codificación y derivados de tamaño fijo.
+
+La foto subida se valida y se re-codifica a JPEG (sin metadatos EXIF y con un
+lado máximo de `FOTOS_LADO_MAXIMO`). Los derivados (miniatura del listado,
+tamaño para PDF y perfil) se generan fuera de la petición en un pool de hilos.
+Todos los archivos se nombran con el hash de su contenido, por lo que pueden
+cachearse indefinidamente y una misma foto no se guarda dos veces.
+"""
+import hashlib
+import io
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import connections, transaction
+from PIL import Image, ImageOps, UnidentifiedImageError
+
+# nombre: (lado en px, formato, extensión)
+DERIVADOS_FOTO = {
+    'miniatura': (96, 'WEBP', 'webp'),
+    'pdf': (240, 'JPEG', 'jpg'),
+    'perfil': (512, 'WEBP', 'webp'),
+}
+FORMATOS_ACEPTADOS = {'JPEG', 'PNG', 'WEBP', 'GIF', 'BMP'}
+DIRECTORIO_FOTOS = 'empleados/fotos/'
+DIRECTORIO_DERIVADOS = 'empleados/fotos/derivados/'
+CALIDAD = {'JPEG': 85, 'WEBP': 80}
+
+
+def _nombre_con_hash(directorio, contenido, extension, prefijo=''):
+    return f"{directorio}{prefijo}{hashlib.sha256(contenido).hexdigest()[:20]}.{extension}"
+
+
+def _codificar(imagen, formato):
+    salida = io.BytesIO()
+    imagen.save(salida, format=formato, quality=CALIDAD[formato], optimize=formato == 'JPEG')
+    return salida.getvalue()
+
+
+def abrir_foto(archivo):
+    """
+    Abre y valida una imagen subida. Lanza `ValidationError` si no es una imagen
+    soportada, excede el peso o las dimensiones permitidas.
+    """
+    if archivo.size > settings.FOTOS_TAMANO_MAXIMO_MB * 1024 * 1024:
+        raise ValidationError(f"La foto no debe exceder {settings.FOTOS_TAMANO_MAXIMO_MB} MB.")
+    try:
+        archivo.seek(0)
+        imagen = Image.open(archivo)
+        if imagen.format not in FORMATOS_ACEPTADOS:
+            raise ValidationError("Formato de imagen no soportado. Usa JPEG, PNG o WebP.")
+        if imagen.width * imagen.height > settings.FOTOS_PIXELES_MAXIMOS:
+            raise ValidationError("La foto tiene demasiados píxeles.")
+        imagen.load()
+    except (UnidentifiedImageError, OSError, Image.DecompressionBombError):
+        raise ValidationError("El archivo no es una imagen válida.")
+    return imagen
+
+
+def _normalizar(imagen):
+    # Respeta la orientación EXIF de las fotos de teléfono y descarta transparencia
+    imagen = ImageOps.exif_transpose(imagen)
+    if imagen.mode != 'RGB':
+        fondo = Image.new('RGB', imagen.size, 'white')
+        imagen = imagen.convert('RGBA')
+        fondo.paste(imagen, mask=imagen.getchannel('A'))
+        imagen = fondo
+    return imagen
+
+
+def preparar_foto(archivo):
+    """
+    Valida y re-codifica la foto subida a JPEG reducido y sin EXIF, sin
+    guardarla todavía: devuelve un `ContentFile` nombrado con el hash de su
+    contenido, listo para `guardar_foto`.
+    """
+    imagen = _normalizar(abrir_foto(archivo))
+    imagen.thumbnail((settings.FOTOS_LADO_MAXIMO, settings.FOTOS_LADO_MAXIMO), Image.LANCZOS)
+    contenido = _codificar(imagen, 'JPEG')
+    return ContentFile(contenido, name=_nombre_con_hash(DIRECTORIO_FOTOS, contenido, 'jpg'))
+
+
+def guardar_foto(foto):
+    """
+    Guarda una foto de `preparar_foto` y devuelve su ruta en el storage. Subir
+    la misma foto dos veces reutiliza el archivo.
+    """
+    if not default_storage.exists(foto.name):
+        default_storage.save(foto.name, foto)
+    return foto.name
+
+
+def crear_derivados(archivo):
+    """Genera y guarda los derivados de una foto. Devuelve {nombre: ruta en el storage}."""
+    with Image.open(archivo) as original:
+        imagen = _normalizar(original)
+        rutas = {}
+        for nombre, (lado, formato, extension) in DERIVADOS_FOTO.items():
+            derivado = ImageOps.fit(imagen, (lado, lado), Image.LANCZOS)
+            contenido = _codificar(derivado, formato)
+            ruta = _nombre_con_hash(DIRECTORIO_DERIVADOS, contenido, extension, prefijo=f'{nombre}_')
+            if not default_storage.exists(ruta):
+                default_storage.save(ruta, ContentFile(contenido))
+            rutas[nombre] = ruta
+    return rutas
+
+
+def generar_derivados(empleado_id):
+    """
+    Genera los derivados de la foto actual del empleado y los registra en
+    `foto_derivados`. Si la foto cambió mientras tanto, no pisa el resultado.
+    """
+    from .models import CambioEmpleado, Empleado
+
+    empleado = Empleado.objects.filter(pk=empleado_id).only('foto', 'foto_derivados').first()
+    if empleado is None or not empleado.foto:
+        return None
+
+    origen = empleado.foto.name
+    with empleado.foto.open('rb') as archivo:
+        rutas = crear_derivados(archivo)
+
+    derivados = {'origen': origen, **rutas}
+    actualizados = Empleado.objects.filter(pk=empleado_id, foto=origen).update(foto_derivados=derivados)
+    if not actualizados:
+        return None
+    # Cambian las URLs de `fotos`: cuenta como edición para el feed y los ETag
+    CambioEmpleado.registrar('ACTUALIZADO', empleado_id)
+
+    # Los derivados anteriores se borran salvo que otro empleado tenga la misma foto
+    anteriores = empleado.foto_derivados or {}
+    compartidos = Empleado.objects.exclude(pk=empleado_id).filter(foto=anteriores.get('origen')).exists()
+    if not compartidos:
+        for nombre, ruta in anteriores.items():
+            if nombre != 'origen' and ruta not in rutas.values():
+                default_storage.delete(ruta)
+    return derivados
+
+
+# === POOL DE GENERACIÓN FUERA DE LA PETICIÓN ===
+_pool = None
+
+
+def _generar_en_hilo(empleado_id):
+    try:
+        return generar_derivados(empleado_id)
+    finally:
+        # Cada hilo abre su propia conexión
+        connections.close_all()
+
+
+def programar_derivados(empleado_id):
+    """
+    Encola la generación de derivados al confirmar la transacción.
+    Con `FOTOS_WORKERS = 0` se generan en el mismo hilo.
+    """
+    def enviar():
+        global _pool
+        if settings.FOTOS_WORKERS <= 0:
+            generar_derivados(empleado_id)
+            return
+        if _pool is None:
+            _pool = ThreadPoolExecutor(max_workers=settings.FOTOS_WORKERS, thread_name_prefix='fotos')
+        _pool.submit(_generar_en_hilo, empleado_id)
+
+    transaction.on_commit(enviar)
+
+
+def derivados_pendientes(empleado):
+    return bool(empleado.foto) and (empleado.foto_derivados or {}).get('origen') != empleado.foto.name
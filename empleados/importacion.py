@@ -0,0 +1,175 @@
+import csv
+import io
+from datetime import date, datetime
+
+from django.db import IntegrityError, transaction
+from openpyxl import load_workbook
+
+from .auditoria import serializar_cambios
+from .dashboard import invalidar_dashboard
+from .exportacion import COLUMNAS_EXPORTACION
+from .identificadores import validar_identificadores_lote
+from .models import Bitacora, Empleado
+from .serializers import CAMPOS_UNICOS_EMPLEADO, MENSAJES_UNICIDAD, EmpleadoImportacionSerializer
+from .utils import id_usuario, registrar_bitacora_masiva
+
+TAMANO_LOTE_IMPORTACION = 1000
+# Límite de valores por consulta `__in` (SQLite admite como mínimo 999 parámetros)
+TAMANO_LOTE_CONSULTA = 900
+
+# Acepta tanto el nombre del campo como el encabezado del archivo exportado
+ENCABEZADOS_A_CAMPOS = {}
+for _campo, _encabezado in COLUMNAS_EXPORTACION:
+    ENCABEZADOS_A_CAMPOS[_campo] = _campo
+    ENCABEZADOS_A_CAMPOS[_encabezado.lower()] = _campo
+ENCABEZADOS_A_CAMPOS.pop('id')
+
+
+def _normalizar_fila(fila):
+    """Traduce encabezados a campos del modelo y convierte valores de celdas a texto."""
+    normalizada = {}
+    for encabezado, valor in fila.items():
+        campo = ENCABEZADOS_A_CAMPOS.get(str(encabezado or '').strip().lower())
+        if campo is None or valor is None or valor == '':
+            continue
+        if isinstance(valor, datetime):
+            valor = valor.date().isoformat()
+        elif isinstance(valor, date):
+            valor = valor.isoformat()
+        elif not isinstance(valor, (str, bool)):
+            valor = str(valor)
+        normalizada[campo] = valor.strip() if isinstance(valor, str) else valor
+    return normalizada
+
+
+def leer_csv(archivo):
+    """Devuelve [(número de fila, datos)] de un CSV con encabezados en la primera fila."""
+    texto = io.TextIOWrapper(archivo, encoding='utf-8-sig', newline='')
+    return [(numero, _normalizar_fila(fila)) for numero, fila in enumerate(csv.DictReader(texto), start=2)]
+
+
+def leer_xlsx(archivo):
+    """Devuelve [(número de fila, datos)] de la primera hoja de un XLSX."""
+    libro = load_workbook(archivo, read_only=True, data_only=True)
+    try:
+        filas = libro.active.iter_rows(values_only=True)
+        encabezados = next(filas, ())
+        return [
+            (numero, _normalizar_fila(dict(zip(encabezados, valores))))
+            for numero, valores in enumerate(filas, start=2)
+            if any(valor not in (None, '') for valor in valores)
+        ]
+    finally:
+        libro.close()
+
+
+def leer_json(registros):
+    return [(numero, _normalizar_fila(registro) if isinstance(registro, dict) else None) for numero, registro in enumerate(registros, start=1)]
+
+
+def _valores_existentes(campo, valores):
+    """Una consulta por campo único (dividida en lotes) para saber qué valores ya existen."""
+    existentes = set()
+    valores = list(valores)
+    for inicio in range(0, len(valores), TAMANO_LOTE_CONSULTA):
+        lote = valores[inicio:inicio + TAMANO_LOTE_CONSULTA]
+        existentes.update(Empleado.objects.filter(**{f'{campo}__in': lote}).values_list(campo, flat=True))
+    return existentes
+
+
+def _marcar_existentes(validas, errores):
+    """Anota en `errores` las filas cuyos campos únicos ya usa un empleado de la base."""
+    for campo in CAMPOS_UNICOS_EMPLEADO:
+        existentes = _valores_existentes(campo, {datos[campo] for numero, datos in validas})
+        for numero, datos in validas:
+            if datos[campo] in existentes:
+                errores.setdefault(numero, {}).setdefault(campo, [MENSAJES_UNICIDAD[campo]])
+
+
+def validar_lote(filas):
+    """
+    Valida todas las filas y devuelve ([(número de fila, datos válidos)], errores por fila).
+
+    CURP, RFC y NSS se validan por columnas para todo el lote, el resto de cada
+    fila con `EmpleadoImportacionSerializer` (sin consultas) y después la
+    unicidad se resuelve para todo el lote: duplicados dentro del archivo y una
+    consulta `__in` por cada campo único contra la base de datos.
+    """
+    errores = validar_identificadores_lote(filas)
+    validas = []
+    for numero, datos in filas:
+        if datos is None:
+            errores[numero] = {'non_field_errors': ["Cada registro debe ser un objeto JSON."]}
+            continue
+        serializer = EmpleadoImportacionSerializer(data=datos)
+        if serializer.is_valid():
+            if numero not in errores:
+                validas.append((numero, serializer.validated_data))
+        else:
+            for campo, mensajes in serializer.errors.items():
+                errores.setdefault(numero, {}).setdefault(campo, mensajes)
+
+    for campo in CAMPOS_UNICOS_EMPLEADO:
+        primera_aparicion = {}
+        for numero, datos in validas:
+            valor = datos[campo]
+            if valor in primera_aparicion:
+                errores.setdefault(numero, {})[campo] = [f"Valor duplicado en la importación (fila {primera_aparicion[valor]})."]
+            else:
+                primera_aparicion[valor] = numero
+    _marcar_existentes(validas, errores)
+
+    return [(numero, datos) for numero, datos in validas if numero not in errores], errores
+
+
+def _insertar(empleados, usuario, con_errores):
+    with transaction.atomic():
+        creados = []
+        for inicio in range(0, len(empleados), TAMANO_LOTE_IMPORTACION):
+            creados.extend(Empleado.objects.bulk_create(empleados[inicio:inicio + TAMANO_LOTE_IMPORTACION]))
+        registrar_bitacora_masiva(
+            creados, 'CREACIÓN', usuario=usuario,
+            cambios={'detalle': 'Empleado creado por importación masiva'}
+        )
+        Bitacora.objects.create(
+            usuario_id=id_usuario(usuario),
+            modelo_afectado='Empleado',
+            objeto_id=0,
+            accion='Importación masiva',
+            cambios=serializar_cambios({"creados": len(creados), "con_errores": con_errores}),
+        )
+
+
+def importar_empleados(filas, usuario=None, todo_o_nada=False):
+    """
+    Valida e inserta un lote de empleados. Devuelve el reporte de la importación.
+
+    Las inserciones se hacen con `bulk_create` por bloques dentro de una sola
+    transacción, y la bitácora se escribe también en bloque. Si otra alta
+    confirma un valor único después de validar el lote, la restricción UNIQUE
+    revierte la transacción: esas filas pasan al reporte con el mismo error de
+    unicidad y el resto se vuelve a insertar.
+    """
+    validas, errores = validar_lote(filas)
+    if errores and todo_o_nada:
+        validas = []
+
+    while validas:
+        try:
+            _insertar([Empleado(**datos) for numero, datos in validas], usuario, len(errores))
+            break
+        except IntegrityError:
+            antes = len(errores)
+            _marcar_existentes(validas, errores)
+            if len(errores) == antes:
+                raise
+            validas = [] if todo_o_nada else [(numero, datos) for numero, datos in validas if numero not in errores]
+    if validas:
+        # bulk_create no emite post_save
+        invalidar_dashboard()
+
+    return {
+        'total': len(filas),
+        'creados': len(validas),
+        'errores': [{'fila': numero, 'errores': errores[numero]} for numero in sorted(errores)],
+    }
@@ -0,0 +1,25 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from empleados.archivo import TAMANO_LOTE_ARCHIVO, archivar_bitacoras, fecha_limite
+
+
+class Command(BaseCommand):
+    help = "Mueve las entradas de bitácora más antiguas que el horizonte de retención al archivo histórico."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--dias', type=int, default=settings.BITACORA_RETENCION_DIAS, help="Horizonte de retención en días.")
+        parser.add_argument('--directorio', default=settings.BITACORA_ARCHIVO_DIR, help="Destino de los JSONL comprimidos.")
+        parser.add_argument('--lote', type=int, default=TAMANO_LOTE_ARCHIVO)
+        parser.add_argument('--sin-tabla', action='store_true', help="Solo escribe los JSONL, sin copiar a las tablas de archivo.")
+
+    def handle(self, *args, **options):
+        self.stdout.write(f"Archivando entradas anteriores a {fecha_limite(options['dias']):%Y-%m-%d %H:%M}...")
+        resultado = archivar_bitacoras(
+            dias=options['dias'],
+            directorio=options['directorio'],
+            con_tabla=not options['sin_tabla'],
+            lote=options['lote'],
+        )
+        for origen, total in resultado.items():
+            self.stdout.write(self.style.SUCCESS(f"{origen}: {total} filas archivadas"))
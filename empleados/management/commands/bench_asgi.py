@@ -0,0 +1,74 @@
+import asyncio
+import statistics
+
+from asgiref.sync import async_to_sync, sync_to_async
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.test import AsyncRequestFactory, override_settings
+from rest_framework_simplejwt.tokens import AccessToken
+
+from empleados.benchmarks import Cronometro, crear_empleados_sinteticos, datos_temporales
+from empleados.models import Empleado
+from empleados.views import EmpleadoDashboardAPIView, EmpleadoListCreateAPIView, EmpleadoRetrieveUpdateDestroyAPIView
+
+
+class Command(BaseCommand):
+    help = (
+        "Atiende GET concurrentes como lo haría el servidor ASGI: vistas síncronas "
+        "(un hilo compartido, igual que ASGIHandler) contra `as_view_async()`."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--filas', type=int, default=5_000)
+        parser.add_argument('--peticiones', type=int, default=1_000)
+        parser.add_argument('--concurrencia', type=int, default=200)
+
+    def _rutas(self, ids):
+        for numero in range(self.options['peticiones']):
+            if numero % 4 == 0:
+                yield EmpleadoDashboardAPIView, '/api/empleados/dashboard/', {}, {}
+            elif numero % 4 == 1:
+                pk = ids[numero % len(ids)]
+                yield EmpleadoRetrieveUpdateDestroyAPIView, f'/api/empleados/{pk}/', {}, {'pk': pk}
+            else:
+                yield EmpleadoListCreateAPIView, '/api/empleados/', {'page': numero % 20 + 1, 'activo': 'true'}, {}
+
+    async def _correr(self, ids, asincrona):
+        fabrica = AsyncRequestFactory()
+        vistas = {}
+        limite = asyncio.Semaphore(self.options['concurrencia'])
+        tiempos = []
+
+        def vista(clase):
+            if clase not in vistas:
+                # ASGIHandler ejecuta las vistas síncronas con sync_to_async(thread_sensitive=True)
+                vistas[clase] = clase.as_view_async() if asincrona else sync_to_async(clase.as_view())
+            return vistas[clase]
+
+        async def pedir(clase, ruta, datos, kwargs):
+            async with limite:
+                request = fabrica.get(ruta, datos, headers={'Authorization': self.autorizacion})
+                with Cronometro() as crono:
+                    respuesta = await vista(clase)(request, **kwargs)
+                assert respuesta.status_code == 200, respuesta.status_code
+                tiempos.append(crono.segundos * 1000)
+
+        with Cronometro() as total:
+            await asyncio.gather(*(pedir(*ruta) for ruta in self._rutas(ids)))
+        return len(tiempos) / total.segundos, statistics.quantiles(tiempos, n=100)[-1]
+
+    def handle(self, *args, **options):
+        self.options = options
+        with datos_temporales():
+            crear_empleados_sinteticos(options['filas'], inicio=60_000_000)
+            ids = list(Empleado.objects.filter(num_empleado__startswith='B6').values_list('pk', flat=True)[:500])
+            usuario = get_user_model().objects.create_superuser(username='bench_asgi', password='x')
+            self.autorizacion = f'Bearer {AccessToken.for_user(usuario)}'
+
+            self.stdout.write(f"{'modo':<10}{'req/s':>10}{'p99 (ms)':>12}")
+            # Sin caché de respuestas ni snapshot: se mide la ruta hasta la base de datos
+            with override_settings(CACHE_RESPUESTAS_SEGUNDOS=0, DASHBOARD_CACHE_SEGUNDOS=0):
+                for nombre, asincrona in (('síncrona', False), ('asíncrona', True)):
+                    # async_to_sync desde este hilo: las consultas usan la misma conexión y transacción
+                    rendimiento, p99 = async_to_sync(self._correr)(ids, asincrona)
+                    self.stdout.write(f"{nombre:<10}{rendimiento:>10.1f}{p99:>12.1f}")
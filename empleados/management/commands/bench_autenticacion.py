@@ -0,0 +1,41 @@
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import Group
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIRequestFactory
+
+from empleados.autenticacion import JWTConRevocacionAuthentication, JWTSinEstadoAuthentication
+from empleados.benchmarks import Cronometro, datos_temporales
+from empleados.dashboard import obtener_dashboard
+from empleados.serializers import CustomTokenObtainPairSerializer
+from empleados.views import EmpleadoDashboardAPIView
+
+
+class Command(BaseCommand):
+    help = "Mide peticiones por segundo con autenticación JWT con y sin consulta del usuario."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--peticiones', type=int, default=2000)
+
+    def handle(self, *args, **options):
+        with datos_temporales():
+            usuario = get_user_model().objects.create_user(username='bench_autenticacion', role='gerente')
+            usuario.groups.add(Group.objects.get_or_create(name='Gerente')[0])
+            token = CustomTokenObtainPairSerializer.get_token(usuario).access_token
+            obtener_dashboard()  # el dashboard en caché aísla el costo de autenticación y permisos
+
+            factory = APIRequestFactory()
+            escenarios = (
+                ('con estado', JWTConRevocacionAuthentication),
+                ('sin estado', JWTSinEstadoAuthentication),
+            )
+            self.stdout.write(f"{'modo':<12}{'consultas':>10}{'peticiones/s':>14}")
+            for nombre, autenticacion in escenarios:
+                vista = EmpleadoDashboardAPIView.as_view(authentication_classes=[autenticacion])
+                with CaptureQueriesContext(connection) as consultas, Cronometro() as crono:
+                    for _ in range(options['peticiones']):
+                        respuesta = vista(factory.get('/api/empleados/dashboard/', HTTP_AUTHORIZATION=f'Bearer {token}'))
+                        assert respuesta.status_code == 200, respuesta.status_code
+                por_peticion = len(consultas) / options['peticiones']
+                self.stdout.write(f"{nombre:<12}{por_peticion:>10.1f}{options['peticiones'] / crono.segundos:>14.0f}")
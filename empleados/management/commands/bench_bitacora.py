@@ -0,0 +1,76 @@
+import random
+import tempfile
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.utils.timezone import now
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from empleados.archivo import archivar_bitacoras
+from empleados.benchmarks import Cronometro, datos_temporales
+from empleados.models import Bitacora
+from empleados.views import BitacoraListView
+
+ACCIONES = ['CREACIÓN', 'EDICIÓN', 'ELIMINACIÓN', 'Exportación a Excel']
+
+
+class Command(BaseCommand):
+    help = "Mide la latencia del listado de bitácora antes y después de archivar, sobre filas sintéticas."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--filas', type=int, default=200_000, help="Usa 10000000 para reproducir el escenario de producción.")
+        parser.add_argument('--meses', type=int, default=24, help="Antigüedad máxima de las filas sintéticas.")
+        parser.add_argument('--dias-retencion', type=int, default=90)
+        parser.add_argument('--repeticiones', type=int, default=20)
+
+    def sembrar(self, usuario, total, meses, lote=20_000):
+        azar = random.Random(7)
+        ahora = now()
+        segundos = meses * 30 * 24 * 3600
+        for inicio in range(0, total, lote):
+            Bitacora.objects.bulk_create([
+                Bitacora(
+                    usuario=usuario,
+                    modelo_afectado='Empleado',
+                    objeto_id=azar.randint(1, 50_000),
+                    accion=azar.choice(ACCIONES),
+                    cambios='{"puesto":{"antes":"Analista","después":"Gerente"}}',
+                )
+                for _ in range(min(lote, total - inicio))
+            ])
+        # auto_now_add ignora la fecha en bulk_create: se reparte por tramos de id
+        ids = list(Bitacora.objects.order_by('id').values_list('id', flat=True)[::max(1, total // 200)])
+        for indice, primero in enumerate(ids):
+            Bitacora.objects.filter(id__gte=primero).update(fecha=ahora - timedelta(seconds=segundos * (len(ids) - indice) // len(ids)))
+
+    def medir(self, usuario, consulta, repeticiones):
+        factory = APIRequestFactory()
+        vista = BitacoraListView.as_view()
+        with Cronometro() as crono:
+            for _ in range(repeticiones):
+                request = factory.get('/api/bitacora/', consulta)
+                force_authenticate(request, user=usuario)
+                vista(request).render()
+        return crono.segundos * 1000 / repeticiones
+
+    def handle(self, *args, **options):
+        escenarios = {
+            'primera página': {},
+            'filtro por objeto': {'modelo_afectado': 'Empleado', 'objeto_id': '1234'},
+            'rango de 7 días': {'fecha_desde': (now() - timedelta(days=14)).isoformat(), 'fecha_hasta': (now() - timedelta(days=7)).isoformat()},
+        }
+        with datos_temporales():
+            usuario = get_user_model().objects.create_user(username='bench_bitacora', is_staff=True)
+            self.stdout.write(f"Sembrando {options['filas']} entradas de bitácora (se revierten al terminar)...")
+            self.sembrar(usuario, options['filas'], options['meses'])
+
+            antes = {nombre: self.medir(usuario, consulta, options['repeticiones']) for nombre, consulta in escenarios.items()}
+            with tempfile.TemporaryDirectory() as directorio, Cronometro() as crono:
+                archivadas = archivar_bitacoras(dias=options['dias_retencion'], directorio=directorio)
+            self.stdout.write(f"Archivadas {archivadas['bitacora']} filas en {crono.segundos:.1f} s")
+            despues = {nombre: self.medir(usuario, consulta, options['repeticiones']) for nombre, consulta in escenarios.items()}
+
+        self.stdout.write(f"{'escenario':<20}{'antes (ms)':>12}{'después (ms)':>14}")
+        for nombre in escenarios:
+            self.stdout.write(f"{nombre:<20}{antes[nombre]:>12.2f}{despues[nombre]:>14.2f}")
@@ -0,0 +1,65 @@
+import statistics
+from functools import reduce
+from operator import and_, or_
+
+from django.core.management.base import BaseCommand
+from django.db.models import Q
+
+from empleados.benchmarks import Cronometro, crear_empleados_sinteticos, datos_temporales
+from empleados.busqueda import CAMPOS_BUSQUEDA, buscar_empleados, indice_local, terminos, usa_indice_postgres
+from empleados.models import Empleado
+
+CONSULTAS = ['jose', 'garcía', 'mar lop', 'b0001234', 'empleado4242', '5500012']
+
+
+def _busqueda_anterior(consulta, limite):
+    """Implementación original: `icontains` sobre nueve columnas por término."""
+    condicion = reduce(and_, (
+        reduce(or_, (Q(**{f'{campo}__icontains': termino}) for campo in CAMPOS_BUSQUEDA))
+        for termino in consulta.split()
+    ))
+    return list(Empleado.objects.filter(condicion).order_by('id')[:limite])
+
+
+def _columna_normalizada(consulta, limite):
+    queryset = Empleado.objects.all()
+    for termino in terminos(consulta):
+        queryset = queryset.filter(busqueda__contains=termino)
+    return list(queryset.order_by('id')[:limite])
+
+
+class Command(BaseCommand):
+    help = "Mide la latencia de la búsqueda de empleados (anterior, columna normalizada e índice) sobre filas sintéticas."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--filas', type=int, default=100_000)
+        parser.add_argument('--repeticiones', type=int, default=10)
+        parser.add_argument('--limite', type=int, default=20)
+
+    def handle(self, *args, **options):
+        with datos_temporales():
+            self.stdout.write(f"Sembrando {options['filas']} empleados sintéticos (se revierten al terminar)...")
+            crear_empleados_sinteticos(options['filas'], inicio=10_000_000)
+
+            if not usa_indice_postgres():
+                with Cronometro() as crono:
+                    indice_local.construir()
+                self.stdout.write(f"Índice en memoria construido en {crono.segundos * 1000:.0f} ms")
+
+            escenarios = (
+                ('anterior', _busqueda_anterior),
+                ('normalizada', _columna_normalizada),
+                ('indice', buscar_empleados),
+            )
+            self.stdout.write(f"{'modo':<13}{'p50 (ms)':>10}{'p95 (ms)':>10}")
+            for nombre, funcion in escenarios:
+                tiempos = []
+                for _ in range(options['repeticiones']):
+                    for consulta in CONSULTAS:
+                        with Cronometro() as crono:
+                            funcion(consulta, options['limite'])
+                        tiempos.append(crono.segundos * 1000)
+                p95 = statistics.quantiles(tiempos, n=20)[-1]
+                self.stdout.write(f"{nombre:<13}{statistics.median(tiempos):>10.2f}{p95:>10.2f}")
+
+        indice_local.invalidar()
@@ -0,0 +1,58 @@
+import tempfile
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.test import override_settings
+from rest_framework.test import APIClient
+
+from empleados.benchmarks import Cronometro, crear_empleados_sinteticos, datos_temporales
+
+CONSULTAS = (
+    ('sin filtros', {}),
+    ('departamento', {'departamento': 'TI'}),
+)
+
+
+class Command(BaseCommand):
+    help = "Mide descargas repetidas de GET /api/empleados/exportar-excel/ con y sin la caché de exportaciones."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--empleados', type=int, default=50_000)
+        parser.add_argument('--repeticiones', type=int, default=5)
+
+    def _descargar(self, cliente, parametros):
+        respuesta = cliente.get('/api/empleados/exportar-excel/', parametros)
+        assert respuesta.status_code == 200, respuesta.status_code
+        tamano = sum(len(bloque) for bloque in respuesta.streaming_content)
+        return respuesta.get('X-Cache', '-'), tamano
+
+    def _medir(self, cliente, parametros, repeticiones):
+        tiempos = []
+        for _ in range(repeticiones):
+            with Cronometro() as crono:
+                estado, tamano = self._descargar(cliente, parametros)
+            tiempos.append((estado, crono.segundos))
+        return tiempos, tamano
+
+    def handle(self, *args, **options):
+        total, repeticiones = options['empleados'], options['repeticiones']
+        with datos_temporales(), tempfile.TemporaryDirectory() as directorio, override_settings(EXPORTACIONES_CACHE_DIR=directorio):
+            self.stdout.write(f"Creando {total} empleados sintéticos...")
+            crear_empleados_sinteticos(total, inicio=90_000_000)
+            usuario = get_user_model().objects.create_superuser(username='bench_cache_export', password='x')
+            cliente = APIClient()
+            cliente.force_authenticate(user=usuario)
+
+            self.stdout.write(f"{'consulta':<16}{'sin caché (s)':>15}{'MISS (s)':>11}{'HIT (s)':>10}{'tamaño (MB)':>13}")
+            for nombre, parametros in CONSULTAS:
+                with override_settings(EXPORTACIONES_CACHE_SEGUNDOS=0):
+                    sin_cache, _ = self._medir(cliente, parametros, repeticiones)
+                con_cache, tamano = self._medir(cliente, parametros, repeticiones)
+
+                fallos = [segundos for estado, segundos in con_cache if estado == 'MISS']
+                aciertos = [segundos for estado, segundos in con_cache if estado == 'HIT']
+                promedio_sin_cache = sum(segundos for _, segundos in sin_cache) / len(sin_cache)
+                promedio_hit = sum(aciertos) / len(aciertos) if aciertos else float('nan')
+                self.stdout.write(
+                    f"{nombre:<16}{promedio_sin_cache:>15.3f}{fallos[0]:>11.3f}{promedio_hit:>10.3f}{tamano / 1024 / 1024:>13.1f}"
+                )
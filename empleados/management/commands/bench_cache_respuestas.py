@@ -0,0 +1,63 @@
+import random
+import statistics
+
+from django.contrib.auth import get_user_model
+from django.core.cache import caches
+from django.core.management.base import BaseCommand
+from django.test import override_settings
+from rest_framework.test import APIClient
+
+from empleados.benchmarks import Cronometro, crear_empleados_sinteticos, datos_temporales
+from empleados.cache_respuestas import ALIAS_CACHE, estadisticas_cache, reiniciar_estadisticas
+from empleados.models import Empleado
+
+CONSULTAS = (
+    '/api/empleados/?departamento=TI&activo=true',
+    '/api/empleados/?activo=true&departamento=TI',
+    '/api/empleados/?departamento=Ventas&ordering=-fecha_ingreso',
+    '/api/empleados/?search=garcia',
+    '/api/empleados/?page=2',
+    '/api/bitacora/',
+)
+
+
+class Command(BaseCommand):
+    help = "Repite listados filtrados sin y con la caché de respuestas y mide latencia y tasa de aciertos."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--filas', type=int, default=5_000)
+        parser.add_argument('--peticiones', type=int, default=600)
+        parser.add_argument('--escrituras', type=float, default=0.02, help="Fracción de peticiones que editan un empleado")
+
+    def _correr(self, cliente, ids, options, etiqueta):
+        aleatorio = random.Random(7)
+        tiempos = []
+        for numero in range(options['peticiones']):
+            if aleatorio.random() < options['escrituras']:
+                escritura = cliente.patch(f'/api/empleados/{aleatorio.choice(ids)}/', {'puesto': f'Puesto {etiqueta} {numero}'}, format='json')
+                assert escritura.status_code == 200, escritura.data
+            with Cronometro() as crono:
+                respuesta = cliente.get(aleatorio.choice(CONSULTAS))
+            assert respuesta.status_code == 200, respuesta.status_code
+            tiempos.append(crono.segundos * 1000)
+        return statistics.median(tiempos), statistics.quantiles(tiempos, n=20)[-1]
+
+    def handle(self, *args, **options):
+        with datos_temporales():
+            crear_empleados_sinteticos(options['filas'], inicio=50_000_000)
+            ids = list(Empleado.objects.filter(num_empleado__startswith='B5').values_list('pk', flat=True)[:500])
+            usuario = get_user_model().objects.create_superuser(username='bench_cache', password='x')
+            cliente = APIClient()
+            cliente.force_authenticate(user=usuario)
+
+            self.stdout.write(f"{'modo':<12}{'p50 (ms)':>10}{'p95 (ms)':>10}{'aciertos':>10}{'desalojos':>11}")
+            for nombre, segundos in (('sin caché', 0), ('con caché', 300)):
+                caches[ALIAS_CACHE].clear()
+                reiniciar_estadisticas()
+                with override_settings(CACHE_RESPUESTAS_SEGUNDOS=segundos):
+                    p50, p95 = self._correr(cliente, ids, options, nombre)
+                estadisticas = estadisticas_cache()
+                tasa = estadisticas['tasa_aciertos']
+                self.stdout.write(
+                    f"{nombre:<12}{p50:>10.2f}{p95:>10.2f}{(f'{tasa:.0%}' if tasa is not None else '-'):>10}{estadisticas['desalojos']:>11}"
+                )
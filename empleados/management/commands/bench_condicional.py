@@ -0,0 +1,50 @@
+import statistics
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from rest_framework.test import APIClient
+
+from empleados.benchmarks import Cronometro, crear_empleados_sinteticos, datos_temporales
+from empleados.models import Empleado
+
+
+class Command(BaseCommand):
+    help = (
+        "Simula clientes que refrescan el detalle, el listado y el dashboard: "
+        "compara bytes y latencia de respuestas completas contra revalidaciones 304."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--filas', type=int, default=2_000)
+        parser.add_argument('--peticiones', type=int, default=300)
+
+    def _medir(self, cliente, url, peticiones, **encabezados):
+        tiempos, total_bytes, estados = [], 0, set()
+        for _ in range(peticiones):
+            with Cronometro() as crono:
+                respuesta = cliente.get(url, **encabezados)
+            tiempos.append(crono.segundos * 1000)
+            total_bytes += len(respuesta.content)
+            estados.add(respuesta.status_code)
+        return statistics.median(tiempos), total_bytes / peticiones, estados
+
+    def handle(self, *args, **options):
+        with datos_temporales():
+            crear_empleados_sinteticos(options['filas'], inicio=40_000_000)
+            usuario = get_user_model().objects.create_superuser(username='bench_condicional', password='x')
+            cliente = APIClient()
+            cliente.force_authenticate(user=usuario)
+            pk = Empleado.objects.filter(num_empleado__startswith='B4').values_list('pk', flat=True).first()
+
+            urls = (
+                ('detalle', f'/api/empleados/{pk}/'),
+                ('listado', '/api/empleados/?page_size=100'),
+                ('dashboard', '/api/empleados/dashboard/'),
+            )
+            self.stdout.write(f"{'vista':<11}{'modo':<9}{'estado':>8}{'bytes':>10}{'p50 (ms)':>10}")
+            for nombre, url in urls:
+                etag = cliente.get(url)['ETag']
+                for modo, encabezados in (('completa', {}), ('304', {'HTTP_IF_NONE_MATCH': etag})):
+                    p50, bytes_promedio, estados = self._medir(cliente, url, options['peticiones'], **encabezados)
+                    estado = ','.join(map(str, sorted(estados)))
+                    self.stdout.write(f"{nombre:<11}{modo:<9}{estado:>8}{bytes_promedio:>10.0f}{p50:>10.2f}")
@@ -0,0 +1,107 @@
+import copy
+import statistics
+from io import BytesIO
+
+from django.contrib.auth import get_user_model
+from django.core.handlers.wsgi import WSGIHandler
+from django.core.management.base import BaseCommand
+from django.db import connections
+from django.db.backends.signals import connection_created
+from rest_framework_simplejwt.tokens import AccessToken
+
+from empleados.benchmarks import Cronometro
+
+MODOS = ('sin persistencia', 'persistentes', 'pool')
+RUTA = '/api/empleados/cambios/'
+
+
+def configurar(conexion, modo):
+    """Cierra la conexión (y el pool) de `conexion` y la deja en el modo indicado."""
+    conexion.close()
+    if hasattr(conexion, 'close_pool'):
+        conexion.close_pool()
+    ajustes = conexion.settings_dict
+    ajustes['OPTIONS'].pop('pool', None)
+    ajustes['CONN_MAX_AGE'] = 600 if modo == 'persistentes' else 0
+    ajustes['CONN_HEALTH_CHECKS'] = modo != 'sin persistencia'
+    if modo == 'pool':
+        ajustes['OPTIONS']['pool'] = {'min_size': 1, 'max_size': 2}
+
+
+def pool_disponible(conexion):
+    if conexion.vendor != 'postgresql':
+        return False
+    from django.db.backends.postgresql.psycopg_any import is_psycopg3
+
+    if not is_psycopg3:
+        return False
+    try:
+        import psycopg_pool  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+class Command(BaseCommand):
+    help = (
+        "Compara la latencia de peticiones completas (GET /api/empleados/cambios/ por el manejador WSGI) "
+        "abriendo una conexión por petición, con conexiones persistentes y con el pool de psycopg 3."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--peticiones', type=int, default=500)
+
+    def _entorno(self, token):
+        return {
+            'REQUEST_METHOD': 'GET', 'PATH_INFO': RUTA, 'QUERY_STRING': '', 'SERVER_NAME': 'localhost', 'SERVER_PORT': '80',
+            'HTTP_HOST': 'localhost', 'HTTP_AUTHORIZATION': f'Bearer {token}', 'wsgi.input': BytesIO(), 'wsgi.url_scheme': 'http',
+        }
+
+    def _pedir(self, manejador, token):
+        estado = []
+        resultado = manejador(self._entorno(token), lambda codigo, encabezados: estado.append(codigo))
+        try:
+            b''.join(resultado)
+        finally:
+            # Como un servidor WSGI: request_finished cierra o devuelve la conexión según el modo
+            resultado.close()
+        assert estado[0].startswith('200'), estado[0]
+
+    def handle(self, *args, **options):
+        total = options['peticiones']
+        conexion = connections['default']
+        original = copy.deepcopy(conexion.settings_dict)
+        abiertas = []
+
+        def contar(sender, connection, **kwargs):
+            abiertas.append(connection.alias)
+
+        usuario = get_user_model().objects.create_superuser(username='bench_conexiones', password='x')
+        connection_created.connect(contar)
+        try:
+            token = str(AccessToken.for_user(usuario))
+            manejador = WSGIHandler()
+            self.stdout.write(f"Base: {conexion.vendor} ({conexion.settings_dict.get('HOST') or conexion.settings_dict['NAME']})")
+            self.stdout.write(f"{'modo':<18}{'media (ms)':>12}{'p50 (ms)':>10}{'p95 (ms)':>10}{'conexiones':>12}")
+            for modo in MODOS:
+                if modo == 'pool' and not pool_disponible(conexion):
+                    self.stdout.write(f"{modo:<18}  requiere PostgreSQL con psycopg 3 y psycopg-pool")
+                    continue
+                configurar(conexion, modo)
+                self._pedir(manejador, token)  # calentamiento: abre el pool / la conexión persistente
+                abiertas.clear()
+                tiempos = []
+                for _ in range(total):
+                    with Cronometro() as crono:
+                        self._pedir(manejador, token)
+                    tiempos.append(crono.segundos * 1000)
+                p95 = statistics.quantiles(tiempos, n=20)[-1]
+                self.stdout.write(
+                    f"{modo:<18}{statistics.mean(tiempos):>12.2f}{statistics.median(tiempos):>10.2f}{p95:>10.2f}{len(abiertas):>12}"
+                )
+        finally:
+            connection_created.disconnect(contar)
+            configurar(conexion, 'sin persistencia')
+            conexion.settings_dict.clear()
+            conexion.settings_dict.update(original)
+            usuario.delete()
@@ -0,0 +1,61 @@
+from datetime import date
+
+from django.core.cache import cache
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.db.models import Count
+from django.test.utils import CaptureQueriesContext
+
+from empleados.benchmarks import Cronometro, crear_empleados_sinteticos, datos_temporales
+from empleados.dashboard import calcular_dashboard, obtener_dashboard
+from empleados.models import Empleado
+
+
+def _dashboard_anterior():
+    """Implementación original: seis consultas y todas las filas cargadas en Python para la edad."""
+    hoy = date.today()
+    empleados = Empleado.objects.all()
+    total = empleados.count()
+    activos = empleados.filter(activo=True).count()
+    inactivos = empleados.filter(activo=False).count()
+    edades = [
+        hoy.year - e.fecha_nacimiento.year - ((hoy.month, hoy.day) < (e.fecha_nacimiento.month, e.fecha_nacimiento.day))
+        for e in empleados.exclude(fecha_nacimiento=None)
+    ]
+    return {
+        "total_empleados": total,
+        "activos": activos,
+        "inactivos": inactivos,
+        "edad_promedio": round(sum(edades) / len(edades), 1) if edades else 0,
+        "por_departamento": list(empleados.values('departamento').annotate(total=Count('id'))),
+        "por_puesto": list(empleados.values('puesto').annotate(total=Count('id'))),
+        "por_genero": list(empleados.values('genero').annotate(total=Count('id'))),
+    }
+
+
+class Command(BaseCommand):
+    help = "Mide el dashboard (implementación anterior, agregada y en caché) sobre empleados sintéticos."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--filas', type=int, default=100_000)
+        parser.add_argument('--repeticiones', type=int, default=5)
+
+    def handle(self, *args, **options):
+        with datos_temporales():
+            self.stdout.write(f"Sembrando {options['filas']} empleados sintéticos (se revierten al terminar)...")
+            crear_empleados_sinteticos(options['filas'], inicio=10_000_000)
+
+            cache.delete('empleados:dashboard')
+            obtener_dashboard()  # calienta la caché
+            escenarios = (
+                ('anterior', _dashboard_anterior),
+                ('agregado', calcular_dashboard),
+                ('cache', obtener_dashboard),
+            )
+            self.stdout.write(f"{'modo':<10}{'consultas':>10}{'ms (media)':>14}")
+            for nombre, funcion in escenarios:
+                with CaptureQueriesContext(connection) as consultas, Cronometro() as crono:
+                    for _ in range(options['repeticiones']):
+                        funcion()
+                por_llamada = len(consultas) // options['repeticiones']
+                self.stdout.write(f"{nombre:<10}{por_llamada:>10}{crono.segundos * 1000 / options['repeticiones']:>14.1f}")
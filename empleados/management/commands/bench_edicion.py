@@ -0,0 +1,67 @@
+import statistics
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework import serializers
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from empleados.auditoria import auditoria_explicita
+from empleados.benchmarks import Cronometro, crear_empleados_sinteticos, datos_temporales
+from empleados.models import Empleado
+from empleados.serializers import EmpleadoSerializer
+from empleados.utils import registrar_bitacora
+from empleados.views import EmpleadoRetrieveUpdateDestroyAPIView
+
+
+class _SerializerAnterior(EmpleadoSerializer):
+    def update(self, instance, validated_data):
+        # UPDATE de la fila completa (con el mismo savepoint de unicidad que el actual)
+        with self.errores_de_unicidad(validated_data):
+            return serializers.ModelSerializer.update(self, instance, validated_data)
+
+
+class _VistaAnterior(EmpleadoRetrieveUpdateDestroyAPIView):
+    """perform_update original: recarga el empleado y compara todos los campos."""
+    serializer_class = _SerializerAnterior
+
+    def perform_update(self, serializer):
+        instance = self.get_object()
+        with auditoria_explicita():
+            empleado = serializer.save()
+        registrar_bitacora(instancia=empleado, accion='EDICIÓN', usuario=self.request.user, instancia_anterior=instance)
+
+
+class Command(BaseCommand):
+    help = "Mide la latencia y las consultas de un PATCH de empleado antes y después del rastreo de cambios."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--peticiones', type=int, default=500)
+
+    def handle(self, *args, **options):
+        with datos_temporales():
+            crear_empleados_sinteticos(100, inicio=30_000_000)
+            usuario = get_user_model().objects.create_superuser(username='bench_edicion', password='x')
+            ids = list(Empleado.objects.filter(num_empleado__startswith='B3').values_list('pk', flat=True))
+
+            factory = APIRequestFactory()
+            escenarios = (
+                ('anterior', _VistaAnterior.as_view()),
+                ('rastreo', EmpleadoRetrieveUpdateDestroyAPIView.as_view()),
+            )
+            self.stdout.write(f"{'modo':<10}{'consultas':>10}{'p50 (ms)':>10}{'p95 (ms)':>10}")
+            for nombre, vista in escenarios:
+                tiempos = []
+                with CaptureQueriesContext(connection) as consultas:
+                    for numero in range(options['peticiones']):
+                        pk = ids[numero % len(ids)]
+                        peticion = factory.patch(f'/api/empleados/{pk}/', {'puesto': f'Puesto {numero}'}, format='json')
+                        force_authenticate(peticion, user=usuario)
+                        with Cronometro() as crono:
+                            respuesta = vista(peticion, pk=pk)
+                        assert respuesta.status_code == 200, respuesta.data
+                        tiempos.append(crono.segundos * 1000)
+                por_peticion = len(consultas) / options['peticiones']
+                p95 = statistics.quantiles(tiempos, n=20)[-1]
+                self.stdout.write(f"{nombre:<10}{por_peticion:>10.1f}{statistics.median(tiempos):>10.2f}{p95:>10.2f}")
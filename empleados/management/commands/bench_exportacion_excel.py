@@ -0,0 +1,62 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from empleados.benchmarks import ejecutar_aislado, filas_sinteticas, rss_pico_mb
+
+
+def _exportar_openpyxl(total):
+    """Implementación anterior: libro completo en memoria y segunda pasada para anchos."""
+    from io import BytesIO
+
+    from openpyxl import Workbook
+    from openpyxl.utils import get_column_letter
+
+    from empleados.exportacion import ENCABEZADOS_EXPORTACION, formatear_fila
+
+    base_rss = rss_pico_mb()
+    inicio = time.perf_counter()
+    wb = Workbook()
+    ws = wb.active
+    ws.append(ENCABEZADOS_EXPORTACION)
+    for valores in filas_sinteticas(total):
+        ws.append(formatear_fila(valores))
+    for col in ws.columns:
+        max_length = max(len(str(cell.value or '')) for cell in col)
+        ws.column_dimensions[get_column_letter(col[0].column)].width = max_length + 2
+    salida = BytesIO()
+    wb.save(salida)
+    total_segundos = time.perf_counter() - inicio
+    # Nada llega al cliente hasta que el libro se guarda completo
+    return {'ttfb': total_segundos, 'total': total_segundos, 'bytes': salida.tell(), 'rss': rss_pico_mb() - base_rss}
+
+
+def _exportar_streaming(total):
+    from empleados.exportacion import ENCABEZADOS_EXPORTACION, formatear_fila, generar_xlsx
+
+    base_rss = rss_pico_mb()
+    inicio = time.perf_counter()
+    ttfb = None
+    tamano = 0
+    filas = (formatear_fila(valores) for valores in filas_sinteticas(total))
+    for bloque in generar_xlsx(ENCABEZADOS_EXPORTACION, filas, [20] * len(ENCABEZADOS_EXPORTACION)):
+        if ttfb is None:
+            ttfb = time.perf_counter() - inicio
+        tamano += len(bloque)
+    return {'ttfb': ttfb, 'total': time.perf_counter() - inicio, 'bytes': tamano, 'rss': rss_pico_mb() - base_rss}
+
+
+class Command(BaseCommand):
+    help = "Compara la exportación a Excel en memoria (openpyxl) contra la exportación en streaming."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--filas', type=int, nargs='+', default=[10_000, 100_000])
+
+    def handle(self, *args, **options):
+        self.stdout.write(f"{'modo':<12}{'filas':>10}{'TTFB (s)':>12}{'total (s)':>12}{'RSS pico (MB)':>16}{'tamaño (KB)':>14}")
+        for total in options['filas']:
+            for modo, funcion in (('openpyxl', _exportar_openpyxl), ('streaming', _exportar_streaming)):
+                r = ejecutar_aislado(funcion, total)
+                self.stdout.write(
+                    f"{modo:<12}{total:>10}{r['ttfb']:>12.3f}{r['total']:>12.3f}{r['rss']:>16.1f}{r['bytes'] / 1024:>14.0f}"
+                )
@@ -0,0 +1,49 @@
+import tracemalloc
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from rest_framework.test import APIClient
+
+from empleados.benchmarks import Cronometro, crear_empleados_sinteticos, datos_temporales
+
+MODOS = (
+    ('csv', 'csv', ''),
+    ('csv+gzip', 'csv', 'gzip'),
+    ('ndjson', 'ndjson', ''),
+    ('ndjson+gzip', 'ndjson', 'gzip'),
+)
+
+
+class Command(BaseCommand):
+    help = "Mide filas por segundo y memoria de GET /api/empleados/exportar/ en CSV y NDJSON, con y sin gzip."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--filas', type=int, default=1_000_000)
+
+    def _descargar(self, cliente, formato, encoding):
+        respuesta = cliente.get('/api/empleados/exportar/', {'formato': formato}, HTTP_ACCEPT_ENCODING=encoding)
+        assert respuesta.status_code == 200, respuesta.status_code
+        return sum(len(bloque) for bloque in respuesta.streaming_content)
+
+    def handle(self, *args, **options):
+        total = options['filas']
+        with datos_temporales():
+            self.stdout.write(f"Creando {total} empleados sintéticos...")
+            crear_empleados_sinteticos(total, inicio=80_000_000)
+            usuario = get_user_model().objects.create_superuser(username='bench_streaming', password='x')
+            cliente = APIClient()
+            cliente.force_authenticate(user=usuario)
+
+            self.stdout.write(f"{'modo':<14}{'filas/s':>12}{'total (s)':>12}{'tamaño (MB)':>14}{'pico Python (MB)':>19}")
+            for nombre, formato, encoding in MODOS:
+                with Cronometro() as crono:
+                    tamano = self._descargar(cliente, formato, encoding)
+                # Segunda pasada sólo para la memoria: tracemalloc frena la primera
+                tracemalloc.start()
+                self._descargar(cliente, formato, encoding)
+                pico = tracemalloc.get_traced_memory()[1]
+                tracemalloc.stop()
+                self.stdout.write(
+                    f"{nombre:<14}{total / crono.segundos:>12,.0f}{crono.segundos:>12.2f}"
+                    f"{tamano / 1024 / 1024:>14.1f}{pico / 1024 / 1024:>19.1f}"
+                )
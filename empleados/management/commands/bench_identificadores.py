@@ -0,0 +1,60 @@
+import re
+
+from django.core.management.base import BaseCommand
+
+from empleados.benchmarks import Cronometro, identificadores_sinteticos
+from empleados.identificadores import errores_curp, errores_nss, errores_rfc, validar_columna
+
+CURP_ANTERIOR = r'^[A-Z][AEIOU][A-Z]{2}\d{2}(0[1-9]|1[0-2])' \
+                r'(0[1-9]|[12]\d|3[01])[HM]' \
+                r'(AS|BC|BS|CC|CL|CM|CS|CH|DF|DG|GT|GR|HG|JC|MC|MN|MS|NT|NL|OC|' \
+                r'PL|QT|QR|SP|SL|SR|TC|TS|TL|VZ|YN|ZS)' \
+                r'[B-DF-HJ-NP-TV-Z]{3}[0-9A-Z]\d$'
+RFC_ANTERIOR = r'^[A-ZÑ&]{3,4}\d{6}[A-Z0-9]{3}$'
+NSS_ANTERIOR = r'^\d{11}$'
+
+
+def _anterior(curps, rfcs, nsss):
+    """Implementación original del serializer: patrón sin compilar por llamada."""
+    for curp, rfc, nss in zip(curps, rfcs, nsss):
+        re.match(CURP_ANTERIOR, curp.upper())
+        re.match(RFC_ANTERIOR, rfc.upper())
+        re.match(NSS_ANTERIOR, nss)
+
+
+def _por_valor(estricto):
+    def validar(curps, rfcs, nsss):
+        for curp, rfc, nss in zip(curps, rfcs, nsss):
+            errores_curp(curp, estricto=estricto)
+            errores_rfc(rfc, estricto=estricto)
+            errores_nss(nss, estricto=estricto)
+    return validar
+
+
+def _por_columna(curps, rfcs, nsss):
+    validar_columna(curps, errores_curp, estricto=True)
+    validar_columna(rfcs, errores_rfc, estricto=True)
+    validar_columna(nsss, errores_nss, estricto=True)
+
+
+class Command(BaseCommand):
+    help = "Mide validaciones por segundo de CURP, RFC y NSS (anterior, compilado, estricto y por columnas)."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--cantidad', type=int, default=1_000_000)
+
+    def handle(self, *args, **options):
+        curps, rfcs, nsss = map(list, zip(*identificadores_sinteticos(options['cantidad'])))
+        escenarios = (
+            ('anterior (solo formato)', _anterior),
+            ('compilado (solo formato)', _por_valor(False)),
+            ('compilado estricto', _por_valor(True)),
+            ('columna estricta', _por_columna),
+        )
+        # Cada fila valida tres identificadores
+        validaciones = options['cantidad'] * 3
+        self.stdout.write(f"{'modo':<26}{'segundos':>10}{'validaciones/s':>16}")
+        for nombre, funcion in escenarios:
+            with Cronometro() as crono:
+                funcion(curps, rfcs, nsss)
+            self.stdout.write(f"{nombre:<26}{crono.segundos:>10.2f}{validaciones / crono.segundos:>16,.0f}")
@@ -0,0 +1,60 @@
+import statistics
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.test import modify_settings, override_settings
+from rest_framework.test import APIClient
+
+from empleados.benchmarks import Cronometro, crear_empleados_sinteticos, datos_temporales
+from empleados.models import Empleado
+
+MIDDLEWARE_METRICAS = 'empleados.middleware.InstrumentacionMiddleware'
+
+
+class Command(BaseCommand):
+    help = "Mide el costo del middleware de instrumentación: mismas peticiones con y sin él, en rondas alternadas."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--filas', type=int, default=5_000)
+        parser.add_argument('--peticiones', type=int, default=300, help="Peticiones por ronda y endpoint")
+        parser.add_argument('--rondas', type=int, default=5)
+
+    def _medir(self, usuario, rutas, instrumentado):
+        # Un cliente nuevo carga la cadena de middleware vigente
+        cliente = APIClient()
+        cliente.force_authenticate(user=usuario)
+        tiempos = {ruta: [] for ruta in rutas}
+        for _ in range(self.options['peticiones']):
+            for ruta in rutas:
+                with Cronometro() as crono:
+                    respuesta = cliente.get(ruta)
+                assert respuesta.status_code == 200, respuesta.status_code
+                tiempos[ruta].append(crono.segundos * 1000)
+        return tiempos
+
+    def handle(self, *args, **options):
+        self.options = options
+        with datos_temporales():
+            crear_empleados_sinteticos(options['filas'], inicio=70_000_000)
+            pk = Empleado.objects.filter(num_empleado__startswith='B7').values_list('pk', flat=True).first()
+            usuario = get_user_model().objects.create_superuser(username='bench_metricas', password='x')
+            rutas = ('/api/empleados/?activo=true', f'/api/empleados/{pk}/', '/api/bitacora/')
+
+            resultados = {(ruta, instrumentado): [] for ruta in rutas for instrumentado in (False, True)}
+            # Sin caché de respuestas: cada petición recorre vista, consultas y render
+            with override_settings(CACHE_RESPUESTAS_SEGUNDOS=0):
+                for _ in range(options['rondas']):
+                    for instrumentado in (False, True):
+                        if instrumentado:
+                            tiempos = self._medir(usuario, rutas, True)
+                        else:
+                            with modify_settings(MIDDLEWARE={'remove': [MIDDLEWARE_METRICAS]}):
+                                tiempos = self._medir(usuario, rutas, False)
+                        for ruta, valores in tiempos.items():
+                            resultados[(ruta, instrumentado)] += valores
+
+            self.stdout.write(f"{'endpoint':<32}{'sin (ms)':>10}{'con (ms)':>10}{'costo':>9}")
+            for ruta in rutas:
+                sin = statistics.median(resultados[(ruta, False)])
+                con = statistics.median(resultados[(ruta, True)])
+                self.stdout.write(f"{ruta:<32}{sin:>10.3f}{con:>10.3f}{(con - sin) / sin:>9.1%}")
@@ -0,0 +1,51 @@
+import resource
+import sys
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from empleados.benchmarks import datos_empleado, ejecutar_aislado, rss_pico_mb
+
+
+def _rss_hijos_mb():
+    """Pico de memoria del proceso hijo más grande ya terminado, en MB."""
+    pico = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+    return pico / (1024 * 1024) if sys.platform == 'darwin' else pico / 1024
+
+
+def _renderizar(total, workers):
+    from django.test import override_settings
+
+    from empleados import pdf
+
+    filas = ({'id': indice, **{campo: datos_empleado(indice)[campo] for campo in pdf.CAMPOS_PDF[1:]}} for indice in range(1, total + 1))
+    base_rss = rss_pico_mb()
+    inicio = time.perf_counter()
+    with override_settings(PDF_WORKERS=workers):
+        documento = pdf.renderizar_pdf(filas)
+    segundos = time.perf_counter() - inicio
+    if pdf._pool is not None:
+        # Los hijos reportan su pico al terminar
+        pdf._pool.shutdown()
+    return {'segundos': segundos, 'rss': rss_pico_mb() - base_rss, 'rss_hijos': _rss_hijos_mb(), 'bytes': len(documento)}
+
+
+class Command(BaseCommand):
+    help = "Compara el PDF de empleados renderizado en un solo proceso contra bloques en paralelo."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--filas', type=int, nargs='+', default=[1_000, 10_000, 50_000])
+        parser.add_argument('--workers', type=int, default=settings.PDF_WORKERS or 4)
+
+    def handle(self, *args, **options):
+        self.stdout.write(
+            f"PDF_FILAS_POR_BLOQUE={settings.PDF_FILAS_POR_BLOQUE}\n"
+            f"{'modo':<14}{'filas':>8}{'total (s)':>12}{'RSS pico (MB)':>16}{'RSS hijo (MB)':>16}{'tamaño (KB)':>14}"
+        )
+        for total in options['filas']:
+            for modo, workers in (('un proceso', 0), (f"{options['workers']} procesos", options['workers'])):
+                r = ejecutar_aislado(_renderizar, total, workers)
+                self.stdout.write(
+                    f"{modo:<14}{total:>8}{r['segundos']:>12.2f}{r['rss']:>16.1f}{r['rss_hijos']:>16.1f}{r['bytes'] / 1024:>14.0f}"
+                )
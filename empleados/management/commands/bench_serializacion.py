@@ -0,0 +1,46 @@
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from rest_framework.pagination import PageNumberPagination
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from empleados.benchmarks import Cronometro, crear_empleados_sinteticos, datos_temporales
+from empleados.serializers import CAMPOS_DIRECTORIO
+from empleados.views import EmpleadoListCreateAPIView
+
+TAMANOS_PAGINA = (10, 100, 1000)
+
+
+class Command(BaseCommand):
+    help = "Mide filas por segundo del listado de empleados completo contra `?fields=` (proyección con values())."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--filas', type=int, default=5000)
+        parser.add_argument('--filas-por-escenario', type=int, default=20_000)
+
+    def handle(self, *args, **options):
+        with datos_temporales():
+            crear_empleados_sinteticos(options['filas'], inicio=20_000_000)
+            usuario = get_user_model().objects.create_superuser(username='bench_serializacion', password='x')
+
+            factory = APIRequestFactory()
+            escenarios = (
+                ('completo', {}),
+                ('proyeccion', {'fields': ','.join(CAMPOS_DIRECTORIO)}),
+            )
+            self.stdout.write(f"{'modo':<12}{'pagina':>8}{'filas/s':>12}{'ms/pagina':>11}")
+            for tamano in TAMANOS_PAGINA:
+                paginacion = type('Paginacion', (PageNumberPagination,), {'page_size': tamano})
+                vista = EmpleadoListCreateAPIView.as_view(pagination_class=paginacion)
+                paginas = max(1, options['filas_por_escenario'] // tamano)
+                for nombre, parametros in escenarios:
+                    with Cronometro() as crono:
+                        for numero in range(paginas):
+                            pagina = numero % max(1, options['filas'] // tamano) + 1
+                            peticion = factory.get('/api/empleados/', {**parametros, 'page': pagina})
+                            force_authenticate(peticion, user=usuario)
+                            respuesta = vista(peticion).render()
+                            assert respuesta.status_code == 200, respuesta.status_code
+                    filas = paginas * tamano
+                    self.stdout.write(
+                        f"{nombre:<12}{tamano:>8}{filas / crono.segundos:>12.0f}{crono.segundos * 1000 / paginas:>11.2f}"
+                    )
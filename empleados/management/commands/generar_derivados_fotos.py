@@ -0,0 +1,51 @@
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from django.core.management.base import BaseCommand
+from django.db import connections
+
+from empleados.imagenes import generar_derivados
+from empleados.models import Empleado
+from empleados.workers import generar_derivados_foto, inicializar_proceso
+
+
+class Command(BaseCommand):
+    help = "Genera las miniaturas y demás derivados de las fotos de empleados que aún no los tienen."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, default=os.cpu_count() or 1, help="0 = en este proceso.")
+        parser.add_argument('--todos', action='store_true', help="Regenera también las fotos que ya tienen derivados.")
+
+    def handle(self, *args, **options):
+        pendientes = [
+            pk for pk, foto, derivados in Empleado.objects.exclude(foto='').exclude(foto__isnull=True)
+            .values_list('id', 'foto', 'foto_derivados').iterator()
+            if options['todos'] or (derivados or {}).get('origen') != foto
+        ]
+        self.stdout.write(f"Fotos por procesar: {len(pendientes)}")
+        if not pendientes:
+            return
+
+        generados = errores = 0
+        if options['workers'] <= 0:
+            # En este proceso: generar_derivados_foto cerraría las conexiones del comando
+            for pk in pendientes:
+                try:
+                    generar_derivados(pk)
+                    generados += 1
+                except Exception as exc:
+                    errores += 1
+                    self.stderr.write(f"Empleado {pk}: {exc}")
+        else:
+            # Las conexiones abiertas no deben heredarse por fork a los hijos
+            connections.close_all()
+            with ProcessPoolExecutor(max_workers=options['workers'], initializer=inicializar_proceso) as pool:
+                futuros = {pool.submit(generar_derivados_foto, pk): pk for pk in pendientes}
+                for futuro in as_completed(futuros):
+                    try:
+                        futuro.result()
+                        generados += 1
+                    except Exception as exc:
+                        errores += 1
+                        self.stderr.write(f"Empleado {futuros[futuro]}: {exc}")
+        self.stdout.write(self.style.SUCCESS(f"Derivados generados: {generados}. Errores: {errores}."))
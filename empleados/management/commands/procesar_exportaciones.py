@@ -0,0 +1,77 @@
+import time
+from concurrent.futures import ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import connections
+
+from empleados.trabajos import devolver_trabajos, fallar_trabajos, reclamar_trabajos
+from empleados.workers import inicializar_proceso, procesar_trabajo_exportacion
+
+ERROR_POOL_ROTO = "El proceso que generaba la exportación terminó abruptamente (p. ej. por falta de memoria)."
+
+
+class Command(BaseCommand):
+    help = "Procesa la cola de exportaciones de empleados con un pool local de procesos."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, default=settings.EXPORTACIONES_WORKERS)
+        parser.add_argument('--intervalo', type=float, default=2.0, help="Segundos entre consultas a la cola.")
+        parser.add_argument('--una-vez', action='store_true', help="Procesa lo pendiente y termina.")
+
+    def _crear_pool(self, workers):
+        # Las conexiones abiertas no deben heredarse por fork a los hijos
+        connections.close_all()
+        return ProcessPoolExecutor(max_workers=workers, initializer=inicializar_proceso)
+
+    def _recoger(self, en_curso, futuros):
+        """Informa los trabajos terminados; True si alguno murió con el pool."""
+        roto = False
+        for futuro in futuros:
+            trabajo_id = en_curso.pop(futuro)
+            try:
+                estado = futuro.result()
+            except BrokenProcessPool:
+                # No se sabe qué trabajo mató al proceso: fallan todos los que corrían en el pool
+                roto = True
+                fallar_trabajos([trabajo_id], ERROR_POOL_ROTO)
+                estado = "ERROR (el pool de procesos se rompió)"
+            except Exception as exc:
+                estado = f"ERROR ({exc})"
+            self.stdout.write(f"Trabajo {trabajo_id}: {estado}")
+        return roto
+
+    def handle(self, *args, **options):
+        workers = max(1, options['workers'])
+        en_curso = {}
+
+        pool = self._crear_pool(workers)
+        try:
+            while True:
+                roto = self._recoger(en_curso, [f for f in en_curso if f.done()])
+
+                libres = workers - len(en_curso)
+                reclamados = reclamar_trabajos(libres) if libres and not roto else []
+                for posicion, trabajo_id in enumerate(reclamados):
+                    try:
+                        en_curso[pool.submit(procesar_trabajo_exportacion, trabajo_id)] = trabajo_id
+                    except BrokenProcessPool:
+                        # Los que no llegaron al pool vuelven a la cola
+                        roto = True
+                        devolver_trabajos(reclamados[posicion:])
+                        break
+
+                if roto:
+                    # El resto de trabajos en curso estaba en el mismo pool
+                    self._recoger(en_curso, list(wait(en_curso).done))
+                    self.stderr.write("El pool de procesos se rompió; se crea uno nuevo.")
+                    pool.shutdown(wait=False, cancel_futures=True)
+                    pool = self._crear_pool(workers)
+                    continue
+
+                if options['una_vez'] and not en_curso and not reclamados:
+                    break
+                time.sleep(options['intervalo'] if not reclamados else 0)
+        finally:
+            pool.shutdown()
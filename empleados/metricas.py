@@ -0,0 +1,246 @@
+"""
+Métricas de rendimiento por vista, en el formato de texto de Prometheus.
+
+`empleados.middleware.InstrumentacionMiddleware` registra aquí cada petición:
+latencia (histograma), consultas a la base de datos y su tiempo, bytes de la
+respuesta y tiempo de render. Los agregados viven en memoria del proceso; con
+METRICAS_DIRECTORIO cada worker vuelca además los suyos a
+`<directorio>/metricas-<pid>.json` cada METRICAS_VOLCADO_SEGUNDOS, y
+`GET /metrics` suma los archivos de todos los workers. Un worker terminado
+conserva su archivo, así que los contadores no retroceden; si el sistema da su
+pid a un worker nuevo, éste suma el archivo viejo a `metricas-terminados.json`
+antes de escribir el suyo.
+"""
+import atexit
+import json
+import os
+from contextlib import contextmanager
+import tempfile
+import threading
+import time
+from bisect import bisect_left
+from collections import defaultdict
+from glob import glob
+
+from django.conf import settings
+
+try:
+    import fcntl
+except ImportError:  # Windows: sin bloqueo entre procesos
+    fcntl = None
+
+from .auditoria import estadisticas_auditoria
+from .cache_respuestas import estadisticas_cache
+
+TIPO_CONTENIDO_PROMETHEUS = 'text/plain; version=0.0.4; charset=utf-8'
+ARCHIVO_TERMINADOS = 'metricas-terminados.json'
+BUCKETS_SEGUNDOS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+METRICAS = {
+    # nombre: (tipo, ayuda)
+    'rh_http_peticiones_duracion_segundos': ('histogram', 'Latencia de las peticiones por vista.'),
+    'rh_http_respuestas_total': ('counter', 'Respuestas por vista, método y código de estado.'),
+    'rh_http_respuesta_bytes_total': ('counter', 'Bytes del cuerpo de las respuestas (sin streaming).'),
+    'rh_http_peticiones_lentas_total': ('counter', 'Peticiones por encima de METRICAS_LENTA_MS.'),
+    'rh_db_consultas_total': ('counter', 'Consultas SQL ejecutadas por vista.'),
+    'rh_db_consultas_duracion_segundos_total': ('counter', 'Tiempo en consultas SQL por vista.'),
+    'rh_render_duracion_segundos_total': ('counter', 'Tiempo de render (serialización del cuerpo) por vista.'),
+    'rh_cache_respuestas_total': ('counter', 'Operaciones de la caché de respuestas por resultado.'),
+    'rh_auditoria_entradas_total': ('counter', 'Entradas de bitácora por estado.'),
+}
+
+_candado = threading.Lock()
+_contadores = defaultdict(float)
+_histogramas = {}
+_ultimo_volcado = time.monotonic()
+_pid_volcado = None  # pid del proceso que escribió el archivo propio por última vez
+
+
+# === REGISTRO ===
+def registrar_peticion(vista, metodo, estado, segundos, consultas, segundos_db, tamano, segundos_render):
+    """Suma una petición a los agregados del proceso (un solo bloqueo por petición)."""
+    etiquetas = (('vista', vista), ('metodo', metodo))
+    lenta = segundos * 1000 >= settings.METRICAS_LENTA_MS
+    with _candado:
+        conteos = _histogramas.get(('rh_http_peticiones_duracion_segundos', etiquetas))
+        if conteos is None:
+            # Un conteo por bucket más +Inf, luego suma y total
+            conteos = _histogramas[('rh_http_peticiones_duracion_segundos', etiquetas)] = [0] * (len(BUCKETS_SEGUNDOS) + 3)
+        conteos[bisect_left(BUCKETS_SEGUNDOS, segundos)] += 1
+        conteos[-2] += segundos
+        conteos[-1] += 1
+
+        _contadores[('rh_http_respuestas_total', etiquetas + (('estado', str(estado)),))] += 1
+        _contadores[('rh_http_respuesta_bytes_total', etiquetas)] += tamano
+        _contadores[('rh_db_consultas_total', etiquetas)] += consultas
+        _contadores[('rh_db_consultas_duracion_segundos_total', etiquetas)] += segundos_db
+        _contadores[('rh_render_duracion_segundos_total', etiquetas)] += segundos_render
+        if lenta:
+            _contadores[('rh_http_peticiones_lentas_total', etiquetas)] += 1
+    return lenta
+
+
+def reiniciar_metricas():
+    with _candado:
+        _contadores.clear()
+        _histogramas.clear()
+
+
+def instantanea():
+    """Agregados del proceso, incluidos los contadores de caché y auditoría, listos para JSON."""
+    with _candado:
+        contadores = [[nombre, list(etiquetas), valor] for (nombre, etiquetas), valor in _contadores.items()]
+        histogramas = [[nombre, list(etiquetas), list(conteos)] for (nombre, etiquetas), conteos in _histogramas.items()]
+
+    cache = estadisticas_cache()
+    for resultado in ('aciertos', 'fallos', 'guardados', 'desalojos'):
+        contadores.append(['rh_cache_respuestas_total', [['resultado', resultado]], cache[resultado]])
+    auditoria = estadisticas_auditoria()
+    for estado in ('encolados', 'escritos', 'descartados', 'duplicados_omitidos'):
+        contadores.append(['rh_auditoria_entradas_total', [['estado', estado]], auditoria[estado]])
+    return {'contadores': contadores, 'histogramas': histogramas}
+
+
+# === ALMACÉN COMPARTIDO ENTRE WORKERS ===
+def _archivo_proceso(directorio):
+    return os.path.join(directorio, f'metricas-{os.getpid()}.json')
+
+
+@contextmanager
+def _bloqueo(directorio, exclusivo):
+    """Bloqueo del directorio: exclusivo al archivar, compartido al leer todos los archivos."""
+    if fcntl is None:
+        yield
+        return
+    with open(os.path.join(directorio, 'metricas.lock'), 'a') as candado:
+        fcntl.flock(candado, fcntl.LOCK_EX if exclusivo else fcntl.LOCK_SH)
+        try:
+            yield
+        finally:
+            fcntl.flock(candado, fcntl.LOCK_UN)
+
+
+def _escribir(ruta, datos):
+    descriptor, temporal = tempfile.mkstemp(dir=os.path.dirname(ruta), suffix='.tmp')
+    with os.fdopen(descriptor, 'w') as archivo:
+        json.dump(datos, archivo)
+    # Reemplazo atómico: quien lee ve el archivo anterior o el nuevo, nunca uno a medias
+    os.replace(temporal, ruta)
+
+
+def _leer(ruta):
+    try:
+        with open(ruta) as archivo:
+            return json.load(archivo)
+    except (OSError, ValueError):
+        return None
+
+
+def _archivar_anterior(directorio):
+    """
+    Si ya existe un archivo con el pid de este proceso es de un worker terminado
+    cuyo pid se reutilizó: se suma a ARCHIVO_TERMINADOS y se borra, en un solo
+    paso para quien lee, antes de sobrescribirlo.
+    """
+    propio = _archivo_proceso(directorio)
+    if not os.path.exists(propio):
+        return
+    with _bloqueo(directorio, exclusivo=True):
+        anterior = _leer(propio)
+        if anterior is not None:
+            terminados = os.path.join(directorio, ARCHIVO_TERMINADOS)
+            _escribir(terminados, _como_instantanea(*_sumar([_leer(terminados) or {}, anterior])))
+        os.remove(propio)
+
+
+def volcar(forzar=False):
+    """Escribe la instantánea del proceso en METRICAS_DIRECTORIO, como mucho cada METRICAS_VOLCADO_SEGUNDOS."""
+    global _ultimo_volcado, _pid_volcado
+    directorio = settings.METRICAS_DIRECTORIO
+    if not directorio:
+        return
+    ahora = time.monotonic()
+    if not forzar and ahora - _ultimo_volcado < settings.METRICAS_VOLCADO_SEGUNDOS:
+        return
+    _ultimo_volcado = ahora
+
+    os.makedirs(directorio, exist_ok=True)
+    # Primer volcado de este proceso (también tras un fork)
+    if _pid_volcado != os.getpid():
+        _archivar_anterior(directorio)
+        _pid_volcado = os.getpid()
+    _escribir(_archivo_proceso(directorio), instantanea())
+
+
+def _instantaneas():
+    """La del proceso actual (en vivo) más las volcadas por los demás workers y las archivadas."""
+    instantaneas = [instantanea()]
+    directorio = settings.METRICAS_DIRECTORIO
+    if directorio and os.path.isdir(directorio):
+        propio = _archivo_proceso(directorio)
+        with _bloqueo(directorio, exclusivo=False):
+            for ruta in sorted(glob(os.path.join(directorio, 'metricas-*.json'))):
+                datos = _leer(ruta) if ruta != propio else None
+                if datos is not None:
+                    instantaneas.append(datos)
+    return instantaneas
+
+
+def _sumar(instantaneas):
+    contadores = defaultdict(float)
+    histogramas = {}
+    for datos in instantaneas:
+        for nombre, etiquetas, valor in datos.get('contadores', ()):
+            contadores[(nombre, tuple(map(tuple, etiquetas)))] += valor
+        for nombre, etiquetas, conteos in datos.get('histogramas', ()):
+            acumulado = histogramas.setdefault((nombre, tuple(map(tuple, etiquetas))), [0] * len(conteos))
+            for posicion, conteo in enumerate(conteos):
+                acumulado[posicion] += conteo
+    return contadores, histogramas
+
+
+def _como_instantanea(contadores, histogramas):
+    return {
+        'contadores': [[nombre, [list(par) for par in etiquetas], valor] for (nombre, etiquetas), valor in contadores.items()],
+        'histogramas': [[nombre, [list(par) for par in etiquetas], conteos] for (nombre, etiquetas), conteos in histogramas.items()],
+    }
+
+
+# === FORMATO DE TEXTO DE PROMETHEUS ===
+def _escapar(valor):
+    return str(valor).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _etiquetas(pares):
+    return '{' + ','.join(f'{nombre}="{_escapar(valor)}"' for nombre, valor in pares) + '}' if pares else ''
+
+
+def _numero(valor):
+    return repr(float(valor)) if isinstance(valor, float) and not valor.is_integer() else str(int(valor))
+
+
+def exportar_metricas():
+    """Texto de exposición de Prometheus con la suma de todos los workers."""
+    contadores, histogramas = _sumar(_instantaneas())
+
+    lineas = []
+    for nombre, (tipo, ayuda) in METRICAS.items():
+        lineas += [f'# HELP {nombre} {ayuda}', f'# TYPE {nombre} {tipo}']
+        if tipo == 'histogram':
+            for (metrica, etiquetas), conteos in sorted(histogramas.items()):
+                if metrica != nombre:
+                    continue
+                acumulado = 0
+                for limite, conteo in zip((*BUCKETS_SEGUNDOS, '+Inf'), conteos):
+                    acumulado += conteo
+                    lineas.append(f'{nombre}_bucket{_etiquetas(etiquetas + (("le", limite),))} {acumulado}')
+                lineas.append(f'{nombre}_sum{_etiquetas(etiquetas)} {_numero(conteos[-2])}')
+                lineas.append(f'{nombre}_count{_etiquetas(etiquetas)} {conteos[-1]}')
+        else:
+            for (metrica, etiquetas), valor in sorted(contadores.items()):
+                if metrica == nombre:
+                    lineas.append(f'{nombre}{_etiquetas(etiquetas)} {_numero(valor)}')
+    return '\n'.join(lineas) + '\n'
+
+
+atexit.register(volcar, forzar=True)
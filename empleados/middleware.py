@@ -0,0 +1,166 @@
+import logging
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+from rest_framework.permissions import SAFE_METHODS
+
+from .metricas import registrar_peticion, volcar
+from .replicas import registrar_escritura
+
+logger = logging.getLogger('empleados.metricas')
+
+CONSULTAS_EN_LOG = 5
+
+
+class MedidorConsultas:
+    """Anota duración y SQL de cada consulta de la petición (ver `medir_consulta`)."""
+
+    def __init__(self):
+        self.consultas = []
+
+    def __call__(self, execute, sql, params, many, context):
+        inicio = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.consultas.append((time.perf_counter() - inicio, sql))
+
+
+# Medidor de la petición en curso. Viaja en el contexto hasta los hilos donde
+# corren las consultas: el de sync_to_async (vistas síncronas bajo ASGI) y el
+# del ORM asíncrono, cuyas conexiones no son las del hilo del event loop
+_medidor_actual = ContextVar('medidor_consultas', default=None)
+
+
+def medir_consulta(execute, sql, params, many, context):
+    """`execute_wrapper` fijo de cada conexión: mide si la petición en curso tiene medidor."""
+    medidor = _medidor_actual.get()
+    if medidor is None:
+        return execute(sql, params, many, context)
+    return medidor(execute, sql, params, many, context)
+
+
+def instalar_medicion(connection):
+    """Agrega `medir_consulta` a `connection`; signals lo hace con cada conexión que se abre."""
+    # Al principio: `execute_wrapper()` quita siempre el último de la lista
+    if medir_consulta not in connection.execute_wrappers:
+        connection.execute_wrappers.insert(0, medir_consulta)
+
+
+class InstrumentacionMiddleware:
+    """
+    Mide cada petición para `/metrics` (ver empleados.metricas): latencia por
+    vista, consultas y su tiempo, tamaño de la respuesta y tiempo de render.
+    Las peticiones de más de METRICAS_LENTA_MS se registran en el log
+    `empleados.metricas` con sus consultas más lentas.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not settings.METRICAS_ACTIVAS:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.asincrono = iscoroutinefunction(get_response)
+        if self.asincrono:
+            markcoroutinefunction(self)
+            # Evita que Django la envuelva en sync_to_async bajo ASGI
+            self.process_template_response = self._aprocess_template_response
+
+    def __call__(self, request):
+        if self.asincrono:
+            return self.__acall__(request)
+        medidor, inicio = MedidorConsultas(), time.perf_counter()
+        with self._medir_consultas(medidor):
+            respuesta = self.get_response(request)
+        self._registrar(request, respuesta, medidor, time.perf_counter() - inicio)
+        return respuesta
+
+    async def __acall__(self, request):
+        medidor, inicio = MedidorConsultas(), time.perf_counter()
+        with self._medir_consultas(medidor):
+            respuesta = await self.get_response(request)
+        self._registrar(request, respuesta, medidor, time.perf_counter() - inicio)
+        return respuesta
+
+    @contextmanager
+    def _medir_consultas(self, medidor):
+        # Por si alguna conexión de este hilo se abrió antes de registrar la señal (arranque)
+        for alias in connections:
+            instalar_medicion(connections[alias])
+        token = _medidor_actual.set(medidor)
+        try:
+            yield
+        finally:
+            _medidor_actual.reset(token)
+
+    # === Render: entre process_template_response y el callback posterior ===
+    def process_template_response(self, request, respuesta):
+        inicio = time.perf_counter()
+
+        def medir_render(respuesta_renderizada):
+            request._segundos_render = time.perf_counter() - inicio
+
+        respuesta.add_post_render_callback(medir_render)
+        return respuesta
+
+    async def _aprocess_template_response(self, request, respuesta):
+        return InstrumentacionMiddleware.process_template_response(self, request, respuesta)
+
+    def _registrar(self, request, respuesta, medidor, segundos):
+        ruta = request.resolver_match
+        # Sólo rutas conocidas: una URL arbitraria (404) no crea series nuevas
+        vista = ruta.view_name if ruta is not None else 'sin_ruta'
+        segundos_db = sum(duracion for duracion, _ in medidor.consultas)
+        lenta = registrar_peticion(
+            vista, request.method, respuesta.status_code, segundos, len(medidor.consultas), segundos_db,
+            0 if respuesta.streaming else len(respuesta.content), getattr(request, '_segundos_render', 0.0),
+        )
+        if lenta:
+            lentas = sorted(medidor.consultas, key=lambda consulta: consulta[0], reverse=True)[:CONSULTAS_EN_LOG]
+            logger.warning(
+                "Petición lenta %s %s (%s): %.0f ms, %d consultas en %.0f ms%s",
+                request.method, request.path, vista, segundos * 1000, len(medidor.consultas), segundos_db * 1000,
+                ''.join(f'\n  {duracion * 1000:8.1f} ms  {sql[:300]}' for duracion, sql in lentas),
+            )
+        volcar()
+
+
+class LecturaPropiaMiddleware:
+    """
+    Con réplicas de lectura (ver empleados.replicas): tras una escritura
+    correcta, el usuario lee de la primaria durante
+    DB_REPLICAS_LECTURA_PROPIA_SEGUNDOS y ve sus propios cambios.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not settings.REPLICAS_LECTURA:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.asincrono = iscoroutinefunction(get_response)
+        if self.asincrono:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.asincrono:
+            return self.__acall__(request)
+        respuesta = self.get_response(request)
+        self._registrar(request, respuesta)
+        return respuesta
+
+    async def __acall__(self, request):
+        respuesta = await self.get_response(request)
+        self._registrar(request, respuesta)
+        return respuesta
+
+    def _registrar(self, request, respuesta):
+        # DRF deja en `request.user` el usuario autenticado por la vista (JWT incluido)
+        if request.method not in SAFE_METHODS and respuesta.status_code < 400:
+            registrar_escritura(getattr(request, 'user', None))
@@ -0,0 +1,41 @@
+# Generated by Django 5.2.4 on 2026-10-18 09:57
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("empleados", "0003_bitacora"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="TrabajoExportacion",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("formato", models.CharField(choices=[("excel", "Excel"), ("pdf", "PDF"), ("csv", "CSV")], max_length=10)),
+                ("filtros", models.TextField(blank=True, default="{}")),
+                (
+                    "estado",
+                    models.CharField(
+                        choices=[("PENDIENTE", "Pendiente"), ("EN_PROCESO", "En proceso"), ("COMPLETADO", "Completado"), ("ERROR", "Error")],
+                        default="PENDIENTE",
+                        max_length=20,
+                    ),
+                ),
+                ("archivo", models.FileField(blank=True, null=True, upload_to="exportaciones/")),
+                ("error", models.TextField(blank=True)),
+                ("creado", models.DateTimeField(auto_now_add=True)),
+                ("iniciado", models.DateTimeField(blank=True, null=True)),
+                ("finalizado", models.DateTimeField(blank=True, null=True)),
+                ("usuario", models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                "indexes": [models.Index(fields=["estado", "creado"], name="trabajo_exp_estado_idx")],
+            },
+        ),
+    ]
@@ -0,0 +1,35 @@
+# Generated by Django 5.2.4 on 2026-10-18 10:05
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("empleados", "0004_trabajoexportacion"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="bitacora",
+            index=models.Index(fields=["-fecha", "-id"], name="bitacora_fecha_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="bitacora",
+            index=models.Index(fields=["modelo_afectado", "objeto_id", "-fecha"], name="bitacora_objeto_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="bitacora",
+            index=models.Index(fields=["usuario", "-fecha"], name="bitacora_usuario_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="bitacora",
+            index=models.Index(fields=["accion", "-fecha"], name="bitacora_accion_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="bitacoraempleado",
+            index=models.Index(fields=["empleado", "-fecha"], name="bitacora_emp_empleado_idx"),
+        ),
+    ]
@@ -0,0 +1,64 @@
+# Generated by Django 5.2.4 on 2026-10-18 10:06
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("empleados", "0005_indices_bitacora"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="BitacoraArchivada",
+            fields=[
+                ("id", models.BigIntegerField(primary_key=True, serialize=False)),
+                ("modelo_afectado", models.CharField(max_length=100)),
+                ("objeto_id", models.PositiveIntegerField()),
+                ("accion", models.CharField(max_length=50)),
+                ("cambios", models.TextField(blank=True, null=True)),
+                ("fecha", models.DateTimeField()),
+                ("periodo", models.CharField(max_length=7)),
+                (
+                    "usuario",
+                    models.ForeignKey(
+                        db_constraint=False, null=True, on_delete=django.db.models.deletion.DO_NOTHING, related_name="+", to=settings.AUTH_USER_MODEL
+                    ),
+                ),
+            ],
+            options={
+                "indexes": [
+                    models.Index(fields=["-fecha", "-id"], name="bitacora_arch_fecha_idx"),
+                    models.Index(fields=["modelo_afectado", "objeto_id", "-fecha"], name="bitacora_arch_objeto_idx"),
+                    models.Index(fields=["periodo"], name="bitacora_arch_periodo_idx"),
+                ],
+            },
+        ),
+        migrations.CreateModel(
+            name="BitacoraEmpleadoArchivada",
+            fields=[
+                ("id", models.BigIntegerField(primary_key=True, serialize=False)),
+                ("empleado_id", models.BigIntegerField()),
+                ("accion", models.CharField(max_length=20)),
+                ("fecha", models.DateTimeField()),
+                ("detalles", models.TextField(blank=True)),
+                ("periodo", models.CharField(max_length=7)),
+                (
+                    "usuario",
+                    models.ForeignKey(
+                        db_constraint=False, null=True, on_delete=django.db.models.deletion.DO_NOTHING, related_name="+", to=settings.AUTH_USER_MODEL
+                    ),
+                ),
+            ],
+            options={
+                "indexes": [
+                    models.Index(fields=["empleado_id", "-fecha"], name="bitacora_emp_arch_idx"),
+                    models.Index(fields=["periodo"], name="bitacora_emp_arch_periodo_idx"),
+                ],
+            },
+        ),
+    ]
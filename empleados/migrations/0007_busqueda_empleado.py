@@ -0,0 +1,80 @@
+# Generated by Django 5.2.4 on 2026-10-18 10:11
+
+import re
+import unicodedata
+
+from django.db import migrations, models
+
+# Copia congelada de empleados.busqueda al crear la columna: la migración debe
+# seguir calculando lo mismo aunque el normalizador cambie después
+CAMPOS_BUSQUEDA = [
+    "nombres", "apellido_paterno", "apellido_materno", "num_empleado",
+    "curp", "rfc", "nss", "email", "telefono",
+]
+_NO_ALFANUMERICO = re.compile(r"[^a-z0-9]+")
+
+
+def normalizar(texto):
+    texto = unicodedata.normalize("NFKD", str(texto or "").lower())
+    texto = "".join(caracter for caracter in texto if not unicodedata.combining(caracter))
+    return _NO_ALFANUMERICO.sub(" ", texto).strip()
+
+
+def texto_busqueda(valores):
+    return " ".join(filter(None, (normalizar(valor) for valor in valores)))
+
+
+INDICES_POSTGRES = [
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    "CREATE INDEX IF NOT EXISTS empleado_busqueda_fts_idx" " ON empleados_empleado USING gin (to_tsvector('simple', busqueda))",
+    "CREATE INDEX IF NOT EXISTS empleado_busqueda_trgm_idx" " ON empleados_empleado USING gin (busqueda gin_trgm_ops)",
+]
+
+QUITAR_INDICES_POSTGRES = [
+    "DROP INDEX IF EXISTS empleado_busqueda_trgm_idx",
+    "DROP INDEX IF EXISTS empleado_busqueda_fts_idx",
+]
+
+
+def calcular_busqueda(apps, schema_editor):
+    Empleado = apps.get_model("empleados", "Empleado")
+    pendientes = []
+    for empleado in Empleado.objects.only(*CAMPOS_BUSQUEDA).iterator(chunk_size=2000):
+        empleado.busqueda = texto_busqueda(getattr(empleado, campo) for campo in CAMPOS_BUSQUEDA)
+        pendientes.append(empleado)
+        if len(pendientes) >= 2000:
+            Empleado.objects.bulk_update(pendientes, ["busqueda"])
+            pendientes = []
+    Empleado.objects.bulk_update(pendientes, ["busqueda"])
+
+
+def ejecutar_en_postgres(sentencias):
+    def ejecutar(apps, schema_editor):
+        # Los índices GIN y pg_trgm sólo existen en PostgreSQL; otros motores
+        # usan el índice en memoria de empleados.busqueda
+        if schema_editor.connection.vendor != "postgresql":
+            return
+        for sentencia in sentencias:
+            schema_editor.execute(sentencia)
+
+    return ejecutar
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("empleados", "0006_bitacora_archivada"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="empleado",
+            name="busqueda",
+            field=models.TextField(blank=True, default="", editable=False),
+        ),
+        migrations.RunPython(calcular_busqueda, migrations.RunPython.noop),
+        migrations.RunPython(
+            ejecutar_en_postgres(INDICES_POSTGRES),
+            ejecutar_en_postgres(QUITAR_INDICES_POSTGRES),
+        ),
+    ]
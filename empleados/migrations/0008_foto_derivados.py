@@ -0,0 +1,18 @@
+# Generated by Django 5.2.4 on 2026-10-18 10:23
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("empleados", "0007_busqueda_empleado"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="empleado",
+            name="foto_derivados",
+            field=models.JSONField(blank=True, default=dict, editable=False),
+        ),
+    ]
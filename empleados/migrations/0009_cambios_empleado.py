@@ -0,0 +1,37 @@
+# Generated by Django 5.2.4 on 2026-10-18 10:43
+
+from django.db import migrations, models
+
+
+def registrar_empleados_existentes(apps, schema_editor):
+    # El feed arranca con un alta por cada empleado existente: un consumidor sin
+    # cursor puede sincronizar todo desde el principio
+    Empleado = apps.get_model("empleados", "Empleado")
+    CambioEmpleado = apps.get_model("empleados", "CambioEmpleado")
+    pendientes = []
+    for empleado_id in Empleado.objects.order_by("id").values_list("id", flat=True).iterator(chunk_size=2000):
+        pendientes.append(CambioEmpleado(empleado_id=empleado_id, tipo="CREADO"))
+        if len(pendientes) >= 2000:
+            CambioEmpleado.objects.bulk_create(pendientes)
+            pendientes = []
+    CambioEmpleado.objects.bulk_create(pendientes)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("empleados", "0008_foto_derivados"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="CambioEmpleado",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("empleado_id", models.BigIntegerField()),
+                ("tipo", models.CharField(choices=[("CREADO", "Creado"), ("ACTUALIZADO", "Actualizado"), ("ELIMINADO", "Eliminado")], max_length=12)),
+                ("fecha", models.DateTimeField(auto_now_add=True)),
+            ],
+        ),
+        migrations.RunPython(registrar_empleados_existentes, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.4 on 2026-10-18 10:51
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("empleados", "0009_cambios_empleado"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="cambioempleado",
+            index=models.Index(fields=["empleado_id", "-id"], name="cambio_emp_empleado_idx"),
+        ),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 5.2.4 on 2026-10-18 12:13
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ("empleados", "0010_indice_cambios_empleado"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="VersionToken",
+            fields=[
+                (
+                    "usuario",
+                    models.OneToOneField(
+                        db_constraint=False,
+                        on_delete=django.db.models.deletion.DO_NOTHING,
+                        primary_key=True,
+                        related_name="+",
+                        serialize=False,
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+                ("version", models.PositiveIntegerField(default=0)),
+            ],
+        ),
+    ]
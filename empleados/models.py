@@ -1,6 +1,23 @@
-from django.db import models
+from django.db import models, transaction
+from django.db.models.fields.files import FieldFile
 from django.conf import settings  # ✅ para usar AUTH_USER_MODEL
 
+from .busqueda import CAMPOS_BUSQUEDA, indice_local, texto_busqueda
+from .condicional import registrar_cambio_empleados
+
+
+class EmpleadoQuerySet(models.QuerySet):
+    def bulk_create(self, objs, *args, **kwargs):
+        # bulk_create no llama a save(): el texto de búsqueda se calcula aquí
+        objs = list(objs)
+        for empleado in objs:
+            empleado.actualizar_busqueda()
+        creados = super().bulk_create(objs, *args, **kwargs)
+        indice_local.invalidar()
+        # Tampoco emite post_save: las altas se registran aquí en el feed de cambios
+        CambioEmpleado.registrar('CREADO', *(empleado.pk for empleado in creados if empleado.pk is not None))
+        return creados
+
 
 # === MODELO EMPLEADO ===
 class Empleado(models.Model):
@@ -21,10 +38,70 @@ class Empleado(models.Model):
     fecha_ingreso = models.DateField()
     activo = models.BooleanField(default=True)
     foto = models.ImageField(upload_to='empleados/fotos/', null=True, blank=True)
+    # Rutas de miniatura, PDF y perfil, más la foto de 'origen' (ver empleados.imagenes)
+    foto_derivados = models.JSONField(default=dict, blank=True, editable=False)
+    # Texto normalizado de CAMPOS_BUSQUEDA; se recalcula en cada save() (ver empleados.busqueda)
+    busqueda = models.TextField(blank=True, default='', editable=False)
+
+    objects = EmpleadoQuerySet.as_manager()
 
     def __str__(self):
         return f"{self.num_empleado} - {self.nombres} {self.apellido_paterno}"
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instancia = super().from_db(db, field_names, values)
+        # Valores tal como se cargaron: base de campos_modificados() sin volver a consultar
+        instancia._valores_cargados = dict(zip(field_names, values))
+        return instancia
+
+    def _valor_actual(self, attname):
+        valor = getattr(self, attname)
+        return valor.name if isinstance(valor, FieldFile) else valor
+
+    def campos_modificados(self):
+        """
+        Campos editables cuyo valor cambió desde que se cargó o guardó la
+        instancia. Sin valores de carga (instancia nueva) se consideran todos.
+        """
+        cargados = getattr(self, '_valores_cargados', {})
+        return [
+            campo.attname for campo in self._meta.concrete_fields
+            if campo.editable and not campo.primary_key
+            and (campo.attname not in cargados or self._valor_actual(campo.attname) != cargados[campo.attname])
+        ]
+
+    def guardar_cambios(self):
+        """
+        Guarda sólo las columnas modificadas (sin UPDATE si no hay cambios) y
+        devuelve el diff {campo: {"antes", "después"}} con el formato de la bitácora.
+        """
+        cargados = getattr(self, '_valores_cargados', {})
+        modificados = self.campos_modificados()
+        cambios = {
+            campo: {"antes": str(cargados.get(campo)), "después": str(self._valor_actual(campo))}
+            for campo in modificados
+        }
+        if modificados:
+            self.save(update_fields=modificados)
+        return cambios
+
+    def actualizar_busqueda(self):
+        self.busqueda = texto_busqueda(getattr(self, campo) for campo in CAMPOS_BUSQUEDA)
+
+    def save(self, *args, **kwargs):
+        self.actualizar_busqueda()
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and set(update_fields) & set(CAMPOS_BUSQUEDA):
+            kwargs['update_fields'] = {*update_fields, 'busqueda'}
+        super().save(*args, **kwargs)
+
+        guardados = kwargs.get('update_fields') or [campo.attname for campo in self._meta.concrete_fields]
+        self._valores_cargados = {
+            **getattr(self, '_valores_cargados', {}),
+            **{campo: self._valor_actual(campo) for campo in guardados},
+        }
+
 
 # === BITÁCORA DE EMPLEADO (DETALLADA) ===
 class BitacoraEmpleado(models.Model):
@@ -40,6 +117,11 @@ class BitacoraEmpleado(models.Model):
     fecha = models.DateTimeField(auto_now_add=True)
     detalles = models.TextField(blank=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['empleado', '-fecha'], name='bitacora_emp_empleado_idx'),
+        ]
+
     def __str__(self):
         return f'{self.accion} - {self.empleado} - {self.fecha.strftime("%Y-%m-%d %H:%M")}'
 
@@ -53,5 +135,146 @@ class Bitacora(models.Model):
     cambios = models.TextField(blank=True, null=True)  # JSON de diferencias o descripción
     fecha = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        # Todos terminan en fecha descendente para servir la paginación por llave (fecha, id)
+        indexes = [
+            models.Index(fields=['-fecha', '-id'], name='bitacora_fecha_idx'),
+            models.Index(fields=['modelo_afectado', 'objeto_id', '-fecha'], name='bitacora_objeto_idx'),
+            models.Index(fields=['usuario', '-fecha'], name='bitacora_usuario_idx'),
+            models.Index(fields=['accion', '-fecha'], name='bitacora_accion_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.fecha} - {self.usuario} - {self.accion} {self.modelo_afectado} ({self.objeto_id})"
+
+
+# === ARCHIVO HISTÓRICO DE BITÁCORAS ===
+# Filas movidas por `python manage.py archivar_bitacora`. Conservan su id original
+# y no tienen llaves foráneas reales: el usuario o el empleado pueden ya no existir.
+class BitacoraArchivada(models.Model):
+    id = models.BigIntegerField(primary_key=True)
+    usuario = models.ForeignKey(
+        settings.AUTH_USER_MODEL, on_delete=models.DO_NOTHING, null=True, db_constraint=False, related_name='+'
+    )
+    modelo_afectado = models.CharField(max_length=100)
+    objeto_id = models.PositiveIntegerField()
+    accion = models.CharField(max_length=50)
+    cambios = models.TextField(blank=True, null=True)
+    fecha = models.DateTimeField()
+    periodo = models.CharField(max_length=7)  # AAAA-MM
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['-fecha', '-id'], name='bitacora_arch_fecha_idx'),
+            models.Index(fields=['modelo_afectado', 'objeto_id', '-fecha'], name='bitacora_arch_objeto_idx'),
+            models.Index(fields=['periodo'], name='bitacora_arch_periodo_idx'),
+        ]
+
+    def __str__(self):
+        return f"[{self.periodo}] {self.fecha} - {self.accion} {self.modelo_afectado} ({self.objeto_id})"
+
+
+class BitacoraEmpleadoArchivada(models.Model):
+    id = models.BigIntegerField(primary_key=True)
+    empleado_id = models.BigIntegerField()
+    usuario = models.ForeignKey(
+        settings.AUTH_USER_MODEL, on_delete=models.DO_NOTHING, null=True, db_constraint=False, related_name='+'
+    )
+    accion = models.CharField(max_length=20)
+    fecha = models.DateTimeField()
+    detalles = models.TextField(blank=True)
+    periodo = models.CharField(max_length=7)  # AAAA-MM
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['empleado_id', '-fecha'], name='bitacora_emp_arch_idx'),
+            models.Index(fields=['periodo'], name='bitacora_emp_arch_periodo_idx'),
+        ]
+
+    def __str__(self):
+        return f"[{self.periodo}] {self.accion} - empleado {self.empleado_id}"
+
+
+# === FEED DE CAMBIOS DE EMPLEADOS (sincronización incremental) ===
+# Una fila por alta, edición o baja, insertada al confirmar la transacción; el id
+# autoincremental es la secuencia que usan los consumidores como cursor. Las bajas
+# quedan como marcas 'ELIMINADO'.
+# El último cambio de cada empleado es también su versión para ETag / Last-Modified.
+class CambioEmpleado(models.Model):
+    TIPOS = [
+        ('CREADO', 'Creado'),
+        ('ACTUALIZADO', 'Actualizado'),
+        ('ELIMINADO', 'Eliminado'),
+    ]
+
+    empleado_id = models.BigIntegerField()
+    tipo = models.CharField(max_length=12, choices=TIPOS)
+    fecha = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['empleado_id', '-id'], name='cambio_emp_empleado_idx'),
+        ]
+
+    def __str__(self):
+        return f"#{self.pk} {self.tipo} - empleado {self.empleado_id}"
+
+    @classmethod
+    def registrar(cls, tipo, *empleado_ids):
+        """
+        Registra el cambio en el feed al confirmar la transacción y avanza la
+        versión usada en los ETag. Insertar al confirmar hace que el orden de
+        los ids siga al de los COMMIT: una transacción larga (p. ej. una
+        importación todo o nada) no deja cambios con ids menores que aparecen
+        después de que los consumidores ya avanzaron su cursor.
+        """
+        cambios = [cls(empleado_id=empleado_id, tipo=tipo) for empleado_id in empleado_ids]
+        transaction.on_commit(lambda: cls.objects.bulk_create(cambios))
+        registrar_cambio_empleados()
+
+
+# === VERSIÓN DE LOS TOKENS JWT ===
+# Contador por usuario que se copia en los tokens al emitirlos (claim 'ver'); al
+# avanzarlo se revocan todos los tokens anteriores (ver empleados.autenticacion).
+# Sin llave foránea real: el contador sobrevive al usuario para revocar sus tokens.
+class VersionToken(models.Model):
+    usuario = models.OneToOneField(
+        settings.AUTH_USER_MODEL, on_delete=models.DO_NOTHING, primary_key=True, db_constraint=False, related_name='+'
+    )
+    version = models.PositiveIntegerField(default=0)
+
+    def __str__(self):
+        return f"Tokens de {self.usuario_id}: versión {self.version}"
+
+
+# === TRABAJOS DE EXPORTACIÓN EN SEGUNDO PLANO ===
+class TrabajoExportacion(models.Model):
+    FORMATOS = [
+        ('excel', 'Excel'),
+        ('pdf', 'PDF'),
+        ('csv', 'CSV'),
+    ]
+    ESTADOS = [
+        ('PENDIENTE', 'Pendiente'),
+        ('EN_PROCESO', 'En proceso'),
+        ('COMPLETADO', 'Completado'),
+        ('ERROR', 'Error'),
+    ]
+
+    usuario = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.SET_NULL, null=True)
+    formato = models.CharField(max_length=10, choices=FORMATOS)
+    filtros = models.TextField(blank=True, default='{}')  # JSON con los mismos parámetros del listado
+    estado = models.CharField(max_length=20, choices=ESTADOS, default='PENDIENTE')
+    archivo = models.FileField(upload_to='exportaciones/', null=True, blank=True)
+    error = models.TextField(blank=True)
+    creado = models.DateTimeField(auto_now_add=True)
+    iniciado = models.DateTimeField(null=True, blank=True)
+    finalizado = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['estado', 'creado'], name='trabajo_exp_estado_idx'),
+        ]
+
     def __str__(self):
-        return f"{self.fecha} - {self.usuario} - {self.accion} {self.modelo_afectado} ({self.objeto_id})"
\ No newline at end of file
+        return f"Exportación {self.formato} #{self.pk} ({self.estado})"
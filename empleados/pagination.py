@@ -0,0 +1,217 @@
+import asyncio
+import base64
+import json
+
+from django.core.paginator import InvalidPage, Page
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import replace_query_param
+
+
+async def listar(queryset):
+    return [fila async for fila in queryset]
+
+
+async def apaginar_por_numero(paginador, queryset, request, view=None):
+    """
+    Versión asíncrona de `PageNumberPagination.paginate_queryset`. El COUNT y
+    la página pedida se lanzan juntos; el número de página se valida contra el
+    total al terminar (con `?page=last` la página espera al COUNT).
+    """
+    paginador.request = request
+    tamano = paginador.get_page_size(request)
+    if not tamano:
+        return None
+
+    paginador_django = paginador.django_paginator_class(queryset, tamano)
+    # Como get_page_number(), pero sin resolver `last` con un COUNT síncrono
+    numero = request.query_params.get(paginador.page_query_param) or 1
+    try:
+        inicio = (int(numero) - 1) * tamano
+    except (TypeError, ValueError):
+        inicio = None
+
+    if inicio is not None and inicio >= 0:
+        total, filas = await asyncio.gather(queryset.acount(), listar(queryset[inicio:inicio + tamano]))
+    else:
+        total, filas = await queryset.acount(), None
+    # `count` es un cached_property: se fija para que el Paginator no vuelva a consultarlo
+    paginador_django.__dict__['count'] = total
+    if numero in paginador.last_page_strings:
+        numero = paginador_django.num_pages
+
+    try:
+        numero = paginador_django.validate_number(numero)
+    except InvalidPage as exc:
+        raise NotFound(paginador.invalid_page_message.format(page_number=numero, message=str(exc)))
+    if filas is None:
+        inicio = (numero - 1) * tamano
+        filas = await listar(queryset[inicio:inicio + tamano])
+
+    paginador.page = Page(filas, numero, paginador_django)
+    if paginador_django.num_pages > 1 and paginador.template is not None:
+        paginador.display_page_controls = True
+    return filas
+
+
+class KeysetPagination(BasePagination):
+    """
+    Paginación por llave (keyset): cada página continúa a partir de los valores
+    de orden de la última fila, con `WHERE (fecha, id) < (...)`, sin COUNT(*)
+    ni OFFSET. El costo de una página no depende de qué tan profunda sea.
+
+    `ordering` debe terminar en un campo único (p. ej. `id`) y todos sus
+    campos deben ir en la misma dirección.
+    """
+    page_size = api_settings.PAGE_SIZE
+    page_size_query_param = 'page_size'
+    max_page_size = 500
+    cursor_query_param = 'cursor'
+    ordering = ('-fecha', '-id')
+    invalid_cursor_message = 'Cursor inválido.'
+
+    @property
+    def campos(self):
+        return [campo.lstrip('-') for campo in self.ordering]
+
+    @property
+    def descendente(self):
+        return self.ordering[0].startswith('-')
+
+    def get_page_size(self, request):
+        try:
+            tamano = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        return max(1, min(tamano, self.max_page_size))
+
+    # === Cursor ===
+    def codificar_cursor(self, valores):
+        texto = json.dumps([str(valor) for valor in valores], separators=(',', ':'))
+        return base64.urlsafe_b64encode(texto.encode()).decode().rstrip('=')
+
+    def decodificar_cursor(self, request, modelo):
+        cursor = request.query_params.get(self.cursor_query_param)
+        if not cursor:
+            return None
+        try:
+            texto = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)).decode()
+            valores = json.loads(texto)
+            if len(valores) != len(self.campos):
+                raise ValueError
+            return [modelo._meta.get_field(campo).to_python(valor) for campo, valor in zip(self.campos, valores)]
+        except Exception:
+            raise NotFound(self.invalid_cursor_message)
+
+    def condicion_despues_de(self, valores):
+        """(a, b) < (x, y)  ==>  a < x OR (a = x AND b < y), válido en cualquier base de datos."""
+        comparacion = 'lt' if self.descendente else 'gt'
+        condicion = Q()
+        for posicion, campo in enumerate(self.campos):
+            iguales = {anterior: valores[i] for i, anterior in enumerate(self.campos[:posicion])}
+            condicion |= Q(**iguales, **{f'{campo}__{comparacion}': valores[posicion]})
+        return condicion
+
+    # === Paginación ===
+    def paginate_queryset(self, queryset, request, view=None):
+        return self.paginate_querysets([queryset], request)
+
+    def paginate_querysets(self, querysets, request):
+        """
+        Pagina la unión ordenada de varios querysets con los mismos campos de
+        orden (p. ej. tabla activa + tabla de archivo): cada uno aporta como
+        máximo una página desde el cursor y se mezclan en Python.
+        """
+        consultas = self.consultas_pagina(querysets, request)
+        return self.unir_paginas([list(consulta) for consulta in consultas])
+
+    async def apaginate_querysets(self, querysets, request):
+        """Versión asíncrona de `paginate_querysets`: las consultas de cada queryset se lanzan juntas."""
+        consultas = self.consultas_pagina(querysets, request)
+        return self.unir_paginas(await asyncio.gather(*(listar(consulta) for consulta in consultas)))
+
+    def consultas_pagina(self, querysets, request):
+        """Una consulta (sin evaluar) por queryset: hasta una página más una fila desde el cursor."""
+        self.request = request
+        self.tamano = self.get_page_size(request)
+        posicion = self.decodificar_cursor(request, querysets[0].model)
+
+        consultas = []
+        for queryset in querysets:
+            queryset = queryset.order_by(*self.ordering)
+            if posicion is not None:
+                queryset = queryset.filter(self.condicion_despues_de(posicion))
+            consultas.append(queryset[:self.tamano + 1])
+        return consultas
+
+    def unir_paginas(self, paginas):
+        filas = [fila for pagina in paginas for fila in pagina]
+        if len(paginas) > 1:
+            filas.sort(key=lambda fila: tuple(getattr(fila, campo) for campo in self.campos), reverse=self.descendente)
+        return self.recortar_pagina(filas)
+
+    def recortar_pagina(self, filas):
+        """Se queda con una página y recuerda los valores de orden de su última fila."""
+        self.siguiente = None
+        if len(filas) > self.tamano:
+            filas = filas[:self.tamano]
+            self.siguiente = [getattr(filas[-1], campo) for campo in self.campos]
+        return filas
+
+    def get_next_link(self):
+        if self.siguiente is None:
+            return None
+        url = self.request.build_absolute_uri()
+        return replace_query_param(url, self.cursor_query_param, self.codificar_cursor(self.siguiente))
+
+    def get_paginated_response(self, data):
+        return Response({
+            'next': self.get_next_link(),
+            'results': data,
+        })
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'required': ['results'],
+            'properties': {
+                'next': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'results': schema,
+            },
+        }
+
+
+class BitacoraPagination(KeysetPagination):
+    ordering = ('-fecha', '-id')
+
+
+class CambiosEmpleadoPagination(KeysetPagination):
+    """
+    Feed de cambios en orden ascendente de secuencia. La respuesta incluye
+    siempre el `cursor` de la última fila entregada (o el recibido, si no hubo
+    cambios) para que el consumidor pida después sólo lo nuevo.
+    """
+    page_size = 500
+    max_page_size = 5000
+    ordering = ('id',)
+
+    def recortar_pagina(self, filas):
+        filas = super().recortar_pagina(filas)
+        self.ultima = filas[-1].pk if filas else None
+        return filas
+
+    def get_paginated_response(self, data):
+        cursor = self.codificar_cursor([self.ultima]) if self.ultima is not None else self.request.query_params.get(self.cursor_query_param)
+        return Response({
+            'next': self.get_next_link(),
+            'cursor': cursor,
+            'results': data,
+        })
+
+    def get_paginated_response_schema(self, schema):
+        respuesta = super().get_paginated_response_schema(schema)
+        respuesta['properties']['cursor'] = {'type': 'string', 'nullable': True}
+        return respuesta
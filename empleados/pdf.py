@@ -0,0 +1,149 @@
+"""
+Render del listado de empleados en PDF con WeasyPrint.
+
+- Recursos locales: `obtener_recurso` es el `url_fetcher` de cada render. Sirve
+  los archivos estáticos de las apps (logo, hoja de estilos) desde una caché en
+  memoria del proceso y rechaza cualquier otra URL, así que el render nunca
+  espera a la red.
+- Estilos y fuentes: `empleados/pdf/empleados_pdf.css` se analiza una vez por
+  proceso y se reutiliza, con la misma `FontConfiguration`, en cada render.
+- Bloques en paralelo: las filas se parten en bloques de PDF_FILAS_POR_BLOQUE
+  que se renderizan en un pool de PDF_WORKERS procesos y se unen con pypdf en
+  un solo documento. El encabezado va en el primer bloque y el pie en el
+  último; cada bloque empieza en una página nueva, así que conviene que
+  PDF_FILAS_POR_BLOQUE sea múltiplo de las filas que caben en una página.
+  Un listado de un solo bloque (o PDF_WORKERS = 0) se renderiza completo en
+  el mismo proceso.
+
+WeasyPrint y pypdf se importan al renderizar: cargar WeasyPrint abre Pango y
+no hace falta para atender las demás vistas.
+"""
+import mimetypes
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from io import BytesIO
+from itertools import islice
+from urllib.parse import urlsplit
+
+from django.conf import settings
+from django.contrib.staticfiles import finders
+from django.template.loader import render_to_string
+
+from .workers import inicializar_proceso, renderizar_bloque_pdf
+
+PLANTILLA_PDF = 'empleados/empleados_pdf.html'
+HOJA_ESTILOS_PDF = 'empleados/pdf/empleados_pdf.css'
+# Las rutas de `{% static %}` se resuelven contra esta base y llegan a obtener_recurso
+URL_BASE_PDF = 'file:///'
+CAMPOS_PDF = ['id', 'nombres', 'apellido_paterno', 'apellido_materno', 'departamento', 'puesto', 'activo']
+EMPRESA_PDF = "Mi Empresa S.A. de C.V."
+
+_candado = threading.Lock()
+_recursos = {}
+_estilos = None
+_pool = None
+
+
+# === RECURSOS LOCALES ===
+def _archivo_estatico(url):
+    """Archivo de las apps que corresponde a `url`, o None si no es un estático propio."""
+    prefijo = settings.STATIC_URL
+    ruta = url if url.startswith(prefijo) else urlsplit(url).path if url.startswith('file:') else ''
+    if not ruta.startswith(prefijo):
+        return None
+    return finders.find(ruta[len(prefijo):])
+
+
+def obtener_recurso(url, *args, **kwargs):
+    """`url_fetcher` de WeasyPrint: sólo archivos estáticos locales, en caché por proceso."""
+    recurso = _recursos.get(url)
+    if recurso is None:
+        archivo = _archivo_estatico(url)
+        if archivo is None:
+            # WeasyPrint lo registra como advertencia y omite el recurso
+            raise ValueError(f"Recurso no local en el PDF: {url}")
+        with open(archivo, 'rb') as contenido:
+            recurso = {'string': contenido.read(), 'mime_type': mimetypes.guess_type(archivo)[0], 'redirected_url': url}
+        _recursos[url] = recurso
+    return dict(recurso)
+
+
+def estilos_pdf():
+    """(hoja de estilos, configuración de fuentes) analizadas una sola vez por proceso."""
+    global _estilos
+    if _estilos is None:
+        from weasyprint import CSS
+        from weasyprint.text.fonts import FontConfiguration
+
+        with _candado:
+            if _estilos is None:
+                fuentes = FontConfiguration()
+                url = settings.STATIC_URL + HOJA_ESTILOS_PDF
+                hoja = CSS(string=obtener_recurso(url)['string'].decode(), base_url=url, url_fetcher=obtener_recurso, font_config=fuentes)
+                _estilos = (hoja, fuentes)
+    return _estilos
+
+
+# === RENDER ===
+def renderizar_bloque(filas, fecha, encabezado=True, pie=True, destino=None):
+    """Un documento con `filas`; devuelve los bytes del PDF o los escribe en `destino`."""
+    from weasyprint import HTML
+
+    hoja, fuentes = estilos_pdf()
+    html = render_to_string(PLANTILLA_PDF, {
+        "empleados": filas,
+        "fecha": fecha,
+        "empresa": EMPRESA_PDF,
+        "encabezado": encabezado,
+        "pie": pie,
+    })
+    documento = HTML(string=html, base_url=URL_BASE_PDF, url_fetcher=obtener_recurso)
+    return documento.write_pdf(destino, stylesheets=[hoja], font_config=fuentes)
+
+
+def dividir_en_bloques(filas, tamano):
+    filas = iter(filas)
+    return iter(lambda: list(islice(filas, tamano)), [])
+
+
+def unir_pdfs(pdfs, destino=None):
+    from pypdf import PdfWriter
+
+    escritor = PdfWriter()
+    for pdf in pdfs:
+        escritor.append(BytesIO(pdf))
+    salida = BytesIO() if destino is None else destino
+    escritor.write(salida)
+    return salida.getvalue() if destino is None else None
+
+
+def _pool_pdf():
+    global _pool
+    with _candado:
+        if _pool is None:
+            _pool = ProcessPoolExecutor(max_workers=settings.PDF_WORKERS, initializer=inicializar_proceso)
+    return _pool
+
+
+def renderizar_pdf(filas, destino=None):
+    """
+    PDF del listado a partir de diccionarios con CAMPOS_PDF. Devuelve los bytes
+    o los escribe en `destino` si se indica.
+    """
+    fecha = datetime.now().strftime('%d/%m/%Y %H:%M')
+    bloques = dividir_en_bloques(filas, settings.PDF_FILAS_POR_BLOQUE)
+    primero, segundo = next(bloques, []), next(bloques, [])
+    if not segundo or settings.PDF_WORKERS <= 0:
+        return renderizar_bloque([*primero, *segundo, *(fila for bloque in bloques for fila in bloque)], fecha, destino=destino)
+
+    bloques = [primero, segundo, *bloques]
+    ultimo = len(bloques) - 1
+    pdfs = _pool_pdf().map(
+        renderizar_bloque_pdf,
+        bloques,
+        [fecha] * len(bloques),
+        [indice == 0 for indice in range(len(bloques))],
+        [indice == ultimo for indice in range(len(bloques))],
+    )
+    return unir_pdfs(pdfs, destino)
@@ -1,5 +1,56 @@
+import hmac
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
 from rest_framework.permissions import BasePermission
 
+# === GRUPOS DEL USUARIO (resueltos una vez por petición) ===
+CLAIM_GRUPOS = 'groups'
+CLAVE_CACHE_GRUPOS = 'permisos:grupos:{}'
+
+
+def grupos_usuario(user, request=None):
+    """
+    Nombres de los grupos del usuario. Se buscan, en orden: en el propio objeto
+    (ya resueltos en esta petición), en el token JWT si `PERMISOS_GRUPOS_EN_TOKEN`
+    está activo, en la caché (sólo con CACHE_COMPARTIDA: una caché por proceso
+    no se entera de cambios hechos en otro worker) y, por último, en la base
+    de datos.
+    """
+    grupos = getattr(user, '_grupos_permisos', None)
+    if grupos is not None:
+        return grupos
+
+    token = getattr(request, 'auth', None)
+    if settings.PERMISOS_GRUPOS_EN_TOKEN and hasattr(token, 'get'):
+        grupos = token.get(CLAIM_GRUPOS)
+
+    if grupos is None and not settings.CACHE_COMPARTIDA:
+        grupos = user.groups.values_list('name', flat=True)
+    elif grupos is None:
+        clave = CLAVE_CACHE_GRUPOS.format(user.pk)
+        grupos = cache.get(clave)
+        if grupos is None:
+            grupos = sorted(user.groups.values_list('name', flat=True))
+            cache.set(clave, grupos, settings.PERMISOS_CACHE_SEGUNDOS)
+
+    user._grupos_permisos = frozenset(grupos)
+    return user._grupos_permisos
+
+
+def invalidar_grupos_usuario(*user_ids):
+    """
+    Borra los grupos en caché al momento y otra vez al confirmar la
+    transacción: entretanto, una petición concurrente aún lee (y guarda) los
+    grupos anteriores.
+    """
+    claves = [CLAVE_CACHE_GRUPOS.format(user_id) for user_id in user_ids]
+    if not claves:
+        return
+    cache.delete_many(claves)
+    transaction.on_commit(lambda: cache.delete_many(claves))
+
 
 class IsInGroupOrAdmin(BasePermission):
     """
@@ -19,7 +70,7 @@ class IsInGroupOrAdmin(BasePermission):
             return True
 
         # Acceso si pertenece a uno de los grupos permitidos
-        return user.groups.filter(name__in=self.allowed_groups).exists()
+        return not grupos_usuario(user, request).isdisjoint(self.allowed_groups)
 
 
 class IsRRHHOrAdmin(IsInGroupOrAdmin):
@@ -54,3 +105,18 @@ class IsSuperAdmin(BasePermission):
     def has_permission(self, request, view):
         user = request.user
         return user and user.is_authenticated and user.is_superuser
+
+
+class TokenMetricas(BasePermission):
+    """
+    Acceso a /metrics para el recolector: con METRICAS_TOKEN definido exige
+    `Authorization: Bearer <METRICAS_TOKEN>`; sin él, sólo usuarios staff
+    autenticados (las métricas exponen rutas y volumen de uso).
+    """
+
+    def has_permission(self, request, view):
+        if not settings.METRICAS_TOKEN:
+            user = request.user
+            return bool(user and user.is_authenticated and user.is_staff)
+        encabezado = request.META.get('HTTP_AUTHORIZATION', '')
+        return hmac.compare_digest(encabezado, f'Bearer {settings.METRICAS_TOKEN}')
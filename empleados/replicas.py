@@ -0,0 +1,186 @@
+"""
+Réplicas de lectura (DB_REPLICAS en settings).
+
+Las réplicas son alias adicionales de DATABASES con un peso en
+REPLICAS_LECTURA. `EnrutadorReplicas` manda a una réplica sólo las lecturas
+hechas mientras hay una activa (`activar_lectura` / `usar_replica`); todo lo
+demás, y siempre las escrituras, va a la primaria (`default`). Las vistas de
+lectura la activan con `LecturaEnReplicaMixin` (ver views) tras autenticar:
+
+- las réplicas se turnan en proporción a su peso, saltando las caídas;
+- una réplica que no conecta o va más de DB_REPLICAS_RETRASO_MAXIMO segundos
+  atrás (sólo PostgreSQL) queda fuera DB_REPLICAS_REINTENTO_SEGUNDOS; si una
+  consulta falla a mitad del GET, éste se repite en la primaria (la bitácora
+  del intento fallido se descarta). Las respuestas en streaming leen después
+  de la vista: `bloques_con_respaldo` repite en la primaria si la réplica
+  falla antes del primer bloque; después ya no se puede sin duplicar lo
+  enviado y la respuesta se corta;
+- lectura propia: tras una escritura correcta el usuario lee de la primaria
+  durante DB_REPLICAS_LECTURA_PROPIA_SEGUNDOS (`LecturaPropiaMiddleware`).
+  La marca vive en la caché `default`: con varios workers debe ser compartida.
+
+Lo que se guarda en una caché compartida asociado a la generación actual
+(respuestas de listados, snapshot del dashboard) se calcula en la primaria
+con `usar_primaria()`: una réplica atrasada dejaría datos viejos bajo la
+generación nueva hasta el siguiente cambio.
+"""
+import itertools
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS, DatabaseError, OperationalError, connections
+from django.utils.connection import ConnectionDoesNotExist
+from rest_framework.permissions import SAFE_METHODS
+
+logger = logging.getLogger('empleados.replicas')
+
+# Segundos de atraso de una réplica PostgreSQL; 0 si está al día, NULL si no es réplica
+CONSULTA_RETRASO_POSTGRES = (
+    "SELECT CASE WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0 "
+    "ELSE EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()) END"
+)
+
+_alias_lectura = ContextVar('alias_lectura', default=None)
+_turno = itertools.count()
+_estado = {}  # alias -> (sana, instante monotónico hasta el que vale)
+_cerrojo = threading.Lock()
+
+
+# === CONTEXTO DE LECTURA ===
+def alias_lectura():
+    return _alias_lectura.get()
+
+
+def activar_lectura(alias):
+    """Lecturas siguientes del contexto actual a `alias` (None = primaria)."""
+    _alias_lectura.set(alias)
+
+
+@contextmanager
+def usar_replica(alias):
+    token = _alias_lectura.set(alias)
+    try:
+        yield
+    finally:
+        _alias_lectura.reset(token)
+
+
+def usar_primaria():
+    return usar_replica(None)
+
+
+class EnrutadorReplicas:
+    def db_for_read(self, model, **hints):
+        return _alias_lectura.get()
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Primaria y réplicas tienen los mismos datos
+        alias = {DEFAULT_DB_ALIAS, *settings.REPLICAS_LECTURA}
+        if obj1._state.db in alias and obj2._state.db in alias:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # Las réplicas reciben el esquema por replicación
+        return False if db in settings.REPLICAS_LECTURA else None
+
+
+# === SALUD Y SELECCIÓN ===
+def _comprobar(alias):
+    try:
+        conexion = connections[alias]
+        with conexion.cursor() as cursor:
+            if conexion.vendor == 'postgresql' and settings.DB_REPLICAS_RETRASO_MAXIMO:
+                cursor.execute(CONSULTA_RETRASO_POSTGRES)
+                retraso = cursor.fetchone()[0] or 0
+                if retraso > settings.DB_REPLICAS_RETRASO_MAXIMO:
+                    logger.warning("Réplica %s descartada: %.1f s de atraso", alias, retraso)
+                    return False
+            else:
+                cursor.execute("SELECT 1")
+    except (ConnectionDoesNotExist, DatabaseError) as exc:
+        logger.warning("Réplica %s descartada: %s", alias, exc)
+        return False
+    return True
+
+
+def replica_sana(alias):
+    """Resultado de la última comprobación de `alias`, repetida cuando vence."""
+    ahora = time.monotonic()
+    sana, vigencia = _estado.get(alias, (False, 0))
+    if ahora < vigencia:
+        return sana
+    sana = _comprobar(alias)
+    segundos = settings.DB_REPLICAS_CHEQUEO_SEGUNDOS if sana else settings.DB_REPLICAS_REINTENTO_SEGUNDOS
+    with _cerrojo:
+        _estado[alias] = (sana, ahora + segundos)
+    return sana
+
+
+def marcar_caida(alias):
+    logger.warning("Réplica %s descartada tras un error de conexión", alias)
+    with _cerrojo:
+        _estado[alias] = (False, time.monotonic() + settings.DB_REPLICAS_REINTENTO_SEGUNDOS)
+
+
+def reiniciar_estado():
+    with _cerrojo:
+        _estado.clear()
+
+
+def elegir_replica():
+    """Siguiente réplica sana por turno ponderado; None si no hay ninguna."""
+    turnos = [alias for alias, peso in settings.REPLICAS_LECTURA.items() for _ in range(peso)]
+    if not turnos:
+        return None
+    inicio = next(_turno)
+    for desplazamiento in range(len(turnos)):
+        alias = turnos[(inicio + desplazamiento) % len(turnos)]
+        if replica_sana(alias):
+            return alias
+    return None
+
+
+def bloques_con_respaldo(generar, queryset):
+    """Bloques de `generar(queryset)`; si su réplica falla antes del primero, los de la primaria."""
+    enviado = False
+    try:
+        for bloque in generar(queryset):
+            enviado = True
+            yield bloque
+        return
+    except OperationalError:
+        if queryset.db not in settings.REPLICAS_LECTURA:
+            raise
+        marcar_caida(queryset.db)
+        if enviado:
+            raise
+    yield from generar(queryset.using(DEFAULT_DB_ALIAS))
+
+
+# === LECTURA PROPIA ===
+def clave_lectura_propia(usuario_id):
+    return f'replicas:primaria:{usuario_id}'
+
+
+def registrar_escritura(usuario):
+    if usuario is not None and usuario.is_authenticated:
+        cache.set(clave_lectura_propia(usuario.pk), True, settings.DB_REPLICAS_LECTURA_PROPIA_SEGUNDOS)
+
+
+def replica_para(request):
+    """Réplica para las lecturas de `request`; None si debe leer de la primaria."""
+    if not settings.REPLICAS_LECTURA or request.method not in SAFE_METHODS:
+        return None
+    usuario = request.user
+    if usuario.is_authenticated and cache.get(clave_lectura_propia(usuario.pk)):
+        return None
+    return elegir_replica()
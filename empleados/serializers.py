@@ -1,27 +1,114 @@
+import json
 import re
+from contextlib import contextmanager
 from datetime import date
+from functools import reduce
+from operator import or_
+
+from django.conf import settings
+from django.core.files.storage import default_storage
+from django.db import IntegrityError, transaction
+from django.db.models import Q
+from django.urls import reverse
 from rest_framework import serializers
 from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
-from .models import Empleado, Bitacora, BitacoraEmpleado
+from .autenticacion import CLAIM_VERSION, revocaciones
+from .filters import PARAMETROS_FILTRO_EMPLEADOS
+from .identificadores import coincidencias_curp, errores_curp, errores_nss, errores_rfc, estricto_por_defecto
+from .imagenes import DERIVADOS_FOTO, guardar_foto, preparar_foto
+from .permissions import CLAIM_GRUPOS
+from .models import Empleado, Bitacora, BitacoraEmpleado, TrabajoExportacion
+
+# === CAMPOS ÚNICOS DE EMPLEADO Y SUS MENSAJES ===
+MENSAJES_UNICIDAD = {
+    'num_empleado': "Ya existe un empleado con este número de empleado.",
+    'curp': "Ya existe un empleado con este CURP.",
+    'rfc': "Ya existe un empleado con este RFC.",
+    'nss': "Ya existe un empleado con este NSS.",
+    'email': "Ya existe un empleado con este email.",
+}
+CAMPOS_UNICOS_EMPLEADO = list(MENSAJES_UNICIDAD)
+
+
+def conflictos_unicidad(valores, excluir_pk=None):
+    """
+    Campos únicos de `valores` que ya usa otro empleado, resueltos con una sola
+    consulta `OR`. Devuelve {campo: [mensaje]} (vacío si no hay conflictos).
+    """
+    valores = {campo: valores[campo] for campo in CAMPOS_UNICOS_EMPLEADO if valores.get(campo) not in (None, '')}
+    if not valores:
+        return {}
+    queryset = Empleado.objects.filter(reduce(or_, (Q(**{campo: valor}) for campo, valor in valores.items())))
+    if excluir_pk is not None:
+        queryset = queryset.exclude(pk=excluir_pk)
+
+    # Cada campo es único: a lo más una fila por campo
+    conflictos = {}
+    for fila in queryset.values_list(*valores)[:len(valores)]:
+        for campo, valor in zip(valores, fila):
+            if valor == valores[campo]:
+                conflictos[campo] = [MENSAJES_UNICIDAD[campo]]
+    return conflictos
+
+
+# === CAMPOS PARCIALES (?fields=) ===
+class CamposParcialesMixin:
+    """
+    Acepta `campos=[...]` al construir el serializer y descarta el resto de
+    los campos, para no calcularlos (p. ej. las URLs de la foto).
+    """
+
+    def __init__(self, *args, **kwargs):
+        campos = kwargs.pop('campos', None)
+        super().__init__(*args, **kwargs)
+        if campos is not None:
+            for nombre in set(self.fields) - set(campos):
+                self.fields.pop(nombre)
+
 
 # === SERIALIZER DE EMPLEADO ===
 
 
-class EmpleadoSerializer(serializers.ModelSerializer):
+class EmpleadoSerializer(CamposParcialesMixin, serializers.ModelSerializer):
     foto = serializers.ImageField(required=False, allow_null=True)  # ✅ Corrección aquí
+    fotos = serializers.SerializerMethodField()
+
+    # Las importaciones masivas resuelven la unicidad y los identificadores por lote (ver empleados.importacion)
+    verificar_unicidad = True
+    validar_identificadores = True
 
     class Meta:
         model = Empleado
-        fields = '__all__'
+        exclude = ['busqueda', 'foto_derivados']
+        # La unicidad se valida en validate() con una sola consulta, no con un UniqueValidator por campo
+        extra_kwargs = {campo: {'validators': []} for campo in CAMPOS_UNICOS_EMPLEADO}
 
     def to_internal_value(self, data):
         data = data.copy()
 
         if 'activo' in data and isinstance(data['activo'], str):
-            data['activo'] = data['activo'].lower() in ['true', '1', 'yes']
+            data['activo'] = data['activo'].lower() in ['true', '1', 'yes', 'sí', 'si']
 
         return super().to_internal_value(data)
 
+    def get_fotos(self, obj):
+        """URLs de los derivados ya generados de la foto actual (miniatura, pdf, perfil)."""
+        derivados = obj.foto_derivados or {}
+        if not obj.foto or derivados.get('origen') != obj.foto.name:
+            return {}
+        request = self.context.get('request')
+        urls = {}
+        for nombre in DERIVADOS_FOTO:
+            if nombre in derivados:
+                url = default_storage.url(derivados[nombre])
+                urls[nombre] = request.build_absolute_uri(url) if request else url
+        return urls
+
+    def validate_foto(self, value):
+        # Sólo se valida y re-codifica: el archivo se escribe en create/update,
+        # para no dejarlo huérfano si falla la validación de otro campo
+        return preparar_foto(value) if value else value
+
     def validate_fecha_ingreso(self, value):
         if value > date.today():
             raise serializers.ValidationError("La fecha de ingreso no puede ser futura.")
@@ -33,47 +120,27 @@ class EmpleadoSerializer(serializers.ModelSerializer):
         return value
 
     def validate_curp(self, value):
-        curp_regex = r'^[A-Z][AEIOU][A-Z]{2}\d{2}(0[1-9]|1[0-2])' \
-                     r'(0[1-9]|[12]\d|3[01])[HM]' \
-                     r'(AS|BC|BS|CC|CL|CM|CS|CH|DF|DG|GT|GR|HG|JC|MC|MN|MS|NT|NL|OC|' \
-                     r'PL|QT|QR|SP|SL|SR|TC|TS|TL|VZ|YN|ZS)' \
-                     r'[B-DF-HJ-NP-TV-Z]{3}[0-9A-Z]\d$'
-        if not re.match(curp_regex, value.upper()):
-            raise serializers.ValidationError("CURP inválido.")
-        qs = Empleado.objects.filter(curp=value)
-        if self.instance:
-            qs = qs.exclude(pk=self.instance.pk)
-        if qs.exists():
-            raise serializers.ValidationError("Ya existe un empleado con este CURP.")
-        return value.upper()
+        value = value.upper()
+        if self.validar_identificadores:
+            # La coincidencia con fecha de nacimiento y género se revisa en validate()
+            errores = errores_curp(value)
+            if errores:
+                raise serializers.ValidationError(errores)
+        return value
 
     def validate_rfc(self, value):
-        rfc_regex = r'^[A-ZÑ&]{3,4}\d{6}[A-Z0-9]{3}$'
-        if not re.match(rfc_regex, value.upper()):
-            raise serializers.ValidationError("RFC inválido.")
-        qs = Empleado.objects.filter(rfc=value)
-        if self.instance:
-            qs = qs.exclude(pk=self.instance.pk)
-        if qs.exists():
-            raise serializers.ValidationError("Ya existe un empleado con este RFC.")
-        return value.upper()
-
-    def validate_nss(self, value):
-        if not re.match(r'^\d{11}$', value):
-            raise serializers.ValidationError("NSS inválido. Deben ser 11 dígitos.")
-        qs = Empleado.objects.filter(nss=value)
-        if self.instance:
-            qs = qs.exclude(pk=self.instance.pk)
-        if qs.exists():
-            raise serializers.ValidationError("Ya existe un empleado con este NSS.")
+        value = value.upper()
+        if self.validar_identificadores:
+            errores = errores_rfc(value)
+            if errores:
+                raise serializers.ValidationError(errores)
         return value
 
-    def validate_email(self, value):
-        qs = Empleado.objects.filter(email=value)
-        if self.instance:
-            qs = qs.exclude(pk=self.instance.pk)
-        if qs.exists():
-            raise serializers.ValidationError("Ya existe un empleado con este email.")
+    def validate_nss(self, value):
+        if self.validar_identificadores:
+            errores = errores_nss(value)
+            if errores:
+                raise serializers.ValidationError(errores)
         return value
 
     def validate_telefono(self, value):
@@ -81,6 +148,98 @@ class EmpleadoSerializer(serializers.ModelSerializer):
             raise serializers.ValidationError("El número de teléfono debe tener exactamente 10 dígitos.")
         return value
 
+    def validate(self, attrs):
+        attrs = super().validate(attrs)
+        if self.validar_identificadores and estricto_por_defecto():
+            actuales = {campo: getattr(self.instance, campo, None) for campo in ('curp', 'fecha_nacimiento', 'genero')}
+            actuales.update(attrs)
+            if actuales['curp']:
+                errores = coincidencias_curp(actuales['curp'], actuales['fecha_nacimiento'], actuales['genero'])
+                if errores:
+                    raise serializers.ValidationError({'curp': errores})
+        # En modo 'restriccion' no se consulta antes: decide la restricción UNIQUE al guardar
+        if self.verificar_unicidad and settings.UNICIDAD_MODO != 'restriccion':
+            conflictos = conflictos_unicidad(attrs, excluir_pk=getattr(self.instance, 'pk', None))
+            if conflictos:
+                raise serializers.ValidationError(conflictos)
+        return attrs
+
+    @contextmanager
+    def errores_de_unicidad(self, valores):
+        """
+        Traduce el `IntegrityError` de una restricción UNIQUE (p. ej. dos altas
+        simultáneas con el mismo CURP) al mismo error por campo de la validación.
+        """
+        try:
+            with transaction.atomic():
+                yield
+        except IntegrityError:
+            conflictos = conflictos_unicidad(valores, excluir_pk=getattr(self.instance, 'pk', None))
+            if not conflictos:
+                raise
+            raise serializers.ValidationError(conflictos)
+
+    def guardar_foto_validada(self, validated_data):
+        if validated_data.get('foto'):
+            validated_data['foto'] = guardar_foto(validated_data['foto'])
+
+    def create(self, validated_data):
+        self.guardar_foto_validada(validated_data)
+        with self.errores_de_unicidad(validated_data):
+            return super().create(validated_data)
+
+    def update(self, instance, validated_data):
+        self.guardar_foto_validada(validated_data)
+        # UPDATE sólo de las columnas modificadas; el diff queda en `ultimos_cambios` para la bitácora
+        with self.errores_de_unicidad(validated_data):
+            for campo, valor in validated_data.items():
+                setattr(instance, campo, valor)
+            instance.ultimos_cambios = instance.guardar_cambios()
+        return instance
+
+
+# === PROYECCIÓN LIGERA PARA LISTADOS ===
+# Campos que pueden leerse con `values()`; 'foto' y 'fotos' requieren instancias
+CAMPOS_PROYECCION_EMPLEADO = [
+    'id', 'num_empleado', 'nombres', 'apellido_paterno', 'apellido_materno', 'fecha_nacimiento',
+    'genero', 'estado_civil', 'curp', 'rfc', 'nss', 'telefono', 'email', 'puesto',
+    'departamento', 'fecha_ingreso', 'activo',
+]
+CAMPOS_DIRECTORIO = ['id', 'num_empleado', 'nombres', 'apellido_paterno', 'apellido_materno', 'puesto', 'departamento']
+
+
+class EmpleadoProyeccionSerializer(serializers.BaseSerializer):
+    """
+    Serializer de sólo lectura para filas de `Empleado.objects.values(*campos)`:
+    no construye instancias del modelo ni campos de DRF por fila.
+    """
+
+    def __init__(self, *args, campos=None, **kwargs):
+        self.campos = list(campos or CAMPOS_DIRECTORIO)
+        super().__init__(*args, **kwargs)
+
+    def to_representation(self, fila):
+        return {
+            campo: fila[campo].isoformat() if isinstance(fila[campo], date) else fila[campo]
+            for campo in self.campos
+        }
+
+
+# === SERIALIZER DE FILAS DE IMPORTACIÓN MASIVA ===
+class EmpleadoImportacionSerializer(EmpleadoSerializer):
+    """
+    Valida una fila de importación sin consultar la base de datos.
+    """
+    foto = None
+    fotos = None
+    verificar_unicidad = False
+    validar_identificadores = False
+
+    class Meta:
+        model = Empleado
+        exclude = ['foto', 'busqueda', 'foto_derivados']
+        extra_kwargs = {campo: {'validators': []} for campo in CAMPOS_UNICOS_EMPLEADO}
+
 
 # === SERIALIZER DE BITÁCORA GENERAL ===
 class BitacoraSerializer(serializers.ModelSerializer):
@@ -100,10 +259,50 @@ class BitacoraEmpleadoSerializer(serializers.ModelSerializer):
         fields = ['id', 'accion', 'fecha', 'usuario', 'detalles']
 
 
+# === SERIALIZER DE TRABAJOS DE EXPORTACIÓN ===
+class TrabajoExportacionSerializer(serializers.ModelSerializer):
+    filtros = serializers.JSONField(required=False, default=dict)
+    descarga = serializers.SerializerMethodField()
+
+    class Meta:
+        model = TrabajoExportacion
+        fields = ['id', 'formato', 'filtros', 'estado', 'error', 'creado', 'iniciado', 'finalizado', 'descarga']
+        read_only_fields = ['estado', 'error', 'creado', 'iniciado', 'finalizado']
+
+    def to_representation(self, instance):
+        data = super().to_representation(instance)
+        if isinstance(data['filtros'], str):
+            data['filtros'] = json.loads(data['filtros'] or '{}')
+        return data
+
+    def validate_filtros(self, value):
+        if not isinstance(value, dict):
+            raise serializers.ValidationError("Los filtros deben ser un objeto JSON.")
+        desconocidos = set(value) - set(PARAMETROS_FILTRO_EMPLEADOS)
+        if desconocidos:
+            raise serializers.ValidationError(f"Filtros no soportados: {', '.join(sorted(desconocidos))}.")
+        return value
+
+    def get_descarga(self, obj):
+        if obj.estado != 'COMPLETADO':
+            return None
+        url = reverse('exportacion-descargar', kwargs={'pk': obj.pk})
+        request = self.context.get('request')
+        return request.build_absolute_uri(url) if request else url
+
+
 # === TOKEN JWT PERSONALIZADO CON ROL ===
 class CustomTokenObtainPairSerializer(TokenObtainPairSerializer):
     @classmethod
     def get_token(cls, user):
         token = super().get_token(user)
         token['role'] = user.role  # o user.get_role_display() si usas choices
+        # Claims que usa JWTSinEstadoAuthentication para no consultar el usuario
+        token['username'] = user.username
+        token['is_staff'] = user.is_staff
+        token['is_superuser'] = user.is_superuser
+        # Ver PERMISOS_GRUPOS_EN_TOKEN: evita consultar los grupos en cada petición
+        token[CLAIM_GRUPOS] = sorted(user.groups.values_list('name', flat=True))
+        # Los tokens dejan de valer cuando esta versión avanza (ver empleados.autenticacion)
+        token[CLAIM_VERSION] = revocaciones.version_usuario(user.pk, refrescar=True)
         return token
@@ -1,15 +1,122 @@
-from django.db.models.signals import post_save, post_delete
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import Group
+from django.db.backends.signals import connection_created
+from django.db.models.signals import m2m_changed, post_init, post_save, post_delete, pre_delete
 from django.dispatch import receiver
-from .models import Empleado
+from .auditoria import auditoria_de_senal_omitida
+from .autenticacion import cambios_que_revocan, claims_confiables, revocaciones, valores_token
+from .busqueda import indice_local
+from .dashboard import invalidar_dashboard
+from .imagenes import derivados_pendientes, programar_derivados
+from .middleware import instalar_medicion
+from .models import CambioEmpleado, Empleado
+from .permissions import invalidar_grupos_usuario
 from .utils import registrar_bitacora
 
+User = get_user_model()
+
 
 @receiver(post_save, sender=Empleado)
 def auditar_guardado_empleado(sender, instance, created, **kwargs):
+    if auditoria_de_senal_omitida():
+        return
     accion = 'creado' if created else 'actualizado'
     registrar_bitacora(instancia=instance, accion=accion)
 
 
 @receiver(post_delete, sender=Empleado)
 def auditar_eliminacion_empleado(sender, instance, **kwargs):
+    if auditoria_de_senal_omitida():
+        return
     registrar_bitacora(instancia=instance, accion='eliminado')
+
+
+@receiver(post_save, sender=Empleado)
+@receiver(post_delete, sender=Empleado)
+def invalidar_cache_empleados(sender, **kwargs):
+    invalidar_dashboard()
+
+
+@receiver(post_save, sender=Empleado)
+def actualizar_indice_busqueda(sender, instance, **kwargs):
+    indice_local.actualizar(instance.pk, instance.busqueda)
+
+
+@receiver(post_save, sender=Empleado)
+def generar_derivados_foto(sender, instance, **kwargs):
+    if derivados_pendientes(instance):
+        programar_derivados(instance.pk)
+
+
+@receiver(post_delete, sender=Empleado)
+def quitar_de_indice_busqueda(sender, instance, **kwargs):
+    indice_local.eliminar(instance.pk)
+
+
+# === FEED DE CAMBIOS PARA SINCRONIZACIÓN ===
+@receiver(post_save, sender=Empleado)
+def registrar_cambio_empleado(sender, instance, created, **kwargs):
+    CambioEmpleado.registrar('CREADO' if created else 'ACTUALIZADO', instance.pk)
+
+
+@receiver(post_delete, sender=Empleado)
+def registrar_baja_empleado(sender, instance, **kwargs):
+    CambioEmpleado.registrar('ELIMINADO', instance.pk)
+
+
+# === CACHÉ DE GRUPOS PARA PERMISOS ===
+@receiver(m2m_changed, sender=User.groups.through)
+def invalidar_grupos_por_membresia(sender, instance, action, reverse, pk_set, **kwargs):
+    if not reverse:
+        afectados = [instance.pk] if action in ('post_add', 'post_remove', 'post_clear') else []
+    elif action in ('post_add', 'post_remove'):
+        afectados = list(pk_set)
+    elif action == 'pre_clear':
+        afectados = list(instance.user_set.values_list('pk', flat=True))
+    else:
+        afectados = []
+
+    invalidar_grupos_usuario(*afectados)
+    # El claim 'groups' de sus tokens quedó desactualizado
+    if claims_confiables():
+        for user_id in afectados:
+            revocaciones.revocar_usuario(user_id)
+
+
+@receiver(post_save, sender=User)
+def invalidar_grupos_por_usuario(sender, instance, **kwargs):
+    # Cubre cambios de rol y de is_staff
+    invalidar_grupos_usuario(instance.pk)
+
+
+@receiver(post_save, sender=Group)
+@receiver(pre_delete, sender=Group)
+def invalidar_grupos_por_grupo(sender, instance, **kwargs):
+    invalidar_grupos_usuario(*instance.user_set.values_list('pk', flat=True))
+
+
+# === REVOCACIÓN DE TOKENS JWT ===
+@receiver(post_init, sender=User)
+def recordar_valores_token(sender, instance, **kwargs):
+    instance._valores_token = valores_token(instance)
+
+
+@receiver(post_save, sender=User)
+def revocar_tokens_por_cambios(sender, instance, created, **kwargs):
+    if not created and cambios_que_revocan(instance):
+        revocaciones.revocar_usuario(instance.pk)
+    instance._valores_token = valores_token(instance)
+
+
+@receiver(post_delete, sender=User)
+def revocar_tokens_de_usuario_eliminado(sender, instance, **kwargs):
+    revocaciones.revocar_usuario(instance.pk)
+
+
+# === MEDICIÓN DE CONSULTAS PARA /metrics ===
+@receiver(connection_created)
+def medir_consultas_de_conexion(sender, connection, **kwargs):
+    # En cualquier hilo: bajo ASGI las consultas no corren en el del middleware
+    if settings.METRICAS_ACTIVAS:
+        instalar_medicion(connection)
@@ -0,0 +1,21 @@
+import pytest
+from django.core.cache import caches
+
+
+@pytest.fixture(autouse=True)
+def cache_de_respuestas_vacia():
+    # La caché sobrevive al rollback de cada prueba: una respuesta guardada por
+    # otra prueba con la misma generación no debe servirse
+    caches['respuestas'].clear()
+
+
+@pytest.fixture(autouse=True)
+def cache_compartida(settings):
+    # Las pruebas corren en un solo proceso: la caché en memoria la ven todas las peticiones
+    settings.CACHE_COMPARTIDA = True
+
+
+@pytest.fixture(autouse=True)
+def cache_de_exportaciones_temporal(settings, tmp_path):
+    # Cada prueba empieza con la caché de exportaciones vacía y fuera del repositorio
+    settings.EXPORTACIONES_CACHE_DIR = str(tmp_path / 'cache_exportaciones')
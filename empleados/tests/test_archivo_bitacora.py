@@ -0,0 +1,128 @@
+import gzip
+import json
+import os
+import shutil
+import tempfile
+from datetime import timedelta
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.urls import reverse
+from django.utils.timezone import now
+from rest_framework.test import APITestCase, APIClient
+
+from empleados import archivo
+
+from empleados.models import Bitacora, BitacoraArchivada, BitacoraEmpleado, BitacoraEmpleadoArchivada, Empleado
+
+User = get_user_model()
+
+
+class TestArchivoBitacora(APITestCase):
+    def setUp(self):
+        self.directorio = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directorio, ignore_errors=True)
+
+        self.super_user = User.objects.create_user(username='superadmin', password='admin123', is_staff=True, is_superuser=True)
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.super_user)
+
+        self.empleado = Empleado.objects.create(
+            num_empleado="E001", nombres="Juan", apellido_paterno="Pérez", apellido_materno="Gómez",
+            fecha_nacimiento="1990-01-01", genero="Masculino", estado_civil="Soltero", curp="PEGA900101HDFRZN09",
+            rfc="PEGA900101AAA", nss="12345678901", telefono="5551234567", email="juan.perez@example.com",
+            puesto="Desarrollador", departamento="TI", fecha_ingreso="2020-01-01",
+        )
+        Bitacora.objects.bulk_create([
+            Bitacora(usuario=self.super_user, modelo_afectado='Empleado', objeto_id=self.empleado.pk, accion='EDICIÓN', cambios='{}')
+            for _ in range(6)
+        ])
+        BitacoraEmpleado.objects.bulk_create([
+            BitacoraEmpleado(empleado=self.empleado, usuario=self.super_user, accion='EDICIÓN', detalles='x') for _ in range(3)
+        ])
+        # La mitad de cada tabla queda fuera del horizonte de retención
+        hace_dos_anios = now() - timedelta(days=730)
+        for modelo in (Bitacora, BitacoraEmpleado):
+            ids = list(modelo.objects.order_by('id').values_list('id', flat=True))
+            modelo.objects.filter(id__in=ids[:len(ids) // 2 + 1]).update(fecha=hace_dos_anios)
+        self.antiguas = set(Bitacora.objects.filter(fecha__lt=now() - timedelta(days=365)).values_list('id', flat=True))
+
+    def test_archivar_mueve_filas_a_tabla_y_jsonl(self):
+        total_general = Bitacora.objects.count()
+        call_command('archivar_bitacora', dias=365, directorio=self.directorio, stdout=open(os.devnull, 'w'))
+
+        self.assertEqual(set(BitacoraArchivada.objects.values_list('id', flat=True)), self.antiguas)
+        self.assertEqual(Bitacora.objects.count() + BitacoraArchivada.objects.count(), total_general)
+        self.assertTrue(BitacoraEmpleadoArchivada.objects.filter(empleado_id=self.empleado.pk).exists())
+
+        archivos = sorted(os.listdir(self.directorio))
+        self.assertTrue(any(nombre.startswith('bitacora_empleado_') for nombre in archivos))
+        ruta = os.path.join(self.directorio, next(n for n in archivos if n.startswith('bitacora_2')))
+        with gzip.open(ruta, 'rt', encoding='utf-8') as archivo:
+            ids = {json.loads(linea)['id'] for linea in archivo}
+        self.assertEqual(ids, self.antiguas)
+
+    def test_listado_activo_incluir_y_solo_archivo(self):
+        todas = list(Bitacora.objects.order_by('-fecha', '-id').values_list('id', flat=True))
+        call_command('archivar_bitacora', dias=365, directorio=self.directorio, stdout=open(os.devnull, 'w'))
+        url = reverse('bitacora-list')
+
+        activas = [fila['id'] for fila in self.client.get(f"{url}?page_size=100").data['results']]
+        self.assertEqual(set(activas), set(todas) - self.antiguas)
+
+        solo = [fila['id'] for fila in self.client.get(f"{url}?archivo=solo&page_size=100").data['results']]
+        self.assertEqual(set(solo), self.antiguas)
+
+        combinadas, siguiente = [], f"{url}?archivo=incluir&page_size=2"
+        while siguiente:
+            response = self.client.get(siguiente)
+            combinadas.extend(fila['id'] for fila in response.data['results'])
+            siguiente = response.data['next']
+        self.assertEqual(combinadas, todas)
+
+        url_empleado = reverse('bitacora-empleado', kwargs={'empleado_id': self.empleado.pk})
+        response = self.client.get(f"{url_empleado}?archivo=incluir")
+        self.assertEqual(len(response.data['results']), BitacoraEmpleado.objects.count() + BitacoraEmpleadoArchivada.objects.count())
+
+    def ids_en_jsonl(self):
+        ids = []
+        for nombre in os.listdir(self.directorio):
+            if nombre.startswith('bitacora_2'):
+                with gzip.open(os.path.join(self.directorio, nombre), 'rt', encoding='utf-8') as contenido:
+                    ids.extend(json.loads(linea)['id'] for linea in contenido)
+        return ids
+
+    def archivar(self):
+        return archivo.archivar_modelo(Bitacora, BitacoraArchivada, 'bitacora', archivo.fecha_limite(365), self.directorio, lote=2)
+
+    def test_transaccion_fallida_no_deja_filas_en_jsonl(self):
+        with mock.patch('empleados.archivo.registrar_cambio_bitacora', side_effect=RuntimeError('interrumpido')):
+            with self.assertRaises(RuntimeError):
+                self.archivar()
+        self.assertEqual(self.ids_en_jsonl(), [])
+        self.assertFalse(BitacoraArchivada.objects.exists())
+
+        self.assertEqual(self.archivar(), len(self.antiguas))
+        self.assertEqual(sorted(self.ids_en_jsonl()), sorted(self.antiguas))
+
+    def test_interrupcion_tras_confirmar_se_vuelca_una_vez(self):
+        volcar = archivo._volcar_pendiente
+        llamadas = []
+
+        def volcar_e_interrumpir(*args):
+            llamadas.append(args)
+            # La primera llamada es la de arranque; la segunda, tras confirmar el primer lote
+            if len(llamadas) == 2:
+                raise KeyboardInterrupt
+            return volcar(*args)
+
+        with mock.patch('empleados.archivo._volcar_pendiente', side_effect=volcar_e_interrumpir):
+            with self.assertRaises(KeyboardInterrupt):
+                self.archivar()
+        self.assertEqual(BitacoraArchivada.objects.count(), 2)
+        self.assertEqual(self.ids_en_jsonl(), [])
+
+        self.archivar()
+        self.assertEqual(sorted(self.ids_en_jsonl()), sorted(self.antiguas))
+        self.assertFalse(os.path.exists(os.path.join(self.directorio, 'bitacora.pendiente.jsonl')))
@@ -0,0 +1,106 @@
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.db import DatabaseError, transaction
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase, APIClient
+
+from empleados import auditoria
+from empleados.models import Bitacora, BitacoraEmpleado, Empleado
+from empleados.utils import registrar_bitacora
+
+User = get_user_model()
+
+DATOS_EMPLEADO = {
+    "num_empleado": "E002",
+    "nombres": "Ana",
+    "apellido_paterno": "López",
+    "apellido_materno": "Hernández",
+    "fecha_nacimiento": "1992-02-02",
+    "genero": "Femenino",
+    "estado_civil": "Casada",
+    "curp": "LOHA920202MDFRZN01",
+    "rfc": "LOHA920202BBB",
+    "nss": "10987654321",
+    "telefono": "5559876543",
+    "email": "ana.lopez@example.com",
+    "puesto": "Analista",
+    "departamento": "RH",
+    "fecha_ingreso": "2021-02-01",
+}
+
+
+class TestDeduplicacionAuditoria(APITestCase):
+    def setUp(self):
+        self.super_user = User.objects.create_user(username='superadmin', password='admin123', is_staff=True, is_superuser=True)
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.super_user)
+
+    def test_creacion_por_api_registra_una_sola_entrada(self):
+        response = self.client.post(reverse('empleado-list-create'), DATOS_EMPLEADO, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+        entradas = Bitacora.objects.filter(modelo_afectado='Empleado', objeto_id=response.data['id'])
+        self.assertEqual(list(entradas.values_list('accion', flat=True)), ['CREACIÓN'])
+        self.assertEqual(entradas[0].usuario, self.super_user)
+        self.assertNotIn('\n', entradas[0].cambios)  # JSON compacto
+
+    def test_modo_sincrono_propaga_errores_de_base_de_datos(self):
+        empleado = Empleado.objects.create(**DATOS_EMPLEADO)
+        with mock.patch.object(Bitacora.objects, 'bulk_create', side_effect=DatabaseError('sin espacio')):
+            with self.assertRaises(DatabaseError):
+                registrar_bitacora(empleado, 'EDICIÓN')
+
+
+@override_settings(BITACORA_MODO='buffer', BITACORA_BUFFER_TAMANO=1000, BITACORA_BUFFER_SEGUNDOS=3600)
+class TestBufferAuditoria(TestCase):
+    def setUp(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.empleado = Empleado.objects.create(**DATOS_EMPLEADO)
+        Bitacora.objects.all().delete()
+        BitacoraEmpleado.objects.all().delete()
+
+    def test_transaccion_escribe_al_confirmar(self):
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            with transaction.atomic():
+                for _ in range(3):
+                    registrar_bitacora(self.empleado, 'EDICIÓN', cambios={'puesto': 'x'})
+                self.assertFalse(Bitacora.objects.exists())
+
+        self.assertEqual(len(callbacks), 1)
+        self.assertEqual(Bitacora.objects.count(), 3)
+        self.assertEqual(BitacoraEmpleado.objects.count(), 3)
+
+    def test_savepoint_revertido_descarta_sus_entradas(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            registrar_bitacora(self.empleado, 'EDICIÓN', cambios={'a': 1})
+            try:
+                with transaction.atomic():
+                    registrar_bitacora(self.empleado, 'EDICIÓN', cambios={'b': 2})
+                    raise RuntimeError
+            except RuntimeError:
+                pass
+
+        self.assertEqual(list(Bitacora.objects.values_list('cambios', flat=True)), ['{"a":1}'])
+
+    def test_buffer_fuera_de_transaccion_y_contadores(self):
+        antes = auditoria.estadisticas_auditoria()
+        # Simula el modo autocommit del proceso: sin bloque atómico activo
+        with override_settings(BITACORA_BUFFER_TAMANO=2), mock.patch.object(auditoria, '_en_transaccion', return_value=False):
+            registrar_bitacora(self.empleado, 'EDICIÓN', cambios={'n': 1})
+            self.assertFalse(Bitacora.objects.exists())
+            registrar_bitacora(self.empleado, 'EDICIÓN', cambios={'n': 2})
+
+        self.assertEqual(Bitacora.objects.count(), 2)
+        despues = auditoria.estadisticas_auditoria()
+        self.assertEqual(despues['encolados'] - antes['encolados'], 2)
+        self.assertEqual(despues['escritos'] - antes['escritos'], 2)
+
+    def test_volcado_diferido_descarta_errores(self):
+        antes = auditoria.estadisticas_auditoria()
+        with mock.patch.object(Bitacora.objects, 'bulk_create', side_effect=DatabaseError('sin espacio')):
+            with self.captureOnCommitCallbacks(execute=True):
+                registrar_bitacora(self.empleado, 'EDICIÓN')
+        self.assertEqual(auditoria.estadisticas_auditoria()['descartados'] - antes['descartados'], 1)
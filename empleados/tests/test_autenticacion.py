@@ -0,0 +1,173 @@
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import Group
+from django.core.cache import cache
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase, APIClient
+from rest_framework.views import APIView
+from rest_framework_simplejwt.tokens import AccessToken, RefreshToken
+
+from empleados.autenticacion import JWTSinEstadoAuthentication, UsuarioToken, revocaciones
+from empleados.dashboard import obtener_dashboard
+from empleados.models import Bitacora
+
+User = get_user_model()
+
+
+def sin_estado(prueba):
+    """Equivale a JWT_SIN_ESTADO=True (las vistas leen la clase de autenticación al importarse)."""
+    prueba = mock.patch.object(APIView, 'authentication_classes', [JWTSinEstadoAuthentication])(prueba)
+    return override_settings(JWT_SIN_ESTADO=True)(prueba)
+
+
+class TestAutenticacionJWT(APITestCase):
+    def setUp(self):
+        cache.clear()
+        revocaciones.limpiar()
+        self.usuario = User.objects.create_user(username='rrhh', password='clave123', role='rrhh')
+        self.usuario.groups.add(Group.objects.create(name='RRHH'), Group.objects.create(name='Gerente'))
+        self.client = APIClient()
+        self.tokens = self.client.post(reverse('token_obtain_pair'), {'username': 'rrhh', 'password': 'clave123'}).data
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {self.tokens['access']}")
+        obtener_dashboard()
+        self.url = reverse('empleado-dashboard')
+
+    def tearDown(self):
+        revocaciones.limpiar()
+
+    @sin_estado
+    def test_sin_estado_no_consulta_el_usuario(self):
+        with self.assertNumQueries(0):
+            response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIsInstance(response.wsgi_request.user, UsuarioToken)
+        self.assertEqual(response.wsgi_request.user.role, 'rrhh')
+
+    @sin_estado
+    def test_sin_estado_bitacora_con_id_de_usuario(self):
+        response = self.client.post(reverse('empleado-list-create'), {
+            "num_empleado": "E001", "nombres": "Juan", "apellido_paterno": "Pérez", "apellido_materno": "Gómez",
+            "fecha_nacimiento": "1990-01-01", "genero": "Masculino", "estado_civil": "Soltero",
+            "curp": "PEGA900101HDFRZN09", "rfc": "PEGA900101AAA", "nss": "12345678901", "telefono": "5551234567",
+            "email": "juan.perez@example.com", "puesto": "Desarrollador", "departamento": "TI",
+            "fecha_ingreso": "2020-01-01", "activo": True,
+        }, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(Bitacora.objects.get(accion='CREACIÓN').usuario_id, self.usuario.pk)
+
+    @sin_estado
+    def test_tokens_sin_claims_se_resuelven_con_la_base_de_datos(self):
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {AccessToken.for_user(self.usuario)}")
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIsInstance(response.wsgi_request.user, User)
+
+    def test_revocar_token(self):
+        revocaciones.revocar_token(AccessToken(self.tokens['access']))
+        self.assertEqual(self.client.get(self.url).status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_cambio_de_contrasena_revoca_tokens_y_renovacion(self):
+        self.usuario.set_password('otra-clave')
+        self.usuario.save()
+
+        self.assertEqual(self.client.get(self.url).status_code, status.HTTP_401_UNAUTHORIZED)
+        response = self.client.post(reverse('token_refresh'), {'refresh': self.tokens['refresh']})
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    @sin_estado
+    def test_sin_estado_cambio_de_rol_revoca(self):
+        self.assertEqual(self.client.get(self.url).status_code, status.HTTP_200_OK)
+
+        self.usuario.role = 'usuario'
+        self.usuario.save()
+        self.assertEqual(self.client.get(self.url).status_code, status.HTTP_401_UNAUTHORIZED)
+
+    @sin_estado
+    def test_sin_estado_cambio_de_grupos_revoca(self):
+        User.objects.get(pk=self.usuario.pk).groups.clear()
+        self.assertEqual(self.client.get(self.url).status_code, status.HTTP_401_UNAUTHORIZED)
+
+    @sin_estado
+    def test_sin_estado_desactivar_usuario_revoca(self):
+        self.assertEqual(self.client.get(self.url).status_code, status.HTTP_200_OK)
+
+        usuario = User.objects.get(pk=self.usuario.pk)
+        usuario.is_active = False
+        usuario.save()
+        self.assertEqual(self.client.get(self.url).status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_con_estado_cambio_de_rol_revoca(self):
+        # El cliente lee el rol del token aunque el servidor relea el usuario
+        self.usuario.role = 'gerente'
+        self.usuario.save()
+        self.assertEqual(self.client.get(self.url).status_code, status.HTTP_401_UNAUTHORIZED)
+        self.assertTrue(revocaciones.revocado(RefreshToken(self.tokens['refresh'])))
+
+    def test_con_estado_otros_cambios_no_revocan(self):
+        self.usuario.last_login = None
+        self.usuario.email = 'rrhh@example.com'
+        self.usuario.save()
+        self.assertEqual(self.client.get(self.url).status_code, status.HTTP_200_OK)
+        self.assertFalse(revocaciones.revocado(RefreshToken(self.tokens['refresh'])))
+
+    def test_cerrar_sesion_revoca_access_y_refresh(self):
+        otra_sesion = self.client.post(reverse('token_obtain_pair'), {'username': 'rrhh', 'password': 'clave123'}).data
+
+        response = self.client.post(reverse('token_revocar'), {'refresh': self.tokens['refresh']})
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+        self.assertEqual(self.client.get(self.url).status_code, status.HTTP_401_UNAUTHORIZED)
+        response = self.client.post(reverse('token_refresh'), {'refresh': self.tokens['refresh']})
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+        # Las demás sesiones del usuario siguen activas
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {otra_sesion['access']}")
+        self.assertEqual(self.client.get(self.url).status_code, status.HTTP_200_OK)
+
+    def test_cerrar_todas_las_sesiones(self):
+        otra_sesion = self.client.post(reverse('token_obtain_pair'), {'username': 'rrhh', 'password': 'clave123'}).data
+
+        response = self.client.post(reverse('token_revocar'), {'todos': True}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {otra_sesion['access']}")
+        self.assertEqual(self.client.get(self.url).status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_no_revoca_el_refresh_de_otro_usuario(self):
+        otro = User.objects.create_user(username='otro', password='clave123')
+        refresh = str(RefreshToken.for_user(otro))
+
+        response = self.client.post(reverse('token_revocar'), {'refresh': refresh})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(revocaciones.revocado(RefreshToken(refresh)))
+        self.assertEqual(self.client.get(self.url).status_code, status.HTTP_200_OK)
+
+    @override_settings(CACHE_COMPARTIDA=False)
+    def test_sin_cache_compartida_cerrar_sesion_revoca_por_version(self):
+        response = self.client.post(reverse('token_revocar'), {'refresh': self.tokens['refresh']})
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+        # Otro proceso no ve la caché de este, pero sí el contador en la base de datos
+        cache.clear()
+        revocaciones.limpiar()
+        self.assertTrue(revocaciones.revocado(RefreshToken(self.tokens['refresh'])))
+
+    def test_token_emitido_tras_revocar_es_valido(self):
+        # Mismo segundo que la revocación: sólo cuenta la versión, no el iat
+        revocaciones.revocar_usuario(self.usuario.pk)
+        self.assertEqual(self.client.get(self.url).status_code, status.HTTP_401_UNAUTHORIZED)
+
+        tokens = self.client.post(reverse('token_obtain_pair'), {'username': 'rrhh', 'password': 'clave123'}).data
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {tokens['access']}")
+        self.assertEqual(self.client.get(self.url).status_code, status.HTTP_200_OK)
+        response = self.client.post(reverse('token_refresh'), {'refresh': tokens['refresh']})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_revocaciones_se_acumulan_en_la_base_de_datos(self):
+        revocaciones.revocar_usuario(self.usuario.pk)
+        revocaciones.revocar_usuario(self.usuario.pk)
+        # Otro proceso: sin copia local, lee el contador compartido
+        revocaciones.limpiar()
+        self.assertEqual(revocaciones.version_usuario(self.usuario.pk), 2)
+        self.assertTrue(revocaciones.revocado(RefreshToken(self.tokens['refresh'])))
@@ -0,0 +1,63 @@
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+from django.utils.timezone import now
+from rest_framework import status
+from rest_framework.test import APITestCase, APIClient
+
+from empleados.models import Bitacora
+
+User = get_user_model()
+
+
+class TestBitacoraKeyset(APITestCase):
+    def setUp(self):
+        self.super_user = User.objects.create_user(username='superadmin', password='admin123', is_staff=True, is_superuser=True)
+        self.otro = User.objects.create_user(username='rrhh', password='admin123')
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.super_user)
+        self.url = reverse('bitacora-list')
+
+        base = now()
+        entradas = []
+        for i in range(25):
+            entradas.append(Bitacora(
+                usuario=self.super_user if i % 2 else self.otro,
+                modelo_afectado='Empleado',
+                objeto_id=i % 5,
+                accion='EDICIÓN' if i % 3 else 'CREACIÓN',
+                cambios='{}',
+            ))
+        Bitacora.objects.bulk_create(entradas)
+        # Varias filas comparten la misma fecha para ejercitar el desempate por id
+        for indice, entrada in enumerate(Bitacora.objects.order_by('id')):
+            Bitacora.objects.filter(pk=entrada.pk).update(fecha=base - timedelta(minutes=indice // 3))
+
+    def recorrer(self, url):
+        ids = []
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            ids.extend(fila['id'] for fila in response.data['results'])
+            url = response.data['next']
+        return ids
+
+    def test_recorrido_completo_sin_repetidos_ni_huecos(self):
+        esperados = list(Bitacora.objects.order_by('-fecha', '-id').values_list('id', flat=True))
+        self.assertEqual(self.recorrer(f"{self.url}?page_size=4"), esperados)
+
+    def test_una_consulta_por_pagina_sin_count(self):
+        with self.assertNumQueries(1):
+            response = self.client.get(f"{self.url}?page_size=10")
+        self.assertEqual(len(response.data['results']), 10)
+        self.assertIn(response.data['results'][0]['usuario'], [str(self.super_user), str(self.otro)])
+
+    def test_filtros(self):
+        ids = self.recorrer(f"{self.url}?modelo_afectado=Empleado&objeto_id=2&accion=EDICIÓN&usuario={self.otro.pk}")
+        esperados = Bitacora.objects.filter(objeto_id=2, accion='EDICIÓN', usuario=self.otro).order_by('-fecha', '-id')
+        self.assertEqual(ids, list(esperados.values_list('id', flat=True)))
+
+    def test_cursor_invalido(self):
+        response = self.client.get(f"{self.url}?cursor=no-es-un-cursor")
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
@@ -0,0 +1,104 @@
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase, APIClient
+
+from empleados.busqueda import buscar_empleados, indice_local, normalizar, puntaje
+from empleados.filters import filtrar_empleados
+from empleados.models import Empleado
+
+User = get_user_model()
+
+
+class TestBusquedaEmpleados(APITestCase):
+    def setUp(self):
+        indice_local.invalidar()
+        self.super_user = User.objects.create_user(username='superadmin', password='admin123', is_staff=True, is_superuser=True)
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.super_user)
+        self.url = reverse('empleado-buscar')
+
+        self.jose = self.crear_empleado("E001", "José", "Pérez", "Núñez")
+        self.josefina = self.crear_empleado("E002", "Josefina", "López", "García")
+        self.ana = self.crear_empleado("E003", "Ana", "Joseph", "Martínez")
+
+    def crear_empleado(self, num, nombres, paterno, materno):
+        return Empleado.objects.create(
+            num_empleado=num, nombres=nombres, apellido_paterno=paterno, apellido_materno=materno,
+            fecha_nacimiento="1990-01-01", genero="Masculino", estado_civil="Soltero",
+            curp=f"CURP{num}", rfc=f"RFC{num}", nss=f"NSS{num}", telefono="5551234567",
+            email=f"{num.lower()}@example.com", puesto="Analista", departamento="TI", fecha_ingreso="2020-01-01",
+        )
+
+    def nombres(self, response):
+        return [empleado['nombres'] for empleado in response.data['results']]
+
+    def test_texto_normalizado_al_guardar(self):
+        self.assertEqual(normalizar("José Pérez-Ñúñez"), "jose perez nunez")
+        self.assertEqual(self.jose.busqueda, "jose perez nunez e001 curpe001 rfce001 nsse001 e001 example com 5551234567")
+
+        self.jose.apellido_paterno = "Gómez"
+        self.jose.save(update_fields=['apellido_paterno'])
+        self.jose.refresh_from_db()
+        self.assertIn("gomez", self.jose.busqueda)
+
+    def test_busqueda_por_prefijo_sin_acentos_y_clasificada(self):
+        response = self.client.get(self.url, {'q': 'jose'})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        # Palabra completa primero; luego prefijos, más cortos mejor
+        self.assertEqual(self.nombres(response), ["José", "Ana", "Josefina"])
+        self.assertEqual(response.data['results'][0]['puntaje'], 1.0)
+        self.assertNotIn('busqueda', response.data['results'][0])
+
+    def test_todos_los_terminos_deben_coincidir(self):
+        response = self.client.get(self.url, {'q': 'JOSÉ núñ'})
+        self.assertEqual(self.nombres(response), ["José"])
+
+        response = self.client.get(self.url, {'q': 'curpe00'})
+        self.assertEqual(len(response.data['results']), 3)
+
+        response = self.client.get(self.url, {'q': 'zzz'})
+        self.assertEqual(response.data['results'], [])
+
+    def test_limite(self):
+        response = self.client.get(self.url, {'q': 'jos', 'limite': 1})
+        self.assertEqual(len(response.data['results']), 1)
+
+        response = self.client.get(self.url, {'q': 'jos', 'limite': 'x'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_indice_local_sigue_a_los_cambios(self):
+        self.assertEqual(len(buscar_empleados('ana')), 1)
+        self.assertTrue(indice_local.construido)
+
+        self.ana.nombres = "Beatriz"
+        self.ana.save()
+        self.assertEqual(buscar_empleados('ana'), [])
+        self.assertEqual([e.pk for e in buscar_empleados('beat')], [self.ana.pk])
+
+        self.ana.delete()
+        self.assertEqual(buscar_empleados('beat'), [])
+
+    def test_bulk_create_calcula_busqueda_e_invalida_indice(self):
+        buscar_empleados('jose')
+        Empleado.objects.bulk_create([Empleado(
+            num_empleado="E010", nombres="Ángel", apellido_paterno="Ruiz", apellido_materno="Díaz",
+            fecha_nacimiento="1990-01-01", genero="Masculino", estado_civil="Soltero",
+            curp="CURPE010", rfc="RFCE010", nss="NSSE010", telefono="5551234567",
+            email="e010@example.com", puesto="Analista", departamento="TI", fecha_ingreso="2020-01-01",
+        )])
+
+        self.assertFalse(indice_local.construido)
+        self.assertEqual([e.nombres for e in buscar_empleados('angel ru')], ["Ángel"])
+
+    def test_listado_y_filtros_usan_la_columna_normalizada(self):
+        response = self.client.get(reverse('empleado-list-create'), {'search': 'NUÑEZ'})
+        self.assertEqual(self.nombres(response), ["José"])
+
+        self.assertEqual(list(filtrar_empleados({'search': 'garcía'})), [self.josefina])
+
+    def test_puntaje(self):
+        self.assertEqual(puntaje("jose perez", ["jose"]), 1.0)
+        self.assertEqual(puntaje("josefina", ["jose"]), 0.5)
+        self.assertEqual(puntaje("jose perez", ["jose", "lopez"]), 0.0)
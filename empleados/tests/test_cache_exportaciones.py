@@ -0,0 +1,126 @@
+import json
+import os
+from unittest import mock
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.signals import request_finished
+from django.db import close_old_connections
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase, APIClient
+
+from empleados.auditoria import volcar
+from empleados.models import Bitacora, Empleado
+
+User = get_user_model()
+
+
+def datos_empleado(numero, **extra):
+    return {
+        "num_empleado": f"E{numero:03d}", "nombres": "Juan", "apellido_paterno": "Pérez", "apellido_materno": "Gómez",
+        "fecha_nacimiento": "1990-01-01", "genero": "Masculino", "estado_civil": "Soltero",
+        "curp": f"PEGA900101HDFRZN{numero:02d}", "rfc": f"PEGA900101{numero:03d}", "nss": f"{numero:011d}",
+        "telefono": "5551234567", "email": f"e{numero}@example.com", "puesto": "Desarrollador", "departamento": "TI",
+        "fecha_ingreso": "2020-01-01", **extra,
+    }
+
+
+def contenido(response):
+    return b''.join(response.streaming_content)
+
+
+class TestCacheExportaciones(APITestCase):
+    def setUp(self):
+        self.super_user = User.objects.create_user(username='superadmin', password='admin123', is_staff=True, is_superuser=True)
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.super_user)
+        self.url = reverse('empleado-exportar-excel')
+        for numero in range(1, 4):
+            Empleado.objects.create(**datos_empleado(numero, departamento='TI' if numero % 2 else 'Ventas'))
+
+    def archivos_en_cache(self):
+        return sorted(os.listdir(settings.EXPORTACIONES_CACHE_DIR))
+
+    def test_segunda_descarga_sale_del_disco(self):
+        primera = self.client.get(self.url)
+        self.assertEqual(primera['X-Cache'], 'MISS')
+        xlsx = contenido(primera)
+
+        segunda = self.client.get(self.url)
+        self.assertEqual(segunda.status_code, status.HTTP_200_OK)
+        self.assertEqual(segunda['X-Cache'], 'HIT')
+        self.assertEqual(contenido(segunda), xlsx)
+        self.assertIn('attachment; filename="empleados_', segunda['Content-Disposition'])
+        self.assertEqual(len(self.archivos_en_cache()), 1)
+
+    def test_cambio_de_empleados_invalida(self):
+        contenido(self.client.get(self.url))
+        with self.captureOnCommitCallbacks(execute=True):
+            Empleado.objects.create(**datos_empleado(4))
+
+        response = self.client.get(self.url)
+        self.assertEqual(response['X-Cache'], 'MISS')
+        contenido(response)
+        # El archivo anterior se borra al guardar el nuevo
+        self.assertEqual(len(self.archivos_en_cache()), 1)
+
+    def test_filtros_distintos_no_comparten_archivo(self):
+        contenido(self.client.get(self.url, {'departamento': 'TI'}))
+        self.assertEqual(self.client.get(self.url, {'departamento': 'Ventas'})['X-Cache'], 'MISS')
+        self.assertEqual(self.client.get(self.url, {'departamento': 'TI', 'pagina': '2'})['X-Cache'], 'HIT')
+        self.assertEqual(self.client.get(self.url, {'fecha_ingreso': 'ayer'}).status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_descarga_interrumpida_no_queda_en_cache(self):
+        response = self.client.get(self.url)
+        next(iter(response.streaming_content))
+        # Como el cliente de pruebas: request_finished no debe cerrar la conexión de la prueba
+        request_finished.disconnect(close_old_connections)
+        try:
+            response.close()
+        finally:
+            request_finished.connect(close_old_connections)
+        self.assertEqual(self.archivos_en_cache(), [])
+
+    def test_auditoria_registra_cada_descarga(self):
+        contenido(self.client.get(self.url, {'departamento': 'TI'}))
+        self.client.get(self.url, {'departamento': 'TI'})
+        volcar()
+        cambios = [json.loads(b.cambios) for b in Bitacora.objects.filter(accion='Exportación a Excel').order_by('id')]
+        self.assertEqual([(c['cache'], c['filtros']) for c in cambios], [('MISS', {'departamento': 'TI'}), ('HIT', {'departamento': 'TI'})])
+
+    def test_desalojo_por_tamano(self):
+        with override_settings(EXPORTACIONES_CACHE_MAX_MB=0):
+            contenido(self.client.get(self.url, {'departamento': 'TI'}))
+            contenido(self.client.get(self.url, {'departamento': 'Ventas'}))
+        # Sólo sobrevive el archivo recién guardado
+        self.assertEqual(len(self.archivos_en_cache()), 1)
+        self.assertEqual(self.client.get(self.url, {'departamento': 'Ventas'})['X-Cache'], 'HIT')
+
+    @override_settings(EXPORTACIONES_CACHE_SENDFILE='X-Accel-Redirect', EXPORTACIONES_CACHE_SENDFILE_URL='/interno/')
+    def test_envio_delegado_al_servidor_web(self):
+        contenido(self.client.get(self.url))
+        response = self.client.get(self.url)
+        self.assertEqual(response.content, b'')
+        self.assertEqual(response['X-Accel-Redirect'], '/interno/' + self.archivos_en_cache()[0])
+
+    @override_settings(EXPORTACIONES_CACHE_SEGUNDOS=0)
+    def test_sin_cache(self):
+        response = self.client.get(self.url)
+        self.assertNotIn('X-Cache', response)
+        self.assertTrue(contenido(response))
+        self.assertFalse(os.path.exists(settings.EXPORTACIONES_CACHE_DIR))
+
+    @mock.patch('empleados.views.renderizar_pdf_empleados')
+    def test_pdf(self, renderizar):
+        renderizar.side_effect = lambda empleados, destino: destino.write(b'%PDF-1.7 ' + str(empleados.count()).encode())
+        url = reverse('empleados-export-pdf')
+
+        primera = self.client.get(url, {'departamento': 'TI'})
+        segunda = self.client.get(url, {'departamento': 'TI'})
+        self.assertEqual((primera['X-Cache'], segunda['X-Cache']), ('MISS', 'HIT'))
+        self.assertEqual(contenido(segunda), b'%PDF-1.7 2')
+        self.assertEqual(segunda['Content-Type'], 'application/pdf')
+        self.assertTrue(segunda['Content-Disposition'].startswith('inline'))
+        self.assertEqual(renderizar.call_count, 1)
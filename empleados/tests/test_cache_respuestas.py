@@ -0,0 +1,103 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase, APIClient
+
+from empleados.cache_respuestas import MemoriaLRUCache, estadisticas_cache, reiniciar_estadisticas
+from empleados.models import Empleado
+from empleados.utils import registrar_bitacora
+
+User = get_user_model()
+
+
+def datos_empleado(numero, **extra):
+    return {
+        "num_empleado": f"E{numero:03d}", "nombres": "Juan", "apellido_paterno": "Pérez", "apellido_materno": "Gómez",
+        "fecha_nacimiento": "1990-01-01", "genero": "Masculino", "estado_civil": "Soltero",
+        "curp": f"PEGA900101HDFRZN{numero:02d}", "rfc": f"PEGA900101{numero:03d}", "nss": f"{numero:011d}",
+        "telefono": "5551234567", "email": f"e{numero}@example.com", "puesto": "Desarrollador", "departamento": "TI",
+        "fecha_ingreso": "2020-01-01", **extra,
+    }
+
+
+class TestCacheDeRespuestas(APITestCase):
+    def setUp(self):
+        cache.clear()
+        reiniciar_estadisticas()
+        self.super_user = User.objects.create_user(username='superadmin', password='admin123', is_staff=True, is_superuser=True)
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.super_user)
+        self.url = reverse('empleado-list-create')
+        self.empleado = Empleado.objects.create(**datos_empleado(1))
+
+    def test_listado_filtrado_se_sirve_de_cache(self):
+        primera = self.client.get(self.url, {'departamento': 'TI', 'activo': 'true'})
+        self.assertEqual(primera['X-Cache'], 'MISS')
+
+        with self.assertNumQueries(0):
+            segunda = self.client.get(f'{self.url}?activo=true&departamento=TI')
+        self.assertEqual(segunda['X-Cache'], 'HIT')
+        self.assertEqual(segunda.data, primera.data)
+        self.assertEqual(self.client.get(self.url, {'departamento': 'RH'})['X-Cache'], 'MISS')
+
+    def test_escritura_invalida_el_listado(self):
+        self.client.get(self.url)
+        self.client.patch(reverse('empleado-detail', args=[self.empleado.pk]), {'puesto': 'Gerente'}, format='json')
+
+        response = self.client.get(self.url)
+        self.assertEqual(response['X-Cache'], 'MISS')
+        self.assertEqual(response.data['results'][0]['puesto'], 'Gerente')
+
+    def test_alcance_de_permisos_en_la_clave(self):
+        self.client.get(self.url)
+        rrhh = User.objects.create_user(username='rrhh', password='x', role='rrhh')
+        self.client.force_authenticate(user=rrhh)
+        self.assertEqual(self.client.get(self.url)['X-Cache'], 'MISS')
+
+    def test_bitacora_se_invalida_con_nuevas_entradas(self):
+        url = reverse('bitacora-empleado', args=[self.empleado.pk])
+        total = len(self.client.get(url).data['results'])
+        self.assertEqual(self.client.get(url)['X-Cache'], 'HIT')
+
+        registrar_bitacora(self.empleado, 'EDICIÓN', usuario=self.super_user, cambios={'puesto': 'x'})
+        response = self.client.get(url)
+        self.assertEqual(response['X-Cache'], 'MISS')
+        self.assertEqual(len(response.data['results']), total + 1)
+
+    @override_settings(CACHE_RESPUESTAS_SEGUNDOS=0)
+    def test_desactivada(self):
+        self.client.get(self.url)
+        self.assertNotIn('X-Cache', self.client.get(self.url))
+
+    @override_settings(CACHE_COMPARTIDA=False)
+    def test_desactivada_sin_cache_compartida(self):
+        # Con una caché por proceso los demás workers no verían avanzar la generación
+        self.client.get(self.url)
+        self.assertNotIn('X-Cache', self.client.get(self.url))
+
+    def test_estadisticas(self):
+        self.client.get(self.url)
+        self.client.get(self.url)
+        response = self.client.get(reverse('cache-estadisticas'))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual((response.data['aciertos'], response.data['fallos'], response.data['guardados']), (1, 1, 1))
+        self.assertEqual(response.data['tasa_aciertos'], 0.5)
+
+        self.client.force_authenticate(user=User.objects.create_user(username='staff', password='x', is_staff=True))
+        self.assertEqual(self.client.get(reverse('cache-estadisticas')).status_code, status.HTTP_403_FORBIDDEN)
+
+
+class TestMemoriaLRU(APITestCase):
+    def test_desaloja_la_menos_usada_y_cuenta(self):
+        reiniciar_estadisticas()
+        memoria = MemoriaLRUCache('prueba-lru', {'OPTIONS': {'MAX_ENTRIES': 2, 'CULL_FREQUENCY': 2}})
+        memoria.clear()
+        memoria.set('a', 1)
+        memoria.set('b', 2)
+        memoria.get('a')
+        memoria.set('c', 3)
+
+        self.assertEqual((memoria.get('a'), memoria.get('b'), memoria.get('c')), (1, None, 3))
+        self.assertEqual(estadisticas_cache()['desalojos'], 1)
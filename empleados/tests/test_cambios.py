@@ -0,0 +1,96 @@
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient, APITransactionTestCase
+
+from empleados.importacion import importar_empleados
+from empleados.models import CambioEmpleado, Empleado
+
+User = get_user_model()
+
+
+def datos_empleado(numero):
+    return {
+        "num_empleado": f"E{numero:03d}", "nombres": "Juan", "apellido_paterno": "Pérez", "apellido_materno": "Gómez",
+        "fecha_nacimiento": "1990-01-01", "genero": "Masculino", "estado_civil": "Soltero",
+        "curp": f"PEGA900101HDFRZN{numero:02d}", "rfc": f"PEGA900101{numero:03d}", "nss": f"{numero:011d}",
+        "telefono": "5551234567", "email": f"e{numero}@example.com", "puesto": "Desarrollador", "departamento": "TI",
+        "fecha_ingreso": "2020-01-01",
+    }
+
+
+# Con transacciones reales: el feed de cambios se escribe al confirmar, como en producción
+@override_settings(CAMBIOS_EMPLEADOS_MARGEN_SEGUNDOS=0)
+class TestFeedDeCambios(APITransactionTestCase):
+    def setUp(self):
+        self.super_user = User.objects.create_user(username='superadmin', password='admin123', is_staff=True, is_superuser=True)
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.super_user)
+        self.url = reverse('empleado-cambios')
+
+    def sincronizar(self, cursor=None, **parametros):
+        if cursor:
+            parametros['cursor'] = cursor
+        response = self.client.get(self.url, parametros)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response.data
+
+    def test_altas_ediciones_y_bajas_desde_el_cursor(self):
+        primero = Empleado.objects.create(**datos_empleado(1))
+        segundo = Empleado.objects.create(**datos_empleado(2))
+        inicial = self.sincronizar()
+        self.assertEqual([(c['tipo'], c['empleado_id']) for c in inicial['results']], [('CREADO', primero.pk), ('CREADO', segundo.pk)])
+        self.assertEqual(inicial['results'][0]['empleado']['num_empleado'], 'E001')
+
+        primero.puesto = 'Gerente'
+        primero.save()
+        segundo_id = segundo.pk
+        segundo.delete()
+        cambios = self.sincronizar(inicial['cursor'])
+        self.assertEqual([(c['tipo'], c['empleado_id']) for c in cambios['results']], [('ACTUALIZADO', primero.pk), ('ELIMINADO', segundo_id)])
+        self.assertEqual(cambios['results'][0]['empleado']['puesto'], 'Gerente')
+        self.assertIsNone(cambios['results'][1]['empleado'])
+
+        # Sin cambios nuevos se conserva el mismo cursor
+        vacio = self.sincronizar(cambios['cursor'])
+        self.assertEqual(vacio['results'], [])
+        self.assertEqual(vacio['cursor'], cambios['cursor'])
+
+    def test_paginacion_por_llave(self):
+        for numero in range(1, 6):
+            Empleado.objects.create(**datos_empleado(numero))
+
+        pagina = self.sincronizar(page_size=2)
+        vistos = [c['empleado_id'] for c in pagina['results']]
+        while pagina['next']:
+            pagina = self.client.get(pagina['next']).data
+            vistos.extend(c['empleado_id'] for c in pagina['results'])
+        self.assertEqual(vistos, list(Empleado.objects.order_by('id').values_list('id', flat=True)))
+
+    def test_cambios_de_una_transaccion_abierta_no_tienen_secuencia(self):
+        # Si tomaran su id al insertarse, una transacción que confirma después
+        # dejaría cambios por detrás de cursores ya entregados
+        with transaction.atomic():
+            empleado = Empleado.objects.create(**datos_empleado(1))
+            self.assertFalse(CambioEmpleado.objects.exists())
+            posterior = CambioEmpleado.objects.create(empleado_id=999, tipo='ACTUALIZADO')
+        self.assertGreater(CambioEmpleado.objects.get(empleado_id=empleado.pk).pk, posterior.pk)
+
+    def test_importacion_masiva_registra_altas(self):
+        reporte = importar_empleados([(numero, datos_empleado(numero)) for numero in (7, 8)], usuario=self.super_user)
+        self.assertEqual(reporte['creados'], 2)
+        self.assertEqual(CambioEmpleado.objects.filter(tipo='CREADO').count(), 2)
+
+    def test_consultas_constantes_por_pagina(self):
+        for numero in range(1, 11):
+            Empleado.objects.create(**datos_empleado(numero))
+        # Sesión/permisos aparte: una consulta para los cambios y otra para los empleados
+        with self.assertNumQueries(2):
+            self.sincronizar(fields='id,num_empleado')
+
+    @override_settings(CAMBIOS_EMPLEADOS_MARGEN_SEGUNDOS=60)
+    def test_margen_retiene_cambios_recientes(self):
+        Empleado.objects.create(**datos_empleado(1))
+        self.assertEqual(self.sincronizar()['results'], [])
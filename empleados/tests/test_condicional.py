@@ -0,0 +1,108 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient, APITransactionTestCase
+
+from empleados.models import Empleado
+
+User = get_user_model()
+
+
+def datos_empleado(numero):
+    return {
+        "num_empleado": f"E{numero:03d}", "nombres": "Juan", "apellido_paterno": "Pérez", "apellido_materno": "Gómez",
+        "fecha_nacimiento": "1990-01-01", "genero": "Masculino", "estado_civil": "Soltero",
+        "curp": f"PEGA900101HDFRZN{numero:02d}", "rfc": f"PEGA900101{numero:03d}", "nss": f"{numero:011d}",
+        "telefono": "5551234567", "email": f"e{numero}@example.com", "puesto": "Desarrollador", "departamento": "TI",
+        "fecha_ingreso": "2020-01-01",
+    }
+
+
+# Con transacciones reales: el feed de cambios se escribe al confirmar, como en producción
+class TestPeticionesCondicionales(APITransactionTestCase):
+    def setUp(self):
+        cache.clear()
+        self.super_user = User.objects.create_user(username='superadmin', password='admin123', is_staff=True, is_superuser=True)
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.super_user)
+        self.empleado = Empleado.objects.create(**datos_empleado(1))
+        self.url_detalle = reverse('empleado-detail', args=[self.empleado.pk])
+
+    def test_detalle_304_sin_cargar_el_empleado(self):
+        response = self.client.get(self.url_detalle)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn('Last-Modified', response)
+
+        with CaptureQueriesContext(connection) as consultas:
+            response = self.client.get(self.url_detalle, HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response.content, b'')
+        self.assertFalse([q for q in consultas.captured_queries if 'empleados_empleado"' in q['sql']])
+
+    def test_etag_cambia_al_editar(self):
+        etag = self.client.get(self.url_detalle)['ETag']
+        response = self.client.patch(self.url_detalle, {'puesto': 'Gerente'}, format='json')
+        self.assertNotEqual(response['ETag'], etag)
+
+        response = self.client.get(self.url_detalle, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['puesto'], 'Gerente')
+
+    def test_etag_distingue_la_variante(self):
+        completo = self.client.get(self.url_detalle)['ETag']
+        parcial = self.client.get(self.url_detalle, {'fields': 'id,nombres'})
+        self.assertNotEqual(parcial['ETag'], completo)
+        response = self.client.get(self.url_detalle, {'fields': 'id,nombres'}, HTTP_IF_NONE_MATCH=completo)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_if_match_evita_sobrescribir(self):
+        etag = self.client.patch(self.url_detalle, {'puesto': 'Analista'}, format='json')['ETag']
+        Empleado.objects.filter(pk=self.empleado.pk).first().save()  # edición concurrente
+
+        response = self.client.patch(self.url_detalle, {'puesto': 'Gerente'}, format='json', HTTP_IF_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_412_PRECONDITION_FAILED)
+        self.assertEqual(Empleado.objects.get(pk=self.empleado.pk).puesto, 'Analista')
+
+        etag = self.client.get(self.url_detalle)['ETag']
+        response = self.client.patch(self.url_detalle, {'puesto': 'Gerente'}, format='json', HTTP_IF_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(Empleado.objects.get(pk=self.empleado.pk).puesto, 'Gerente')
+
+    def test_detalle_inexistente(self):
+        response = self.client.get(reverse('empleado-detail', args=[999]))
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        self.assertNotIn('ETag', response)
+
+    def test_listado_304_sin_consultas_y_cambia_con_altas(self):
+        url = reverse('empleado-list-create')
+        etag = self.client.get(url)['ETag']
+        with self.assertNumQueries(0):
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertNotEqual(self.client.get(url, {'departamento': 'TI'})['ETag'], etag)
+
+        Empleado.objects.create(**datos_empleado(2))
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['count'], 2)
+
+    def test_dashboard_304_e_invalidacion(self):
+        url = reverse('empleado-dashboard')
+        etag = self.client.get(url)['ETag']
+        with self.assertNumQueries(0):
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        self.empleado.delete()
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, status.HTTP_200_OK)
+
+    def test_sin_cache_compartida_solo_el_detalle_lleva_etag(self):
+        # Otro proceso con su propia caché respondería 304 con una versión vieja
+        with override_settings(CACHE_COMPARTIDA=False):
+            self.assertNotIn('ETag', self.client.get(reverse('empleado-list-create')))
+            self.assertNotIn('ETag', self.client.get(reverse('empleado-dashboard')))
+            self.assertIn('ETag', self.client.get(self.url_detalle))
@@ -0,0 +1,43 @@
+from django.test import SimpleTestCase, override_settings
+
+from empleados.conexiones import avisos_conexiones, presupuesto_conexiones
+
+POSTGRES = 'django.db.backends.postgresql'
+
+
+def con_pool(**pool):
+    return {'ENGINE': POSTGRES, 'CONN_MAX_AGE': 0, 'OPTIONS': {'pool': pool}}
+
+
+@override_settings(DB_WORKERS=4, DB_HILOS_POR_WORKER=8, DB_MAX_CONEXIONES=90, EXPORTACIONES_WORKERS=2, VISTAS_ASYNC=False)
+class TestConexiones(SimpleTestCase):
+    def ids(self, ajustes_db):
+        return [aviso.id for aviso in avisos_conexiones('default', ajustes_db)]
+
+    def test_presupuesto(self):
+        persistentes = presupuesto_conexiones({'ENGINE': POSTGRES, 'CONN_MAX_AGE': 60, 'OPTIONS': {}})
+        self.assertEqual((persistentes['pool'], persistentes['por_worker'], persistentes['total']), (False, 8, 34))
+
+        pool = presupuesto_conexiones(con_pool(min_size=2, max_size=6))
+        self.assertEqual((pool['pool'], pool['por_worker'], pool['total']), (True, 6, 26))
+        # Un hilo no usa más de una conexión: no se recomienda más que los hilos
+        self.assertEqual(pool['pool_max_recomendado'], 8)
+        self.assertEqual(presupuesto_conexiones({'ENGINE': POSTGRES, 'OPTIONS': {'pool': True}})['por_worker'], 4)
+
+    def test_sin_avisos_si_cabe(self):
+        self.assertEqual(self.ids(con_pool(max_size=8)), [])
+        self.assertEqual(self.ids({'ENGINE': 'django.db.backends.sqlite3', 'CONN_MAX_AGE': 60}), [])
+
+    @override_settings(DB_WORKERS=12)
+    def test_exceso_de_conexiones(self):
+        avisos = avisos_conexiones('default', con_pool(max_size=8))
+        self.assertEqual([aviso.id for aviso in avisos], ['empleados.W001'])
+        self.assertIn('DB_POOL_MAX a 7', avisos[0].hint)
+
+    def test_pool_menor_que_los_hilos(self):
+        self.assertEqual(self.ids(con_pool(max_size=4)), ['empleados.W002'])
+
+    @override_settings(VISTAS_ASYNC=True)
+    def test_persistentes_bajo_asgi(self):
+        self.assertEqual(self.ids({'ENGINE': POSTGRES, 'CONN_MAX_AGE': 60, 'OPTIONS': {}}), ['empleados.W003'])
+        self.assertEqual(self.ids(con_pool(max_size=8)), [])
@@ -0,0 +1,71 @@
+from datetime import date
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase, APIClient
+
+from empleados.condicional import registrar_cambio_empleados
+from empleados.dashboard import calcular_dashboard, obtener_dashboard
+from empleados.models import Empleado
+
+User = get_user_model()
+
+
+class TestDashboard(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.super_user = User.objects.create_user(username='superadmin', password='admin123', is_staff=True, is_superuser=True)
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.super_user)
+        self.url = reverse('empleado-dashboard')
+
+        self.crear_empleado("E001", "1990-01-01", departamento="TI", genero="Masculino")
+        self.crear_empleado("E002", "1980-12-31", departamento="TI", genero="Femenino", activo=False)
+
+    def crear_empleado(self, num, nacimiento, activo=True, **extra):
+        return Empleado.objects.create(
+            num_empleado=num, nombres="Nombre", apellido_paterno="Paterno", apellido_materno="Materno",
+            fecha_nacimiento=nacimiento, estado_civil="Soltero", curp=f"CURP{num}", rfc=f"RFC{num}", nss=f"NSS{num}",
+            telefono="5551234567", email=f"{num}@example.com", puesto="Analista", fecha_ingreso="2020-01-01",
+            activo=activo, **extra,
+        )
+
+    def test_estadisticas_con_una_consulta(self):
+        with self.assertNumQueries(1):
+            datos = calcular_dashboard(date(2025, 6, 15))
+
+        self.assertEqual(datos['total_empleados'], 2)
+        self.assertEqual(datos['activos'], 1)
+        self.assertEqual(datos['inactivos'], 1)
+        # 35 años (ya cumplió) y 44 años (cumple en diciembre)
+        self.assertEqual(datos['edad_promedio'], 39.5)
+        self.assertEqual(datos['por_departamento'], [{'departamento': 'TI', 'total': 2}])
+        self.assertEqual(datos['por_genero'], [{'genero': 'Femenino', 'total': 1}, {'genero': 'Masculino', 'total': 1}])
+
+    def test_snapshot_en_cache_e_invalidacion(self):
+        with self.assertNumQueries(1):
+            self.assertEqual(self.client.get(self.url).status_code, status.HTTP_200_OK)
+        with self.assertNumQueries(0):
+            response = self.client.get(self.url)
+        self.assertEqual(response.data['total_empleados'], 2)
+
+        self.crear_empleado("E003", "2000-05-05", departamento="RH", genero="Femenino")
+        response = self.client.get(self.url)
+        self.assertEqual(response.data['total_empleados'], 3)
+
+    def test_cambio_confirmado_en_otro_proceso_vence_el_snapshot(self):
+        obtener_dashboard()
+        # Otro worker reactiva a E002: aquí sólo se ve la versión compartida, no su borrado del snapshot
+        Empleado.objects.filter(num_empleado="E002").update(activo=True)
+        registrar_cambio_empleados()
+
+        self.assertEqual(obtener_dashboard()['activos'], 2)
+
+    @override_settings(CACHE_COMPARTIDA=False)
+    def test_sin_cache_compartida_no_guarda_snapshot(self):
+        obtener_dashboard()
+        with self.assertNumQueries(1):
+            self.assertEqual(obtener_dashboard()['total_empleados'], 2)
@@ -0,0 +1,59 @@
+import json
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase, APIClient
+
+from empleados.models import Bitacora, Empleado
+
+User = get_user_model()
+
+
+class TestEdicionConRastreoDeCambios(APITestCase):
+    def setUp(self):
+        self.super_user = User.objects.create_user(username='superadmin', password='admin123', is_staff=True, is_superuser=True)
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.super_user)
+        self.empleado = Empleado.objects.create(
+            num_empleado="E001", nombres="Juan", apellido_paterno="Pérez", apellido_materno="Gómez",
+            fecha_nacimiento="1990-01-01", genero="Masculino", estado_civil="Soltero",
+            curp="PEGA900101HDFRZN09", rfc="PEGA900101AAA", nss="12345678901", telefono="5551234567",
+            email="juan.perez@example.com", puesto="Desarrollador", departamento="TI", fecha_ingreso="2020-01-01",
+        )
+        self.url = reverse('empleado-detail', args=[self.empleado.pk])
+
+    def consultas_empleado(self, consultas, verbo):
+        return [q['sql'] for q in consultas.captured_queries if q['sql'].startswith(verbo) and '"empleados_empleado"' in q['sql']]
+
+    def test_campos_modificados(self):
+        empleado = Empleado.objects.get(pk=self.empleado.pk)
+        self.assertEqual(empleado.campos_modificados(), [])
+
+        empleado.puesto = "Gerente"
+        empleado.fecha_ingreso = empleado.fecha_ingreso  # mismo valor: no cuenta
+        self.assertEqual(empleado.campos_modificados(), ['puesto'])
+        self.assertEqual(empleado.guardar_cambios(), {'puesto': {"antes": "Desarrollador", "después": "Gerente"}})
+        self.assertEqual(empleado.campos_modificados(), [])
+
+    def test_patch_sin_recarga_y_update_parcial(self):
+        with CaptureQueriesContext(connection) as consultas:
+            response = self.client.patch(self.url, {'nombres': "Juan Carlos"}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        self.assertEqual(len(self.consultas_empleado(consultas, 'SELECT')), 1)  # sólo get_object()
+        [update] = self.consultas_empleado(consultas, 'UPDATE')
+        self.assertIn('"nombres"', update)
+        self.assertIn('"busqueda"', update)  # derivado de nombres
+        self.assertNotIn('"curp"', update)
+
+        edicion = Bitacora.objects.get(accion='EDICIÓN')
+        self.assertEqual(json.loads(edicion.cambios), {'nombres': {"antes": "Juan", "después": "Juan Carlos"}})
+
+    def test_patch_sin_cambios_no_actualiza(self):
+        with CaptureQueriesContext(connection) as consultas:
+            response = self.client.patch(self.url, {'puesto': "Desarrollador"}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(self.consultas_empleado(consultas, 'UPDATE'), [])
@@ -0,0 +1,63 @@
+from io import BytesIO
+
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+from openpyxl import load_workbook
+from rest_framework import status
+from rest_framework.test import APITestCase, APIClient
+
+from empleados.exportacion import ENCABEZADOS_EXPORTACION, generar_xlsx
+from empleados.models import Empleado
+
+User = get_user_model()
+
+
+class TestExportacionExcelStreaming(APITestCase):
+    def setUp(self):
+        self.super_user = User.objects.create_user(username='superadmin', password='admin123', is_staff=True, is_superuser=True)
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.super_user)
+
+        self.empleado = Empleado.objects.create(
+            num_empleado="E001",
+            nombres="Juan & <Hijo>",
+            apellido_paterno="Pérez",
+            apellido_materno="Gómez",
+            fecha_nacimiento="1990-01-01",
+            genero="Masculino",
+            estado_civil="Soltero",
+            curp="PEGA900101HDFRZN09",
+            rfc="PEGA900101AAA",
+            nss="12345678901",
+            telefono="5551234567",
+            email="juan.perez.largo@example.com",
+            puesto="Desarrollador",
+            departamento="TI",
+            fecha_ingreso="2020-01-01",
+            activo=True,
+        )
+
+    def test_exportacion_es_streaming_y_legible(self):
+        response = self.client.get(reverse('empleado-exportar-excel'))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.streaming)
+
+        wb = load_workbook(BytesIO(b''.join(response.streaming_content)))
+        ws = wb.active
+        self.assertEqual(ws.title, "Empleados")
+        filas = list(ws.iter_rows(values_only=True))
+        self.assertEqual(list(filas[0]), ENCABEZADOS_EXPORTACION)
+        self.assertEqual(filas[1][0], self.empleado.id)
+        self.assertEqual(filas[1][2], "Juan & <Hijo>")
+        self.assertEqual(filas[1][5], "1990-01-01")
+        self.assertEqual(filas[1][16], "Sí")
+        # Ancho precalculado: el email más largo + 2
+        self.assertEqual(ws.column_dimensions['M'].width, len("juan.perez.largo@example.com") + 2)
+
+    def test_generar_xlsx_entrega_varios_bloques(self):
+        filas = ([i, f"nombre {i}"] for i in range(5000))
+        bloques = list(generar_xlsx(['ID', 'Nombre'], filas, [8, 14], tamano_bloque=1024))
+        self.assertGreater(len(bloques), 2)
+
+        ws = load_workbook(BytesIO(b''.join(bloques)), read_only=True).active
+        self.assertEqual(sum(1 for _ in ws.iter_rows()), 5001)
@@ -0,0 +1,84 @@
+import csv
+import gzip
+import json
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase, APIClient
+
+from empleados.auditoria import volcar
+from empleados.exportacion import ENCABEZADOS_EXPORTACION, agrupar_bloques
+from empleados.models import Bitacora, Empleado
+
+User = get_user_model()
+
+
+def datos_empleado(numero, **extra):
+    return {
+        "num_empleado": f"E{numero:03d}", "nombres": "Juan", "apellido_paterno": "Pérez", "apellido_materno": "Gómez",
+        "fecha_nacimiento": "1990-01-01", "genero": "Masculino", "estado_civil": "Soltero",
+        "curp": f"PEGA900101HDFRZN{numero:02d}", "rfc": f"PEGA900101{numero:03d}", "nss": f"{numero:011d}",
+        "telefono": "5551234567", "email": f"e{numero}@example.com", "puesto": "Desarrollador", "departamento": "TI",
+        "fecha_ingreso": "2020-01-01", **extra,
+    }
+
+
+class TestExportacionStreaming(APITestCase):
+    def setUp(self):
+        self.super_user = User.objects.create_user(username='superadmin', password='admin123', is_staff=True, is_superuser=True)
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.super_user)
+        self.url = reverse('empleado-exportar')
+        for numero in range(1, 6):
+            Empleado.objects.create(**datos_empleado(numero, departamento='TI' if numero % 2 else 'Ventas', activo=numero != 5))
+
+    def test_csv_con_filtros_y_orden_del_listado(self):
+        response = self.client.get(self.url, {'departamento': 'TI', 'ordering': '-num_empleado'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.streaming)
+        self.assertEqual(response['Content-Type'], 'text/csv; charset=utf-8')
+
+        filas = list(csv.reader(StringIO(b''.join(response.streaming_content).decode('utf-8-sig'))))
+        self.assertEqual(filas[0], ENCABEZADOS_EXPORTACION)
+        self.assertEqual([fila[1] for fila in filas[1:]], ['E005', 'E003', 'E001'])
+        self.assertEqual(filas[1][16], 'No')
+
+    def test_ndjson_con_tipos(self):
+        response = self.client.get(self.url, {'formato': 'ndjson', 'search': 'e002'})
+        self.assertEqual(response['Content-Type'], 'application/x-ndjson')
+        lineas = b''.join(response.streaming_content).decode().splitlines()
+        self.assertEqual(len(lineas), 1)
+        fila = json.loads(lineas[0])
+        self.assertEqual((fila['num_empleado'], fila['fecha_ingreso'], fila['activo']), ('E002', '2020-01-01', True))
+
+    def test_gzip_si_el_cliente_lo_acepta(self):
+        response = self.client.get(self.url, {'formato': 'ndjson'}, HTTP_ACCEPT_ENCODING='gzip, deflate')
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertIn('Accept-Encoding', response['Vary'])
+        lineas = gzip.decompress(b''.join(response.streaming_content)).decode().splitlines()
+        self.assertEqual(len(lineas), 5)
+
+        self.assertNotIn('Content-Encoding', self.client.get(self.url))
+
+    def test_parametros_invalidos(self):
+        self.assertEqual(self.client.get(self.url, {'formato': 'xml'}).status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(self.client.get(self.url, {'fecha_ingreso': 'ayer'}).status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_auditoria(self):
+        self.client.get(self.url, {'formato': 'ndjson', 'departamento': 'TI'}, HTTP_ACCEPT_ENCODING='gzip')
+        volcar()
+        registro = Bitacora.objects.get(accion='Exportación a NDJSON')
+        cambios = json.loads(registro.cambios)
+        self.assertEqual((cambios['filtros'], cambios['gzip']), ({'departamento': 'TI'}, True))
+
+        self.client.force_authenticate(user=User.objects.create_user(username='empleado', password='x'))
+        self.assertEqual(self.client.get(self.url, {'formato': 'ndjson'}).status_code, status.HTTP_403_FORBIDDEN)
+        volcar()
+        self.assertTrue(Bitacora.objects.filter(accion__contains='NDJSON').exclude(pk=registro.pk).exists())
+
+    def test_agrupar_bloques(self):
+        bloques = list(agrupar_bloques((f'{numero}\n' for numero in range(1000)), tamano_bloque=100))
+        self.assertTrue(all(len(bloque) >= 100 for bloque in bloques[:-1]))
+        self.assertEqual(b''.join(bloques).decode().splitlines(), [str(numero) for numero in range(1000)])
@@ -0,0 +1,136 @@
+import io
+import json
+import os
+import shutil
+import tempfile
+from datetime import timedelta
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import override_settings
+from django.utils.timezone import now
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase, APIClient
+
+from empleados.exportacion import escribir_exportacion
+from empleados.models import Bitacora, Empleado, TrabajoExportacion
+from empleados.trabajos import procesar_trabajo, reclamar_trabajos
+
+User = get_user_model()
+MEDIA_TEMPORAL = tempfile.mkdtemp()
+
+
+def terminar_proceso(trabajo_id):
+    # Como un worker que el sistema mata por falta de memoria
+    os._exit(1)
+
+
+@override_settings(MEDIA_ROOT=MEDIA_TEMPORAL)
+class TestTrabajosExportacion(APITestCase):
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(MEDIA_TEMPORAL, ignore_errors=True)
+        super().tearDownClass()
+
+    def setUp(self):
+        self.super_user = User.objects.create_user(username='superadmin', password='admin123', is_staff=True, is_superuser=True)
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.super_user)
+
+        base = {
+            "apellido_materno": "Gómez", "fecha_nacimiento": "1990-01-01", "genero": "Masculino",
+            "estado_civil": "Soltero", "telefono": "5551234567", "puesto": "Desarrollador", "fecha_ingreso": "2020-01-01",
+        }
+        Empleado.objects.create(
+            num_empleado="E001", nombres="Juan", apellido_paterno="Pérez", curp="PEGA900101HDFRZN09",
+            rfc="PEGA900101AAA", nss="12345678901", email="juan@example.com", departamento="TI", **base,
+        )
+        Empleado.objects.create(
+            num_empleado="E002", nombres="Ana", apellido_paterno="López", curp="LOHA920202MDFRZN01",
+            rfc="LOHA920202BBB", nss="10987654321", email="ana@example.com", departamento="RH", **base,
+        )
+
+    def test_ciclo_completo_csv_con_filtros(self):
+        response = self.client.post(
+            reverse('exportacion-crear'),
+            {"formato": "csv", "filtros": {"departamento": "TI"}},
+            format='json',
+        )
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        trabajo_id = response.data['id']
+        self.assertEqual(response.data['estado'], 'PENDIENTE')
+
+        self.assertEqual(reclamar_trabajos(5), [trabajo_id])
+        self.assertEqual(reclamar_trabajos(5), [])
+        self.assertEqual(procesar_trabajo(trabajo_id), 'COMPLETADO')
+
+        estado = self.client.get(reverse('exportacion-estado', kwargs={'pk': trabajo_id}))
+        self.assertEqual(estado.data['estado'], 'COMPLETADO')
+        self.assertIsNotNone(estado.data['descarga'])
+
+        descarga = self.client.get(reverse('exportacion-descargar', kwargs={'pk': trabajo_id}))
+        self.assertEqual(descarga.status_code, status.HTTP_200_OK)
+        contenido = b''.join(descarga.streaming_content).decode('utf-8-sig')
+        self.assertIn("Juan", contenido)
+        self.assertNotIn("Ana", contenido)
+
+        eventos = [json.loads(b.cambios) for b in Bitacora.objects.filter(accion="Exportación a CSV").order_by('id')]
+        self.assertEqual([e['evento'] for e in eventos], ['inicio', 'fin'])
+        self.assertIn('duracion_segundos', eventos[1])
+
+    def test_filtros_no_soportados(self):
+        response = self.client.post(reverse('exportacion-crear'), {"formato": "excel", "filtros": {"salario": "1"}}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(TrabajoExportacion.objects.exists())
+
+    def test_descarga_pendiente(self):
+        trabajo = TrabajoExportacion.objects.create(usuario=self.super_user, formato='excel')
+        response = self.client.get(reverse('exportacion-descargar', kwargs={'pk': trabajo.pk}))
+        self.assertEqual(response.status_code, status.HTTP_409_CONFLICT)
+
+    def test_reclama_trabajos_abandonados(self):
+        abandonado = TrabajoExportacion.objects.create(formato='csv', estado='EN_PROCESO', iniciado=now() - timedelta(hours=2))
+        TrabajoExportacion.objects.create(formato='csv', estado='EN_PROCESO', iniciado=now())
+        with override_settings(EXPORTACIONES_TIEMPO_MAXIMO_SEGUNDOS=3600):
+            self.assertEqual(reclamar_trabajos(5), [abandonado.pk])
+            self.assertEqual(reclamar_trabajos(5), [])
+
+    def archivos_generados(self):
+        return {os.path.join(raiz, nombre) for raiz, _, nombres in os.walk(MEDIA_TEMPORAL) for nombre in nombres}
+
+    def test_trabajo_reclamado_por_otro_descarta_el_resultado(self):
+        trabajo = TrabajoExportacion.objects.create(formato='csv')
+        self.assertEqual(reclamar_trabajos(1), [trabajo.pk])
+        antes = self.archivos_generados()
+
+        def reclamado_mientras_escribe(formato, empleados, salida):
+            # Otro proceso lo da por abandonado y lo vuelve a reclamar
+            TrabajoExportacion.objects.filter(pk=trabajo.pk).update(iniciado=now() + timedelta(seconds=1))
+            escribir_exportacion(formato, empleados, salida)
+
+        with mock.patch('empleados.trabajos.escribir_exportacion', reclamado_mientras_escribe):
+            self.assertEqual(procesar_trabajo(trabajo.pk), 'DESCARTADO')
+        trabajo.refresh_from_db()
+        self.assertEqual(trabajo.estado, 'EN_PROCESO')
+        self.assertFalse(trabajo.archivo)
+        self.assertIsNone(trabajo.finalizado)
+        self.assertEqual(self.archivos_generados(), antes)
+
+    def test_error_al_leer_el_trabajo_queda_registrado(self):
+        trabajo = TrabajoExportacion.objects.create(formato='xml', estado='EN_PROCESO', iniciado=now())
+        self.assertEqual(procesar_trabajo(trabajo.pk), 'ERROR')
+        trabajo.refresh_from_db()
+        self.assertEqual((trabajo.estado, trabajo.error), ('ERROR', "'xml'"))
+        self.assertEqual(procesar_trabajo(0), 'ERROR')
+
+    def test_pool_roto_falla_el_trabajo_y_sigue(self):
+        trabajo = TrabajoExportacion.objects.create(formato='csv')
+        salida = io.StringIO()
+        with mock.patch('empleados.management.commands.procesar_exportaciones.procesar_trabajo_exportacion', terminar_proceso):
+            call_command('procesar_exportaciones', workers=1, una_vez=True, intervalo=0, stdout=salida, stderr=io.StringIO())
+        trabajo.refresh_from_db()
+        self.assertEqual(trabajo.estado, 'ERROR')
+        self.assertIn('terminó abruptamente', trabajo.error)
+        self.assertIn(f"Trabajo {trabajo.pk}: ERROR", salida.getvalue())
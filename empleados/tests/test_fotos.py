@@ -0,0 +1,118 @@
+import io
+import tempfile
+
+from django.contrib.auth import get_user_model
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.core.management import call_command
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import override_settings
+from django.urls import reverse
+from PIL import Image
+from rest_framework import status
+from rest_framework.test import APITestCase, APIClient
+
+from empleados.imagenes import preparar_foto
+from empleados.models import Empleado
+
+User = get_user_model()
+
+MEDIA_TEMPORAL = tempfile.mkdtemp()
+
+
+def imagen(ancho=3000, alto=2000, formato='PNG', modo='RGBA'):
+    salida = io.BytesIO()
+    Image.new(modo, (ancho, alto), (200, 30, 30, 128) if modo == 'RGBA' else (200, 30, 30)).save(salida, format=formato)
+    return salida.getvalue()
+
+
+@override_settings(MEDIA_ROOT=MEDIA_TEMPORAL, FOTOS_WORKERS=0)
+class TestFotosEmpleado(APITestCase):
+    def setUp(self):
+        self.super_user = User.objects.create_user(username='superadmin', password='admin123', is_staff=True, is_superuser=True)
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.super_user)
+        self.datos = {
+            "num_empleado": "E001", "nombres": "Juan", "apellido_paterno": "Pérez", "apellido_materno": "Gómez",
+            "fecha_nacimiento": "1990-01-01", "genero": "Masculino", "estado_civil": "Soltero",
+            "curp": "PEGA900101HDFRZN09", "rfc": "PEGA900101AAA", "nss": "12345678901", "telefono": "5551234567",
+            "email": "juan.perez@example.com", "puesto": "Desarrollador", "departamento": "TI",
+            "fecha_ingreso": "2020-01-01", "activo": "true",
+        }
+
+    def crear_con_foto(self, contenido, nombre='foto.png'):
+        with self.captureOnCommitCallbacks(execute=True):
+            return self.client.post(
+                reverse('empleado-list-create'),
+                {**self.datos, 'foto': SimpleUploadedFile(nombre, contenido)},
+                format='multipart',
+            )
+
+    def test_foto_reencodificada_y_derivados(self):
+        response = self.crear_con_foto(imagen())
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+        empleado = Empleado.objects.get(num_empleado="E001")
+        self.assertRegex(empleado.foto.name, r'^empleados/fotos/[0-9a-f]{20}\.jpg$')
+        with Image.open(empleado.foto.path) as original:
+            self.assertEqual((original.format, original.size), ('JPEG', (2048, 1365)))
+
+        derivados = empleado.foto_derivados
+        self.assertEqual(derivados['origen'], empleado.foto.name)
+        for nombre, (lado, formato) in {'miniatura': (96, 'WEBP'), 'pdf': (240, 'JPEG'), 'perfil': (512, 'WEBP')}.items():
+            self.assertRegex(derivados[nombre], rf'^empleados/fotos/derivados/{nombre}_[0-9a-f]{{20}}\.')
+            with default_storage.open(derivados[nombre]) as archivo, Image.open(archivo) as derivado:
+                self.assertEqual((derivado.format, derivado.size), (formato, (lado, lado)))
+
+        response = self.client.get(reverse('empleado-detail', args=[empleado.pk]))
+        self.assertEqual(set(response.data['fotos']), {'miniatura', 'pdf', 'perfil'})
+        self.assertTrue(response.data['fotos']['miniatura'].startswith('http://testserver/media/empleados/fotos/derivados/'))
+        self.assertNotIn('foto_derivados', response.data)
+
+    def test_cambiar_foto_reemplaza_derivados(self):
+        self.crear_con_foto(imagen())
+        empleado = Empleado.objects.get(num_empleado="E001")
+        anteriores = empleado.foto_derivados
+
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.patch(
+                reverse('empleado-detail', args=[empleado.pk]),
+                {'foto': SimpleUploadedFile('otra.jpg', imagen(800, 600, 'JPEG', 'RGB'))},
+                format='multipart',
+            )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        empleado.refresh_from_db()
+        self.assertNotEqual(empleado.foto_derivados['miniatura'], anteriores['miniatura'])
+        self.assertFalse(default_storage.exists(anteriores['miniatura']))
+        self.assertTrue(default_storage.exists(empleado.foto_derivados['miniatura']))
+
+    def test_archivo_invalido_o_demasiado_grande(self):
+        response = self.crear_con_foto(b'no es una imagen', 'foto.jpg')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('foto', response.data)
+
+        with override_settings(FOTOS_PIXELES_MAXIMOS=1000):
+            response = self.crear_con_foto(imagen(100, 100))
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(Empleado.objects.exists())
+
+    def test_foto_no_se_guarda_si_falla_otro_campo(self):
+        contenido = imagen(321, 123)
+        self.datos['telefono'] = '123'
+        response = self.crear_con_foto(contenido)
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertNotIn('foto', response.data)
+        self.assertFalse(default_storage.exists(preparar_foto(SimpleUploadedFile('foto.png', contenido)).name))
+
+    def test_comando_de_relleno(self):
+        # Foto guardada sin pasar por la API (p. ej. anterior al pipeline)
+        empleado = Empleado(**{**self.datos, 'activo': True})
+        empleado.foto.save('antigua.png', ContentFile(imagen(640, 480)), save=False)
+        empleado.save()
+        self.assertEqual(empleado.foto_derivados, {})
+
+        call_command('generar_derivados_fotos', workers=0, stdout=io.StringIO())
+
+        empleado.refresh_from_db()
+        self.assertEqual(set(empleado.foto_derivados), {'origen', 'miniatura', 'pdf', 'perfil'})
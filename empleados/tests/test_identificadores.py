@@ -0,0 +1,102 @@
+from datetime import date
+
+from django.contrib.auth import get_user_model
+from django.test import SimpleTestCase, override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase, APIClient
+
+from empleados.benchmarks import identificadores_sinteticos
+from empleados.identificadores import (
+    digito_curp, digito_nss, digito_rfc, errores_curp, errores_nss, errores_rfc, validar_columna,
+    validar_identificadores_lote,
+)
+from empleados.serializers import EmpleadoImportacionSerializer, EmpleadoSerializer
+
+CURP, RFC, NSS = next(identificadores_sinteticos(1))  # nacido el 1960-01-01
+
+
+def datos_empleado(**cambios):
+    return {
+        "num_empleado": "E001", "nombres": "Juan", "apellido_paterno": "Pérez", "apellido_materno": "Gómez",
+        "fecha_nacimiento": "1960-01-01", "genero": "Masculino", "estado_civil": "Soltero",
+        "curp": CURP, "rfc": RFC, "nss": NSS, "telefono": "5551234567",
+        "email": "juan.perez@example.com", "puesto": "Desarrollador", "departamento": "TI",
+        "fecha_ingreso": "2020-01-01", "activo": True, **cambios,
+    }
+
+
+class TestDigitosVerificadores(SimpleTestCase):
+    def test_digitos_conocidos(self):
+        self.assertEqual(digito_rfc("GODE561231GR8"), "8")
+        self.assertEqual(digito_rfc("VECJ880326XX5"), "1")
+        self.assertEqual(digito_nss("12345678901"), "3")
+        self.assertEqual(digito_curp("PEGA600101HDFBBB05"), "5")
+
+    def test_estricto_rechaza_digitos_y_fechas(self):
+        self.assertEqual(errores_curp(CURP, estricto=True), [])
+        self.assertEqual(errores_curp(CURP[:-1] + "9", estricto=True), ["Dígito verificador del CURP inválido."])
+        self.assertEqual(errores_rfc("GODE561231GR8", estricto=True), [])
+        self.assertIn("La fecha del RFC no es válida.", errores_rfc("GODE560231GR8", estricto=True))
+        self.assertEqual(errores_nss("12345678903", estricto=True), [])
+        self.assertEqual(errores_nss("12345678901", estricto=True), ["Dígito verificador del NSS inválido."])
+
+    def test_coincidencia_con_fecha_y_genero(self):
+        self.assertEqual(errores_curp(CURP, date(1960, 1, 1), "Masculino", estricto=True), [])
+        self.assertEqual(errores_curp(CURP, date(1961, 1, 1), "Femenino", estricto=True), [
+            "El CURP no coincide con la fecha de nacimiento.",
+            "El CURP no coincide con el género.",
+        ])
+
+    def test_sin_estricto_solo_formato(self):
+        self.assertEqual(errores_nss("12345678901", estricto=False), [])
+        self.assertEqual(errores_curp("PEGA900101", estricto=False), ["CURP inválido."])
+
+
+class TestValidacionPorColumnas(SimpleTestCase):
+    def test_errores_por_indice(self):
+        valores = ["GODE561231GR8", "XXX", "GODE561231GR8", "GODE561231GR0"]
+        self.assertEqual(validar_columna(valores, errores_rfc, estricto=True), {
+            1: ["RFC inválido."],
+            3: ["Dígito verificador del RFC inválido."],
+        })
+
+    def test_lote_de_importacion(self):
+        filas = [
+            (2, datos_empleado()),
+            (3, datos_empleado(curp=CURP.lower(), nss="12345678901")),
+            (4, datos_empleado(genero="Femenino", rfc="")),
+            (5, None),
+        ]
+        self.assertEqual(validar_identificadores_lote(filas, estricto=True), {
+            3: {'nss': ["Dígito verificador del NSS inválido."]},
+            4: {'curp': ["El CURP no coincide con el género."]},
+        })
+
+
+class TestSerializerIdentificadores(SimpleTestCase):
+    @override_settings(IDENTIFICADORES_ESTRICTOS=True)
+    def test_serializer_estricto(self):
+        serializer = EmpleadoImportacionSerializer(data=datos_empleado(fecha_nacimiento="1990-01-01"))
+        self.assertTrue(serializer.is_valid(), serializer.errors)  # la importación valida por columnas
+
+        serializer = EmpleadoSerializer()
+        self.assertEqual(serializer.validate_curp(CURP.lower()), CURP)
+        with self.assertRaisesMessage(Exception, "Dígito verificador del NSS inválido."):
+            serializer.validate_nss("12345678901")
+
+
+@override_settings(IDENTIFICADORES_ESTRICTOS=True)
+class TestAltaEstricta(APITestCase):
+    def setUp(self):
+        usuario = get_user_model().objects.create_user(username='superadmin', password='admin123', is_staff=True, is_superuser=True)
+        self.client = APIClient()
+        self.client.force_authenticate(user=usuario)
+
+    def test_curp_debe_coincidir_con_fecha_de_nacimiento(self):
+        response = self.client.post(reverse('empleado-list-create'), datos_empleado(fecha_nacimiento="1990-01-01"), format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data, {'curp': ["El CURP no coincide con la fecha de nacimiento."]})
+
+        response = self.client.post(reverse('empleado-list-create'), datos_empleado(), format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
@@ -0,0 +1,116 @@
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase, APIClient
+
+from empleados import importacion
+from empleados.models import Bitacora, BitacoraEmpleado, Empleado
+
+User = get_user_model()
+CONSONANTES = "BCDFGHJKLMNPQRSTVWXYZ"
+
+
+def fila(indice, **extra):
+    datos = {
+        "num_empleado": f"I{indice:03d}",
+        "nombres": "Ana",
+        "apellido_paterno": "López",
+        "apellido_materno": "Hernández",
+        "fecha_nacimiento": "1992-02-02",
+        "genero": "Femenino",
+        "estado_civil": "Casada",
+        "curp": f"LOHA920202MDF{CONSONANTES[indice % 21]}{CONSONANTES[indice // 21 % 21]}Z01",
+        "rfc": f"LOHA920202{indice:03d}",
+        "nss": f"{indice:011d}",
+        "telefono": "5559876543",
+        "email": f"ana{indice}@example.com",
+        "puesto": "Analista",
+        "departamento": "RH",
+        "fecha_ingreso": "2021-02-01",
+        "activo": True,
+    }
+    datos.update(extra)
+    return datos
+
+
+class TestImportacionMasiva(APITestCase):
+    def setUp(self):
+        self.super_user = User.objects.create_user(username='superadmin', password='admin123', is_staff=True, is_superuser=True)
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.super_user)
+        self.url = reverse('empleado-importar')
+
+    def test_importacion_json_con_reporte_por_fila(self):
+        Empleado.objects.create(**{**fila(99), "email": "existente@example.com"})
+        filas = [fila(i) for i in range(1, 6)]
+        filas.append(fila(6, curp=filas[0]["curp"]))          # duplicado dentro del lote
+        filas.append(fila(7, email="existente@example.com"))  # ya existe en la base de datos
+        filas.append(fila(8, telefono="123"))                 # error de formato
+
+        response = self.client.post(self.url, filas, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data['total'], 8)
+        self.assertEqual(response.data['creados'], 5)
+        errores = {e['fila']: e['errores'] for e in response.data['errores']}
+        self.assertEqual(set(errores), {6, 7, 8})
+        self.assertIn('curp', errores[6])
+        self.assertEqual(errores[7]['email'], ["Ya existe un empleado con este email."])
+        self.assertIn('telefono', errores[8])
+
+        self.assertEqual(Empleado.objects.count(), 6)
+        self.assertEqual(Bitacora.objects.filter(accion='CREACIÓN').count(), 5)
+        self.assertEqual(BitacoraEmpleado.objects.filter(accion='CREACIÓN').count(), 5)
+
+    def test_consultas_no_crecen_con_el_lote(self):
+        def consultas_para(total, inicio):
+            from django.db import connection
+            from django.test.utils import CaptureQueriesContext
+
+            with CaptureQueriesContext(connection) as ctx:
+                response = self.client.post(self.url, [fila(i) for i in range(inicio, inicio + total)], format='json')
+            self.assertEqual(response.data['creados'], total)
+            return len(ctx)
+
+        self.assertEqual(consultas_para(5, 100), consultas_para(50, 200))
+
+    def test_todo_o_nada(self):
+        response = self.client.post(f"{self.url}?todo_o_nada=true", [fila(1), fila(2, telefono="1")], format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(Empleado.objects.exists())
+
+    def test_alta_concurrente_tras_validar_se_reporta_por_fila(self):
+        validar_lote = importacion.validar_lote
+
+        def validar_y_adelantarse(filas):
+            resultado = validar_lote(filas)
+            # Otra petición confirma el mismo RFC entre la validación y el bulk_create
+            Empleado.objects.create(**fila(50, rfc=filas[1][1]["rfc"]))
+            return resultado
+
+        with mock.patch('empleados.importacion.validar_lote', side_effect=validar_y_adelantarse):
+            response = self.client.post(self.url, [fila(1), fila(2), fila(3)], format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data['creados'], 2)
+        self.assertEqual(response.data['errores'], [{'fila': 2, 'errores': {'rfc': ["Ya existe un empleado con este RFC."]}}])
+        self.assertEqual(set(Empleado.objects.values_list('num_empleado', flat=True)), {"I001", "I003", "I050"})
+        self.assertEqual(Bitacora.objects.filter(accion='CREACIÓN').count(), 2)
+
+    def test_importacion_csv_con_encabezados_de_exportacion(self):
+        contenido = (
+            "Número de empleado,Nombres,Apellido paterno,Apellido materno,Fecha de nacimiento,Género,Estado civil,"
+            "CURP,RFC,NSS,Teléfono,Email,Puesto,Departamento,Fecha de ingreso,Activo\n"
+            "C001,Luis,García,Ruiz,1985-05-05,Masculino,Casado,GARL850505HDFRZS01,GARL850505AB1,11111111111,"
+            "5550001111,luis@example.com,Contador,Finanzas,2019-01-01,No\n"
+        ).encode('utf-8-sig')
+        archivo = SimpleUploadedFile("empleados.csv", contenido, content_type="text/csv")
+
+        response = self.client.post(self.url, {"archivo": archivo}, format='multipart')
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED, response.data)
+        empleado = Empleado.objects.get(num_empleado="C001")
+        self.assertFalse(empleado.activo)
@@ -0,0 +1,135 @@
+import json
+import os
+import tempfile
+from unittest import mock
+
+from asgiref.sync import sync_to_async
+
+from django.contrib.auth import get_user_model
+from django.test import AsyncRequestFactory, override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase, APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from empleados import metricas
+from empleados.metricas import exportar_metricas, registrar_peticion, reiniciar_metricas, volcar
+from empleados.middleware import InstrumentacionMiddleware
+from empleados.views import EmpleadoListCreateAPIView
+
+User = get_user_model()
+
+
+def serie(texto, prefijo):
+    """Valor de la primera línea de la exposición que empieza con `prefijo`."""
+    for linea in texto.splitlines():
+        if linea.startswith(prefijo):
+            return float(linea.rsplit(' ', 1)[1])
+    return None
+
+
+class TestMetricas(APITestCase):
+    def setUp(self):
+        reiniciar_metricas()
+        self.super_user = User.objects.create_user(username='superadmin', password='admin123', is_staff=True, is_superuser=True)
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.super_user)
+
+    def metricas(self, **encabezados):
+        response = self.client.get(reverse('metricas'), **encabezados)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response['Content-Type'].startswith('text/plain; version=0.0.4'))
+        return response.content.decode()
+
+    def test_registra_latencia_consultas_y_render(self):
+        listado = self.client.get(reverse('empleado-list-create'))
+        self.client.get(reverse('empleado-list-create'))
+        texto = self.metricas()
+
+        etiquetas = '{vista="empleado-list-create",metodo="GET"}'
+        self.assertEqual(serie(texto, f'rh_http_peticiones_duracion_segundos_count{etiquetas}'), 2)
+        self.assertEqual(serie(texto, 'rh_http_peticiones_duracion_segundos_bucket{vista="empleado-list-create",metodo="GET",le="+Inf"}'), 2)
+        self.assertEqual(serie(texto, 'rh_http_respuestas_total{vista="empleado-list-create",metodo="GET",estado="200"}'), 2)
+        self.assertGreater(serie(texto, f'rh_db_consultas_total{etiquetas}'), 0)
+        self.assertGreater(serie(texto, f'rh_render_duracion_segundos_total{etiquetas}'), 0)
+        self.assertEqual(serie(texto, f'rh_http_respuesta_bytes_total{etiquetas}'), 2 * len(listado.content))
+        self.assertIn('# TYPE rh_cache_respuestas_total counter', texto)
+
+    async def test_consultas_de_vista_sincrona_bajo_asgi(self):
+        # La vista síncrona corre en el hilo de sync_to_async, con sus propias conexiones
+        token = await sync_to_async(AccessToken.for_user)(self.super_user)
+        respuesta = await self.async_client.get(reverse('empleado-list-create'), headers={'Authorization': f'Bearer {token}'})
+        self.assertEqual(respuesta.status_code, status.HTTP_200_OK)
+
+        texto = await sync_to_async(exportar_metricas)()
+        self.assertGreater(serie(texto, 'rh_db_consultas_total{vista="empleado-list-create",metodo="GET"}'), 0)
+
+    async def test_consultas_de_vista_asincrona(self):
+        async def vista(request):
+            # El manejador de Django renderiza antes de volver al middleware
+            return (await EmpleadoListCreateAPIView.as_view_async()(request)).render()
+
+        request = AsyncRequestFactory().get(reverse('empleado-list-create'))
+        request._force_auth_user = self.super_user
+        request.resolver_match = mock.Mock(view_name='empleado-list-create')
+
+        with mock.patch('empleados.middleware.registrar_peticion', return_value=False) as registrar:
+            await InstrumentacionMiddleware(vista)(request)
+        # (vista, método, estado, segundos, consultas, segundos en la base, ...)
+        self.assertGreater(registrar.call_args.args[4], 0)
+
+    def test_rutas_desconocidas_no_crean_series(self):
+        self.client.get('/api/no-existe/12345/')
+        self.assertIn('vista="sin_ruta"', self.metricas())
+        self.assertNotIn('12345', self.metricas())
+
+    @override_settings(METRICAS_LENTA_MS=0)
+    def test_peticion_lenta_en_el_log(self):
+        with self.assertLogs('empleados.metricas', 'WARNING') as registro:
+            self.client.get(reverse('empleado-list-create'))
+        self.assertIn('Petición lenta GET /api/empleados/', registro.output[0])
+        self.assertIn('SELECT', registro.output[0])
+
+    @override_settings(METRICAS_TOKEN='secreto')
+    def test_token(self):
+        self.assertEqual(self.client.get(reverse('metricas')).status_code, status.HTTP_403_FORBIDDEN)
+        self.metricas(HTTP_AUTHORIZATION='Bearer secreto')
+
+    def test_sin_token_solo_staff(self):
+        self.client.force_authenticate(user=None)
+        self.assertEqual(self.client.get(reverse('metricas')).status_code, status.HTTP_401_UNAUTHORIZED)
+        self.client.force_authenticate(user=User.objects.create_user(username='usuario', password='x'))
+        self.assertEqual(self.client.get(reverse('metricas')).status_code, status.HTTP_403_FORBIDDEN)
+
+    @override_settings(METRICAS_TOKEN='secreto')
+    def test_token_sin_usuario(self):
+        recolector = APIClient()
+        self.assertEqual(recolector.get(reverse('metricas'), HTTP_AUTHORIZATION='Bearer otro').status_code, status.HTTP_403_FORBIDDEN)
+        self.assertEqual(recolector.get(reverse('metricas'), HTTP_AUTHORIZATION='Bearer secreto').status_code, status.HTTP_200_OK)
+
+    def test_suma_los_workers(self):
+        with tempfile.TemporaryDirectory() as directorio, override_settings(METRICAS_DIRECTORIO=directorio):
+            registrar_peticion('empleado-detail', 'GET', 200, 0.02, 3, 0.004, 100, 0.001)
+            volcar(forzar=True)
+            # Otro worker con su propio archivo
+            with open(os.path.join(directorio, 'metricas-1.json'), 'w') as archivo:
+                etiquetas = [['vista', 'empleado-detail'], ['metodo', 'GET']]
+                json.dump({'contadores': [['rh_db_consultas_total', etiquetas, 5]], 'histogramas': []}, archivo)
+
+            texto = self.metricas()
+        self.assertEqual(serie(texto, 'rh_db_consultas_total{vista="empleado-detail",metodo="GET"}'), 8)
+        self.assertEqual(serie(texto, 'rh_http_peticiones_duracion_segundos_bucket{vista="empleado-detail",metodo="GET",le="0.025"}'), 1)
+        self.assertEqual(serie(texto, 'rh_http_peticiones_duracion_segundos_bucket{vista="empleado-detail",metodo="GET",le="0.01"}'), 0)
+
+    def test_pid_reutilizado_no_hace_retroceder_los_contadores(self):
+        etiquetas = [['vista', 'empleado-detail'], ['metodo', 'GET']]
+        with tempfile.TemporaryDirectory() as directorio, override_settings(METRICAS_DIRECTORIO=directorio):
+            # Archivo de un worker terminado que tenía el pid que ahora usa este proceso
+            with open(os.path.join(directorio, f'metricas-{os.getpid()}.json'), 'w') as archivo:
+                json.dump({'contadores': [['rh_db_consultas_total', etiquetas, 5]], 'histogramas': []}, archivo)
+            with mock.patch.object(metricas, '_pid_volcado', None):
+                registrar_peticion('empleado-detail', 'GET', 200, 0.02, 3, 0.004, 100, 0.001)
+                volcar(forzar=True)
+                texto = self.metricas()
+                self.assertTrue(os.path.exists(os.path.join(directorio, metricas.ARCHIVO_TERMINADOS)))
+        self.assertEqual(serie(texto, 'rh_db_consultas_total{vista="empleado-detail",metodo="GET"}'), 8)
@@ -0,0 +1,126 @@
+import unittest
+from io import BytesIO
+from unittest import mock
+
+from django.conf import settings
+from django.test import SimpleTestCase, override_settings
+
+from empleados import pdf
+
+
+def dependencias_pdf():
+    """WeasyPrint necesita Pango (falla al importarse sin él) y la unión de bloques pypdf."""
+    try:
+        import pypdf  # noqa: F401
+        import weasyprint  # noqa: F401
+    except (ImportError, OSError):
+        return False
+    return True
+
+
+class TestRecursosPdf(SimpleTestCase):
+    def setUp(self):
+        pdf._recursos.clear()
+
+    def test_sirve_estaticos_locales_desde_cache(self):
+        url = 'file:///' + settings.STATIC_URL.lstrip('/') + 'empleados/pdf/logo.svg'
+        recurso = pdf.obtener_recurso(url)
+        self.assertEqual(recurso['mime_type'], 'image/svg+xml')
+        self.assertIn(b'<svg', recurso['string'])
+
+        with mock.patch('empleados.pdf.finders.find') as buscar:
+            self.assertEqual(pdf.obtener_recurso(url)['string'], recurso['string'])
+        buscar.assert_not_called()
+
+    def test_rechaza_recursos_externos(self):
+        for url in ('https://dummyimage.com/120x50', 'file:///etc/passwd', settings.STATIC_URL + 'no-existe.png'):
+            with self.assertRaises(ValueError):
+                pdf.obtener_recurso(url)
+
+    def test_plantilla_sin_urls_externas(self):
+        with open(pdf.finders.find(pdf.HOJA_ESTILOS_PDF)) as hoja:
+            self.assertNotIn('http', hoja.read())
+
+
+class TestBloquesPdf(SimpleTestCase):
+    def test_dividir_en_bloques(self):
+        self.assertEqual(list(pdf.dividir_en_bloques(range(7), 3)), [[0, 1, 2], [3, 4, 5], [6]])
+        self.assertEqual(list(pdf.dividir_en_bloques([], 3)), [])
+
+    @override_settings(PDF_FILAS_POR_BLOQUE=2, PDF_WORKERS=2)
+    def test_un_bloque_se_renderiza_en_el_proceso(self):
+        with mock.patch('empleados.pdf.renderizar_bloque', return_value=b'%PDF') as renderizar, \
+                mock.patch('empleados.pdf._pool_pdf') as pool:
+            self.assertEqual(pdf.renderizar_pdf([{'id': 1}, {'id': 2}]), b'%PDF')
+        pool.assert_not_called()
+        self.assertEqual(renderizar.call_args.args[0], [{'id': 1}, {'id': 2}])
+
+    @override_settings(PDF_FILAS_POR_BLOQUE=2, PDF_WORKERS=2)
+    def test_varios_bloques_van_al_pool_y_se_unen(self):
+        pool = mock.Mock()
+        pool.map.side_effect = lambda funcion, *argumentos: [f'{encabezado}-{pie}'.encode() for *_, encabezado, pie in zip(*argumentos)]
+        with mock.patch('empleados.pdf._pool_pdf', return_value=pool), \
+                mock.patch('empleados.pdf.unir_pdfs', side_effect=lambda pdfs, destino: list(pdfs)) as unir:
+            partes = pdf.renderizar_pdf([{'id': numero} for numero in range(5)])
+
+        bloques = pool.map.call_args.args[1]
+        self.assertEqual([len(bloque) for bloque in bloques], [2, 2, 1])
+        # Encabezado sólo en el primer bloque y pie sólo en el último
+        self.assertEqual(partes, [b'True-False', b'False-False', b'False-True'])
+        unir.assert_called_once()
+
+    @override_settings(PDF_FILAS_POR_BLOQUE=2, PDF_WORKERS=0)
+    def test_sin_workers_un_solo_documento(self):
+        with mock.patch('empleados.pdf.renderizar_bloque', return_value=b'%PDF') as renderizar:
+            pdf.renderizar_pdf([{'id': numero} for numero in range(5)])
+        self.assertEqual(len(renderizar.call_args.args[0]), 5)
+
+
+@unittest.skipUnless(dependencias_pdf(), "Requiere WeasyPrint con Pango y pypdf")
+class TestRenderPdf(SimpleTestCase):
+    """Render real, sin dobles: en CI están Pango y pypdf."""
+
+    def setUp(self):
+        pdf._recursos.clear()
+        self.filas = [
+            {'id': numero, 'nombres': f"Nombre{numero}", 'apellido_paterno': "Pérez", 'apellido_materno': "Gómez",
+             'departamento': "TI", 'puesto': "Analista", 'activo': numero % 2 == 0}
+            for numero in range(1, 6)
+        ]
+
+    def paginas(self, contenido):
+        from pypdf import PdfReader
+
+        return [pagina.extract_text() for pagina in PdfReader(BytesIO(contenido)).pages]
+
+    @override_settings(PDF_FILAS_POR_BLOQUE=100, PDF_WORKERS=0)
+    def test_un_documento_en_el_proceso(self):
+        paginas = self.paginas(pdf.renderizar_pdf(self.filas))
+        texto = ''.join(paginas)
+        self.assertIn(pdf.EMPRESA_PDF, texto)
+        self.assertIn("Nombre5", texto)
+        self.assertIn("Sistema de Recursos Humanos", paginas[-1])
+
+    @override_settings(PDF_FILAS_POR_BLOQUE=2, PDF_WORKERS=2)
+    def test_bloques_en_el_pool_se_unen_en_orden(self):
+        self.addCleanup(self.cerrar_pool)
+        paginas = self.paginas(pdf.renderizar_pdf(self.filas))
+
+        # Cada bloque empieza en una página nueva
+        self.assertEqual(len(paginas), 3)
+        self.assertIn(pdf.EMPRESA_PDF, paginas[0])
+        self.assertNotIn(pdf.EMPRESA_PDF, ''.join(paginas[1:]))
+        self.assertEqual([f"Nombre{numero}" in paginas[(numero - 1) // 2] for numero in range(1, 6)], [True] * 5)
+        self.assertIn("Sistema de Recursos Humanos", paginas[-1])
+        self.assertNotIn("Sistema de Recursos Humanos", ''.join(paginas[:-1]))
+
+    def test_unir_pdfs_en_destino(self):
+        partes = [pdf.renderizar_bloque(self.filas[:1], '01/01/2025 00:00'), pdf.renderizar_bloque(self.filas[1:2], '01/01/2025 00:00')]
+        destino = BytesIO()
+        self.assertIsNone(pdf.unir_pdfs(partes, destino))
+        self.assertEqual(len(self.paginas(destino.getvalue())), 2)
+
+    def cerrar_pool(self):
+        if pdf._pool is not None:
+            pdf._pool.shutdown()
+            pdf._pool = None
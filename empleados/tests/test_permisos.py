@@ -0,0 +1,105 @@
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import Group
+from django.core.cache import cache
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase, APIClient
+
+from empleados.dashboard import obtener_dashboard
+from empleados.models import Empleado
+from empleados.permissions import CLAVE_CACHE_GRUPOS
+
+User = get_user_model()
+
+
+class TestPermisosPorGrupo(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.gerentes = Group.objects.create(name='Gerente')
+        self.usuario = User.objects.create_user(username='gerente', password='clave123', role='gerente')
+        self.usuario.groups.add(self.gerentes)
+        self.client = APIClient()
+        self.autenticar()
+        obtener_dashboard()  # el dashboard en caché deja sólo las consultas de autenticación y permisos
+        self.url = reverse('empleado-dashboard')
+
+    def autenticar(self):
+        response = self.client.post(reverse('token_obtain_pair'), {'username': 'gerente', 'password': 'clave123'})
+        self.token = response.data['access']
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {self.token}')
+
+    def test_listado_autenticado_numero_de_consultas(self):
+        Empleado.objects.create(
+            num_empleado="E001", nombres="Juan", apellido_paterno="Pérez", apellido_materno="Gómez",
+            fecha_nacimiento="1990-01-01", genero="Masculino", estado_civil="Soltero", curp="CURPE001",
+            rfc="RFCE001", nss="NSSE001", telefono="5551234567", email="e001@example.com",
+            puesto="Analista", departamento="TI", fecha_ingreso="2020-01-01",
+        )
+        # usuario del token + COUNT + página
+        with self.assertNumQueries(3):
+            response = self.client.get(reverse('empleado-list-create'))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_grupos_en_cache_entre_peticiones(self):
+        # usuario del token + grupos
+        with self.assertNumQueries(2):
+            self.assertEqual(self.client.get(self.url).status_code, status.HTTP_200_OK)
+        # sólo el usuario del token
+        with self.assertNumQueries(1):
+            self.assertEqual(self.client.get(self.url).status_code, status.HTTP_200_OK)
+
+    @override_settings(PERMISOS_GRUPOS_EN_TOKEN=True)
+    def test_grupos_desde_el_token(self):
+        with self.assertNumQueries(1):
+            self.assertEqual(self.client.get(self.url).status_code, status.HTTP_200_OK)
+
+    def test_invalidacion_al_cambiar_membresia(self):
+        self.assertEqual(self.client.get(self.url).status_code, status.HTTP_200_OK)
+
+        self.usuario.groups.remove(self.gerentes)
+        self.assertEqual(self.client.get(self.url).status_code, status.HTTP_403_FORBIDDEN)
+
+        self.gerentes.user_set.add(self.usuario)
+        self.assertEqual(self.client.get(self.url).status_code, status.HTTP_200_OK)
+
+        self.gerentes.user_set.clear()
+        self.assertEqual(self.client.get(self.url).status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_invalidacion_al_cambiar_rol_o_grupo(self):
+        self.client.get(self.url)
+        clave = CLAVE_CACHE_GRUPOS.format(self.usuario.pk)
+        self.assertEqual(cache.get(clave), ['Gerente'])
+
+        self.usuario.role = 'rrhh'
+        self.usuario.save()
+        self.assertIsNone(cache.get(clave))
+
+        self.autenticar()  # el cambio de rol revoca los tokens anteriores
+        self.client.get(self.url)
+        self.gerentes.delete()
+        self.assertIsNone(cache.get(clave))
+        self.assertEqual(self.client.get(self.url).status_code, status.HTTP_403_FORBIDDEN)
+
+    @override_settings(CACHE_COMPARTIDA=False)
+    def test_sin_cache_compartida_quitar_el_grupo_niega_al_momento(self):
+        self.assertEqual(self.client.get(self.url).status_code, status.HTTP_200_OK)
+
+        self.usuario.groups.remove(self.gerentes)
+        # Otro worker conserva en su caché local los grupos anteriores
+        cache.set(CLAVE_CACHE_GRUPOS.format(self.usuario.pk), ['Gerente'])
+        self.assertEqual(self.client.get(self.url).status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_quitar_el_grupo_invalida_tambien_al_confirmar(self):
+        clave = CLAVE_CACHE_GRUPOS.format(self.usuario.pk)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.usuario.groups.remove(self.gerentes)
+            # Una petición concurrente, antes del commit, vuelve a guardar los grupos viejos
+            cache.set(clave, ['Gerente'])
+        self.assertIsNone(cache.get(clave))
+        self.assertEqual(self.client.get(self.url).status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_token_incluye_grupos(self):
+        from rest_framework_simplejwt.tokens import AccessToken
+
+        self.assertEqual(AccessToken(self.token)['groups'], ['Gerente'])
@@ -0,0 +1,61 @@
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase, APIClient
+
+from empleados.models import Empleado
+from empleados.serializers import EmpleadoSerializer
+
+User = get_user_model()
+
+
+class TestCamposParciales(APITestCase):
+    def setUp(self):
+        self.super_user = User.objects.create_user(username='superadmin', password='admin123', is_staff=True, is_superuser=True)
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.super_user)
+        self.url = reverse('empleado-list-create')
+        self.empleado = Empleado.objects.create(
+            num_empleado="E001", nombres="Juan", apellido_paterno="Pérez", apellido_materno="Gómez",
+            fecha_nacimiento="1990-01-01", genero="Masculino", estado_civil="Soltero",
+            curp="PEGA900101HDFRZN09", rfc="PEGA900101AAA", nss="12345678901", telefono="5551234567",
+            email="juan.perez@example.com", puesto="Desarrollador", departamento="TI", fecha_ingreso="2020-01-01",
+        )
+
+    def test_listado_proyectado_sin_instancias(self):
+        with mock.patch.object(Empleado, 'from_db', side_effect=AssertionError("no debe instanciar")):
+            response = self.client.get(self.url, {'fields': 'id,nombres,fecha_ingreso'})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['results'], [
+            {'id': self.empleado.pk, 'nombres': 'Juan', 'fecha_ingreso': '2020-01-01'},
+        ])
+
+    def test_proyeccion_conserva_filtros(self):
+        response = self.client.get(self.url, {'fields': 'num_empleado', 'departamento': 'Ventas'})
+        self.assertEqual(response.data['results'], [])
+
+    def test_campos_calculados_usan_el_serializer_completo(self):
+        response = self.client.get(self.url, {'fields': 'id,fotos'})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(set(response.data['results'][0]), {'id', 'fotos'})
+
+    def test_detalle_con_campos(self):
+        url = reverse('empleado-detail', args=[self.empleado.pk])
+        response = self.client.get(url, {'fields': 'nombres,puesto'})
+        self.assertEqual(response.data, {'nombres': 'Juan', 'puesto': 'Desarrollador'})
+
+    def test_campo_desconocido(self):
+        response = self.client.get(self.url, {'fields': 'id,salario'})
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('salario', str(response.data['fields']))
+
+    def test_campos_disponibles_se_calculan_una_vez(self):
+        self.client.get(self.url, {'fields': 'id'})
+        with mock.patch.object(EmpleadoSerializer, 'get_fields', side_effect=AssertionError("no debe reconstruirse")):
+            response = self.client.get(self.url, {'fields': 'id,salario'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
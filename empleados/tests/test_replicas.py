@@ -0,0 +1,181 @@
+from collections import Counter
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.db import OperationalError, connection
+from django.http import HttpResponse
+from django.test import AsyncRequestFactory, SimpleTestCase, override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.response import Response
+from rest_framework.test import APITestCase, APIClient
+
+from empleados import exportacion, replicas
+from empleados.models import Bitacora, Empleado
+from empleados.views import EmpleadoExportPdfAPIView, EmpleadoRetrieveUpdateDestroyAPIView, GetCondicionalMixin
+
+User = get_user_model()
+
+
+class RegistroAlias:
+    """`execute_wrapper` que anota la réplica activa en cada consulta."""
+
+    def __init__(self):
+        self.alias = []
+
+    def __call__(self, execute, sql, params, many, context):
+        self.alias.append(replicas.alias_lectura())
+        return execute(sql, params, many, context)
+
+
+@override_settings(REPLICAS_LECTURA={'replica_1': 2, 'replica_2': 1})
+class TestEnrutadorReplicas(SimpleTestCase):
+    def setUp(self):
+        replicas.reiniciar_estado()
+        self.addCleanup(replicas.reiniciar_estado)
+
+    def test_enrutado(self):
+        enrutador = replicas.EnrutadorReplicas()
+        self.assertEqual(Empleado.objects.all().db, 'default')
+        with replicas.usar_replica('replica_2'):
+            self.assertEqual(Empleado.objects.all().db, 'replica_2')
+            self.assertEqual(enrutador.db_for_write(Empleado), 'default')
+            with replicas.usar_primaria():
+                self.assertEqual(Empleado.objects.all().db, 'default')
+        self.assertFalse(enrutador.allow_migrate('replica_1', 'empleados'))
+        self.assertIsNone(enrutador.allow_migrate('default', 'empleados'))
+
+    def test_turno_ponderado(self):
+        with mock.patch('empleados.replicas._comprobar', return_value=True):
+            elegidas = Counter(replicas.elegir_replica() for _ in range(30))
+        self.assertEqual(elegidas, {'replica_1': 20, 'replica_2': 10})
+
+    def test_replica_caida_se_salta_y_se_recuerda(self):
+        with mock.patch('empleados.replicas._comprobar', side_effect=lambda alias: alias == 'replica_2') as comprobar:
+            self.assertEqual({replicas.elegir_replica() for _ in range(10)}, {'replica_2'})
+        # Una comprobación por réplica mientras no venza
+        self.assertEqual(comprobar.call_count, 2)
+
+        replicas.marcar_caida('replica_2')
+        self.assertIsNone(replicas.elegir_replica())
+
+    def test_comprobar(self):
+        self.assertFalse(replicas._comprobar('no_existe'))
+
+
+class TestLecturaEnReplica(APITestCase):
+    databases = {'default'}
+
+    def setUp(self):
+        replicas.reiniciar_estado()
+        self.addCleanup(replicas.reiniciar_estado)
+        self.usuario = User.objects.create_user(username='superadmin', password='x', is_staff=True, is_superuser=True)
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.usuario)
+        self.empleado = Empleado.objects.create(
+            num_empleado="E001", nombres="Juan", apellido_paterno="Pérez", apellido_materno="Gómez",
+            fecha_nacimiento="1990-01-01", genero="Masculino", estado_civil="Soltero", curp="PEGA900101HDFRZN09",
+            rfc="PEGA900101AAA", nss="12345678901", telefono="5551234567", email="juan@example.com",
+            puesto="Desarrollador", departamento="TI", fecha_ingreso="2020-01-01",
+        )
+        self.url = reverse('empleado-detail', args=[self.empleado.pk])
+        # La misma base hace de réplica: se comprueba qué alias está activo en cada consulta
+        ajustes = override_settings(REPLICAS_LECTURA={'default': 1})
+        ajustes.enable()
+        self.addCleanup(ajustes.disable)
+
+    def alias_de(self, metodo, url, **datos):
+        registro = RegistroAlias()
+        with connection.execute_wrapper(registro):
+            respuesta = getattr(self.client, metodo)(url, datos, format='json')
+        return respuesta, registro.alias
+
+    def test_get_lee_de_la_replica(self):
+        respuesta, alias = self.alias_de('get', self.url)
+        self.assertEqual(respuesta.status_code, status.HTTP_200_OK)
+        self.assertIn('default', alias)
+        self.assertIsNone(replicas.alias_lectura())
+
+    async def test_get_asincrono_lee_de_la_replica(self):
+        request = AsyncRequestFactory().get(self.url)
+        request._force_auth_user = self.usuario
+        # Las consultas asíncronas corren en otro hilo: se anota lo que decide el enrutador
+        decisiones = []
+
+        def db_for_read(enrutador, model, **hints):
+            decisiones.append(replicas.alias_lectura())
+            return decisiones[-1]
+
+        with mock.patch.object(replicas.EnrutadorReplicas, 'db_for_read', autospec=True, side_effect=db_for_read):
+            respuesta = await EmpleadoRetrieveUpdateDestroyAPIView.as_view_async()(request, pk=self.empleado.pk)
+        self.assertEqual(respuesta.status_code, status.HTTP_200_OK)
+        self.assertIn('default', decisiones)
+
+    def test_lectura_propia_tras_escribir(self):
+        respuesta, alias = self.alias_de('patch', self.url, puesto='Líder técnico')
+        self.assertEqual(respuesta.status_code, status.HTTP_200_OK)
+        self.assertEqual(set(alias), {None})
+
+        respuesta, alias = self.alias_de('get', self.url)
+        self.assertEqual(respuesta.data['puesto'], 'Líder técnico')
+        self.assertEqual(set(alias), {None})
+
+        replicas.cache.delete(replicas.clave_lectura_propia(self.usuario.pk))
+        self.assertIn('default', self.alias_de('get', self.url)[1])
+
+    def test_cache_compartida_se_llena_desde_la_primaria(self):
+        Bitacora.objects.create(usuario=self.usuario, modelo_afectado='Empleado', objeto_id=1, accion='CREACIÓN')
+        respuesta, alias = self.alias_de('get', reverse('bitacora-list'))
+        self.assertEqual((respuesta.status_code, respuesta['X-Cache']), (status.HTTP_200_OK, 'MISS'))
+        self.assertEqual(set(alias), {None})
+
+    def test_error_en_la_replica_repite_en_la_primaria(self):
+        respuestas = [OperationalError('réplica caída'), Response({'ok': True})]
+        activos = []
+
+        def get(vista, request, *args, **kwargs):
+            activos.append(replicas.alias_lectura())
+            respuesta = respuestas.pop(0)
+            if isinstance(respuesta, Exception):
+                raise respuesta
+            return respuesta
+
+        with mock.patch.object(GetCondicionalMixin, 'get', autospec=True, side_effect=get):
+            respuesta = self.client.get(self.url)
+        self.assertEqual(respuesta.status_code, status.HTTP_200_OK)
+        self.assertEqual(activos, ['default', None])
+        self.assertIsNone(replicas.elegir_replica())
+
+    @override_settings(EXPORTACIONES_CACHE_SEGUNDOS=0)
+    def test_repetir_en_la_primaria_no_duplica_la_bitacora(self):
+        respuestas = [OperationalError('réplica caída'), HttpResponse(b'%PDF', content_type='application/pdf')]
+
+        def respuesta_generada(vista, empleados):
+            respuesta = respuestas.pop(0)
+            if isinstance(respuesta, Exception):
+                raise respuesta
+            return respuesta
+
+        with mock.patch.object(EmpleadoExportPdfAPIView, 'respuesta_generada', autospec=True, side_effect=respuesta_generada):
+            respuesta = self.client.get(reverse('empleados-export-pdf'))
+        self.assertEqual(respuesta.status_code, status.HTTP_200_OK)
+        self.assertEqual(Bitacora.objects.filter(accion='Exportación a PDF').count(), 1)
+
+    def test_streaming_repite_en_la_primaria_antes_del_primer_bloque(self):
+        generar = exportacion.generar_exportacion_streaming
+        llamadas = []
+
+        def generar_con_fallo(formato, queryset):
+            llamadas.append(queryset.db)
+            if len(llamadas) == 1:
+                raise OperationalError('réplica caída')
+            return generar(formato, queryset)
+
+        with mock.patch('empleados.views.generar_exportacion_streaming', side_effect=generar_con_fallo):
+            respuesta = self.client.get(reverse('empleado-exportar'), {'formato': 'ndjson'})
+            contenido = b''.join(respuesta.streaming_content)
+        self.assertEqual(respuesta.status_code, status.HTTP_200_OK)
+        self.assertEqual(contenido.count(b'\n'), 1)
+        self.assertEqual(Bitacora.objects.filter(accion='Exportación a NDJSON').count(), 1)
+        self.assertEqual(llamadas, ['default', 'default'])
+        self.assertIsNone(replicas.elegir_replica())
@@ -0,0 +1,103 @@
+import threading
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TransactionTestCase, override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase, APIClient
+
+from empleados.models import Empleado
+from empleados.serializers import EmpleadoSerializer
+
+User = get_user_model()
+
+
+def datos_empleado(**cambios):
+    return {
+        "num_empleado": "E001", "nombres": "Juan", "apellido_paterno": "Pérez", "apellido_materno": "Gómez",
+        "fecha_nacimiento": "1990-01-01", "genero": "Masculino", "estado_civil": "Soltero",
+        "curp": "PEGA900101HDFRZN09", "rfc": "PEGA900101AAA", "nss": "12345678901", "telefono": "5551234567",
+        "email": "juan.perez@example.com", "puesto": "Desarrollador", "departamento": "TI",
+        "fecha_ingreso": "2020-01-01", "activo": True, **cambios,
+    }
+
+
+OTRO_EMPLEADO = {
+    'num_empleado': "E002", 'curp': "LOMA850505MDFRRN02", 'rfc': "LOMA850505BBB", 'nss': "98765432109",
+    'email': "ana@example.com",
+}
+
+
+class TestUnicidadEmpleado(APITestCase):
+    def setUp(self):
+        self.super_user = User.objects.create_user(username='superadmin', password='admin123', is_staff=True, is_superuser=True)
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.super_user)
+        self.empleado = Empleado.objects.create(**datos_empleado())
+
+    def test_una_sola_consulta_para_todos_los_campos_unicos(self):
+        serializer = EmpleadoSerializer(data=datos_empleado(**OTRO_EMPLEADO))
+        with self.assertNumQueries(1):
+            self.assertTrue(serializer.is_valid(), serializer.errors)
+
+    def test_reporta_cada_campo_en_conflicto(self):
+        serializer = EmpleadoSerializer(data=datos_empleado(num_empleado="E002", nss="98765432109"))
+        with self.assertNumQueries(1):
+            self.assertFalse(serializer.is_valid())
+        self.assertEqual(serializer.errors, {
+            'curp': ["Ya existe un empleado con este CURP."],
+            'rfc': ["Ya existe un empleado con este RFC."],
+            'email': ["Ya existe un empleado con este email."],
+        })
+
+    def test_edicion_excluye_al_propio_empleado(self):
+        serializer = EmpleadoSerializer(self.empleado, data={'curp': self.empleado.curp}, partial=True)
+        self.assertTrue(serializer.is_valid(), serializer.errors)
+
+    @override_settings(UNICIDAD_MODO='restriccion')
+    def test_modo_restriccion_traduce_integrity_error(self):
+        datos = datos_empleado(**{**OTRO_EMPLEADO, 'rfc': self.empleado.rfc})
+        serializer = EmpleadoSerializer(data=datos)
+        with self.assertNumQueries(0):
+            self.assertTrue(serializer.is_valid(), serializer.errors)
+
+        response = self.client.post(reverse('empleado-list-create'), datos, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data, {'rfc': ["Ya existe un empleado con este RFC."]})
+        self.assertEqual(Empleado.objects.count(), 1)
+
+
+class TestAltasSimultaneas(TransactionTestCase):
+    def test_altas_simultaneas_con_el_mismo_curp(self):
+        if connection.vendor == 'sqlite' and connection.is_in_memory_db():
+            self.skipTest("SQLite en memoria no admite escrituras concurrentes desde varios hilos.")
+
+        usuario = User.objects.create_user(username='superadmin', password='admin123', is_staff=True, is_superuser=True)
+        barrera = threading.Barrier(2)
+        respuestas = []
+
+        def alta(numero):
+            client = APIClient()
+            client.force_authenticate(user=usuario)
+            datos = datos_empleado(
+                num_empleado=f"E00{numero}", email=f"e{numero}@example.com", rfc=f"PEGA90010{numero}AAA", nss=f"1234567890{numero}"
+            )
+            barrera.wait()
+            try:
+                respuestas.append(client.post(reverse('empleado-list-create'), datos, format='json'))
+            finally:
+                connection.close()
+
+        with override_settings(UNICIDAD_MODO='restriccion'):
+            hilos = [threading.Thread(target=alta, args=(numero,)) for numero in (1, 2)]
+            for hilo in hilos:
+                hilo.start()
+            for hilo in hilos:
+                hilo.join()
+
+        codigos = sorted(respuesta.status_code for respuesta in respuestas)
+        self.assertEqual(codigos, [status.HTTP_201_CREATED, status.HTTP_400_BAD_REQUEST])
+        rechazada = next(respuesta for respuesta in respuestas if respuesta.status_code == status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(rechazada.data, {'curp': ["Ya existe un empleado con este CURP."]})
+        self.assertEqual(Empleado.objects.count(), 1)
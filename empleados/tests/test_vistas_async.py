@@ -0,0 +1,123 @@
+from asgiref.sync import sync_to_async
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import AsyncRequestFactory
+from rest_framework import status
+from rest_framework.test import APIRequestFactory, APITestCase, force_authenticate
+
+from empleados.models import Empleado
+from empleados.utils import registrar_bitacora
+from empleados.views import (
+    BitacoraEmpleadoAPIView,
+    BitacoraListView,
+    EmpleadoDashboardAPIView,
+    EmpleadoListCreateAPIView,
+    EmpleadoRetrieveUpdateDestroyAPIView,
+)
+
+User = get_user_model()
+
+
+def datos_empleado(numero, **extra):
+    return {
+        "num_empleado": f"E{numero:03d}", "nombres": "Juan", "apellido_paterno": "Pérez", "apellido_materno": "Gómez",
+        "fecha_nacimiento": "1990-01-01", "genero": "Masculino", "estado_civil": "Soltero",
+        "curp": f"PEGA900101HDFRZN{numero:02d}", "rfc": f"PEGA900101{numero:03d}", "nss": f"{numero:011d}",
+        "telefono": "5551234567", "email": f"e{numero}@example.com", "puesto": "Desarrollador", "departamento": "TI",
+        "fecha_ingreso": "2020-01-01", **extra,
+    }
+
+
+class TestVistasAsync(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.super_user = User.objects.create_user(username='superadmin', password='admin123', is_staff=True, is_superuser=True)
+        # El feed de cambios (versión del detalle) se escribe al confirmar
+        with self.captureOnCommitCallbacks(execute=True):
+            for numero in range(1, 13):
+                Empleado.objects.create(**datos_empleado(numero, departamento='TI' if numero % 2 else 'Ventas'))
+        self.empleado = Empleado.objects.first()
+
+    async def pedir(self, clase, ruta, datos=None, usuario=None, **kwargs):
+        """GET con `as_view_async()`, fuera del enrutador (VISTAS_ASYNC es de arranque)."""
+        request = AsyncRequestFactory().get(ruta, datos or {}, headers=kwargs.pop('encabezados', None))
+        request._force_auth_user = usuario or self.super_user
+        respuesta = await clase.as_view_async()(request, **kwargs)
+        return respuesta.render() if hasattr(respuesta, 'render') else respuesta
+
+    def pedir_sincrono(self, clase, ruta, datos=None, **kwargs):
+        request = APIRequestFactory().get(ruta, datos or {})
+        force_authenticate(request, user=self.super_user)
+        return clase.as_view()(request, **kwargs).render()
+
+    async def test_listado_igual_al_sincrono(self):
+        for datos in ({}, {'departamento': 'TI', 'ordering': '-id'}, {'page': 'last'}, {'fields': 'id,nombres'}):
+            await sync_to_async(cache.clear)()
+            esperado = await sync_to_async(self.pedir_sincrono)(EmpleadoListCreateAPIView, '/api/empleados/', datos)
+            await sync_to_async(cache.clear)()
+            respuesta = await self.pedir(EmpleadoListCreateAPIView, '/api/empleados/', datos)
+            self.assertEqual(respuesta.status_code, status.HTTP_200_OK)
+            self.assertEqual(respuesta.data, esperado.data)
+
+    async def test_pagina_inexistente(self):
+        respuesta = await self.pedir(EmpleadoListCreateAPIView, '/api/empleados/', {'page': 99})
+        self.assertEqual(respuesta.status_code, status.HTTP_404_NOT_FOUND)
+
+    async def test_cache_y_304(self):
+        primera = await self.pedir(EmpleadoListCreateAPIView, '/api/empleados/')
+        self.assertEqual(primera['X-Cache'], 'MISS')
+        segunda = await self.pedir(EmpleadoListCreateAPIView, '/api/empleados/', encabezados={'If-None-Match': primera['ETag']})
+        self.assertEqual(segunda.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual((await self.pedir(EmpleadoListCreateAPIView, '/api/empleados/'))['X-Cache'], 'HIT')
+
+    async def test_detalle(self):
+        ruta = f'/api/empleados/{self.empleado.pk}/'
+        respuesta = await self.pedir(EmpleadoRetrieveUpdateDestroyAPIView, ruta, pk=self.empleado.pk)
+        self.assertEqual(respuesta.status_code, status.HTTP_200_OK)
+        self.assertEqual(respuesta.data['num_empleado'], self.empleado.num_empleado)
+
+        condicional = await self.pedir(
+            EmpleadoRetrieveUpdateDestroyAPIView, ruta, pk=self.empleado.pk, encabezados={'If-None-Match': respuesta['ETag']}
+        )
+        self.assertEqual(condicional.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        faltante = await self.pedir(EmpleadoRetrieveUpdateDestroyAPIView, '/api/empleados/0/', pk=0)
+        self.assertEqual(faltante.status_code, status.HTTP_404_NOT_FOUND)
+
+    async def test_permisos(self):
+        empleado = await User.objects.acreate(username='empleado', password='x', role='empleado')
+        respuesta = await self.pedir(EmpleadoDashboardAPIView, '/api/empleados/dashboard/', usuario=empleado)
+        self.assertEqual(respuesta.status_code, status.HTTP_403_FORBIDDEN)
+
+        request = AsyncRequestFactory().get('/api/empleados/')
+        respuesta = (await EmpleadoListCreateAPIView.as_view_async()(request)).render()
+        self.assertEqual(respuesta.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    async def test_dashboard(self):
+        respuesta = await self.pedir(EmpleadoDashboardAPIView, '/api/empleados/dashboard/')
+        self.assertEqual(respuesta.status_code, status.HTTP_200_OK)
+        self.assertEqual(respuesta.data['total_empleados'], 12)
+
+    async def test_bitacoras(self):
+        await sync_to_async(registrar_bitacora)(self.empleado, 'EDICIÓN', usuario=self.super_user, cambios={'puesto': 'x'})
+
+        respuesta = await self.pedir(BitacoraEmpleadoAPIView, '/api/bitacora/', {'archivo': 'incluir'}, empleado_id=self.empleado.pk)
+        self.assertEqual(respuesta.status_code, status.HTTP_200_OK)
+        self.assertEqual(respuesta.data['results'][0]['usuario'], str(self.super_user))
+
+        # El filtro por usuario valida contra la base de datos antes de entrar al bucle
+        respuesta = await self.pedir(BitacoraListView, '/api/bitacora/', {'usuario': self.super_user.pk, 'archivo': 'incluir'})
+        self.assertEqual(respuesta.status_code, status.HTTP_200_OK)
+        esperado = await sync_to_async(self.pedir_sincrono)(
+            BitacoraListView, '/api/bitacora/', {'usuario': self.super_user.pk, 'archivo': 'incluir', 'page_size': 5}
+        )
+        self.assertEqual(len(esperado.data['results']), min(5, len(respuesta.data['results'])))
+
+    async def test_escritura_usa_la_vista_sincrona(self):
+        request = AsyncRequestFactory().patch(
+            f'/api/empleados/{self.empleado.pk}/', {'puesto': 'Gerente'}, content_type='application/json'
+        )
+        request._force_auth_user = self.super_user
+        respuesta = (await EmpleadoRetrieveUpdateDestroyAPIView.as_view_async()(request, pk=self.empleado.pk)).render()
+        self.assertEqual(respuesta.status_code, status.HTTP_200_OK)
+        self.assertEqual((await Empleado.objects.aget(pk=self.empleado.pk)).puesto, 'Gerente')
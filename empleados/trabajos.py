@@ -0,0 +1,110 @@
+import json
+import tempfile
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.files import File
+from django.db.models import Q
+from django.utils.timezone import now
+
+from .exportacion import FORMATOS_EXPORTACION, escribir_exportacion
+from .filters import PARAMETROS_FILTRO_EMPLEADOS, filtrar_empleados
+from .models import TrabajoExportacion
+from .utils import id_usuario, registrar_exportacion_empleados
+
+
+def encolar_exportacion(usuario, formato, filtros):
+    """
+    Crea un trabajo de exportación pendiente. Solo se guardan los parámetros
+    que entiende el listado de empleados.
+    """
+    filtros = {clave: valor for clave, valor in (filtros or {}).items() if clave in PARAMETROS_FILTRO_EMPLEADOS}
+    return TrabajoExportacion.objects.create(
+        usuario_id=id_usuario(usuario),
+        formato=formato,
+        filtros=json.dumps(filtros, ensure_ascii=False),
+    )
+
+
+def _reclamables():
+    # Un trabajo EN_PROCESO más antiguo que el límite quedó abandonado: el proceso
+    # `procesar_exportaciones` que lo tomó se cayó o lo detuvieron sin terminarlo
+    limite = now() - timedelta(seconds=settings.EXPORTACIONES_TIEMPO_MAXIMO_SEGUNDOS)
+    return Q(estado='PENDIENTE') | Q(estado='EN_PROCESO', iniciado__lt=limite)
+
+
+def reclamar_trabajos(limite):
+    """
+    Marca como EN_PROCESO hasta `limite` trabajos pendientes o abandonados
+    (EN_PROCESO desde hace más de EXPORTACIONES_TIEMPO_MAXIMO_SEGUNDOS) y
+    devuelve sus ids.
+
+    El cambio de estado es un UPDATE condicional, así que varios procesos
+    `procesar_exportaciones` pueden compartir la misma cola sin tomar el mismo trabajo.
+    """
+    candidatos = TrabajoExportacion.objects.filter(_reclamables()).order_by('creado').values_list('id', flat=True)[:limite]
+    reclamados = []
+    for trabajo_id in list(candidatos):
+        if TrabajoExportacion.objects.filter(_reclamables(), pk=trabajo_id).update(estado='EN_PROCESO', iniciado=now()):
+            reclamados.append(trabajo_id)
+    return reclamados
+
+
+def devolver_trabajos(trabajo_ids):
+    """Devuelve a la cola trabajos reclamados que no llegaron a empezar."""
+    TrabajoExportacion.objects.filter(pk__in=trabajo_ids, estado='EN_PROCESO').update(estado='PENDIENTE', iniciado=None)
+
+
+def fallar_trabajos(trabajo_ids, error):
+    """Marca como ERROR trabajos en curso que ya no van a terminar (p. ej. su proceso murió)."""
+    TrabajoExportacion.objects.filter(pk__in=trabajo_ids, estado='EN_PROCESO').update(
+        estado='ERROR', error=error, finalizado=now(),
+    )
+
+
+def procesar_trabajo(trabajo_id):
+    """
+    Genera el archivo de un trabajo reclamado y lo guarda bajo MEDIA_ROOT.
+    Registra en la bitácora el inicio y el fin del trabajo con su duración.
+    Cualquier error, incluso al leer el trabajo, lo deja en ERROR.
+
+    El resultado sólo se escribe si el trabajo sigue EN_PROCESO con el mismo
+    `iniciado` que tenía al empezar. Si otro proceso lo reclamó por abandonado
+    mientras tanto, el resultado de esta ejecución se descarta (incluido el
+    archivo generado) y se devuelve 'DESCARTADO'.
+    """
+    trabajo = tipo = None
+    inicio = time.perf_counter()
+    try:
+        trabajo = TrabajoExportacion.objects.select_related('usuario').get(pk=trabajo_id)
+        tipo, extension, _ = FORMATOS_EXPORTACION[trabajo.formato]
+        registrar_exportacion_empleados(None, tipo, usuario=trabajo.usuario, trabajo=trabajo.pk, evento='inicio')
+
+        empleados = filtrar_empleados(json.loads(trabajo.filtros or '{}'))
+        with tempfile.TemporaryFile() as temporal:
+            escribir_exportacion(trabajo.formato, empleados, temporal)
+            temporal.seek(0)
+            nombre = f"empleados_{trabajo.pk}_{now():%Y%m%d%H%M%S}.{extension}"
+            trabajo.archivo.save(nombre, File(temporal), save=False)
+        estado, error = 'COMPLETADO', ''
+    except Exception as exc:
+        estado, error = 'ERROR', str(exc)
+    duracion = round(time.perf_counter() - inicio, 3)
+
+    if trabajo is None:
+        fallar_trabajos([trabajo_id], error)
+        return estado
+    vigente = TrabajoExportacion.objects.filter(pk=trabajo.pk, estado='EN_PROCESO', iniciado=trabajo.iniciado).update(
+        estado=estado, archivo=trabajo.archivo.name, error=error, finalizado=now(),
+    )
+    if not vigente:
+        if trabajo.archivo:
+            trabajo.archivo.delete(save=False)
+        estado = 'DESCARTADO'
+    if tipo is not None:
+        registrar_exportacion_empleados(
+            None, tipo, usuario=trabajo.usuario, trabajo=trabajo.pk, evento='fin',
+            estado=estado, duracion_segundos=duracion,
+        )
+    return estado
@@ -1,36 +1,68 @@
+from django.conf import settings
 from django.urls import path
 from rest_framework_simplejwt.views import TokenRefreshView
 
 from .views import (
     EmpleadoListCreateAPIView,
     EmpleadoRetrieveUpdateDestroyAPIView,
+    EmpleadoBusquedaAPIView,
+    EmpleadoCambiosAPIView,
     EmpleadoDashboardAPIView,
+    EmpleadoImportacionAPIView,
     EmpleadoExportExcelAPIView,
     EmpleadoExportPdfAPIView,
+    EmpleadoExportStreamingAPIView,
+    ExportacionEmpleadosAPIView,
+    ExportacionEstadoAPIView,
+    ExportacionDescargaAPIView,
     BitacoraListView,
     BitacoraEmpleadoAPIView,
+    EstadisticasCacheAPIView,
+    RevocarTokenAPIView,
 )
 
 from rest_framework_simplejwt.views import TokenObtainPairView
+from .autenticacion import TokenRefreshConRevocacionSerializer
 from .serializers import CustomTokenObtainPairSerializer
 
 # ✅ Vista personalizada que devuelve el rol en el token
 class CustomTokenView(TokenObtainPairView):
     serializer_class = CustomTokenObtainPairSerializer
 
+
+# ✅ Renovación que respeta la revocación de tokens
+class CustomTokenRefreshView(TokenRefreshView):
+    serializer_class = TokenRefreshConRevocacionSerializer
+
+
+# ✅ Vistas de lectura con GET asíncrono bajo ASGI (ver empleados.vistas_async)
+def vista_lectura(clase):
+    return clase.as_view_async() if settings.VISTAS_ASYNC else clase.as_view()
+
 urlpatterns = [
     # ✅ Autenticación
     path('token/', CustomTokenView.as_view(), name='token_obtain_pair'),
-    path('token/refresh/', TokenRefreshView.as_view(), name='token_refresh'),
+    path('token/refresh/', CustomTokenRefreshView.as_view(), name='token_refresh'),
+    path('token/revocar/', RevocarTokenAPIView.as_view(), name='token_revocar'),
 
     # ✅ Empleados
-    path('empleados/', EmpleadoListCreateAPIView.as_view(), name='empleado-list-create'),
-    path('empleados/<int:pk>/', EmpleadoRetrieveUpdateDestroyAPIView.as_view(), name='empleado-detail'),
-    path('empleados/dashboard/', EmpleadoDashboardAPIView.as_view(), name='empleado-dashboard'),
+    path('empleados/', vista_lectura(EmpleadoListCreateAPIView), name='empleado-list-create'),
+    path('empleados/<int:pk>/', vista_lectura(EmpleadoRetrieveUpdateDestroyAPIView), name='empleado-detail'),
+    path('empleados/buscar/', EmpleadoBusquedaAPIView.as_view(), name='empleado-buscar'),
+    path('empleados/cambios/', EmpleadoCambiosAPIView.as_view(), name='empleado-cambios'),
+    path('empleados/importar/', EmpleadoImportacionAPIView.as_view(), name='empleado-importar'),
+    path('empleados/dashboard/', vista_lectura(EmpleadoDashboardAPIView), name='empleado-dashboard'),
     path('empleados/exportar-excel/', EmpleadoExportExcelAPIView.as_view(), name='empleado-exportar-excel'),
     path('empleados/export/pdf/', EmpleadoExportPdfAPIView.as_view(), name='empleados-export-pdf'),
+    path('empleados/exportar/', EmpleadoExportStreamingAPIView.as_view(), name='empleado-exportar'),
+    path('empleados/exportaciones/', ExportacionEmpleadosAPIView.as_view(), name='exportacion-crear'),
+    path('empleados/exportaciones/<int:pk>/', ExportacionEstadoAPIView.as_view(), name='exportacion-estado'),
+    path('empleados/exportaciones/<int:pk>/descargar/', ExportacionDescargaAPIView.as_view(), name='exportacion-descargar'),
 
     # ✅ Bitácora
-    path('bitacora/', BitacoraListView.as_view(), name='bitacora-list'),
-    path('bitacora/empleado/<int:empleado_id>/', BitacoraEmpleadoAPIView.as_view(), name='bitacora-empleado'),
+    path('bitacora/', vista_lectura(BitacoraListView), name='bitacora-list'),
+    path('bitacora/empleado/<int:empleado_id>/', vista_lectura(BitacoraEmpleadoAPIView), name='bitacora-empleado'),
+
+    # ✅ Caché de respuestas
+    path('cache/estadisticas/', EstadisticasCacheAPIView.as_view(), name='cache-estadisticas'),
 ]
\ No newline at end of file
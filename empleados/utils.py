@@ -1,7 +1,15 @@
-import json
+from .auditoria import encolar, serializar_cambios
 from .models import Bitacora, BitacoraEmpleado, Empleado
 
 
+def id_usuario(usuario):
+    """
+    Id del usuario autenticado, o None. Las bitácoras guardan sólo el id para
+    aceptar tanto `CustomUser` como el usuario del token JWT (sin consultarlo).
+    """
+    return usuario.pk if usuario and getattr(usuario, "is_authenticated", False) else None
+
+
 def registrar_bitacora(instancia, accion, usuario=None, cambios=None, instancia_anterior=None):
     """
     Registra una entrada en la bitácora general del sistema y en la bitácora de empleados (si aplica).
@@ -36,15 +44,15 @@ def registrar_bitacora(instancia, accion, usuario=None, cambios=None, instancia_
             for field in instancia._meta.fields
         }
 
-    # Serializar cambios a JSON
-    cambios_json = json.dumps(cambios or {}, ensure_ascii=False, indent=2)
+    # Serializar cambios a JSON compacto
+    cambios_json = serializar_cambios(cambios)
 
     # Validar usuario autenticado
-    usuario_valido = usuario if usuario and getattr(usuario, "is_authenticated", False) else None
+    usuario_id = id_usuario(usuario)
 
     # === Bitácora general ===
-    Bitacora.objects.create(
-        usuario=usuario_valido,
+    general = Bitacora(
+        usuario_id=usuario_id,
         modelo_afectado=modelo_nombre,
         objeto_id=objeto_id,
         accion=accion,
@@ -52,44 +60,83 @@ def registrar_bitacora(instancia, accion, usuario=None, cambios=None, instancia_
     )
 
     # === Bitácora específica de empleados ===
-    if isinstance(instancia, Empleado):
-        BitacoraEmpleado.objects.create(
+    # En una eliminación la fila se borraría en cascada junto con el empleado
+    detalle_empleado = None
+    if isinstance(instancia, Empleado) and accion not in ('ELIMINACIÓN', 'eliminado'):
+        detalle_empleado = BitacoraEmpleado(
             empleado=instancia,
-            usuario=usuario_valido,
+            usuario_id=usuario_id,
             accion=accion,
             detalles=f"Cambio detectado:\n{cambios_json}"
         )
 
+    encolar(general, detalle_empleado)
+
 
-def registrar_exportacion_empleados(request, tipo_exportacion):
+def registrar_bitacora_masiva(instancias, accion, usuario=None, cambios=None):
     """
-    Registra una exportación masiva de empleados (Excel o PDF).
+    Registra la misma acción para muchos objetos con dos `bulk_create`
+    (bitácora general y bitácora de empleados) en lugar de dos INSERT por objeto.
     """
-    usuario_valido = request.user if request.user and request.user.is_authenticated else None
+    cambios_json = serializar_cambios(cambios)
+    usuario_id = id_usuario(usuario)
 
-    Bitacora.objects.create(
-        usuario=usuario_valido,
+    Bitacora.objects.bulk_create([
+        Bitacora(
+            usuario_id=usuario_id,
+            modelo_afectado=instancia.__class__.__name__,
+            objeto_id=instancia.pk,
+            accion=accion,
+            cambios=cambios_json
+        )
+        for instancia in instancias
+    ])
+    BitacoraEmpleado.objects.bulk_create([
+        BitacoraEmpleado(
+            empleado=instancia,
+            usuario_id=usuario_id,
+            accion=accion,
+            detalles=f"Cambio detectado:\n{cambios_json}"
+        )
+        for instancia in instancias if isinstance(instancia, Empleado)
+    ])
+
+
+def registrar_exportacion_empleados(request, tipo_exportacion, usuario=None, **detalles):
+    """
+    Registra una exportación masiva de empleados (Excel, PDF, CSV o NDJSON).
+
+    Los trabajos en segundo plano no tienen `request`: pasan `usuario` y los
+    datos del trabajo (id, evento, duración...) como `detalles` adicionales.
+    """
+    if request is not None:
+        usuario = request.user
+    usuario_id = id_usuario(usuario)
+
+    encolar(Bitacora(
+        usuario_id=usuario_id,
         modelo_afectado='Empleado',
         objeto_id=0,
         accion=f"Exportación a {tipo_exportacion}",
-        cambios=json.dumps({
-            "detalle": f"Exportación masiva de empleados a {tipo_exportacion.upper()}"
-        }, ensure_ascii=False, indent=2)
-    )
+        cambios=serializar_cambios({
+            "detalle": f"Exportación masiva de empleados a {tipo_exportacion.upper()}",
+            **detalles,
+        })
+    ))
 
 
 def registrar_intento_fallido_exportacion(request, tipo_exportacion):
     """
     Registra un intento fallido de exportación por falta de permisos.
     """
-    usuario_valido = request.user if request.user and request.user.is_authenticated else None
+    usuario_id = id_usuario(request.user)
 
-    Bitacora.objects.create(
-        usuario=usuario_valido,
+    encolar(Bitacora(
+        usuario_id=usuario_id,
         modelo_afectado='Empleado',
         objeto_id=0,
         accion=f"Intento fallido de exportación a {tipo_exportacion}",
-        cambios=json.dumps({
+        cambios=serializar_cambios({
             "detalle": f"Intento NO autorizado de exportar empleados a {tipo_exportacion.upper()}"
-        }, ensure_ascii=False, indent=2)
-    )
+        })
+    ))
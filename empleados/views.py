@@ -1,26 +1,90 @@
-from datetime import date, datetime
-
-from django.db.models import Count
-from django.http import HttpResponse
-from django.template.loader import render_to_string
+import re
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import OperationalError, transaction
+from django.http import FileResponse, HttpResponse, StreamingHttpResponse
+from django.utils.cache import patch_vary_headers
+from django.utils.text import compress_sequence
 from django.utils.timezone import now
 from django_filters.rest_framework import DjangoFilterBackend
-from openpyxl import Workbook
-from openpyxl.utils import get_column_letter
-from rest_framework import generics, filters, permissions
+from rest_framework import generics, filters, permissions, status
+from rest_framework.parsers import FormParser, JSONParser, MultiPartParser
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.views import APIView
 from rest_framework.exceptions import PermissionDenied, ValidationError
-from weasyprint import HTML
-
-from .models import Empleado, Bitacora, BitacoraEmpleado
-from .permissions import IsRRHHOrAdmin, IsGerenteOrAdmin, IsSuperAdmin
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from .auditoria import auditoria_explicita, auditoria_retenida
+from .autenticacion import revocaciones
+from .cache_exportaciones import (
+    buscar_exportacion,
+    cache_exportaciones_activa,
+    filtros_exportacion,
+    guardar_bloques,
+    guardar_exportacion,
+    respuesta_exportacion,
+    ruta_exportacion,
+)
+from .cache_respuestas import cache_activa, clave_respuesta, estadisticas_cache, guardar_respuesta, obtener_respuesta
+from .condicional import (
+    agregar_validadores,
+    avalidadores_empleado,
+    respuesta_condicional,
+    validadores_dashboard,
+    validadores_empleado,
+    validadores_empleados,
+)
+from .dashboard import aobtener_dashboard, obtener_dashboard
+from .exportacion import (
+    ENCABEZADOS_EXPORTACION,
+    FORMATOS_EXPORTACION,
+    FORMATOS_STREAMING,
+    anchos_columnas,
+    filas_exportacion,
+    generar_exportacion_streaming,
+    generar_xlsx,
+    renderizar_pdf_empleados,
+)
+from .busqueda import LIMITE_RESULTADOS, buscar_empleados
+from .filters import (
+    BitacoraArchivadaFilter,
+    BitacoraFilter,
+    BusquedaNormalizadaFilter,
+    EmpleadoFilter,
+    FilterSetPorModeloBackend,
+    EMPLEADO_SEARCH_FIELDS,
+    EMPLEADO_ORDERING_FIELDS,
+    PARAMETROS_FILTRO_EMPLEADOS,
+    filtrar_empleados,
+)
+from .importacion import importar_empleados, leer_csv, leer_json, leer_xlsx
+from .models import (
+    Empleado,
+    CambioEmpleado,
+    Bitacora,
+    BitacoraArchivada,
+    BitacoraEmpleado,
+    BitacoraEmpleadoArchivada,
+    TrabajoExportacion,
+)
+from .pagination import BitacoraPagination, CambiosEmpleadoPagination
+from .metricas import TIPO_CONTENIDO_PROMETHEUS, exportar_metricas
+from .permissions import IsRRHHOrAdmin, IsGerenteOrAdmin, IsSuperAdmin, TokenMetricas
+from .replicas import activar_lectura, alias_lectura, bloques_con_respaldo, marcar_caida, replica_para, usar_primaria
 from .serializers import (
+    CAMPOS_PROYECCION_EMPLEADO,
+    EmpleadoProyeccionSerializer,
     EmpleadoSerializer,
     BitacoraSerializer,
     BitacoraEmpleadoSerializer,
+    TrabajoExportacionSerializer,
 )
+from .trabajos import encolar_exportacion
+from .vistas_async import DetalleAsyncMixin, LecturaAsyncMixin, ListaAsyncMixin
 from .utils import (
     registrar_bitacora,
     registrar_exportacion_empleados,
@@ -28,24 +92,231 @@ from .utils import (
 )
 
 
+# 🧩 Campos parciales: ?fields=id,nombres,puesto
+class CamposSolicitadosMixin:
+    parametro_campos = 'fields'
+    # Campos de EmpleadoSerializer; se calculan en la primera petición y no cambian
+    _campos_disponibles = None
+
+    @staticmethod
+    def campos_disponibles():
+        if CamposSolicitadosMixin._campos_disponibles is None:
+            CamposSolicitadosMixin._campos_disponibles = tuple(EmpleadoSerializer().fields)
+        return CamposSolicitadosMixin._campos_disponibles
+
+    def campos_solicitados(self):
+        """Campos pedidos en `?fields=` (None si no se indicó). Sólo aplica a lecturas."""
+        valor = self.request.query_params.get(self.parametro_campos) if self.request.method == 'GET' else None
+        if not valor:
+            return None
+        campos = list(dict.fromkeys(campo.strip() for campo in valor.split(',') if campo.strip()))
+        disponibles = self.campos_disponibles()
+        desconocidos = [campo for campo in campos if campo not in disponibles]
+        if desconocidos:
+            raise ValidationError({
+                self.parametro_campos: f"Campos desconocidos: {', '.join(desconocidos)}. Disponibles: {', '.join(disponibles)}."
+            })
+        return campos
+
+    def get_serializer(self, *args, **kwargs):
+        campos = self.campos_solicitados()
+        if campos is not None:
+            kwargs.setdefault('campos', campos)
+        return super().get_serializer(*args, **kwargs)
+
+
+# 🏷️ GET condicional: ETag / Last-Modified y 304 antes de consultar y serializar
+class GetCondicionalMixin:
+    def validadores(self, request, *args, **kwargs):
+        raise NotImplementedError
+
+    def get(self, request, *args, **kwargs):
+        etag, modificado = self.validadores(request, *args, **kwargs)
+        respuesta = respuesta_condicional(request, etag, modificado)
+        if respuesta is None:
+            respuesta = self.respuesta_completa(request, *args, **kwargs)
+        return agregar_validadores(respuesta, etag, modificado)
+
+    def respuesta_completa(self, request, *args, **kwargs):
+        return super().get(request, *args, **kwargs)
+
+    # Mismo flujo para el GET asíncrono (ver empleados.vistas_async)
+    async def aget(self, request, *args, **kwargs):
+        etag, modificado = await self.avalidadores(request, *args, **kwargs)
+        respuesta = respuesta_condicional(request, etag, modificado)
+        if respuesta is None:
+            respuesta = await self.arespuesta_completa(request, *args, **kwargs)
+        return agregar_validadores(respuesta, etag, modificado)
+
+    async def avalidadores(self, request, *args, **kwargs):
+        # Los de listados y dashboard sólo leen la caché
+        return self.validadores(request, *args, **kwargs)
+
+    async def arespuesta_completa(self, request, *args, **kwargs):
+        return await super().aget(request, *args, **kwargs)
+
+
+# 🗃️ Caché compartida de respuestas de lectura, invalidada por generaciones
+class RespuestaEnCacheMixin:
+    # Conjuntos de datos de los que depende la respuesta (ver cache_respuestas.GENERACIONES)
+    generaciones_cache = ()
+
+    def get(self, request, *args, **kwargs):
+        if not cache_activa():
+            return super().get(request, *args, **kwargs)
+
+        clave = clave_respuesta(request, self, self.generaciones_cache)
+        datos = obtener_respuesta(clave)
+        if datos is not None:
+            respuesta = Response(datos)
+            respuesta['X-Cache'] = 'HIT'
+            return respuesta
+
+        # Queda guardada bajo la generación actual: se calcula en la primaria (ver empleados.replicas)
+        with usar_primaria():
+            respuesta = super().get(request, *args, **kwargs)
+        if respuesta.status_code == status.HTTP_200_OK:
+            guardar_respuesta(clave, respuesta.data)
+        respuesta['X-Cache'] = 'MISS'
+        return respuesta
+
+    async def aget(self, request, *args, **kwargs):
+        if not cache_activa():
+            return await super().aget(request, *args, **kwargs)
+
+        clave = clave_respuesta(request, self, self.generaciones_cache)
+        datos = obtener_respuesta(clave)
+        if datos is not None:
+            respuesta = Response(datos)
+            respuesta['X-Cache'] = 'HIT'
+            return respuesta
+
+        with usar_primaria():
+            respuesta = await super().aget(request, *args, **kwargs)
+        if respuesta.status_code == status.HTTP_200_OK:
+            guardar_respuesta(clave, respuesta.data)
+        respuesta['X-Cache'] = 'MISS'
+        return respuesta
+
+
+# 🪞 Lecturas en réplica (ver empleados.replicas)
+class LecturaEnReplicaMixin:
+    """GET en una réplica de lectura; si una consulta falla, se repite en la primaria."""
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        # Tras autenticar: la lectura propia depende del usuario
+        if not getattr(self, 'replica_descartada', False):
+            activar_lectura(replica_para(request))
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        activar_lectura(None)
+        return super().finalize_response(request, response, *args, **kwargs)
+
+    def descartar_replica(self):
+        alias = alias_lectura()
+        if alias is None:
+            return False
+        marcar_caida(alias)
+        activar_lectura(None)
+        self.replica_descartada = True
+        return True
+
+    def dispatch(self, request, *args, **kwargs):
+        # La bitácora se registra sólo del intento que responde
+        try:
+            with auditoria_retenida():
+                return super().dispatch(request, *args, **kwargs)
+        except OperationalError:
+            if not self.descartar_replica():
+                raise
+        return super().dispatch(request, *args, **kwargs)
+
+    async def adispatch(self, request, *args, **kwargs):
+        try:
+            with auditoria_retenida():
+                return await super().adispatch(request, *args, **kwargs)
+        except OperationalError:
+            if not self.descartar_replica():
+                raise
+        return await super().adispatch(request, *args, **kwargs)
+
+
+# 🚪 Cerrar sesión: revoca los tokens JWT (ver empleados.autenticacion)
+class RevocarTokenAPIView(APIView):
+    """
+    POST {"refresh": "..."} revoca el access token de la petición y ese refresh
+    token; con {"todos": true}, todos los tokens del usuario (todas sus sesiones).
+    """
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request):
+        if str(request.data.get('todos', '')).lower() in ['true', '1', 'yes']:
+            revocaciones.revocar_usuario(request.user.pk)
+            return Response(status=status.HTTP_204_NO_CONTENT)
+
+        tokens = [request.auth] if request.auth is not None else []
+        if request.data.get('refresh'):
+            try:
+                refresh = RefreshToken(request.data['refresh'])
+            except TokenError as exc:
+                raise ValidationError({'refresh': [str(exc)]})
+            if str(refresh.get(api_settings.USER_ID_CLAIM)) != str(request.user.pk):
+                raise ValidationError({'refresh': ["El refresh token no pertenece al usuario autenticado."]})
+            tokens.append(refresh)
+        revocaciones.revocar_token(*tokens)
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+
 # 📄 Listar y Crear empleados
-class EmpleadoListCreateAPIView(generics.ListCreateAPIView):
+class EmpleadoListCreateAPIView(
+    LecturaEnReplicaMixin, GetCondicionalMixin, RespuestaEnCacheMixin, CamposSolicitadosMixin, ListaAsyncMixin,
+    generics.ListCreateAPIView
+):
     queryset = Empleado.objects.all().order_by('id')
     serializer_class = EmpleadoSerializer
-    filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
+    generaciones_cache = ('empleados',)
+    filter_backends = [DjangoFilterBackend, BusquedaNormalizadaFilter, filters.OrderingFilter]
     permission_classes = [IsAuthenticated]
 
-    filterset_fields = ['activo', 'puesto', 'departamento', 'genero', 'estado_civil', 'fecha_ingreso']
-    search_fields = ['nombres', 'apellido_paterno', 'apellido_materno', 'num_empleado', 'curp', 'rfc', 'nss', 'email', 'telefono']
-    ordering_fields = ['num_empleado', 'apellido_paterno', 'apellido_materno', 'fecha_ingreso', 'departamento', 'puesto']
+    filterset_class = EmpleadoFilter
+    search_fields = EMPLEADO_SEARCH_FIELDS
+    ordering_fields = EMPLEADO_ORDERING_FIELDS
 
     def get_permissions(self):
         if self.request.method == 'POST':
             return [IsAuthenticated(), IsRRHHOrAdmin()]
         return super().get_permissions()
 
+    def validadores(self, request, *args, **kwargs):
+        return validadores_empleados(request)
+
+    def campos_proyeccion(self):
+        """Campos de `?fields=` si todos se pueden leer con values(); None si no."""
+        campos = self.campos_solicitados()
+        return campos if campos is not None and set(campos) <= set(CAMPOS_PROYECCION_EMPLEADO) else None
+
+    def queryset_lista(self):
+        queryset = self.filter_queryset(self.get_queryset())
+        campos = self.campos_proyeccion()
+        # Proyección: filas de values() sin instancias del modelo
+        return queryset if campos is None else queryset.values(*campos)
+
+    def serializar_lista(self, filas):
+        campos = self.campos_proyeccion()
+        if campos is None:
+            return self.get_serializer(filas, many=True).data
+        return EmpleadoProyeccionSerializer(filas, many=True, campos=campos).data
+
+    def list(self, request, *args, **kwargs):
+        queryset = self.queryset_lista()
+        pagina = self.paginate_queryset(queryset)
+        datos = self.serializar_lista(queryset if pagina is None else pagina)
+        return self.get_paginated_response(datos) if pagina is not None else Response(datos)
+
     def perform_create(self, serializer):
-        empleado = serializer.save()
+        with auditoria_explicita():
+            empleado = serializer.save()
         empleado._request_user = self.request.user
         registrar_bitacora(
             instancia=empleado,
@@ -56,7 +327,9 @@ class EmpleadoListCreateAPIView(generics.ListCreateAPIView):
 
 
 # 🔍 Consultar, Actualizar, Eliminar empleados
-class EmpleadoRetrieveUpdateDestroyAPIView(generics.RetrieveUpdateDestroyAPIView):
+class EmpleadoRetrieveUpdateDestroyAPIView(
+    LecturaEnReplicaMixin, GetCondicionalMixin, CamposSolicitadosMixin, DetalleAsyncMixin, generics.RetrieveUpdateDestroyAPIView
+):
     queryset = Empleado.objects.all()
     serializer_class = EmpleadoSerializer
 
@@ -67,10 +340,42 @@ class EmpleadoRetrieveUpdateDestroyAPIView(generics.RetrieveUpdateDestroyAPIView
             return [IsAuthenticated(), IsGerenteOrAdmin()]
         return [IsAuthenticated()]
 
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        # Con If-Match la fila se bloquea entre la comparación y el guardado
+        return queryset.select_for_update() if getattr(self, 'bloquear_fila', False) else queryset
+
+    def get_object(self):
+        # Se consulta una sola vez por petición: con If-Match se bloquea antes de update()
+        if getattr(self, '_empleado', None) is None:
+            self._empleado = super().get_object()
+        return self._empleado
+
+    def validadores(self, request, *args, **kwargs):
+        return validadores_empleado(kwargs['pk'], request)
+
+    async def avalidadores(self, request, *args, **kwargs):
+        return await avalidadores_empleado(kwargs['pk'], request)
+
+    def update(self, request, *args, **kwargs):
+        if 'HTTP_IF_MATCH' not in request.META and 'HTTP_IF_UNMODIFIED_SINCE' not in request.META:
+            respuesta = super().update(request, *args, **kwargs)
+        else:
+            with transaction.atomic():
+                # Bloquea la fila antes de comparar: nadie la cambia entre la comparación y el guardado
+                self.bloquear_fila = True
+                self.get_object()
+                respuesta = respuesta_condicional(request, *validadores_empleado(kwargs['pk']))
+                if respuesta is not None:
+                    return respuesta
+                respuesta = super().update(request, *args, **kwargs)
+        return agregar_validadores(respuesta, *validadores_empleado(kwargs['pk']))
+
     def perform_update(self, serializer):
-        instance = self.get_object()
-        anterior_activo = instance.activo
-        empleado = serializer.save()
+        # serializer.instance ya viene de get_object(); el diff lo calcula el propio modelo
+        anterior_activo = serializer.instance.activo
+        with auditoria_explicita():
+            empleado = serializer.save()
         empleado._request_user = self.request.user
 
         if 'activo' in serializer.validated_data and serializer.validated_data['activo'] != anterior_activo:
@@ -86,7 +391,7 @@ class EmpleadoRetrieveUpdateDestroyAPIView(generics.RetrieveUpdateDestroyAPIView
                 instancia=empleado,
                 accion='EDICIÓN',
                 usuario=self.request.user,
-                instancia_anterior=instance
+                cambios=empleado.ultimos_cambios
             )
 
     def perform_destroy(self, instance):
@@ -100,122 +405,361 @@ class EmpleadoRetrieveUpdateDestroyAPIView(generics.RetrieveUpdateDestroyAPIView
             usuario=self.request.user,
             cambios={'detalle': 'Empleado eliminado desde la API'}
         )
-        instance.delete()
+        with auditoria_explicita():
+            instance.delete()
 
 
-# 📊 Dashboard de estadísticas
-class EmpleadoDashboardAPIView(APIView):
-    permission_classes = [IsAuthenticated, IsGerenteOrAdmin]
+# 🔎 Búsqueda clasificada de empleados (typeahead)
+class EmpleadoBusquedaAPIView(APIView):
+    permission_classes = [IsAuthenticated]
 
     def get(self, request):
-        hoy = date.today()
-        empleados = Empleado.objects.all()
-        total = empleados.count()
-        activos = empleados.filter(activo=True).count()
-        inactivos = empleados.filter(activo=False).count()
-
-        empleados_con_edad = empleados.exclude(fecha_nacimiento=None)
-        edades = [
-            hoy.year - e.fecha_nacimiento.year -
-            ((hoy.month, hoy.day) < (e.fecha_nacimiento.month, e.fecha_nacimiento.day))
-            for e in empleados_con_edad
-        ]
-        edad_promedio = round(sum(edades) / len(edades), 1) if edades else 0
-
-        return Response({
-            "total_empleados": total,
-            "activos": activos,
-            "inactivos": inactivos,
-            "edad_promedio": edad_promedio,
-            "por_departamento": list(empleados.values('departamento').annotate(total=Count('id'))),
-            "por_puesto": list(empleados.values('puesto').annotate(total=Count('id'))),
-            "por_genero": list(empleados.values('genero').annotate(total=Count('id'))),
-        })
+        try:
+            limite = int(request.query_params.get('limite', LIMITE_RESULTADOS))
+        except ValueError:
+            raise ValidationError({'limite': "Debe ser un número entero."})
 
+        resultados = []
+        for empleado in buscar_empleados(request.query_params.get('q', ''), limite):
+            datos = EmpleadoSerializer(empleado, context={'request': request}).data
+            datos['puntaje'] = round(empleado.puntaje, 4)
+            resultados.append(datos)
+        return Response({'results': resultados})
 
-# 🗕 Exportar a Excel
-class EmpleadoExportExcelAPIView(APIView):
+
+# 🔄 Feed de cambios para sincronización incremental (?cursor=...)
+class EmpleadoCambiosAPIView(CamposSolicitadosMixin, generics.GenericAPIView):
+    permission_classes = [IsAuthenticated]
+    serializer_class = EmpleadoSerializer
+    pagination_class = CambiosEmpleadoPagination
+    filter_backends = []
+
+    def get_queryset(self):
+        limite = now() - timedelta(seconds=settings.CAMBIOS_EMPLEADOS_MARGEN_SEGUNDOS)
+        return CambioEmpleado.objects.filter(fecha__lte=limite)
+
+    def get(self, request):
+        cambios = self.paginate_queryset(self.get_queryset())
+
+        # Estado actual de los empleados vigentes de la página, en una sola consulta
+        vigentes = Empleado.objects.in_bulk({cambio.empleado_id for cambio in cambios if cambio.tipo != 'ELIMINADO'})
+        datos = dict(zip(vigentes, self.get_serializer(list(vigentes.values()), many=True).data))
+
+        return self.get_paginated_response([
+            {
+                'secuencia': cambio.pk,
+                'tipo': cambio.tipo,
+                'empleado_id': cambio.empleado_id,
+                'fecha': cambio.fecha,
+                'empleado': datos.get(cambio.empleado_id) if cambio.tipo != 'ELIMINADO' else None,
+            }
+            for cambio in cambios
+        ])
+
+
+# 📥 Importación masiva de empleados (JSON, CSV o XLSX)
+class EmpleadoImportacionAPIView(APIView):
     permission_classes = [IsAuthenticated, IsRRHHOrAdmin]
+    parser_classes = [JSONParser, MultiPartParser, FormParser]
+
+    def post(self, request):
+        archivo = request.FILES.get('archivo')
+        if archivo is not None:
+            nombre = archivo.name.lower()
+            if nombre.endswith('.csv'):
+                filas = leer_csv(archivo)
+            elif nombre.endswith('.xlsx'):
+                filas = leer_xlsx(archivo)
+            else:
+                raise ValidationError("Formato de archivo no soportado. Usa CSV o XLSX.")
+        elif isinstance(request.data, list):
+            filas = leer_json(request.data)
+        else:
+            raise ValidationError("Envía una lista JSON de empleados o un archivo CSV/XLSX en el campo 'archivo'.")
+
+        todo_o_nada = str(request.query_params.get('todo_o_nada', '')).lower() in ['true', '1', 'yes']
+        reporte = importar_empleados(filas, usuario=request.user, todo_o_nada=todo_o_nada)
+        codigo = status.HTTP_201_CREATED if reporte['creados'] else status.HTTP_400_BAD_REQUEST
+        return Response(reporte, status=codigo)
+
+
+# 📊 Dashboard de estadísticas
+class EmpleadoDashboardAPIView(LecturaEnReplicaMixin, GetCondicionalMixin, LecturaAsyncMixin, APIView):
+    permission_classes = [IsAuthenticated, IsGerenteOrAdmin]
+
+    def validadores(self, request, *args, **kwargs):
+        return validadores_dashboard(request)
+
+    def respuesta_completa(self, request, *args, **kwargs):
+        return Response(obtener_dashboard())
+
+    async def arespuesta_completa(self, request, *args, **kwargs):
+        return Response(await aobtener_dashboard())
+
+
+# 🗃️ Exportaciones Excel/PDF servidas desde la caché en disco mientras no cambien los empleados
+class ExportacionEnCacheMixin:
+    formato_exportacion = None
+    adjunto = True
+
+    def nombre_descarga(self):
+        raise NotImplementedError
+
+    def respuesta_generada(self, empleados):
+        """Respuesta construida desde la base de datos, sin caché."""
+        raise NotImplementedError
+
+    def respuesta_guardada(self, empleados, ruta):
+        """Genera la exportación, la guarda en `ruta` y la devuelve."""
+        raise NotImplementedError
 
     def get(self, request):
-        registrar_exportacion_empleados(request, tipo_exportacion='Excel')
-
-        wb = Workbook()
-        ws = wb.active
-        ws.title = "Empleados"
-
-        columnas = [
-            'ID', 'Número de empleado', 'Nombres', 'Apellido paterno', 'Apellido materno',
-            'Fecha de nacimiento', 'Género', 'Estado civil', 'CURP', 'RFC', 'NSS', 'Teléfono',
-            'Email', 'Puesto', 'Departamento', 'Fecha de ingreso', 'Activo',
-        ]
-        ws.append(columnas)
-
-        for emp in Empleado.objects.all():
-            ws.append([
-                emp.id, emp.num_empleado, emp.nombres, emp.apellido_paterno, emp.apellido_materno,
-                emp.fecha_nacimiento.strftime('%Y-%m-%d') if emp.fecha_nacimiento else "",
-                emp.genero, emp.estado_civil, emp.curp, emp.rfc, emp.nss, emp.telefono,
-                emp.email, emp.puesto, emp.departamento,
-                emp.fecha_ingreso.strftime('%Y-%m-%d') if emp.fecha_ingreso else "",
-                "Sí" if emp.activo else "No"
-            ])
-
-        for col in ws.columns:
-            max_length = max(len(str(cell.value or '')) for cell in col)
-            ws.column_dimensions[get_column_letter(col[0].column)].width = max_length + 2
-
-        nombre_archivo = f"empleados_{now().date()}.xlsx"
-        response = HttpResponse(
-            content_type='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
-        )
-        response['Content-Disposition'] = f'attachment; filename="{nombre_archivo}"'
-        wb.save(response)
+        try:
+            empleados = filtrar_empleados(request.query_params)
+        except ValueError as exc:
+            raise ValidationError(exc.args[0])
+        # El archivo se genera al enviar la respuesta, ya fuera de la vista: se fija la base elegida ahora
+        empleados = empleados.using(empleados.db)
+
+        tipo, extension, content_type = FORMATOS_EXPORTACION[self.formato_exportacion]
+        filtros = {clave: valor for clave, valor in request.query_params.items() if clave in PARAMETROS_FILTRO_EMPLEADOS}
+        if not cache_exportaciones_activa():
+            registrar_exportacion_empleados(request, tipo_exportacion=tipo, filtros=filtros)
+            return self.respuesta_generada(empleados)
+
+        ruta = ruta_exportacion(self.formato_exportacion, extension, filtros_exportacion(request.query_params))
+        if buscar_exportacion(ruta):
+            estado = 'HIT'
+            response = respuesta_exportacion(ruta, self.nombre_descarga(), content_type, adjunto=self.adjunto)
+        else:
+            estado = 'MISS'
+            response = self.respuesta_guardada(empleados, ruta)
+        registrar_exportacion_empleados(request, tipo_exportacion=tipo, filtros=filtros, cache=estado)
+        response['X-Cache'] = estado
         return response
 
     def permission_denied(self, request, message=None, code=None):
-        registrar_intento_fallido_exportacion(request, tipo_exportacion='Excel')
+        registrar_intento_fallido_exportacion(request, tipo_exportacion=FORMATOS_EXPORTACION[self.formato_exportacion][0])
         raise PermissionDenied("No tienes permisos para exportar empleados.")
 
 
-# 🧾 Exportar a PDF
-class EmpleadoExportPdfAPIView(APIView):
+# 🗕 Exportar a Excel
+class EmpleadoExportExcelAPIView(LecturaEnReplicaMixin, ExportacionEnCacheMixin, APIView):
     permission_classes = [IsAuthenticated, IsRRHHOrAdmin]
+    formato_exportacion = 'excel'
 
-    def get(self, request):
-        registrar_exportacion_empleados(request, tipo_exportacion='PDF')
+    def nombre_descarga(self):
+        return f"empleados_{now().date()}.xlsx"
+
+    def bloques(self, empleados):
+        return generar_xlsx(ENCABEZADOS_EXPORTACION, filas_exportacion(empleados), anchos_columnas(empleados))
 
-        empleados = Empleado.objects.all()
-        fecha = datetime.now().strftime('%d/%m/%Y %H:%M')
+    def respuesta_streaming(self, bloques):
+        response = StreamingHttpResponse(bloques, content_type=FORMATOS_EXPORTACION['excel'][2])
+        response['Content-Disposition'] = f'attachment; filename="{self.nombre_descarga()}"'
+        return response
 
-        html_string = render_to_string("empleados/empleados_pdf.html", {
-            "empleados": empleados,
-            "fecha": fecha,
-            "empresa": "Mi Empresa S.A. de C.V.",
-        })
+    def respuesta_generada(self, empleados):
+        return self.respuesta_streaming(bloques_con_respaldo(self.bloques, empleados))
 
-        pdf = HTML(string=html_string).write_pdf()
+    def respuesta_guardada(self, empleados, ruta):
+        # Se guarda a la vez que se envía: el primer cliente no espera al archivo completo
+        return self.respuesta_streaming(guardar_bloques(bloques_con_respaldo(self.bloques, empleados), ruta))
+
+
+# 🧾 Exportar a PDF
+class EmpleadoExportPdfAPIView(LecturaEnReplicaMixin, ExportacionEnCacheMixin, APIView):
+    permission_classes = [IsAuthenticated, IsRRHHOrAdmin]
+    formato_exportacion = 'pdf'
+    adjunto = False
+
+    def nombre_descarga(self):
+        return "empleados.pdf"
+
+    def respuesta_generada(self, empleados):
+        pdf = renderizar_pdf_empleados(empleados)
         response = HttpResponse(pdf, content_type="application/pdf")
         response["Content-Disposition"] = 'inline; filename="empleados.pdf"'
         return response
 
+    def respuesta_guardada(self, empleados, ruta):
+        guardar_exportacion(ruta, lambda destino: renderizar_pdf_empleados(empleados, destino))
+        return respuesta_exportacion(ruta, self.nombre_descarga(), "application/pdf", adjunto=False)
+
+
+# 🚚 Exportación en streaming (CSV / NDJSON) con los filtros, búsqueda y orden del listado
+ACEPTA_GZIP = re.compile(r'\bgzip\b')
+
+
+class EmpleadoExportStreamingAPIView(LecturaEnReplicaMixin, APIView):
+    permission_classes = [IsAuthenticated, IsRRHHOrAdmin]
+
+    def formato(self, request):
+        return request.query_params.get('formato', 'csv')
+
+    def get(self, request):
+        formato = self.formato(request)
+        if formato not in FORMATOS_STREAMING:
+            raise ValidationError({'formato': [f"Formato no soportado. Opciones: {', '.join(FORMATOS_STREAMING)}."]})
+        try:
+            empleados = filtrar_empleados(request.query_params)
+        except ValueError as exc:
+            raise ValidationError(exc.args[0])
+        # El archivo se genera al enviar la respuesta, ya fuera de la vista: se fija la base elegida ahora
+        empleados = empleados.using(empleados.db)
+
+        tipo, extension, content_type = FORMATOS_STREAMING[formato]
+        gzip = bool(ACEPTA_GZIP.search(request.META.get('HTTP_ACCEPT_ENCODING', '')))
+        filtros = {clave: valor for clave, valor in request.query_params.items() if clave in PARAMETROS_FILTRO_EMPLEADOS}
+        registrar_exportacion_empleados(request, tipo_exportacion=tipo, filtros=filtros, gzip=gzip)
+
+        # Cursor del servidor -> líneas -> bloques de 64 KB -> gzip al vuelo
+        bloques = bloques_con_respaldo(lambda queryset: generar_exportacion_streaming(formato, queryset), empleados)
+        response = StreamingHttpResponse(compress_sequence(bloques) if gzip else bloques, content_type=content_type)
+        if gzip:
+            response['Content-Encoding'] = 'gzip'
+        patch_vary_headers(response, ('Accept-Encoding',))
+        response['Content-Disposition'] = f'attachment; filename="empleados_{now().date()}.{extension}"'
+        return response
+
+    def permission_denied(self, request, message=None, code=None):
+        tipo = FORMATOS_STREAMING.get(self.formato(request), ('archivo',))[0]
+        registrar_intento_fallido_exportacion(request, tipo_exportacion=tipo)
+        raise PermissionDenied("No tienes permisos para exportar empleados.")
+
+
+# ⏳ Exportaciones en segundo plano
+class TrabajosExportacionMixin:
+    permission_classes = [IsAuthenticated, IsRRHHOrAdmin]
+
+    def get_queryset(self):
+        queryset = TrabajoExportacion.objects.all()
+        if not self.request.user.is_staff:
+            queryset = queryset.filter(usuario_id=self.request.user.pk)
+        return queryset
+
+
+class ExportacionEmpleadosAPIView(TrabajosExportacionMixin, generics.CreateAPIView):
+    serializer_class = TrabajoExportacionSerializer
+
+    def create(self, request, *args, **kwargs):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        trabajo = encolar_exportacion(request.user, serializer.validated_data['formato'], serializer.validated_data.get('filtros'))
+        return Response(self.get_serializer(trabajo).data, status=status.HTTP_202_ACCEPTED)
+
     def permission_denied(self, request, message=None, code=None):
-        registrar_intento_fallido_exportacion(request, tipo_exportacion='PDF')
+        formato = request.data.get('formato', '') if hasattr(request, 'data') else ''
+        registrar_intento_fallido_exportacion(request, tipo_exportacion=FORMATOS_EXPORTACION.get(formato, ('archivo',))[0])
         raise PermissionDenied("No tienes permisos para exportar empleados.")
 
 
+class ExportacionEstadoAPIView(TrabajosExportacionMixin, generics.RetrieveAPIView):
+    serializer_class = TrabajoExportacionSerializer
+
+
+class ExportacionDescargaAPIView(TrabajosExportacionMixin, generics.GenericAPIView):
+    def get(self, request, pk):
+        trabajo = self.get_object()
+        if trabajo.estado != 'COMPLETADO' or not trabajo.archivo:
+            return Response({"detail": f"La exportación aún no está disponible ({trabajo.estado})."}, status=status.HTTP_409_CONFLICT)
+
+        _, extension, content_type = FORMATOS_EXPORTACION[trabajo.formato]
+        return FileResponse(
+            trabajo.archivo.open('rb'),
+            as_attachment=True,
+            filename=f"empleados_{trabajo.creado.date()}.{extension}",
+            content_type=content_type,
+        )
+
+
+# 🗄️ Consulta opcional del archivo histórico de bitácoras
+class BitacoraConArchivoMixin:
+    """
+    `?archivo=incluir` agrega las filas archivadas a la consulta y
+    `?archivo=solo` consulta únicamente el archivo. Por defecto solo se leen
+    las tablas activas.
+    """
+    pagination_class = BitacoraPagination
+
+    def modo_archivo(self):
+        modo = self.request.query_params.get('archivo', '')
+        return modo if modo in ('incluir', 'solo') else None
+
+    def get_queryset(self):
+        if self.modo_archivo() == 'solo':
+            return self.get_queryset_archivo()
+        return self.get_queryset_activo()
+
+    def paginate_queryset(self, queryset):
+        if self.modo_archivo() == 'incluir':
+            archivo = self.filter_queryset(self.get_queryset_archivo())
+            return self.paginator.paginate_querysets([queryset, archivo], self.request)
+        return super().paginate_queryset(queryset)
+
+    def preparar(self, request, *args, **kwargs):
+        super().preparar(request, *args, **kwargs)
+        if self.modo_archivo() == 'incluir':
+            self._queryset_archivo = self.filter_queryset(self.get_queryset_archivo())
+
+    async def apaginate_queryset(self, queryset):
+        # Tabla activa y archivo se consultan a la vez
+        if self.modo_archivo() == 'incluir':
+            return await self.paginator.apaginate_querysets([queryset, self._queryset_archivo], self.request)
+        return await super().apaginate_queryset(queryset)
+
+
 # 📋 Bitácora general del sistema
-class BitacoraListView(generics.ListAPIView):
-    queryset = Bitacora.objects.all().order_by('-fecha')
+class BitacoraListView(LecturaEnReplicaMixin, RespuestaEnCacheMixin, BitacoraConArchivoMixin, ListaAsyncMixin, generics.ListAPIView):
     serializer_class = BitacoraSerializer
     permission_classes = [permissions.IsAuthenticated]
+    generaciones_cache = ('bitacora',)
+    filter_backends = [FilterSetPorModeloBackend]
+    filterset_classes = {
+        Bitacora: BitacoraFilter,
+        BitacoraArchivada: BitacoraArchivadaFilter,
+    }
+
+    def get_queryset_activo(self):
+        return Bitacora.objects.select_related('usuario')
+
+    def get_queryset_archivo(self):
+        return BitacoraArchivada.objects.select_related('usuario')
 
 
 # 📂 Bitácora específica por empleado
-class BitacoraEmpleadoAPIView(generics.ListAPIView):
+class BitacoraEmpleadoAPIView(
+    LecturaEnReplicaMixin, RespuestaEnCacheMixin, BitacoraConArchivoMixin, ListaAsyncMixin, generics.ListAPIView
+):
     serializer_class = BitacoraEmpleadoSerializer
     permission_classes = [permissions.IsAuthenticated]
+    generaciones_cache = ('bitacora',)
+    filter_backends = []
 
-    def get_queryset(self):
+    def get_queryset_activo(self):
+        empleado_id = self.kwargs.get("empleado_id")
+        return BitacoraEmpleado.objects.filter(empleado_id=empleado_id).select_related('usuario')
+
+    def get_queryset_archivo(self):
         empleado_id = self.kwargs.get("empleado_id")
-        return BitacoraEmpleado.objects.filter(empleado_id=empleado_id).order_by('-fecha')
\ No newline at end of file
+        return BitacoraEmpleadoArchivada.objects.filter(empleado_id=empleado_id).select_related('usuario')
+
+
+# 📈 Aciertos, fallos y desalojos de la caché de respuestas (por proceso)
+class EstadisticasCacheAPIView(APIView):
+    permission_classes = [IsAuthenticated, IsSuperAdmin]
+
+    def get(self, request):
+        return Response(estadisticas_cache())
+
+
+# 📊 Métricas de rendimiento en formato Prometheus (todas las vistas y workers)
+class MetricasAPIView(APIView):
+    permission_classes = [TokenMetricas]
+
+    def get_authenticators(self):
+        # Con METRICAS_TOKEN el encabezado Authorization lleva ese token, no un JWT
+        return [] if settings.METRICAS_TOKEN else super().get_authenticators()
+
+    def get(self, request):
+        return HttpResponse(exportar_metricas(), content_type=TIPO_CONTENIDO_PROMETHEUS)
\ No newline at end of file
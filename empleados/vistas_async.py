@@ -0,0 +1,121 @@
+"""
+GET asíncrono para las vistas de lectura frecuente (despliegues ASGI).
+
+Bajo ASGI una vista síncrona de DRF ocupa un hilo de `sync_to_async` durante
+toda la petición. Con `VISTAS_ASYNC=True` las rutas de listado y detalle de
+empleados, dashboard y bitácoras usan `as_view_async()`: el GET corre en el
+bucle de eventos y sus consultas pesadas usan el ORM asíncrono de Django; las
+independientes (COUNT y página, tabla activa y de archivo) se lanzan juntas.
+
+Las vistas son las mismas clases DRF: se reutilizan autenticación, permisos,
+filtros, serializadores, paginación, ETag y caché de respuestas, así que la
+respuesta es idéntica a la síncrona. Sólo cambia la E/S:
+
+- autenticación, permisos y filtros (que pueden consultar al usuario o validar
+  contra la base de datos) se resuelven juntos en un solo salto a un hilo;
+- las consultas de la página y del objeto se hacen con `acount()`, iteración
+  asíncrona y `aget_object_or_404`;
+- los demás métodos (POST, PUT, PATCH, DELETE) siguen en la vista síncrona.
+
+Con el ORM de Django 5.2 las consultas asíncronas de una misma petición aún se
+ejecutan una tras otra en el hilo de esa petición; lanzarlas juntas deja el
+código listo para cuando el ORM las ejecute en paralelo y, mientras tanto, el
+bucle atiende otras peticiones durante la espera.
+"""
+from asgiref.sync import sync_to_async
+from django.shortcuts import aget_object_or_404
+from django.views.decorators.csrf import csrf_exempt
+from rest_framework.response import Response
+
+from .pagination import KeysetPagination, apaginar_por_numero, listar
+
+
+class LecturaAsyncMixin:
+    """`as_view_async()`: GET asíncrono; el resto de los métodos usa la vista síncrona."""
+
+    @classmethod
+    def as_view_async(cls, **initkwargs):
+        vista_sincrona = cls.as_view(**initkwargs)
+        sincrona = sync_to_async(vista_sincrona)
+
+        async def vista(request, *args, **kwargs):
+            if request.method != 'GET':
+                return await sincrona(request, *args, **kwargs)
+            instancia = cls(**initkwargs)
+            instancia.setup(request, *args, **kwargs)
+            return await instancia.adispatch(request, *args, **kwargs)
+
+        vista.cls = cls
+        vista.initkwargs = initkwargs
+        return csrf_exempt(vista)
+
+    def preparar(self, request, *args, **kwargs):
+        """Parte síncrona del GET: autenticación, permisos y throttling de DRF."""
+        self.initial(request, *args, **kwargs)
+
+    async def adispatch(self, request, *args, **kwargs):
+        """Equivalente asíncrono de `APIView.dispatch` para GET."""
+        self.args = args
+        self.kwargs = kwargs
+        request = self.initialize_request(request, *args, **kwargs)
+        self.request = request
+        self.headers = self.default_response_headers
+        try:
+            await sync_to_async(self.preparar)(request, *args, **kwargs)
+            respuesta = await self.aget(request, *args, **kwargs)
+        except Exception as exc:
+            respuesta = self.handle_exception(exc)
+        self.response = self.finalize_response(request, respuesta, *args, **kwargs)
+        return self.response
+
+    async def aget(self, request, *args, **kwargs):
+        raise NotImplementedError
+
+
+class ListaAsyncMixin(LecturaAsyncMixin):
+    """`alist()` con los mismos ganchos que el `list()` síncrono de las vistas del proyecto."""
+
+    def preparar(self, request, *args, **kwargs):
+        super().preparar(request, *args, **kwargs)
+        # Los filtros pueden validar contra la base de datos (p. ej. ModelChoiceFilter)
+        self._queryset_lista = self.queryset_lista()
+
+    def queryset_lista(self):
+        return self.filter_queryset(self.get_queryset())
+
+    def serializar_lista(self, filas):
+        return self.get_serializer(filas, many=True).data
+
+    async def apaginate_queryset(self, queryset):
+        paginador = self.paginator
+        if paginador is None:
+            return None
+        if isinstance(paginador, KeysetPagination):
+            return await paginador.apaginate_querysets([queryset], self.request)
+        return await apaginar_por_numero(paginador, queryset, self.request, view=self)
+
+    async def aget(self, request, *args, **kwargs):
+        return await self.alist(request, *args, **kwargs)
+
+    async def alist(self, request, *args, **kwargs):
+        queryset = self._queryset_lista
+        pagina = await self.apaginate_queryset(queryset)
+        if pagina is not None:
+            return self.get_paginated_response(self.serializar_lista(pagina))
+        return Response(self.serializar_lista(await listar(queryset)))
+
+
+class DetalleAsyncMixin(LecturaAsyncMixin):
+    async def aget_object(self):
+        queryset = self.filter_queryset(self.get_queryset())
+        campo_url = self.lookup_url_kwarg or self.lookup_field
+        instancia = await aget_object_or_404(queryset, **{self.lookup_field: self.kwargs[campo_url]})
+        self.check_object_permissions(self.request, instancia)
+        return instancia
+
+    async def aget(self, request, *args, **kwargs):
+        return await self.aretrieve(request, *args, **kwargs)
+
+    async def aretrieve(self, request, *args, **kwargs):
+        instancia = await self.aget_object()
+        return Response(self.get_serializer(instancia).data)
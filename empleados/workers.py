@@ -0,0 +1,48 @@
+"""
+Funciones de entrada para los procesos hijos de los pools de trabajo.
+
+Este módulo no importa modelos al cargarse: con el método de arranque `spawn`
+(Windows, macOS) el hijo lo importa antes de que Django esté configurado.
+Las funciones cierran las conexiones del hijo al terminar, así que no deben
+llamarse en el proceso principal.
+"""
+import os
+
+
+def inicializar_proceso():
+    """Inicializador de cada proceso del pool: configura Django si no fue heredado por fork."""
+    import django
+    from django.apps import apps
+
+    if not apps.ready:
+        os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'rh_django.settings')
+        django.setup()
+
+
+def procesar_trabajo_exportacion(trabajo_id):
+    from django.db import connections
+
+    from .trabajos import procesar_trabajo
+
+    try:
+        return procesar_trabajo(trabajo_id)
+    finally:
+        connections.close_all()
+
+
+def generar_derivados_foto(empleado_id):
+    from django.db import connections
+
+    from .imagenes import generar_derivados
+
+    try:
+        return generar_derivados(empleado_id)
+    finally:
+        connections.close_all()
+
+
+def renderizar_bloque_pdf(filas, fecha, encabezado, pie):
+    # Sin base de datos: las filas llegan ya leídas desde el proceso que atiende la petición
+    from .pdf import renderizar_bloque
+
+    return renderizar_bloque(filas, fecha, encabezado, pie)
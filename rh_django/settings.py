@@ -37,6 +37,7 @@ INSTALLED_APPS = [
 
 # === Middleware ===
 MIDDLEWARE = [
+    'empleados.middleware.InstrumentacionMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
@@ -45,6 +46,7 @@ MIDDLEWARE = [
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'empleados.middleware.LecturaPropiaMiddleware',
 ]
 
 # === Configuración de URLs ===
@@ -70,7 +72,12 @@ TEMPLATES = [
 # === WSGI ===
 WSGI_APPLICATION = 'rh_django.wsgi.application'
 
+# === ASGI: GET asíncrono en listados, detalle, dashboard y bitácoras (ver empleados.vistas_async) ===
+VISTAS_ASYNC = os.getenv('VISTAS_ASYNC', 'False') == 'True'
+
 # === Base de datos ===
+# Conexiones persistentes (DB_CONN_MAX_AGE segundos) o pool de psycopg 3 por proceso (DB_POOL)
+DB_POOL = os.getenv('DB_POOL', 'False') == 'True'
 DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.postgresql',
@@ -79,8 +86,42 @@ DATABASES = {
         'PASSWORD': os.getenv('DB_PASSWORD'),
         'HOST': os.getenv('DB_HOST'),
         'PORT': os.getenv('DB_PORT'),
+        # Con pool Django exige CONN_MAX_AGE=0: la conexión vuelve al pool al terminar la petición
+        'CONN_MAX_AGE': 0 if DB_POOL else int(os.getenv('DB_CONN_MAX_AGE', '60')),
+        'CONN_HEALTH_CHECKS': os.getenv('DB_CONN_HEALTH_CHECKS', 'True') == 'True',
+        'OPTIONS': {
+            'pool': {
+                'min_size': int(os.getenv('DB_POOL_MIN', '2')),
+                'max_size': int(os.getenv('DB_POOL_MAX', '10')),
+                'timeout': float(os.getenv('DB_POOL_TIMEOUT', '10')),
+            },
+        } if DB_POOL else {},
     }
 }
+# Dimensionamiento de conexiones (ver empleados.conexiones): procesos y hilos del servidor
+# y conexiones que PostgreSQL admite para la aplicación (max_connections menos reservadas y otros clientes)
+DB_WORKERS = int(os.getenv('WEB_CONCURRENCY', '1'))
+DB_HILOS_POR_WORKER = int(os.getenv('DB_HILOS_POR_WORKER', '1'))
+DB_MAX_CONEXIONES = int(os.getenv('DB_MAX_CONEXIONES', '90'))
+
+# === Réplicas de lectura (ver empleados.replicas) ===
+# DB_REPLICAS: "host[:puerto][*peso]" separadas por comas; mismas credenciales que la primaria
+REPLICAS_LECTURA = {}
+for numero, replica in enumerate(filter(None, map(str.strip, os.getenv('DB_REPLICAS', '').split(','))), start=1):
+    direccion, _, peso = replica.partition('*')
+    host, _, puerto = direccion.partition(':')
+    DATABASES[f'replica_{numero}'] = {
+        **DATABASES['default'], 'HOST': host, 'PORT': puerto or DATABASES['default']['PORT'], 'TEST': {'MIRROR': 'default'},
+    }
+    REPLICAS_LECTURA[f'replica_{numero}'] = int(peso or 1)
+DATABASE_ROUTERS = ['empleados.replicas.EnrutadorReplicas']
+# Tras escribir, el usuario lee de la primaria durante estos segundos (lectura propia)
+DB_REPLICAS_LECTURA_PROPIA_SEGUNDOS = int(os.getenv('DB_REPLICAS_LECTURA_PROPIA_SEGUNDOS', '5'))
+# Cada cuánto se comprueba una réplica sana y cuánto queda fuera una caída
+DB_REPLICAS_CHEQUEO_SEGUNDOS = int(os.getenv('DB_REPLICAS_CHEQUEO_SEGUNDOS', '10'))
+DB_REPLICAS_REINTENTO_SEGUNDOS = int(os.getenv('DB_REPLICAS_REINTENTO_SEGUNDOS', '30'))
+# Atraso máximo de una réplica PostgreSQL en segundos (0 = no se mide)
+DB_REPLICAS_RETRASO_MAXIMO = float(os.getenv('DB_REPLICAS_RETRASO_MAXIMO', '10'))
 
 # === Validadores de contraseña ===
 AUTH_PASSWORD_VALIDATORS = [
@@ -104,9 +145,132 @@ STATIC_ROOT = os.path.join(BASE_DIR, 'staticfiles')
 MEDIA_URL = '/media/'
 MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
 
+# === Fotos de empleados (ver empleados.imagenes) ===
+FOTOS_TAMANO_MAXIMO_MB = int(os.getenv('FOTOS_TAMANO_MAXIMO_MB', '10'))
+FOTOS_LADO_MAXIMO = int(os.getenv('FOTOS_LADO_MAXIMO', '2048'))
+FOTOS_PIXELES_MAXIMOS = int(os.getenv('FOTOS_PIXELES_MAXIMOS', '40000000'))
+# Hilos que generan los derivados fuera de la petición (0 = en la misma petición)
+FOTOS_WORKERS = int(os.getenv('FOTOS_WORKERS', '2'))
+
+# === Unicidad de empleados: consulta | restriccion ===
+# 'consulta' valida CURP, RFC, NSS, email y número de empleado con una consulta antes de
+# guardar; 'restriccion' se ahorra esa consulta y traduce el error de la restricción UNIQUE
+UNICIDAD_MODO = os.getenv('UNICIDAD_MODO', 'consulta')
+
+# === Identificadores de empleados (ver empleados.identificadores) ===
+# Además del formato, exige dígito verificador de CURP, RFC y NSS, fechas existentes
+# y que el CURP coincida con la fecha de nacimiento y el género
+IDENTIFICADORES_ESTRICTOS = os.getenv('IDENTIFICADORES_ESTRICTOS', 'False') == 'True'
+
+# === Feed de cambios de empleados (GET /api/empleados/cambios/) ===
+# Los cambios se insertan al confirmar cada transacción (ver CambioEmpleado.registrar);
+# el margen cubre los pocos milisegundos en que dos de esos INSERT pueden confirmar
+# en desorden, así que no queda fuera del cursor del consumidor ninguno con secuencia menor
+CAMBIOS_EMPLEADOS_MARGEN_SEGUNDOS = int(os.getenv('CAMBIOS_EMPLEADOS_MARGEN_SEGUNDOS', '5'))
+
+# === Bitácora de auditoría ===
+# 'sincrono': cada entrada se inserta al momento
+# 'buffer': se agrupan y se escriben con bulk_create al confirmar la transacción,
+#           al llenarse el buffer, al vencer su antigüedad o al terminar la petición
+BITACORA_MODO = os.getenv('BITACORA_MODO', 'sincrono')
+BITACORA_BUFFER_TAMANO = int(os.getenv('BITACORA_BUFFER_TAMANO', '100'))
+BITACORA_BUFFER_SEGUNDOS = float(os.getenv('BITACORA_BUFFER_SEGUNDOS', '5'))
+BITACORA_BUFFER_MAXIMO = int(os.getenv('BITACORA_BUFFER_MAXIMO', '10000'))
+
+# === Retención de bitácoras (python manage.py archivar_bitacora) ===
+BITACORA_RETENCION_DIAS = int(os.getenv('BITACORA_RETENCION_DIAS', '365'))
+BITACORA_ARCHIVO_DIR = os.getenv('BITACORA_ARCHIVO_DIR', os.path.join(BASE_DIR, 'archivo_bitacora'))
+
+# === Caché (ver empleados.cache_respuestas) ===
+# 'memoria': por proceso, con desalojo LRU; 'archivo': directorio compartido por los
+# procesos del host; 'redis': compartida entre hosts (CACHE_UBICACION=redis://...).
+# Con varios workers usa 'archivo' o 'redis': las versiones de ETag, los grupos de
+# permisos y las generaciones de la caché de respuestas deben ser las mismas para todos.
+CACHE_TIPO = os.getenv('CACHE_TIPO', 'memoria')
+CACHE_UBICACION = os.getenv('CACHE_UBICACION', os.path.join(BASE_DIR, 'cache'))
+# True si todos los procesos ven la misma caché 'default'. Sin ella no se emiten
+# ETag de listados ni dashboard ni se usa la caché de respuestas: otro worker
+# respondería con su versión vieja.
+# Con 'memoria' y un solo proceso (runserver) puede activarse a mano.
+CACHE_COMPARTIDA = os.getenv('CACHE_COMPARTIDA', str(CACHE_TIPO != 'memoria')) == 'True'
+# Entradas máximas de la caché de respuestas antes de desalojar (memoria y archivo)
+CACHE_RESPUESTAS_MAX_ENTRADAS = int(os.getenv('CACHE_RESPUESTAS_MAX_ENTRADAS', '2000'))
+# Vigencia de una respuesta en caché (0 = sin caché de respuestas; sólo con CACHE_COMPARTIDA)
+CACHE_RESPUESTAS_SEGUNDOS = int(os.getenv('CACHE_RESPUESTAS_SEGUNDOS', '300'))
+
+_BACKENDS_CACHE = {
+    # tipo: (backend de 'default', backend de 'respuestas' con conteo de desalojos)
+    'memoria': ('django.core.cache.backends.locmem.LocMemCache', 'empleados.cache_respuestas.MemoriaLRUCache'),
+    'archivo': ('django.core.cache.backends.filebased.FileBasedCache', 'empleados.cache_respuestas.ArchivoCache'),
+    'redis': ('django.core.cache.backends.redis.RedisCache', 'django.core.cache.backends.redis.RedisCache'),
+}
+
+
+def _cache(backend, nombre, max_entradas, **opciones):
+    if CACHE_TIPO == 'redis':
+        # Redis desaloja por su cuenta (maxmemory-policy); OPTIONS va al cliente
+        return {'BACKEND': backend, 'LOCATION': CACHE_UBICACION, 'KEY_PREFIX': nombre, **opciones}
+    ubicacion = f'rh-{nombre}' if CACHE_TIPO == 'memoria' else os.path.join(CACHE_UBICACION, nombre)
+    return {'BACKEND': backend, 'LOCATION': ubicacion, 'OPTIONS': {'MAX_ENTRIES': max_entradas}, **opciones}
+
+
+_BACKEND_DEFAULT, _BACKEND_RESPUESTAS = _BACKENDS_CACHE[CACHE_TIPO]
+CACHES = {
+    'default': _cache(_BACKEND_DEFAULT, 'default', 10000),
+    'respuestas': _cache(_BACKEND_RESPUESTAS, 'respuestas', CACHE_RESPUESTAS_MAX_ENTRADAS, TIMEOUT=CACHE_RESPUESTAS_SEGUNDOS),
+}
+
+# === Métricas de rendimiento (GET /metrics, ver empleados.metricas) ===
+METRICAS_ACTIVAS = os.getenv('METRICAS_ACTIVAS', 'True') == 'True'
+# Directorio compartido por los workers del host ('' = sólo el proceso que responde)
+METRICAS_DIRECTORIO = os.getenv('METRICAS_DIRECTORIO', '')
+METRICAS_VOLCADO_SEGUNDOS = float(os.getenv('METRICAS_VOLCADO_SEGUNDOS', '5'))
+# Umbral para registrar una petición lenta con sus consultas más costosas
+METRICAS_LENTA_MS = float(os.getenv('METRICAS_LENTA_MS', '500'))
+# Si se define, /metrics exige `Authorization: Bearer <token>`; si no, un usuario staff autenticado
+METRICAS_TOKEN = os.getenv('METRICAS_TOKEN', '')
+
+# === Dashboard: segundos de vigencia del snapshot en caché (0 = sin caché; sólo con CACHE_COMPARTIDA) ===
+DASHBOARD_CACHE_SEGUNDOS = int(os.getenv('DASHBOARD_CACHE_SEGUNDOS', '300'))
+
+# === Exportaciones en segundo plano (python manage.py procesar_exportaciones) ===
+EXPORTACIONES_WORKERS = int(os.getenv('EXPORTACIONES_WORKERS', '2'))
+# Un trabajo EN_PROCESO desde hace más de estos segundos se da por abandonado y se reclama otra vez
+EXPORTACIONES_TIEMPO_MAXIMO_SEGUNDOS = int(os.getenv('EXPORTACIONES_TIEMPO_MAXIMO_SEGUNDOS', '1800'))
+
+# === Caché de exportaciones Excel/PDF (ver empleados.cache_exportaciones) ===
+EXPORTACIONES_CACHE_DIR = os.getenv('EXPORTACIONES_CACHE_DIR', os.path.join(BASE_DIR, 'cache_exportaciones'))
+# Segundos sin uso antes de borrar un archivo (0 = sin caché)
+EXPORTACIONES_CACHE_SEGUNDOS = int(os.getenv('EXPORTACIONES_CACHE_SEGUNDOS', '86400'))
+EXPORTACIONES_CACHE_MAX_MB = int(os.getenv('EXPORTACIONES_CACHE_MAX_MB', '500'))
+# Delegar el envío al servidor web: X-Sendfile (Apache, lighttpd) o X-Accel-Redirect (nginx)
+EXPORTACIONES_CACHE_SENDFILE = os.getenv('EXPORTACIONES_CACHE_SENDFILE', '')
+# Con X-Accel-Redirect: location interna de nginx que apunta a EXPORTACIONES_CACHE_DIR
+EXPORTACIONES_CACHE_SENDFILE_URL = os.getenv('EXPORTACIONES_CACHE_SENDFILE_URL', '/interno/exportaciones/')
+
+# === PDF de empleados (ver empleados.pdf) ===
+# Procesos que renderizan los bloques del PDF en paralelo (0 = todo en el mismo proceso)
+PDF_WORKERS = int(os.getenv('PDF_WORKERS', '2'))
+# Filas por bloque; idealmente múltiplo de las filas que caben en una página
+PDF_FILAS_POR_BLOQUE = int(os.getenv('PDF_FILAS_POR_BLOQUE', '1000'))
+
+# === Permisos por grupo ===
+# Segundos que se guardan en caché los grupos de cada usuario (se invalidan al
+# confirmar el cambio). Sólo con CACHE_COMPARTIDA; si no, se consultan en cada petición
+PERMISOS_CACHE_SEGUNDOS = int(os.getenv('PERMISOS_CACHE_SEGUNDOS', '300'))
+# Confiar en los grupos incluidos en el JWT: cero consultas, pero un cambio de
+# grupos no se refleja hasta que el token expira (ACCESS_TOKEN_LIFETIME)
+PERMISOS_GRUPOS_EN_TOKEN = os.getenv('PERMISOS_GRUPOS_EN_TOKEN', 'False') == 'True'
+
 # === CORS (Permitir peticiones del frontend) ===
 CORS_ALLOW_ALL_ORIGINS = True
 
+# === Autenticación JWT ===
+# Sin estado: confía en los claims firmados del token y no consulta el usuario por petición
+JWT_SIN_ESTADO = os.getenv('JWT_SIN_ESTADO', 'False') == 'True'
+# Cada cuántos segundos relee un proceso la versión de los tokens de un usuario (revocación)
+JWT_REVOCACION_REFRESCO_SEGUNDOS = float(os.getenv('JWT_REVOCACION_REFRESCO_SEGUNDOS', '5'))
+
 # === Django REST Framework ===
 REST_FRAMEWORK = {
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
@@ -117,7 +281,8 @@ REST_FRAMEWORK = {
         'rest_framework.filters.SearchFilter',
     ],
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'empleados.autenticacion.JWTSinEstadoAuthentication' if JWT_SIN_ESTADO
+        else 'empleados.autenticacion.JWTConRevocacionAuthentication',
     ],
 }
 
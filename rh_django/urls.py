@@ -4,11 +4,14 @@ from rest_framework_simplejwt.views import TokenObtainPairView, TokenRefreshView
 from django.conf import settings
 from django.conf.urls.static import static
 
+from empleados.views import MetricasAPIView
+
 urlpatterns = [
     path('admin/', admin.site.urls),
     path('api/', include('empleados.urls')),
     path('api/token/', TokenObtainPairView.as_view(), name='token_obtain_pair'),
     path('api/token/refresh/', TokenRefreshView.as_view(), name='token_refresh'),
+    path('metrics', MetricasAPIView.as_view(), name='metricas'),
 ]
 
 # Servir archivos multimedia (como fotos) solo en modo DEBUG